@@ -0,0 +1,87 @@
+"""
+HTTP caching for per-user GET endpoints: read-through response cache and
+conditional requests.
+
+``cached_json`` serves a route's JSON body from the response cache when its
+scope has not been written since, and answers ``If-None-Match`` with
+``304 Not Modified`` (no body) when the client already holds the current
+representation. ETags are digests of the body, so a client revalidating
+after an unrelated write still gets a 304.
+"""
+
+import json
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from kaihelper.domain.core.logger import get_logger
+from kaihelper.utils.response_cache import CachedResponse, ResponseCache, entity_tag
+
+log = get_logger("HttpCache")
+
+# Clients may store the body but must revalidate before every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def _variant(request: Request) -> str:
+    """Path and query, with parameters in a stable order."""
+    return f"{request.url.path}?{urlencode(sorted(request.query_params.multi_items()))}"
+
+
+def _encode(payload: dict) -> bytes:
+    # Same serialization as FastAPI's JSONResponse
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _respond(request: Request, response: CachedResponse) -> Response:
+    headers = {"ETag": response.etag, "Cache-Control": CACHE_CONTROL}
+    if _not_modified(request, response.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=response.body, media_type="application/json", headers=headers)
+
+
+def cached_json(request: Request, user_id: int, scope: str, build: Callable[[], dict]) -> Response:
+    """
+    Serve a per-user JSON response through the response cache.
+
+    Args:
+        request (Request): Incoming request (path, query and ``If-None-Match``).
+        user_id (int): Owner of the data.
+        scope (str): Cache scope the route reads (``response_cache.SCOPES``).
+        build (Callable[[], dict]): Builds the response body on a miss; an
+            ``HTTPException`` it raises propagates and nothing is cached.
+
+    Returns:
+        Response: The JSON body with its ETag, or 304 when the client's copy is current.
+    """
+    cache: Optional[ResponseCache] = request.app.state.services.get_response_cache()
+    key = None
+    if cache is not None:
+        try:
+            key = cache.key(user_id, scope, _variant(request))
+            if (cached := cache.get(key)) is not None:
+                return _respond(request, cached)
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("Response cache lookup failed", scope=scope, error=repr(err))
+            key = None
+
+    body = _encode(build())
+    response = CachedResponse(body, entity_tag(body))
+    if key is not None:
+        try:
+            response = cache.put(key, body)
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("Response cache store failed", scope=scope, error=repr(err))
+    return _respond(request, response)
@@ -6,14 +6,9 @@ No double-prefixing, no moving URLs.
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from mangum import Mangum
 
-try:
-    import pillow_heif
-    pillow_heif.register_heif_opener()
-except Exception:
-    pass
-
 # 1) Stage prefix ONLY in root_path (e.g., set STAGE_BASE=/Prod in Lambda)
 STAGE_BASE = os.getenv("STAGE_BASE", "").rstrip("/")  # "" locally, "/Prod" in prod
 
@@ -39,14 +34,26 @@ app.add_middleware(
 # ----- Wire services & routes -----
 from kaihelper.business.services.service_installer import ServiceInstaller  # noqa: E402
 from kaihelper.domain.domain_installer import DomainInstaller  # noqa: E402
-from kaihelper.domain.core.database import Base, engine  # noqa: E402
+from kaihelper.domain.core.database import engine, get_pool_metrics  # noqa: E402
+from kaihelper.domain.core.migrations import check_schema_version  # noqa: E402
+from kaihelper.domain.core.budget_ledger import current_budgets  # noqa: E402
+from kaihelper.domain.core.item_matching import item_indexes  # noqa: E402
+from kaihelper.domain.core.logger import get_logger  # noqa: E402
+from kaihelper.domain.core.metrics import counter_value, gauge, registry  # noqa: E402
+from kaihelper.domain.core.tracing import build_tracer, set_tracer  # noqa: E402
+from kaihelper.config.settings import settings  # noqa: E402
 
-# Ensure models are imported so create_all sees them
+# Register every model so string relationships ("Expense", "Grocery") resolve
 import kaihelper.domain.models.user       # noqa: F401,E402
 import kaihelper.domain.models.category   # noqa: F401,E402
 import kaihelper.domain.models.grocery    # noqa: F401,E402
+import kaihelper.domain.models.grocery_purchase  # noqa: F401,E402
 import kaihelper.domain.models.budget     # noqa: F401,E402
 import kaihelper.domain.models.expense    # noqa: F401,E402
+import kaihelper.domain.models.extraction_cache  # noqa: F401,E402
+import kaihelper.domain.models.receipt_job       # noqa: F401,E402
+import kaihelper.domain.models.spending_rollup   # noqa: F401,E402
+import kaihelper.domain.models.sync_tombstone    # noqa: F401,E402
 
 from kaihelper.api.routes.user_api import router as user_routes  # noqa: E402
 from kaihelper.api.routes.category_api import router as category_router  # noqa: E402
@@ -54,20 +61,94 @@ from kaihelper.api.routes.grocery_api import router as grocery_router  # noqa: E
 from kaihelper.api.routes.budget_api import router as budget_router  # noqa: E402
 from kaihelper.api.routes.expense_api import router as expense_router  # noqa: E402
 from kaihelper.api.routes.receipt_api import router as receipt_router  # noqa: E402
+from kaihelper.api.routes.analytics_api import router as analytics_router  # noqa: E402
+from kaihelper.api.routes.search_api import router as search_router  # noqa: E402
+from kaihelper.api.routes.sync_api import router as sync_router  # noqa: E402
 
 domain = DomainInstaller()
 services = ServiceInstaller(domain)
 app.state.domain = domain
 app.state.services = services
+app.state.schema = {}
+
+log = get_logger("KaiHelperAPI")
+set_tracer(build_tracer(settings))
+
+
+def _collect_runtime_metrics():
+    """Pool and cache counters, read at scrape time."""
+    pool = get_pool_metrics()
+    families = [
+        counter_value("kaihelper_db_pool_checkouts_total", "Connection pool checkouts.", pool["checkouts"]),
+        counter_value("kaihelper_db_pool_checkout_failures_total", "Failed pool checkouts.", pool["checkout_failures"]),
+        gauge("kaihelper_db_pool_checkout_ms_max", "Slowest pool checkout (ms).", pool["checkout_ms_max"]),
+        counter_value("kaihelper_db_connects_total", "New DBAPI connections.", pool["connects"]),
+        counter_value("kaihelper_db_invalidations_total", "Invalidated connections.", pool["invalidations"]),
+    ]
+    if "checked_out" in pool:
+        families.append(gauge("kaihelper_db_pool_checked_out", "Connections in use.", pool["checked_out"]))
+    budgets = current_budgets.stats()
+    families += [
+        gauge("kaihelper_budget_cache_entries", "Users in the current-budget cache.", budgets["entries"]),
+        counter_value("kaihelper_budget_cache_hits_total", "Current-budget cache hits.", budgets["hits"]),
+        counter_value("kaihelper_budget_cache_misses_total", "Current-budget cache misses.", budgets["misses"]),
+    ]
+    categories = services.get_category_service().get_cache_stats().data or {}
+    if categories:
+        families += [
+            gauge("kaihelper_category_cache_entries", "Categories in the name cache.", categories["entries"]),
+            counter_value("kaihelper_category_cache_hits_total", "Category cache hits.", categories["hits"]),
+            counter_value("kaihelper_category_cache_misses_total", "Category cache misses.", categories["misses"]),
+        ]
+    items = item_indexes.stats()
+    families += [
+        gauge("kaihelper_item_index_users", "Users with a loaded item-name index.", items["users"]),
+        gauge("kaihelper_item_index_items", "Items in the loaded item-name indexes.", items["items"]),
+        counter_value("kaihelper_item_index_loads_total", "Item-name index loads.", items["loads"]),
+        counter_value("kaihelper_item_matches_fuzzy_total", "Item names matched as misspellings.", items["fuzzy_matches"]),
+    ]
+    if (response_cache := services.get_response_cache()) is not None:
+        responses = response_cache.stats()
+        families += [
+            counter_value("kaihelper_response_cache_hits_total", "Cached GET responses served.", responses["hits"]),
+            counter_value("kaihelper_response_cache_misses_total", "GET responses built on a miss.", responses["misses"]),
+            counter_value("kaihelper_response_cache_invalidations_total", "Scope versions bumped by writes.",
+                          responses["invalidations"]),
+        ]
+    return families
+
+
+registry.register_collector(_collect_runtime_metrics)
+
+def _check_schema() -> None:
+    """
+    Compare the database revision with the migrations shipped in this build.
+
+    The schema is owned by ``python -m kaihelper.domain.core.migrations upgrade``;
+    serving starts even when it is behind, but says so loudly.
+    """
+    status = check_schema_version(engine)
+    if not status["up_to_date"] and settings.DB_AUTO_MIGRATE:
+        from kaihelper.domain.core.migrations import upgrade_database
+
+        log.info("Migrating schema", current=status["current"], head=status["head"])
+        upgrade_database(engine)
+        status = check_schema_version(engine)
+    if not status["up_to_date"]:
+        log.warning(
+            "Schema is behind the code; run `python -m kaihelper.domain.core.migrations upgrade`",
+            current=status["current"],
+            head=status["head"],
+        )
+    app.state.schema = status
 
 @app.on_event("startup")
 def on_startup():
     try:
-        Base.metadata.create_all(bind=engine)
-        print(f"[KaiHelper API] root_path={app.root_path!r}")
-        print(f"[KaiHelper API] docs={app.docs_url} openapi={app.openapi_url}")
-    except Exception as exc:  # pylint: disable=broad-except
-        print(f"[KaiHelper API] Startup error: {exc}")
+        _check_schema()
+        log.info("Started", root_path=app.root_path, docs=app.docs_url, openapi=app.openapi_url)
+    except Exception:  # pylint: disable=broad-except
+        log.exception("Startup error")
 
 # API routes: under /api/* (NO stage here)
 app.include_router(user_routes,     prefix="/api/users",      tags=["Users"])
@@ -76,6 +157,9 @@ app.include_router(grocery_router,  prefix="/api/groceries",  tags=["Groceries"]
 app.include_router(budget_router,   prefix="/api/budgets",    tags=["Budgets"])
 app.include_router(expense_router,  prefix="/api/expenses",   tags=["Expenses"])
 app.include_router(receipt_router,  prefix="/api/receipts",   tags=["Receipts"])
+app.include_router(analytics_router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(search_router,   prefix="/api/search",     tags=["Search"])
+app.include_router(sync_router,     prefix="/api/sync",       tags=["Sync"])
 
 @app.get("/")
 def root():
@@ -85,5 +169,15 @@ def root():
 def health():
     return {"status": "ok"}
 
+@app.get("/health/db", tags=["Health"])
+def health_db():
+    """Connection pool checkout/connect metrics and the schema revision seen at startup."""
+    return {"status": "ok", "pool": get_pool_metrics(), "schema": app.state.schema}
+
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+def metrics():
+    """Pipeline span timings, pool and cache counters in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Lambda handler
 handler = Mangum(app)
@@ -0,0 +1,54 @@
+"""
+Analytics endpoints: category months, stores, local share, top items, summary
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from kaihelper.contracts.analytics_dto import AnalyticsQueryDTO, DEFAULT_TOP_N, MAX_TOP_N
+
+router = APIRouter()
+
+
+def analytics_query(
+    date_from: Optional[date] = Query(None, description="Inclusive lower bound on the expense/purchase date"),
+    date_to: Optional[date] = Query(None, description="Inclusive upper bound on the expense/purchase date"),
+    limit: int = Query(DEFAULT_TOP_N, ge=1, le=MAX_TOP_N, description="Rows in ranked results"),
+) -> AnalyticsQueryDTO:
+    return AnalyticsQueryDTO(date_from=date_from, date_to=date_to, limit=limit)
+
+
+def _respond(result):
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    return {"success": True, "message": result.message, "data": result.data}
+
+@router.get("/user/{user_id}/categories")
+def category_monthly_totals(user_id: int, request: Request, query: AnalyticsQueryDTO = Depends(analytics_query)):
+    """Spend per category per month."""
+    service = request.app.state.services.get_analytics_service()
+    return _respond(service.category_monthly_totals(user_id, query))
+
+@router.get("/user/{user_id}/stores")
+def store_totals(user_id: int, request: Request, query: AnalyticsQueryDTO = Depends(analytics_query)):
+    """Spend per store, highest first."""
+    service = request.app.state.services.get_analytics_service()
+    return _respond(service.store_totals(user_id, query))
+
+@router.get("/user/{user_id}/local-share")
+def local_share(user_id: int, request: Request, query: AnalyticsQueryDTO = Depends(analytics_query)):
+    """Local vs imported grocery spend."""
+    service = request.app.state.services.get_analytics_service()
+    return _respond(service.local_share(user_id, query))
+
+@router.get("/user/{user_id}/top-items")
+def top_items(user_id: int, request: Request, query: AnalyticsQueryDTO = Depends(analytics_query)):
+    """Grocery items ranked by total cost."""
+    service = request.app.state.services.get_analytics_service()
+    return _respond(service.top_items(user_id, query))
+
+@router.get("/user/{user_id}/summary")
+def summary(user_id: int, request: Request, query: AnalyticsQueryDTO = Depends(analytics_query)):
+    """Every dashboard aggregate in one response."""
+    service = request.app.state.services.get_analytics_service()
+    return _respond(service.summary(user_id, query))
@@ -1,8 +1,12 @@
 """
-Budget endpoints: create, list
+Budget endpoints: create, list, current
 """
+from datetime import date
+
 from fastapi import APIRouter, HTTPException, Request
+from kaihelper.api.http_cache import cached_json
 from kaihelper.contracts.budget_dto import BudgetDTO
+from kaihelper.utils.response_cache import BUDGETS
 
 router = APIRouter()
 
@@ -16,8 +20,20 @@ def create_budget(dto: BudgetDTO, request: Request):
 
 @router.get("/user/{user_id}")
 def list_budgets(user_id: int, request: Request):
+    """List a user's active budgets (cached; answers If-None-Match with 304)."""
+    def build() -> dict:
+        service = request.app.state.services.get_budget_service()
+        result = service.list_budgets(user_id)
+        if not result.success:
+            raise HTTPException(status_code=404, detail=result.message)
+        return {"success": True, "message": result.message, "data": result.data}
+
+    return cached_json(request, user_id, BUDGETS, build)
+
+@router.get("/user/{user_id}/current")
+def get_current_budget(user_id: int, request: Request, on_date: date | None = None):
     service = request.app.state.services.get_budget_service()
-    result = service.list_budgets(user_id)
+    result = service.get_current_budget(user_id, on_date)
     if not result.success:
         raise HTTPException(status_code=404, detail=result.message)
     return {"success": True, "message": result.message, "data": result.data}
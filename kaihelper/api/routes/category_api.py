@@ -1,5 +1,5 @@
 """
-Category endpoints: create, list
+Category endpoints: create, list, cache stats
 """
 from fastapi import APIRouter, HTTPException, Request
 from kaihelper.contracts.category_dto import CategoryDTO
@@ -24,4 +24,11 @@ def list_categories(request: Request):
     inner = result.data
     if isinstance(inner, dict) and "data" in inner:
         return {"success": True, "message": inner.get("message", result.message), "data": inner["data"]}
-    return {"success": True, "message": result.message, "data": result.data}
\ No newline at end of file
+    return {"success": True, "message": result.message, "data": result.data}
+
+@router.get("/cache/stats")
+def category_cache_stats(request: Request):
+    """Report size and hit rate of the in-process category cache."""
+    service = request.app.state.services.get_category_service()
+    result = service.get_cache_stats()
+    return {"success": True, "message": result.message, "data": result.data}
@@ -1,8 +1,14 @@
 """
-Expense endpoints: add, list
+Expense endpoints: add, list, get
 """
-from fastapi import APIRouter, HTTPException, Request
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
 from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.page_dto import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageQueryDTO, page_size
+from kaihelper.api.http_cache import cached_json
+from kaihelper.utils.response_cache import EXPENSES
 
 router = APIRouter()
 
@@ -15,9 +21,52 @@ def add_expense(dto: ExpenseDTO, request: Request):
     return {"success": True, "message": result.message, "data": result.data}
 
 @router.get("/user/{user_id}")
-def list_expenses(user_id: int, request: Request):
+def list_expenses(
+    user_id: int,
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE,
+        description=f"Page size (default {DEFAULT_PAGE_SIZE} with a cursor); omit both for the full list",
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    date_from: Optional[date] = Query(None, description="Inclusive lower bound on expense_date"),
+    date_to: Optional[date] = Query(None, description="Inclusive upper bound on expense_date"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. amount,store_name,expense_date"),
+    include: Optional[str] = Query(None, description="Embed related rows: groceries"),
+):
+    """
+    List a user's expenses newest first (cached per page).
+
+    Without ``limit`` and ``cursor`` every expense is returned, as before
+    pagination; with either, one keyset page plus ``next_cursor``.
+    """
+    def build() -> dict:
+        service = request.app.state.services.get_expense_service()
+        query = PageQueryDTO(
+            limit=page_size(limit, cursor), cursor=cursor, date_from=date_from, date_to=date_to,
+            fields=PageQueryDTO.parse_list(fields), include=PageQueryDTO.parse_list(include),
+        )
+        result = service.list_expenses_page(user_id, query)
+        if not result.success:
+            # 400 for a bad cursor, field or include; 500 when the query itself failed
+            raise HTTPException(status_code=result.code or 404, detail=result.message)
+        page = result.data
+        return {"success": True, "message": result.message, "data": page.items, "next_cursor": page.next_cursor}
+
+    return cached_json(request, user_id, EXPENSES, build)
+
+@router.get("/{expense_id}")
+def get_expense(
+    expense_id: int,
+    request: Request,
+    include: Optional[str] = Query(None, description="Embed related rows: groceries"),
+):
+    """Get a single expense; groceries are only loaded with include=groceries."""
+    includes = PageQueryDTO.parse_list(include) or []
+    if set(includes) - {"groceries"}:
+        raise HTTPException(status_code=400, detail="Unknown include. Supported: groceries.")
     service = request.app.state.services.get_expense_service()
-    result = service.list_expenses(user_id)
+    result = service.get_expense_by_id(expense_id, include_groceries="groceries" in includes)
     if not result.success:
         raise HTTPException(status_code=404, detail=result.message)
     return {"success": True, "message": result.message, "data": result.data}
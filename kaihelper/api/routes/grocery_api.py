@@ -1,8 +1,14 @@
 """
 Grocery endpoints: add, list, get, update, delete
 """
-from fastapi import APIRouter, HTTPException, Request
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from kaihelper.contracts.grocery_dto import DEFAULT_PRICE_POINTS, MAX_PRICE_POINTS, GroceryDTO, PriceHistoryQueryDTO
+from kaihelper.contracts.page_dto import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PageQueryDTO, page_size
+from kaihelper.api.http_cache import cached_json
+from kaihelper.utils.response_cache import GROCERIES
 
 router = APIRouter()
 
@@ -16,13 +22,38 @@ def add_grocery(dto: GroceryDTO, request: Request):
     return {"success": True, "message": result.message, "data": result.data}
 
 @router.get("/user/{user_id}", response_model=dict)
-def list_groceries(user_id: int, request: Request):
-    """Get all groceries for a specific user."""
-    service = request.app.state.services.get_grocery_service()
-    result = service.list_groceries(user_id)
-    if not result.success:
-        raise HTTPException(status_code=404, detail=result.message)
-    return {"success": True, "message": result.message, "data": result.data}
+def list_groceries(
+    user_id: int,
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE,
+        description=f"Page size (default {DEFAULT_PAGE_SIZE} with a cursor); omit both for the full list",
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    date_from: Optional[date] = Query(None, description="Inclusive lower bound on purchase_date"),
+    date_to: Optional[date] = Query(None, description="Inclusive upper bound on purchase_date"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns, e.g. item_name,total_cost"),
+):
+    """
+    Get a user's groceries newest purchase first (cached per page).
+
+    Without ``limit`` and ``cursor`` every grocery is returned, as before
+    pagination; with either, one keyset page plus ``next_cursor``.
+    """
+    def build() -> dict:
+        service = request.app.state.services.get_grocery_service()
+        query = PageQueryDTO(
+            limit=page_size(limit, cursor), cursor=cursor, date_from=date_from, date_to=date_to,
+            fields=PageQueryDTO.parse_list(fields),
+        )
+        result = service.list_groceries_page(user_id, query)
+        if not result.success:
+            # 400 for a bad cursor, field or include; 500 when the query itself failed
+            raise HTTPException(status_code=result.code or 404, detail=result.message)
+        page = result.data
+        return {"success": True, "message": result.message, "data": page.items, "next_cursor": page.next_cursor}
+
+    return cached_json(request, user_id, GROCERIES, build)
 
 @router.get("/expense/{expense_id}", response_model=dict)
 def list_groceries_by_expense(expense_id: int, request: Request):
@@ -33,6 +64,24 @@ def list_groceries_by_expense(expense_id: int, request: Request):
         raise HTTPException(status_code=404, detail=result.message)
     return {"success": True, "message": result.message, "data": result.data}
 
+@router.get("/{grocery_id}/price-history", response_model=dict)
+def get_price_history(
+    grocery_id: int,
+    request: Request,
+    date_from: Optional[date] = Query(None, description="Inclusive lower bound on purchase_date"),
+    date_to: Optional[date] = Query(None, description="Inclusive upper bound on purchase_date"),
+    store: Optional[str] = Query(None, description="Only purchases at this store"),
+    limit: int = Query(DEFAULT_PRICE_POINTS, ge=1, le=MAX_PRICE_POINTS),
+):
+    """Get every purchase of an item (oldest first) and its unit-price statistics per store."""
+    service = request.app.state.services.get_grocery_service()
+    query = PriceHistoryQueryDTO(date_from=date_from, date_to=date_to, store_name=store, limit=limit)
+    result = service.get_price_history(grocery_id, query)
+    if not result.success:
+        status = 404 if result.message == "Grocery not found" else 400
+        raise HTTPException(status_code=status, detail=result.message)
+    return {"success": True, "message": result.message, "data": result.data}
+
 @router.get("/{grocery_id}", response_model=dict)
 async def get_grocery(grocery_id: int, request: Request):
     """Get a single grocery item by ID."""
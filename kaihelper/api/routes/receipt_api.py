@@ -1,30 +1,100 @@
 """
-Receipt endpoints: upload and process receipt image via GPT-4o
+Receipt endpoints: upload and process receipt image via GPT-4o,
+either synchronously, as a server-sent event stream, or as a background
+job polled by ID.
 """
+import asyncio
+import json
+import os
+import zipfile
+from io import BytesIO
+from typing import List
+
 from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form
-from kaihelper.utils.image_normalizer import to_jpeg_bytes
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from kaihelper.config.settings import settings
+from kaihelper.domain.core.logger import get_logger
+from kaihelper.utils.image_normalizer import preprocess_receipt_image
 
 router = APIRouter()
+log = get_logger("ReceiptAPI")
+
+# Upper bound for a single image inside an uploaded zip archive
+MAX_ZIP_MEMBER_BYTES = 20 * 1024 * 1024
+
+
+class BatchTooLarge(ValueError):
+    """A batch upload exceeds the file count or size limits."""
+
+
+def _preprocess(raw: bytes) -> bytes:
+    """Run the image pipeline once and log its size/timing metrics."""
+    image = preprocess_receipt_image(raw)
+    log.info(
+        "Preprocessed image",
+        input_bytes=image.input_bytes,
+        output_bytes=image.output_bytes,
+        width=image.width,
+        height=image.height,
+        cropped=image.cropped,
+        **image.timings_ms,
+    )
+    return image.data
 
 
 @router.post("/upload")
-async def upload_receipt(user_id: int = Form(...), file: UploadFile = File(...), request: Request = None):
+async def upload_receipt(
+    user_id: int = Form(...),
+    file: UploadFile = File(...),
+    async_mode: bool = Form(False),
+    stream: bool = Form(False),
+    request: Request = None,
+):
     """
-    Upload a receipt image, process it through GPT-4o Vision, 
+    Upload a receipt image, process it through GPT-4o Vision,
     extract items, and map them into groceries and expenses.
-    """
-    service = request.app.state.services.get_receipt_service()
-    #image_bytes = await file.read()
-    #result = service.process_receipt(user_id, image_bytes)
 
+    With ``async_mode=true`` the receipt is queued and a job ID is returned
+    immediately (HTTP 202); poll ``GET /api/receipts/jobs/{job_id}`` for the result.
+
+    With ``stream=true`` the response is a ``text/event-stream``: ``started``,
+    one ``item`` event per line item as the model emits it, ``extracted``, then
+    ``result`` or ``error``. Nothing is written until the receipt is complete:
+    the items are saved in one transaction before ``result``.
+    """
     image_raw = await file.read()
-    
+
     try:
-        image_bytes = to_jpeg_bytes(image_raw)
+        image_bytes = await run_in_threadpool(_preprocess, image_raw)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
 
-    result = service.process_receipt(user_id, image_bytes)
+    if async_mode:
+        job_service = request.app.state.services.get_receipt_job_service()
+        result = await run_in_threadpool(job_service.submit, user_id, image_bytes)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return JSONResponse(
+            status_code=202,
+            content={
+                "success": True,
+                "message": result.message,
+                "data": {"job_id": result.data.job_id, "status": result.data.status},
+            },
+        )
+
+    service = request.app.state.services.get_receipt_service()
+    if stream:
+        return StreamingResponse(
+            _receipt_events(service, user_id, image_bytes),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # Blocking vision call + DB writes run off the event loop
+    result = await run_in_threadpool(service.process_receipt, user_id, image_bytes)
 
     if not result.success:
         raise HTTPException(status_code=400, detail=result.message)
@@ -34,3 +104,182 @@ async def upload_receipt(user_id: int = Form(...), file: UploadFile = File(...),
         "message": result.message,
         "data": result.data
     }
+
+
+def _sse(event: str, payload: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(payload))}\n\n"
+
+
+async def _receipt_events(service, user_id: int, image_bytes: bytes):
+    """Run the streaming extraction in a worker thread and relay its progress as SSE."""
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(event: str, payload: dict) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, (event, payload))
+
+    task = asyncio.ensure_future(
+        run_in_threadpool(service.process_receipt_stream, user_id, image_bytes, on_event)
+    )
+    # Events are queued from the worker thread before the task completes, so the sentinel comes last
+    task.add_done_callback(lambda _: events.put_nowait(None))
+
+    while (message := await events.get()) is not None:
+        yield _sse(*message)
+
+    try:
+        result = task.result()
+    except Exception as err:  # pylint: disable=broad-except
+        yield _sse("error", {"success": False, "message": f"Failed to process receipt: {repr(err)}"})
+        return
+    if result.success:
+        yield _sse("result", {"success": True, "message": result.message, "data": result.data})
+    else:
+        yield _sse("error", {"success": False, "message": result.message})
+
+
+def _zip_members(archive: zipfile.ZipFile) -> list[zipfile.ZipInfo]:
+    """Image candidates in an archive (no directories, macOS metadata or hidden files)."""
+    return [
+        member for member in archive.infolist()
+        if not member.is_dir()
+        and not member.filename.startswith("__MACOSX/")
+        and not os.path.basename(member.filename).startswith(".")
+    ]
+
+
+def _expand_uploads(uploads: list[tuple[str, bytes]]) -> list[tuple[str, bytes]]:
+    """
+    Flatten uploaded files, unpacking ``.zip`` archives into their members.
+
+    Every archive's directory is checked against RECEIPT_BATCH_MAX_FILES,
+    RECEIPT_BATCH_MAX_BYTES and MAX_ZIP_MEMBER_BYTES before any member is
+    decompressed; ``zipfile`` never inflates a member past its declared size.
+
+    Raises:
+        BatchTooLarge: If the batch exceeds a limit.
+        zipfile.BadZipFile: If an archive is corrupt.
+    """
+    # (filename, raw bytes) for plain files, (filename, archive, members) for zips, in upload order
+    sources: list[tuple] = []
+    count = total_bytes = 0
+    try:
+        for filename, raw in uploads:
+            if not zipfile.is_zipfile(BytesIO(raw)):
+                sources.append((filename, raw))
+                count += 1
+                continue
+            archive = zipfile.ZipFile(BytesIO(raw))
+            members = _zip_members(archive)
+            sources.append((filename, archive, members))
+            for member in members:
+                if member.file_size > MAX_ZIP_MEMBER_BYTES:
+                    raise BatchTooLarge(
+                        f"{filename}/{member.filename} is larger than {MAX_ZIP_MEMBER_BYTES // (1024 * 1024)} MB."
+                    )
+            count += len(members)
+            total_bytes += sum(member.file_size for member in members)
+            if count > settings.RECEIPT_BATCH_MAX_FILES:
+                raise BatchTooLarge(f"Too many files; the limit is {settings.RECEIPT_BATCH_MAX_FILES}.")
+            if total_bytes > settings.RECEIPT_BATCH_MAX_BYTES:
+                raise BatchTooLarge(
+                    f"Archives expand past {settings.RECEIPT_BATCH_MAX_BYTES // (1024 * 1024)} MB."
+                )
+
+        files: list[tuple[str, bytes]] = []
+        for source in sources:
+            if len(source) == 2:
+                files.append(source)
+            else:
+                filename, archive, members = source
+                files.extend((f"{filename}/{member.filename}", archive.read(member)) for member in members)
+        return files
+    finally:
+        for source in sources:
+            if len(source) == 3:
+                source[1].close()
+
+
+@router.post("/upload-batch")
+async def upload_receipt_batch(
+    user_id: int = Form(...),
+    files: List[UploadFile] = File(...),
+    request: Request = None,
+):
+    """
+    Upload many receipt images (or ``.zip`` archives of images) at once.
+
+    Extraction fans out with bounded concurrency (RECEIPT_BATCH_CONCURRENCY),
+    all results are persisted in one batched transaction, and the response
+    reports a per-file outcome.
+    """
+    uploads = [(upload.filename or f"file-{i}", await upload.read()) for i, upload in enumerate(files)]
+    try:
+        expanded = await run_in_threadpool(_expand_uploads, uploads)
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"Invalid zip archive: {e}")
+    except BatchTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if not expanded:
+        raise HTTPException(status_code=400, detail="No receipt images provided.")
+    if len(expanded) > settings.RECEIPT_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many files ({len(expanded)}); the limit is {settings.RECEIPT_BATCH_MAX_FILES}.",
+        )
+
+    normalized = await asyncio.gather(
+        *(run_in_threadpool(_preprocess, raw) for _, raw in expanded),
+        return_exceptions=True,
+    )
+    images: list[tuple[str, bytes]] = []
+    rejected: list[dict] = []
+    for (filename, _), image in zip(expanded, normalized):
+        if isinstance(image, Exception):
+            rejected.append({"filename": filename, "success": False, "message": f"Invalid image: {image}", "data": None})
+        else:
+            images.append((filename, image))
+
+    summary = {"total": 0, "succeeded": 0, "failed": 0, "results": []}
+    message = "No valid receipt images"
+    if images:
+        service = request.app.state.services.get_receipt_service()
+        result = await run_in_threadpool(service.process_receipts, user_id, images)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        summary, message = result.data, result.message
+
+    summary["results"] = summary["results"] + rejected
+    summary["total"] += len(rejected)
+    summary["failed"] += len(rejected)
+    return {"success": summary["succeeded"] > 0, "message": message, "data": summary}
+
+
+@router.get("/jobs/user/{user_id}")
+def list_receipt_jobs(user_id: int, request: Request):
+    """List the most recent receipt jobs of a user."""
+    service = request.app.state.services.get_receipt_job_service()
+    result = service.list_jobs(user_id)
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    return {"success": True, "message": result.message, "data": result.data}
+
+
+@router.get("/jobs/{job_id}")
+def get_receipt_job(job_id: str, request: Request):
+    """Report the status (and result, once finished) of a receipt job."""
+    service = request.app.state.services.get_receipt_job_service()
+    result = service.get_job(job_id)
+    if not result.success:
+        raise HTTPException(status_code=result.code or 404, detail=result.message)
+    return {"success": True, "message": result.message, "data": result.data}
+
+
+@router.get("/cache/stats")
+def extraction_cache_stats(request: Request):
+    """Report hit/miss counters of the receipt extraction cache."""
+    service = request.app.state.services.get_receipt_service()
+    result = service.get_cache_stats()
+    return {"success": True, "message": result.message, "data": result.data}
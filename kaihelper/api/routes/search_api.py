@@ -0,0 +1,29 @@
+"""
+Search endpoint: full-text search over a user's expenses and grocery items
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from kaihelper.contracts.page_dto import PageQueryDTO
+from kaihelper.contracts.search_dto import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, SearchQueryDTO
+
+router = APIRouter()
+
+
+@router.get("/user/{user_id}")
+def search(
+    user_id: int,
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find, e.g. countdown coffee"),
+    types: Optional[str] = Query(None, description="Comma-separated: expense,grocery (default: both)"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
+    """Search a user's expenses (store, description, notes, receipt number, items) and grocery items."""
+    service = request.app.state.services.get_search_service()
+    query = SearchQueryDTO(q=q, types=PageQueryDTO.parse_list(types), limit=limit, cursor=cursor)
+    result = service.search(user_id, query)
+    if not result.success:
+        raise HTTPException(status_code=400, detail=result.message)
+    page = result.data
+    return {"success": True, "message": result.message, "data": page.hits, "next_cursor": page.next_cursor}
@@ -0,0 +1,51 @@
+"""
+Sync endpoint: delta sync of a user's expenses and grocery items for the mobile client
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from kaihelper.contracts.sync_dto import DEFAULT_SYNC_LIMIT, MAX_SYNC_LIMIT, SyncQueryDTO
+
+router = APIRouter()
+
+
+_SINCE = Query(None, description="next_token of the previous call; omit for a full sync")
+_LIMIT = Query(DEFAULT_SYNC_LIMIT, ge=1, le=MAX_SYNC_LIMIT, description="Rows per table in this batch")
+
+
+@router.get("")
+def sync_changes(
+    request: Request,
+    user_id: int = Query(..., description="User to sync"),
+    since: Optional[str] = _SINCE,
+    limit: int = _LIMIT,
+):
+    """``GET /api/sync?user_id=&since=``: same as ``GET /api/sync/user/{user_id}?since=``."""
+    return sync(user_id, request, since, limit)
+
+
+@router.get("/user/{user_id}")
+def sync(
+    user_id: int,
+    request: Request,
+    since: Optional[str] = _SINCE,
+    limit: int = _LIMIT,
+):
+    """
+    Expenses and grocery items created, updated or deleted since ``since``.
+
+    Apply ``deleted`` first, then upsert the rows; store ``next_token`` and call
+    again while ``has_more`` is true. 410 means the token is too old: sync from scratch.
+    """
+    service = request.app.state.services.get_sync_service()
+    result = service.changes(user_id, SyncQueryDTO(since=since, limit=limit))
+    if not result.success:
+        raise HTTPException(status_code=410 if result.code == 410 else 400, detail=result.message)
+    batch = result.data
+    return {
+        "success": True,
+        "message": result.message,
+        "data": {"expenses": batch.expenses, "groceries": batch.groceries, "deleted": batch.deleted},
+        "next_token": batch.next_token,
+        "has_more": batch.has_more,
+    }
@@ -2,7 +2,9 @@
 User endpoints: register, login, profile
 """
 from fastapi import APIRouter, HTTPException, Request
+from kaihelper.api.http_cache import cached_json
 from kaihelper.contracts.user_dto import RegisterUserDTO, LoginRequestDTO
+from kaihelper.utils.response_cache import PROFILE
 
 router = APIRouter()
 
@@ -24,8 +26,12 @@ def login_user(dto: LoginRequestDTO, request: Request):
 
 @router.get("/profile/{user_id}")
 def get_profile(user_id: int, request: Request):
-    user_service = request.app.state.services.get_user_service()
-    result = user_service.get_user_profile(user_id)
-    if not result.success:
-        raise HTTPException(status_code=404, detail=result.message)
-    return {"success": True, "message": result.message, "data": result.data}
+    """Get a user's profile (cached; answers If-None-Match with 304)."""
+    def build() -> dict:
+        user_service = request.app.state.services.get_user_service()
+        result = user_service.get_user_profile(user_id)
+        if not result.success:
+            raise HTTPException(status_code=404, detail=result.message)
+        return {"success": True, "message": result.message, "data": result.data}
+
+    return cached_json(request, user_id, PROFILE, build)
@@ -0,0 +1,63 @@
+"""
+Receipt job worker (SQS consumer)
+Lambda entry point for RECEIPT_JOB_QUEUE=sqs: each SQS record carries a job ID
+whose state and image live in the receipt_jobs table.
+
+Recovering lost or abandoned jobs is also the worker's job, not the API's:
+``resume_handler`` is meant for a scheduled rule (e.g. every few minutes), and
+the same sweep runs locally against a queued backlog with:
+    python -m kaihelper.api.worker
+"""
+import json
+
+from kaihelper.domain.core.logger import get_logger
+from kaihelper.domain.domain_installer import DomainInstaller
+from kaihelper.business.services.service_installer import ServiceInstaller
+
+log = get_logger("ReceiptWorker")
+
+_services = None
+
+
+def _get_services() -> ServiceInstaller:
+    """Build the service graph once per container."""
+    global _services  # pylint: disable=global-statement
+    if _services is None:
+        _services = ServiceInstaller(DomainInstaller())
+    return _services
+
+
+def handler(event, context):  # pylint: disable=unused-argument
+    """
+    Process SQS records; failed records are reported back for redelivery.
+
+    Returns:
+        dict: Partial batch response (``batchItemFailures``) understood by Lambda.
+    """
+    job_service = _get_services().get_receipt_job_service()
+    failures = []
+    for record in event.get("Records", []):
+        try:
+            job_id = json.loads(record["body"])["job_id"]
+            job_service.run_job(job_id)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed record", message_id=record.get("messageId"))
+            failures.append({"itemIdentifier": record.get("messageId")})
+    return {"batchItemFailures": failures}
+
+
+def resume_handler(event, context):  # pylint: disable=unused-argument
+    """
+    Scheduled sweep: re-submit queued jobs whose delivery was lost and jobs
+    abandoned by a crashed worker.
+
+    Returns:
+        dict: ``{"resumed": <number of job IDs submitted>}``.
+    """
+    pending = _get_services().get_receipt_job_service().resume_pending()
+    return {"resumed": len(pending.data or [])}
+
+
+if __name__ == "__main__":
+    # Drain queued/abandoned jobs directly from the database
+    log.info("Submitted jobs", jobs=resume_handler({}, None)["resumed"])
@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.analytics_dto import AnalyticsQueryDTO
+
+
+class IAnalyticsService(ABC):
+    """Interface for spending analytics."""
+
+    @abstractmethod
+    def category_monthly_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Spend per category per month."""
+        pass
+
+    @abstractmethod
+    def store_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Spend per store, highest first."""
+        pass
+
+    @abstractmethod
+    def local_share(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Local vs imported grocery spend."""
+        pass
+
+    @abstractmethod
+    def top_items(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Grocery items ranked by total cost."""
+        pass
+
+    @abstractmethod
+    def summary(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """All dashboard aggregates in one result (AnalyticsSummaryDTO)."""
+        pass
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from datetime import date
 from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.contracts.budget_dto import BudgetDTO
 
@@ -12,3 +13,7 @@ class IBudgetService(ABC):
     @abstractmethod
     def list_budgets(self, user_id: int) -> ResultDTO:
         pass
+
+    @abstractmethod
+    def get_current_budget(self, user_id: int, on_date: date | None = None) -> ResultDTO:
+        pass
@@ -20,3 +20,11 @@ class ICategoryService(ABC):
     @abstractmethod
     def get_category(self, category_name: str) -> ResultDTO:
         pass
+
+    @abstractmethod
+    def ensure_category(self, category_name: str, description: str | None = None) -> ResultDTO:
+        pass
+
+    @abstractmethod
+    def get_cache_stats(self) -> ResultDTO:
+        pass
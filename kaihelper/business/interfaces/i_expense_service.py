@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 from datetime import date
 
 
@@ -22,14 +23,19 @@ class IExpenseService(ABC):
         """List all expenses for a specific user."""
         pass
 
+    @abstractmethod
+    def list_expenses_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """List one keyset page of a user's expenses, newest first."""
+        pass
+
     @abstractmethod
     def find_by_grocery_id(self, grocery_id: int) -> ResultDTO:
         """Find an expense linked to a specific grocery (used by ReceiptService)."""
         pass
 
     @abstractmethod
-    def get_expense_by_id(self, expense_id: int) -> ResultDTO:
-        """Retrieve an expense record by its ID."""
+    def get_expense_by_id(self, expense_id: int, include_groceries: bool = False) -> ResultDTO:
+        """Retrieve an expense record by its ID (groceries only when requested)."""
         pass
 
     @abstractmethod
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from kaihelper.contracts.result_dto import ResultDTO
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO, PriceHistoryQueryDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 
 
 class IGroceryService(ABC):
@@ -16,6 +17,11 @@ class IGroceryService(ABC):
         """List all groceries for a specific user."""
         pass
 
+    @abstractmethod
+    def list_groceries_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """List one keyset page of a user's groceries, newest purchase first."""
+        pass
+
     @abstractmethod
     def find_by_name(self, user_id: int, item_name: str) -> ResultDTO:
         """Find an existing grocery by item name for a specific user."""
@@ -26,6 +32,16 @@ class IGroceryService(ABC):
         """Update an existing grocery record."""
         pass
     
+    @abstractmethod
+    def record_purchases(self, expense_id: int | None, store_name: str | None, groceries: list[GroceryDTO]) -> ResultDTO:
+        """Record the purchase lines of one receipt in the item's price history."""
+        pass
+
+    @abstractmethod
+    def get_price_history(self, grocery_id: int, query: PriceHistoryQueryDTO) -> ResultDTO:
+        """Retrieve the price history of a grocery item."""
+        pass
+
     @abstractmethod
     def get_by_expense_id(self, expense_id: int) -> ResultDTO:
         """Retrieve a grocery record associated with a specific expense ID."""
@@ -0,0 +1,53 @@
+"""
+IReceiptExtractor Interface
+Defines the contract for engines that turn a receipt image into structured data.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable
+from kaihelper.contracts.receipt_dto import ReceiptExtractionDTO
+
+#: Callback receiving each completed line item and the receipt header fields seen so far
+ItemCallback = Callable[[dict, dict], None]
+
+
+class IReceiptExtractor(ABC):
+    """Abstract base class for receipt extraction engines."""
+
+    #: Short engine identifier used in logs and ReceiptExtractionDTO.engine
+    name: str = "extractor"
+
+    @abstractmethod
+    def extract(self, image_bytes: bytes) -> ReceiptExtractionDTO:
+        """
+        Extract structured receipt data from an image.
+
+        Args:
+            image_bytes (bytes): Preprocessed receipt image.
+
+        Returns:
+            ReceiptExtractionDTO: Parsed receipt plus a confidence score.
+
+        Raises:
+            RuntimeError: If the engine cannot process the image at all.
+        """
+        pass
+
+    def extract_stream(self, image_bytes: bytes, on_item: ItemCallback) -> ReceiptExtractionDTO:
+        """
+        Extract a receipt, reporting each line item as soon as it is available.
+
+        Engines without incremental output call ``on_item`` for every item once
+        the full result is known; streaming engines override this.
+
+        Args:
+            image_bytes (bytes): Preprocessed receipt image.
+            on_item (ItemCallback): Called with ``(item, header)`` per line item.
+
+        Returns:
+            ReceiptExtractionDTO: The complete extraction.
+        """
+        result = self.extract(image_bytes)
+        for item in result.data.get("items") or []:
+            on_item(item, result.data)
+        return result
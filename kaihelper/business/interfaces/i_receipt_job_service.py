@@ -0,0 +1,36 @@
+"""
+IReceiptJobService Interface
+Defines the contract for asynchronous receipt ingestion.
+"""
+
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class IReceiptJobService(ABC):
+    """Abstract base class for the Receipt Job Service."""
+
+    @abstractmethod
+    def submit(self, user_id: int, image_bytes: bytes) -> ResultDTO:
+        """Persist a receipt job and hand it to the worker queue."""
+        pass
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> ResultDTO:
+        """Return the current state of a job."""
+        pass
+
+    @abstractmethod
+    def list_jobs(self, user_id: int) -> ResultDTO:
+        """Return the most recent jobs of a user."""
+        pass
+
+    @abstractmethod
+    def run_job(self, job_id: str) -> ResultDTO:
+        """Claim and process a single job (called by workers)."""
+        pass
+
+    @abstractmethod
+    def resume_pending(self) -> ResultDTO:
+        """Re-submit queued and abandoned jobs after a restart."""
+        pass
@@ -4,6 +4,7 @@ Defines the contract for receipt processing services.
 """
 
 from abc import ABC, abstractmethod
+from typing import Callable
 from kaihelper.contracts.result_dto import ResultDTO
 
 
@@ -23,3 +24,47 @@ class IReceiptService(ABC):
             ResultDTO: A standardized response containing the parsed receipt data.
         """
         pass
+
+    @abstractmethod
+    def process_receipts(self, user_id: int, images: list[tuple[str, bytes]]) -> ResultDTO:
+        """
+        Analyze many receipt images concurrently and persist them in one batch.
+
+        Args:
+            user_id (int): ID of the user who uploaded the receipts.
+            images (list[tuple[str, bytes]]): ``(filename, normalized image bytes)`` pairs.
+
+        Returns:
+            ResultDTO: Batch summary with a per-file outcome list.
+        """
+        pass
+
+    @abstractmethod
+    def process_receipt_stream(
+        self,
+        user_id: int,
+        image_bytes: bytes,
+        on_event: Callable[[str, dict], None],
+    ) -> ResultDTO:
+        """
+        Analyze a receipt with a streamed extraction, persisting line items as they arrive.
+
+        Args:
+            user_id (int): ID of the user who uploaded the receipt.
+            image_bytes (bytes): Binary content of the uploaded receipt image.
+            on_event (Callable[[str, dict], None]): Progress callback (``started``, ``item``, ``extracted``).
+
+        Returns:
+            ResultDTO: Same response as ``process_receipt``.
+        """
+        pass
+
+    @abstractmethod
+    def get_cache_stats(self) -> ResultDTO:
+        """
+        Report extraction cache statistics (hits, misses, size).
+
+        Returns:
+            ResultDTO: Counters of the configured extraction cache.
+        """
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.search_dto import SearchQueryDTO
+
+
+class ISearchService(ABC):
+    """Interface for full-text search."""
+
+    @abstractmethod
+    def search(self, user_id: int, query: SearchQueryDTO) -> ResultDTO:
+        """Expenses and grocery items matching the query, best first (SearchPageDTO)."""
+        pass
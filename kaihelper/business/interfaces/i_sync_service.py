@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.sync_dto import SyncQueryDTO
+
+
+class ISyncService(ABC):
+    """Interface for delta sync."""
+
+    @abstractmethod
+    def changes(self, user_id: int, query: SyncQueryDTO) -> ResultDTO:
+        """The user's expenses and grocery items changed since the token (SyncBatchDTO)."""
+        pass
@@ -0,0 +1,113 @@
+"""
+AnalyticsService
+Validates analytics requests and delegates the aggregation to the database.
+"""
+
+# --- First-party imports ---
+from kaihelper.business.interfaces.i_analytics_service import IAnalyticsService
+from kaihelper.domain.repositories.analytics_repository import AnalyticsRepository
+from kaihelper.contracts.analytics_dto import AnalyticsQueryDTO, AnalyticsSummaryDTO, MAX_TOP_N
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class AnalyticsService(IAnalyticsService):
+    """Service layer for spending analytics."""
+
+    def __init__(self, repository: AnalyticsRepository | None = None) -> None:
+        """
+        Initialize the AnalyticsService with an optional repository.
+
+        Args:
+            repository (AnalyticsRepository | None): Optional repository for dependency injection.
+        """
+        self._repo = repository or AnalyticsRepository()
+
+    @staticmethod
+    def _validate(user_id: int, query: AnalyticsQueryDTO) -> ResultDTO | None:
+        """Return a failure for invalid input (and clamp the limit), None if the query is usable."""
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+        if query.date_from and query.date_to and query.date_from > query.date_to:
+            return ResultDTO.fail("date_from must be on or before date_to.")
+        query.limit = max(1, min(query.limit, MAX_TOP_N))
+        return None
+
+    def category_monthly_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Spend per category per month.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Date range.
+
+        Returns:
+            ResultDTO: list[CategoryMonthTotalDTO].
+        """
+        return self._validate(user_id, query) or self._repo.category_monthly_totals(user_id, query)
+
+    def store_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Spend per store, highest first.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Date range and number of stores.
+
+        Returns:
+            ResultDTO: list[StoreTotalDTO].
+        """
+        return self._validate(user_id, query) or self._repo.store_totals(user_id, query)
+
+    def local_share(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Local vs imported grocery spend.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Date range.
+
+        Returns:
+            ResultDTO: LocalShareDTO.
+        """
+        return self._validate(user_id, query) or self._repo.local_share(user_id, query)
+
+    def top_items(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Grocery items ranked by total cost.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Date range and number of items.
+
+        Returns:
+            ResultDTO: list[TopItemDTO].
+        """
+        return self._validate(user_id, query) or self._repo.top_items(user_id, query)
+
+    def summary(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Every dashboard aggregate in one result.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Date range and ranking size.
+
+        Returns:
+            ResultDTO: AnalyticsSummaryDTO, or the first failing aggregate's error.
+        """
+        if (invalid := self._validate(user_id, query)) is not None:
+            return invalid
+
+        results = [
+            self._repo.category_monthly_totals(user_id, query),
+            self._repo.store_totals(user_id, query),
+            self._repo.local_share(user_id, query),
+            self._repo.top_items(user_id, query),
+        ]
+        if failed := next((result for result in results if not result.success), None):
+            return failed
+        category_months, stores, local_share, top_items = (result.data for result in results)
+        return ResultDTO.ok(
+            "Analytics summary retrieved successfully",
+            AnalyticsSummaryDTO(category_months, stores, local_share, top_items),
+        )
@@ -1,6 +1,7 @@
 """
 BudgetService
 Implements business logic for Budget operations.
+Committed writes invalidate the user's cached budget responses.
 """
 
 # --- Standard library imports ---
@@ -11,19 +12,26 @@ from kaihelper.business.interfaces.i_budget_service import IBudgetService
 from kaihelper.domain.repositories.budget_repository import BudgetRepository
 from kaihelper.contracts.budget_dto import BudgetDTO
 from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.utils.response_cache import BUDGETS, ResponseCache
 
 
 class BudgetService(IBudgetService):
     """Service layer implementing business rules for Budget operations."""
 
-    def __init__(self, repository: BudgetRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: BudgetRepository | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
         """
         Initialize BudgetService with a BudgetRepository.
 
         Args:
             repository (BudgetRepository | None): Optional repository instance for dependency injection.
+            response_cache (ResponseCache | None): Cached GET responses to invalidate on writes.
         """
         self._repo = repository or BudgetRepository()
+        self._response_cache = response_cache
 
     def create_budget(self, dto: BudgetDTO) -> ResultDTO:
         """
@@ -43,7 +51,10 @@ class BudgetService(IBudgetService):
             return ResultDTO(False, "Start date cannot be in the past.")
 
         dto.remaining_balance = dto.total_budget
-        return self._repo.create(dto)
+        result = self._repo.create(dto)
+        if result.success and self._response_cache is not None:
+            self._response_cache.invalidate(dto.user_id, BUDGETS)
+        return result
 
     def list_budgets(self, user_id: int) -> ResultDTO:
         """
@@ -59,3 +70,24 @@ class BudgetService(IBudgetService):
             return ResultDTO(False, "User ID is required.")
 
         return self._repo.get_active_budgets(user_id)
+
+    def get_current_budget(self, user_id: int, on_date: date | None = None) -> ResultDTO:
+        """
+        Retrieve the budget that expenses on a date are charged to.
+
+        Args:
+            user_id (int): Unique identifier for the user.
+            on_date (date | None): Date to look up; defaults to today.
+
+        Returns:
+            ResultDTO: Result containing the budget, or an error if none covers the date.
+        """
+        if not user_id:
+            return ResultDTO(False, "User ID is required.")
+
+        result = self._repo.get_covering_budgets(user_id, on_date or date.today())
+        if not result.success:
+            return result
+        if not result.data:
+            return ResultDTO(False, "No active budget for this date.")
+        return ResultDTO(True, "Current budget retrieved successfully", result.data[0])
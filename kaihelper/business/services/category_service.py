@@ -1,26 +1,52 @@
 """
 CategoryService
 Handles category business logic.
+
+The category table is small and rarely changes, so the service keeps the
+whole name -> category map in memory (keys are case-folded names). It is
+reloaded after ``CATEGORY_CACHE_TTL_SECONDS`` and dropped on every category
+write made through this service. Expense responses embed category names, so a
+delete also invalidates every user's cached expense lists.
 """
 
+# --- Standard library imports ---
+import time
+from threading import Lock
+from typing import Dict
+
 # --- First-party imports ---
 from kaihelper.business.interfaces.i_category_service import ICategoryService
 from kaihelper.domain.repositories.category_repository import CategoryRepository
 from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.contracts.category_dto import CategoryDTO
+from kaihelper.utils.response_cache import EXPENSES, ResponseCache
 
 
 class CategoryService(ICategoryService):
     """Service layer for managing category operations."""
 
-    def __init__(self, repository: CategoryRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: CategoryRepository | None = None,
+        cache_ttl_seconds: int = 300,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
         """
         Initialize the CategoryService with an optional repository.
 
         Args:
             repository (CategoryRepository | None): Optional injected repository for dependency testing.
+            cache_ttl_seconds (int): Lifetime of the in-memory category map (0 disables it).
+            response_cache (ResponseCache | None): Cached GET responses to invalidate on writes.
         """
         self._repo = repository or CategoryRepository()
+        self._response_cache = response_cache
+        self._cache_ttl_seconds = cache_ttl_seconds
+        self._by_name: Dict[str, CategoryDTO] | None = None
+        self._loaded_at = 0.0
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
 
     def list_categories(self) -> ResultDTO:
         """
@@ -46,7 +72,10 @@ class CategoryService(ICategoryService):
             ResultDTO: Operation result with success or failure message.
         """
         try:
+            if self._lookup(dto.name) is not None:
+                return ResultDTO.fail("Category already exists")
             result = self._repo.create(dto)
+            self.invalidate_cache()
             if result.success:
                 return ResultDTO.ok("Category added successfully", result.data)
             return ResultDTO.fail(result.message)
@@ -65,7 +94,10 @@ class CategoryService(ICategoryService):
         """
         try:
             result = self._repo.delete(category_id)
+            self.invalidate_cache()
             if result.success:
+                if self._response_cache is not None:
+                    self._response_cache.invalidate_all(EXPENSES)
                 return ResultDTO.ok("Category deleted successfully")
             return ResultDTO.fail(result.message)
         except Exception as err:
@@ -73,7 +105,7 @@ class CategoryService(ICategoryService):
 
     def get_category(self, category_name: str) -> ResultDTO:
         """
-        Retrieve a category by its name.
+        Retrieve a category by its name (case-insensitive, served from the cache).
 
         Args:
             category_name (str): Name of the category.
@@ -82,9 +114,89 @@ class CategoryService(ICategoryService):
             ResultDTO: Operation result with the category or error message.
         """
         try:
-            category = self._repo.get_by_name(category_name)
-            if category.success:
-                return ResultDTO.ok("Category retrieved successfully", category.data)
-            return ResultDTO.fail("Category not found")
+            category = self._lookup(category_name)
+            if category is None:
+                # Possibly created by another process since the map was loaded
+                result = self._repo.get_by_name(category_name.strip())
+                if not result.success:
+                    return ResultDTO.fail("Category not found")
+                category = self._remember(result.data)
+            return ResultDTO.ok("Category retrieved successfully", category)
         except Exception as err:
             return ResultDTO.fail(f"Failed to retrieve category: {repr(err)}")
+
+    def ensure_category(self, category_name: str, description: str | None = None) -> ResultDTO:
+        """
+        Retrieve a category by name, creating it if it does not exist.
+
+        The insert is race-free: concurrent callers asking for the same new
+        name all get the one row that was created.
+
+        Args:
+            category_name (str): Name of the category.
+            description (str | None): Description used if the category is created.
+
+        Returns:
+            ResultDTO: Operation result with the category or error message.
+        """
+        try:
+            category = self._lookup(category_name)
+            if category is not None:
+                return ResultDTO.ok("Category retrieved successfully", category)
+            result = self._repo.get_or_create(category_name.strip(), description)
+            if not result.success:
+                return ResultDTO.fail(result.message)
+            return ResultDTO.ok("Category retrieved successfully", self._remember(result.data))
+        except Exception as err:
+            return ResultDTO.fail(f"Failed to ensure category: {repr(err)}")
+
+    def get_cache_stats(self) -> ResultDTO:
+        """Return size and hit/miss counters of the category cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return ResultDTO.ok("Category cache statistics", {
+                "enabled": self._cache_ttl_seconds > 0,
+                "entries": len(self._by_name or {}),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            })
+
+    def invalidate_cache(self) -> None:
+        """Drop the category map; the next lookup reloads it."""
+        with self._lock:
+            self._by_name = None
+
+    # ------------------------------------------------------------------
+    # Cache internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(category_name: str) -> str:
+        return (category_name or "").strip().casefold()
+
+    def _lookup(self, category_name: str) -> CategoryDTO | None:
+        """Cached category for a name, loading the whole map when missing or expired."""
+        if self._cache_ttl_seconds <= 0:
+            return None
+        with self._lock:
+            if self._by_name is None or time.monotonic() - self._loaded_at > self._cache_ttl_seconds:
+                result = self._repo.get_all()
+                if not result.success:
+                    self._misses += 1
+                    return None
+                self._by_name = {self._key(category.name): category for category in result.data}
+                self._loaded_at = time.monotonic()
+            category = self._by_name.get(self._key(category_name))
+            if category is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return category
+
+    def _remember(self, category: CategoryDTO) -> CategoryDTO:
+        """Add a category fetched from the database to the loaded map."""
+        with self._lock:
+            if self._by_name is not None:
+                self._by_name[self._key(category.name)] = category
+        return category
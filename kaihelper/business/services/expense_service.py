@@ -1,6 +1,8 @@
 """
 ExpenseService
 Implements business logic for Expense operations with budget synchronization.
+The budget is adjusted by the repository inside the expense's own transaction;
+committed writes invalidate the user's cached expense and budget responses.
 """
 
 # --- Standard library imports ---
@@ -9,27 +11,41 @@ from datetime import date
 # --- First-party imports ---
 from kaihelper.business.interfaces.i_expense_service import IExpenseService
 from kaihelper.domain.repositories.expense_repository import ExpenseRepository
-from kaihelper.domain.repositories.budget_repository import BudgetRepository
 from kaihelper.contracts.expense_dto import ExpenseDTO
 from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.page_dto import MAX_PAGE_SIZE, PageQueryDTO
+from kaihelper.utils.response_cache import BUDGETS, EXPENSES, GROCERIES, ResponseCache
 
 
 class ExpenseService(IExpenseService):
     """Implements business logic for Expense operations."""
 
-    def __init__(self, repository: ExpenseRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: ExpenseRepository | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
         """
         Initialize the ExpenseService.
 
         Args:
             repository (ExpenseRepository | None): Optional repository for dependency injection.
+            response_cache (ResponseCache | None): Cached GET responses to invalidate on writes.
         """
         self._expense_repo = repository or ExpenseRepository()
-        self._budget_repo = BudgetRepository()
+        self._response_cache = response_cache
+
+    def _invalidate(self, result: ResultDTO, *scopes: str) -> ResultDTO:
+        """Invalidate the written expense's user (expenses charge budgets too) and pass the result on."""
+        if result.success and self._response_cache is not None and result.data is not None:
+            self._response_cache.invalidate(result.data.user_id, EXPENSES, BUDGETS, *scopes)
+        return result
 
     def add_expense(self, dto: ExpenseDTO) -> ResultDTO:
         """
-        Add a new expense and update the user's active budget.
+        Add a new expense and charge the user's active budget atomically.
+
+        If the budget cannot cover the amount, nothing is recorded.
 
         Args:
             dto (ExpenseDTO): Expense data transfer object.
@@ -44,27 +60,12 @@ class ExpenseService(IExpenseService):
         if not dto.expense_date or dto.expense_date > date.today():
             return ResultDTO(False, "Invalid expense date.")
 
-        result = self._expense_repo.create(dto)
-        if not result.success:
-            return result
-
-        active_budgets = self._budget_repo.get_active_budgets(dto.user_id)
-        if not active_budgets.success or not active_budgets.data:
-            return ResultDTO(True, "Expense recorded, but no active budget found.", result.data)
-
-        latest_budget = active_budgets.data[-1]
-        if latest_budget.start_date <= dto.expense_date <= latest_budget.end_date:
-            remaining = latest_budget.remaining_balance - dto.amount
-            if remaining < 0:
-                return ResultDTO(False, "Insufficient budget balance.")
-            latest_budget.remaining_balance = remaining
-            self._budget_repo.update(latest_budget)
-
-        return ResultDTO(True, "Expense added and budget updated.", result.data)
+        return self._invalidate(self._expense_repo.create(dto))
 
     def update_expense(self, dto: ExpenseDTO) -> ResultDTO:
         """
-        Update an existing expense record and adjust the active budget if necessary.
+        Update an existing expense record; the budget is refunded the old amount
+        and charged the new one in the same transaction.
 
         Args:
             dto (ExpenseDTO): Updated expense data.
@@ -74,26 +75,10 @@ class ExpenseService(IExpenseService):
         """
         if not dto.expense_id:
             return ResultDTO(False, "Expense ID is required for update.")
+        if dto.amount <= 0:
+            return ResultDTO(False, "Expense amount must be greater than zero.")
 
-        existing = self._expense_repo.get_by_id(dto.expense_id)
-        if not existing.success or not existing.data:
-            return ResultDTO(False, "Expense not found.")
-
-        old_expense = existing.data
-        difference = dto.amount - old_expense.amount
-
-        result = self._expense_repo.update(dto)
-        if not result.success:
-            return result
-
-        active_budgets = self._budget_repo.get_active_budgets(dto.user_id)
-        if active_budgets.success and active_budgets.data:
-            latest_budget = active_budgets.data[-1]
-            if latest_budget.start_date <= dto.expense_date <= latest_budget.end_date:
-                latest_budget.remaining_balance -= difference
-                self._budget_repo.update(latest_budget)
-
-        return ResultDTO(True, "Expense updated successfully.", result.data)
+        return self._invalidate(self._expense_repo.update(dto))
 
     def list_expenses(self, user_id: int) -> ResultDTO:
         """
@@ -109,6 +94,23 @@ class ExpenseService(IExpenseService):
             return ResultDTO(False, "User ID is required.")
         return self._expense_repo.get_all(user_id)
 
+    def list_expenses_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """
+        Retrieve one page of a user's expenses, newest first.
+
+        Args:
+            user_id (int): User identifier.
+            query (PageQueryDTO): Page size, cursor, date range and field projection.
+
+        Returns:
+            ResultDTO: Operation result with a PageDTO.
+        """
+        if not user_id:
+            return ResultDTO.fail("User ID is required.", code=400)
+        if query.limit is not None:
+            query.limit = max(1, min(query.limit, MAX_PAGE_SIZE))
+        return self._expense_repo.get_page(user_id, query)
+
     def find_by_grocery_id(self, grocery_id: int) -> ResultDTO:
         """
         Retrieve an expense linked to a specific grocery record.
@@ -127,23 +129,24 @@ class ExpenseService(IExpenseService):
         except Exception as err:
             return ResultDTO.fail(f"Failed to find expense by grocery ID: {repr(err)}")
 
-    def get_expense_by_id(self, expense_id: int) -> ResultDTO:
+    def get_expense_by_id(self, expense_id: int, include_groceries: bool = False) -> ResultDTO:
         """
         Retrieve an expense record by its unique identifier.
 
         Args:
             expense_id (int): Expense identifier.
+            include_groceries (bool): Also return the expense's grocery lines.
 
         Returns:
             ResultDTO: Operation result.
         """
         if not expense_id:
             return ResultDTO(False, "Expense ID is required.")
-        return self._expense_repo.get_by_id(expense_id)
+        return self._expense_repo.get_by_id(expense_id, include_groceries)
 
     def delete_expense(self, expense_id: int) -> ResultDTO:
         """
-        Delete an expense and adjust the budget if applicable.
+        Delete an expense and restore its amount to the budget in the same transaction.
 
         Args:
             expense_id (int): Expense identifier.
@@ -152,24 +155,10 @@ class ExpenseService(IExpenseService):
             ResultDTO: Operation result.
         """
         try:
-            existing = self._expense_repo.get_by_id(expense_id)
-            if not existing.success or not existing.data:
-                return ResultDTO(False, "Expense not found.")
-
-            expense = existing.data
-
-            active_budgets = self._budget_repo.get_active_budgets(expense.user_id)
-            if active_budgets.success and active_budgets.data:
-                latest_budget = active_budgets.data[-1]
-                if latest_budget.start_date <= expense.expense_date <= latest_budget.end_date:
-                    latest_budget.remaining_balance += expense.amount
-                    self._budget_repo.update(latest_budget)
-
-            result = self._expense_repo.delete(expense_id)
-            if not result.success:
-                return ResultDTO.fail(result.message)
-
-            return ResultDTO.ok("Expense deleted and budget restored.", result.data)
+            if not expense_id:
+                return ResultDTO(False, "Expense ID is required.")
+            # Deleting detaches the expense's groceries (their expense_id is cleared)
+            return self._invalidate(self._expense_repo.delete(expense_id), GROCERIES)
         except Exception as err:
             return ResultDTO.fail(f"Failed to delete expense: {repr(err)}")
         
@@ -1,26 +1,41 @@
 """
 GroceryService
 Implements business logic for Grocery operations.
+Committed writes invalidate the user's cached grocery and expense responses.
 """
 
 # --- First-party imports ---
 from kaihelper.business.interfaces.i_grocery_service import IGroceryService
 from kaihelper.domain.repositories.grocery_repository import GroceryRepository
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO, MAX_PRICE_POINTS, PriceHistoryQueryDTO
 from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.page_dto import MAX_PAGE_SIZE, PageQueryDTO
+from kaihelper.utils.response_cache import EXPENSES, GROCERIES, ResponseCache
 
 
 class GroceryService(IGroceryService):
     """Service layer implementing business logic for grocery operations."""
 
-    def __init__(self, repository: GroceryRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: GroceryRepository | None = None,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
         """
         Initialize the GroceryService with an optional repository.
 
         Args:
             repository (GroceryRepository | None): Optional repository for dependency injection.
+            response_cache (ResponseCache | None): Cached GET responses to invalidate on writes.
         """
         self._repo = repository or GroceryRepository()
+        self._response_cache = response_cache
+
+    def _invalidate(self, result: ResultDTO) -> ResultDTO:
+        """Invalidate the written item's user (expense pages embed their groceries) and pass the result on."""
+        if result.success and self._response_cache is not None and result.data is not None:
+            self._response_cache.invalidate(result.data.user_id, GROCERIES, EXPENSES)
+        return result
 
     def add_grocery(self, dto: GroceryDTO) -> ResultDTO:
         """
@@ -36,7 +51,7 @@ class GroceryService(IGroceryService):
             return ResultDTO.fail(
                 "Invalid grocery details. Please check name, price, and quantity."
             )
-        return self._repo.create(dto)
+        return self._invalidate(self._repo.create(dto))
 
     def list_groceries(self, user_id: int) -> ResultDTO:
         """
@@ -52,6 +67,23 @@ class GroceryService(IGroceryService):
             return ResultDTO.fail("User ID is required.")
         return self._repo.get_all(user_id)
 
+    def list_groceries_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """
+        Retrieve one page of a user's groceries, newest purchase first.
+
+        Args:
+            user_id (int): User identifier.
+            query (PageQueryDTO): Page size, cursor, purchase-date range and field projection.
+
+        Returns:
+            ResultDTO: Operation result with a PageDTO.
+        """
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+        if query.limit is not None:
+            query.limit = max(1, min(query.limit, MAX_PAGE_SIZE))
+        return self._repo.get_page(user_id, query)
+
     def find_by_name(self, user_id: int, item_name: str) -> ResultDTO:
         """
         Retrieve a grocery item by name for a specific user.
@@ -89,11 +121,46 @@ class GroceryService(IGroceryService):
 
             result = self._repo.update(dto)
             if result and result.success:
-                return ResultDTO.ok("Grocery updated successfully", result.data)
+                return self._invalidate(ResultDTO.ok("Grocery updated successfully", result.data))
             return ResultDTO.fail(result.message if result else "Failed to update grocery")
         except Exception as err:  # pylint: disable=broad-except
             return ResultDTO.fail(f"Error updating grocery: {repr(err)}")
 
+    def record_purchases(self, expense_id: int | None, store_name: str | None, groceries: list[GroceryDTO]) -> ResultDTO:
+        """
+        Record the purchase lines of one receipt in the items' price history.
+
+        Args:
+            expense_id (int | None): Receipt-level expense (its earlier lines are replaced).
+            store_name (str | None): Store of the receipt.
+            groceries (list[GroceryDTO]): Saved grocery lines.
+
+        Returns:
+            ResultDTO: Operation result with the number of lines written.
+        """
+        saved = [dto for dto in groceries if dto.grocery_id]
+        if not saved:
+            return ResultDTO.ok("No purchases to record", 0)
+        return self._repo.add_purchases(expense_id, store_name, saved)
+
+    def get_price_history(self, grocery_id: int, query: PriceHistoryQueryDTO) -> ResultDTO:
+        """
+        Retrieve the price history of a grocery item.
+
+        Args:
+            grocery_id (int): Grocery identifier.
+            query (PriceHistoryQueryDTO): Date range, store and point limit.
+
+        Returns:
+            ResultDTO: Operation result with a PriceHistoryDTO.
+        """
+        if not grocery_id:
+            return ResultDTO.fail("Grocery ID is required.")
+        if query.date_from and query.date_to and query.date_from > query.date_to:
+            return ResultDTO.fail("date_from must not be after date_to.")
+        query.limit = max(1, min(query.limit, MAX_PRICE_POINTS))
+        return self._repo.get_price_history(grocery_id, query)
+
     def get_by_expense_id(self, expense_id: int) -> ResultDTO:
         """
         Retrieve a grocery record associated with a specific expense ID.
@@ -120,7 +187,7 @@ class GroceryService(IGroceryService):
         """
         if not grocery_id:
             return ResultDTO.fail("Grocery ID is required for deletion.")
-        return self._repo.delete(grocery_id)
+        return self._invalidate(self._repo.delete(grocery_id))
     
     def update(self, dto: GroceryDTO) -> ResultDTO:
         """
@@ -140,7 +207,7 @@ class GroceryService(IGroceryService):
 
             result = self._repo.update(dto)
             if result and result.success:
-                return ResultDTO.ok("Grocery updated successfully", result.data)
+                return self._invalidate(ResultDTO.ok("Grocery updated successfully", result.data))
             return ResultDTO.fail(result.message if result else "Failed to update grocery")
         except Exception as err:  # pylint: disable=broad-except
             return ResultDTO.fail(f"Error updating grocery: {repr(err)}")
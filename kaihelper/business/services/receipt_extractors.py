@@ -0,0 +1,439 @@
+"""
+Receipt extraction engines
+Interchangeable IReceiptExtractor implementations selected by RECEIPT_EXTRACTOR.
+
+- VisionLLMExtractor: OpenAI vision model (the original GPT-4o-mini path).
+- TesseractExtractor: local OCR (pytesseract) plus the rule-based parser in
+  ``kaihelper.utils.receipt_text_parser``; no network, no per-call cost.
+- FakeReceiptExtractor: deterministic, offline engine for tests and benchmarks.
+- ``replay``: VisionLLMExtractor driven by ``FakeVisionClient``, replaying
+  recorded model responses with a configurable latency (no key, no network).
+- RoutingReceiptExtractor: tries engines cheapest first and escalates while the
+  confidence stays below a threshold (``routed``: Tesseract, then the LLM).
+"""
+
+# --- Standard library imports ---
+import base64
+import copy
+import hashlib
+import json
+from collections import Counter
+from io import BytesIO
+from threading import Lock
+
+# --- First-party imports ---
+from kaihelper.business.interfaces.i_receipt_extractor import IReceiptExtractor, ItemCallback
+from kaihelper.contracts.receipt_dto import ReceiptExtractionDTO
+from kaihelper.domain.core.logger import get_logger
+from kaihelper.domain.core.tracing import span
+from kaihelper.utils.image_normalizer import image_mime_type
+from kaihelper.utils.incremental_json import ReceiptStreamParser
+from kaihelper.utils.receipt_text_parser import parse_receipt_text, score_receipt
+
+log = get_logger("ReceiptExtractor")
+
+# HTTP statuses worth retrying: timeout, conflict, rate limit, server errors
+_TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+# openai SDK errors that carry no status code (timeouts, dropped connections)
+_TRANSIENT_NAMES = {"APITimeoutError", "APIConnectionError"}
+
+
+class TransientExtractionError(RuntimeError):
+    """Extraction failed for a reason that may pass (timeout, rate limit, provider outage)."""
+
+
+def is_transient_error(err: BaseException) -> bool:
+    """Whether ``err`` or an exception it was raised from is worth retrying later."""
+    seen = set()
+    while err is not None and id(err) not in seen:
+        seen.add(id(err))
+        if isinstance(err, (TransientExtractionError, TimeoutError, ConnectionError)):
+            return True
+        if type(err).__name__ in _TRANSIENT_NAMES or getattr(err, "status_code", None) in _TRANSIENT_STATUS:
+            return True
+        err = err.__cause__ or err.__context__
+    return False
+
+
+def _extraction_error(message: str, err: Exception) -> RuntimeError:
+    return (TransientExtractionError if is_transient_error(err) else RuntimeError)(f"{message}: {repr(err)}")
+
+VISION_SYSTEM_PROMPT = (
+    "You are an intelligent receipt analysis assistant.\n"
+    "Your job is to extract clean, structured JSON data from an image of a purchase receipt.\n"
+    "\n"
+    "=== OUTPUT RULES ===\n"
+    "- Return ONLY valid JSON (no explanations, markdown, or code fences).\n"
+    "- All date fields must use ISO format: \"YYYY-MM-DD\".\n"
+    "  • Recognize compact or unusual formats like '22NOV25' → '2025-11-22'.\n"
+    "  • Convert variants such as '22 November 2025', '22/11/25', or 'Nov 22, 2025'.\n"
+    "  • Keep only the date (ignore time). If missing, use current date.\n"
+    "- Trim all strings and apply reasonable capitalization (e.g., title case for store and item names).\n"
+    "- Numeric fields (unit_price, quantity, subtotal_amount, tax_amount, discount_amount, total_amount) must be floats.\n"
+    "- If a field is missing, include it as null — except `items`, which must never be empty.\n"
+    "\n"
+    "=== ITEM RULES ===\n"
+    "- The 'items' array must ALWAYS contain at least one item.\n"
+    "- If the receipt is a bill, invoice, or payment to a company/person, create an item that represents the service or purpose — e.g., "
+    "company name, account, or description of what was paid for.\n"
+    "- Include taxes, service fees, or any charges as an items when they have value.\n"
+    "- Each item must have: item_name, quantity, unit_price, total_price, and local.\n"
+    "- If only a total amount is shown, set quantity = 1 and unit_price = total_amount.\n"
+    "- Never leave the 'items' list empty or null. Include at least one descriptive item.\n"
+    "\n"
+    "=== FIELD INTERPRETATION ===\n"
+    "- 'local' = true if the product or service appears to be New Zealand–made or associated with brands such as "
+    "'NZ', 'Kiwi', 'Aotearoa', 'Pams', 'Rolling Meadow'.\n"
+    "- 'local' = false for imported or international brands (e.g., Maggi, McCain, Nestlé). Default to false if uncertain.\n"
+    "\n"
+    "=== REQUIRED JSON STRUCTURE ===\n"
+    "{\n"
+    "  \"store_name\": string | null,\n"
+    "  \"store_address\": string | null,\n"
+    "  \"receipt_number\": string | null,\n"
+    "  \"receipt_date\": \"YYYY-MM-DD\" | null,\n"
+    "  \"due_date\": \"YYYY-MM-DD\" | null,\n"
+    "  \"payment_method\": string | null,\n"
+    "  \"category\": string,\n"
+    "  \"currency\": string | null,\n"
+    "  \"items\": [\n"
+    "    {\n"
+    "      \"item_name\": string,\n"
+    "      \"quantity\": float,\n"
+    "      \"unit_price\": float,\n"
+    "      \"total_price\": float | null,\n"
+    "      \"local\": boolean\n"
+    "    }\n"
+    "  ],\n"
+    "  \"subtotal_amount\": float | null,\n"
+    "  \"tax_amount\": float | null,\n"
+    "  \"discount_amount\": float | null,\n"
+    "  \"total_amount\": float,\n"
+    "  \"suggestion\": string\n"
+    "}\n"
+    "\n"
+    "=== SUGGESTION RULE ===\n"
+    "- Provide a short, friendly suggestion for how to categorize or tag this receipt, "
+    "for example: \"Consider categorizing this as Utilities since it appears to be an electricity bill.\""
+)
+
+_DEFAULT_SUGGESTION = "You can save this receipt under 'Groceries' or tag it by store name for tracking."
+
+
+def normalize_item(item: dict) -> dict:
+    """Apply the item-name rule (also used on streamed items before the receipt is complete)."""
+    item["item_name"] = str(item.get("item_name") or "Unknown item").strip().capitalize()
+    return item
+
+
+def normalize_extraction(parsed: dict) -> dict:
+    """Apply the capitalization/default rules every engine's output goes through."""
+    parsed["category"] = str(parsed.get("category") or "Groceries").strip().capitalize()
+    for item in parsed.get("items") or []:
+        normalize_item(item)
+    parsed.setdefault("suggestion", _DEFAULT_SUGGESTION)
+    return parsed
+
+
+class VisionLLMExtractor(IReceiptExtractor):
+    """Extracts receipts with an OpenAI vision model."""
+
+    name = "llm"
+
+    def __init__(self, api_key: str, model: str = "gpt-4o-mini", base_url: str | None = None, client=None) -> None:
+        """
+        Args:
+            api_key (str): OpenAI API key.
+            model (str): Vision-capable chat model.
+            base_url (str | None): Alternative API endpoint (e.g. a local mock server).
+            client: Pre-built OpenAI client (mainly for tests).
+        """
+        if client is None:
+            if not api_key:
+                raise RuntimeError("Missing OPENAI_API_KEY in .env or environment.")
+            from openai import OpenAI  # deferred: only this engine needs the SDK
+
+            client = OpenAI(api_key=api_key, base_url=base_url or None)
+        self.client = client
+        self.model = model
+
+    def extract(self, image_bytes: bytes) -> ReceiptExtractionDTO:
+        try:
+            request, bytes_sent = self._request(image_bytes)
+            with span("vision.request", model=self.model, bytes_sent=bytes_sent, streamed=False):
+                response = self.client.chat.completions.create(**request)
+            with span("vision.parse") as current:
+                parsed = normalize_extraction(json.loads(response.choices[0].message.content))
+                current.set_attribute("items", len(parsed.get("items") or []))
+        except Exception as err:  # pylint: disable=broad-except
+            raise _extraction_error("GPT-4o extraction failed", err) from err
+        return self._finish(parsed)
+
+    def extract_stream(self, image_bytes: bytes, on_item: ItemCallback) -> ReceiptExtractionDTO:
+        """Stream the completion and hand each ``items[]`` entry to ``on_item`` as it closes."""
+        parser = ReceiptStreamParser()
+        try:
+            request, bytes_sent = self._request(image_bytes)
+            # Parsing is interleaved with the stream, so it is part of the request span
+            with span("vision.request", model=self.model, bytes_sent=bytes_sent, streamed=True) as current:
+                stream = self.client.chat.completions.create(**request, stream=True)
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    for item in parser.feed(chunk.choices[0].delta.content or ""):
+                        on_item(normalize_item(item), parser.header)
+                parsed = normalize_extraction(parser.result())
+                current.set_attribute("items", len(parsed.get("items") or []))
+        except Exception as err:  # pylint: disable=broad-except
+            raise _extraction_error("GPT-4o streaming extraction failed", err) from err
+        return self._finish(parsed)
+
+    def _request(self, image_bytes: bytes) -> tuple[dict, int]:
+        """Chat-completions arguments for one receipt image, and the approximate payload size."""
+        # Bytes were already preprocessed once (image_normalizer); send them as-is
+        mime_type = image_mime_type(image_bytes)
+        with span("vision.base64", image_bytes=len(image_bytes)):
+            b64_image = base64.b64encode(image_bytes).decode("ascii")
+        prompt = "Extract and format this receipt as JSON only."
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": VISION_SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{b64_image}"}},
+                    ],
+                },
+            ],
+            "response_format": {"type": "json_object"},
+            "temperature": 0,
+        }
+        return request, len(b64_image) + len(VISION_SYSTEM_PROMPT) + len(prompt)
+
+    def _finish(self, parsed: dict) -> ReceiptExtractionDTO:
+        log.info(
+            "Vision extraction",
+            engine=self.name,
+            category=parsed.get("category"),
+            items=len(parsed.get("items", [])),
+            total=parsed.get("total_amount"),
+            suggestion=parsed.get("suggestion"),
+        )
+        return ReceiptExtractionDTO(data=parsed, confidence=score_receipt(parsed), engine=self.name)
+
+
+class TesseractExtractor(IReceiptExtractor):
+    """Extracts till slips locally with Tesseract OCR and a rule-based parser."""
+
+    name = "tesseract"
+
+    def __init__(self, lang: str = "eng", psm: int = 6) -> None:
+        """
+        Args:
+            lang (str): Tesseract language pack(s), e.g. ``eng`` or ``eng+mri``.
+            psm (int): Page segmentation mode; 6 (single uniform block) suits till slips.
+
+        Raises:
+            RuntimeError: If pytesseract or the tesseract binary is not available.
+        """
+        try:
+            import pytesseract  # optional dependency, only needed for this engine
+
+            pytesseract.get_tesseract_version()
+        except Exception as err:  # pylint: disable=broad-except
+            raise RuntimeError(f"Tesseract OCR is not available: {repr(err)}") from err
+        self._pytesseract = pytesseract
+        self.lang = lang
+        self.psm = psm
+
+    def extract(self, image_bytes: bytes) -> ReceiptExtractionDTO:
+        from PIL import Image
+
+        try:
+            with Image.open(BytesIO(image_bytes)) as img:
+                data = self._pytesseract.image_to_data(
+                    img,
+                    lang=self.lang,
+                    config=f"--psm {self.psm}",
+                    output_type=self._pytesseract.Output.DICT,
+                )
+        except Exception as err:  # pylint: disable=broad-except
+            raise RuntimeError(f"Tesseract extraction failed: {repr(err)}") from err
+
+        lines: dict[tuple[int, int, int], list[str]] = {}
+        confidences = []
+        for index, word in enumerate(data["text"]):
+            word = word.strip()
+            conf = float(data["conf"][index])
+            if not word or conf < 0:
+                continue
+            key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+            lines.setdefault(key, []).append(word)
+            confidences.append(conf)
+
+        text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+        ocr_confidence = (sum(confidences) / len(confidences) / 100) if confidences else 0.0
+        parsed, confidence = parse_receipt_text(text, ocr_confidence)
+        parsed = normalize_extraction(parsed)
+
+        log.info(
+            "Tesseract extraction",
+            items=len(parsed["items"]),
+            total=parsed.get("total_amount"),
+            ocr_confidence=round(ocr_confidence, 2),
+            confidence=round(confidence, 2),
+        )
+        return ReceiptExtractionDTO(data=parsed, confidence=confidence, engine=self.name)
+
+
+class FakeReceiptExtractor(IReceiptExtractor):
+    """
+    Deterministic offline engine.
+
+    Returns ``fixture`` when given; otherwise derives a small, self-consistent
+    receipt from the SHA-256 of the image so the same bytes always produce the
+    same result and different bytes produce different receipts.
+    """
+
+    name = "fake"
+
+    def __init__(self, fixture: dict | None = None, confidence: float = 1.0) -> None:
+        self.fixture = fixture
+        self.confidence = confidence
+
+    def extract(self, image_bytes: bytes) -> ReceiptExtractionDTO:
+        if self.fixture is not None:
+            parsed = copy.deepcopy(self.fixture)
+        else:
+            digest = hashlib.sha256(image_bytes).digest()
+            items = []
+            for index in range(1 + digest[0] % 3):
+                quantity = float(1 + digest[index + 1] % 3)
+                unit_price = round(1 + digest[index + 4] / 10, 2)
+                items.append({
+                    "item_name": f"Item {digest[index + 8]:03d}",
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "total_price": round(quantity * unit_price, 2),
+                    "local": bool(digest[index + 12] % 2),
+                })
+            parsed = {
+                "store_name": "Fake Mart",
+                "receipt_number": digest.hex()[:12],
+                "receipt_date": "2025-01-15",
+                "category": "Groceries",
+                "currency": "NZD",
+                "items": items,
+                "total_amount": round(sum(item["total_price"] for item in items), 2),
+            }
+        return ReceiptExtractionDTO(data=normalize_extraction(parsed), confidence=self.confidence, engine=self.name)
+
+
+class RoutingReceiptExtractor(IReceiptExtractor):
+    """
+    Tries engines in order and stops at the first confident result.
+
+    Engines that raise or score below ``min_confidence`` escalate to the next
+    one. The last engine's answer is accepted whatever its score; if every
+    engine raises, the extraction fails (transiently if any engine's failure was).
+    """
+
+    name = "routed"
+
+    def __init__(self, engines: list[IReceiptExtractor], min_confidence: float = 0.8) -> None:
+        if not engines:
+            raise ValueError("RoutingReceiptExtractor needs at least one engine")
+        self.engines = engines
+        self.min_confidence = min_confidence
+        self._lock = Lock()
+        self._counters: Counter = Counter()
+
+    def extract(self, image_bytes: bytes) -> ReceiptExtractionDTO:
+        return self._route(image_bytes, on_item=None)
+
+    def extract_stream(self, image_bytes: bytes, on_item: ItemCallback) -> ReceiptExtractionDTO:
+        """
+        Route like ``extract``. Only the last engine streams; an earlier engine's
+        items are reported once its result is accepted, so escalation never
+        emits the same receipt twice.
+        """
+        return self._route(image_bytes, on_item=on_item)
+
+    def _route(self, image_bytes: bytes, on_item: ItemCallback | None) -> ReceiptExtractionDTO:
+        errors = []
+        transient = False
+        last_index = len(self.engines) - 1
+        for index, engine in enumerate(self.engines):
+            try:
+                if on_item is not None and index == last_index:
+                    result = engine.extract_stream(image_bytes, on_item)
+                    self._count(f"{engine.name}.accepted")
+                    return result
+                result = engine.extract(image_bytes)
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(f"{engine.name}: {err}")
+                transient = transient or is_transient_error(err)
+                self._count(f"{engine.name}.errors")
+                continue
+            if result.confidence >= self.min_confidence or index == last_index:
+                self._count(f"{engine.name}.accepted")
+                if on_item is not None:
+                    for item in result.data.get("items") or []:
+                        on_item(item, result.data)
+                return result
+            log.info(
+                "Escalating extraction",
+                engine=engine.name,
+                confidence=round(result.confidence, 2),
+                min_confidence=self.min_confidence,
+            )
+            self._count(f"{engine.name}.escalated")
+        raise (TransientExtractionError if transient else RuntimeError)(
+            f"All extraction engines failed: {'; '.join(errors)}"
+        )
+
+    def stats(self) -> dict:
+        """Per-engine accepted/escalated/error counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counters[key] += 1
+
+
+def build_receipt_extractor(config) -> IReceiptExtractor:
+    """
+    Build the extraction engine configured in Settings.
+
+    ``routed`` silently drops Tesseract when it is not installed, which leaves
+    the LLM as the only engine (the previous behaviour).
+
+    Args:
+        config (Settings): Application settings.
+    """
+    engine = config.RECEIPT_EXTRACTOR
+    if engine == "llm":
+        return VisionLLMExtractor(config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL)
+    if engine == "tesseract":
+        return TesseractExtractor(lang=config.RECEIPT_OCR_LANG)
+    if engine == "fake":
+        return FakeReceiptExtractor()
+    if engine == "replay":
+        from kaihelper.utils.fake_vision_client import FakeVisionClient, load_recordings
+
+        if not config.RECEIPT_REPLAY_PATH:
+            raise ValueError("RECEIPT_EXTRACTOR=replay needs RECEIPT_REPLAY_PATH")
+        client = FakeVisionClient(load_recordings(config.RECEIPT_REPLAY_PATH), config.RECEIPT_REPLAY_LATENCY_MS)
+        return VisionLLMExtractor("", client=client)
+    if engine == "routed":
+        engines: list[IReceiptExtractor] = []
+        try:
+            engines.append(TesseractExtractor(lang=config.RECEIPT_OCR_LANG))
+        except RuntimeError as err:
+            log.warning("Local OCR disabled", error=str(err))
+        engines.append(VisionLLMExtractor(config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL))
+        return RoutingReceiptExtractor(engines, min_confidence=config.RECEIPT_OCR_MIN_CONFIDENCE)
+    raise ValueError(f"Unknown RECEIPT_EXTRACTOR '{engine}'")
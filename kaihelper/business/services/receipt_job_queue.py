@@ -0,0 +1,99 @@
+"""
+Receipt job queues
+Dispatch receipt job IDs to workers. Job state itself lives in the database
+(ReceiptJobRepository), so a queue only has to deliver IDs at least once.
+
+- InProcessJobQueue: bounded ThreadPoolExecutor inside the API process; also the
+  local stand-in for SQS during development and tests.
+- SqsJobQueue: publishes job IDs to an SQS-compatible queue; a separate consumer
+  (see ``kaihelper.api.worker.handler``) runs the jobs.
+"""
+
+# --- Standard library imports ---
+import json
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Upper bound SQS accepts for DelaySeconds
+SQS_MAX_DELAY_SECONDS = 900
+
+
+class ReceiptJobQueue(ABC):
+    """Delivers receipt job IDs to a handler."""
+
+    def __init__(self) -> None:
+        self._handler: Optional[Callable[[str], object]] = None
+
+    def bind(self, handler: Callable[[str], object]) -> None:
+        """Register the callable that processes a job ID."""
+        self._handler = handler
+
+    @abstractmethod
+    def submit(self, job_id: str, delay_seconds: int = 0) -> None:
+        """Enqueue a job ID for processing, optionally after a delay (retry backoff)."""
+        pass
+
+    def shutdown(self) -> None:
+        """Release worker resources (no-op by default)."""
+
+
+class InProcessJobQueue(ReceiptJobQueue):
+    """Runs jobs on a bounded thread pool in the current process."""
+
+    def __init__(self, max_workers: int = 2) -> None:
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="receipt-job")
+
+    def submit(self, job_id: str, delay_seconds: int = 0) -> None:
+        if self._handler is None:
+            raise RuntimeError("No handler bound to the receipt job queue.")
+        if delay_seconds > 0:
+            timer = threading.Timer(delay_seconds, self._executor.submit, args=(self._handler, job_id))
+            timer.daemon = True
+            timer.start()
+            return
+        self._executor.submit(self._handler, job_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class SqsJobQueue(ReceiptJobQueue):
+    """Publishes job IDs to an SQS (or SQS-compatible, e.g. ElasticMQ) queue."""
+
+    def __init__(self, queue_url: str, endpoint_url: str | None = None) -> None:
+        super().__init__()
+        self._queue_url = queue_url
+        self._endpoint_url = endpoint_url
+        self._client = None
+
+    def submit(self, job_id: str, delay_seconds: int = 0) -> None:
+        self._get_client().send_message(
+            QueueUrl=self._queue_url,
+            MessageBody=json.dumps({"job_id": job_id}),
+            DelaySeconds=min(max(delay_seconds, 0), SQS_MAX_DELAY_SECONDS),
+        )
+
+    def _get_client(self):
+        """Create the SQS client on first submit; boto3 is slow to import on a cold start."""
+        if self._client is None:
+            try:
+                import boto3  # optional dependency, only needed for this queue
+            except ImportError as err:
+                raise RuntimeError("SqsJobQueue requires boto3 (pip install boto3).") from err
+            self._client = boto3.client("sqs", endpoint_url=self._endpoint_url or None)
+        return self._client
+
+
+def build_receipt_job_queue(config) -> ReceiptJobQueue:
+    """
+    Build the queue configured in Settings.
+
+    Args:
+        config (Settings): Application settings.
+    """
+    if config.RECEIPT_JOB_QUEUE == "sqs":
+        return SqsJobQueue(config.RECEIPT_JOB_SQS_URL, config.RECEIPT_JOB_SQS_ENDPOINT or None)
+    return InProcessJobQueue(max_workers=config.RECEIPT_JOB_WORKERS)
@@ -0,0 +1,176 @@
+"""
+ReceiptJobService
+Runs receipt ingestion in the background: uploads are stored as durable jobs,
+workers extract and persist them, and clients poll the job status.
+"""
+
+# --- Standard library imports ---
+import json
+import threading
+from contextlib import contextmanager
+
+# --- First-party imports ---
+from kaihelper.business.interfaces.i_receipt_job_service import IReceiptJobService
+from kaihelper.business.interfaces.i_receipt_service import IReceiptService
+from kaihelper.business.services.receipt_job_queue import SQS_MAX_DELAY_SECONDS, ReceiptJobQueue
+from kaihelper.domain.interfaces.i_receipt_job_repository import IReceiptJobRepository
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.domain.core.logger import get_logger
+
+log = get_logger("ReceiptJobService")
+
+
+class ReceiptJobService(IReceiptJobService):
+    """Coordinates durable receipt jobs between the API, the queue and ReceiptService."""
+
+    def __init__(
+        self,
+        repository: IReceiptJobRepository,
+        receipt_service: IReceiptService,
+        queue: ReceiptJobQueue,
+        max_attempts: int = 3,
+        stale_after_seconds: int = 300,
+        retry_delay_seconds: int = 15,
+    ) -> None:
+        """
+        Initialize the job service and bind it as the queue's handler.
+
+        Args:
+            repository (IReceiptJobRepository): Durable job storage.
+            receipt_service (IReceiptService): Performs extraction and persistence.
+            queue (ReceiptJobQueue): Delivers job IDs to workers.
+            max_attempts (int): Attempts before a crashing or transiently failing job is failed for good.
+            stale_after_seconds (int): Age after which a running job is considered abandoned.
+            retry_delay_seconds (int): Delay before the first retry; doubles on every further attempt.
+        """
+        self._repo = repository
+        self._receipt_service = receipt_service
+        self._queue = queue
+        self._max_attempts = max_attempts
+        self._stale_after_seconds = stale_after_seconds
+        self._retry_delay_seconds = retry_delay_seconds
+        self._queue.bind(self.run_job)
+
+    def submit(self, user_id: int, image_bytes: bytes) -> ResultDTO:
+        """
+        Store the receipt as a queued job and enqueue it.
+
+        Args:
+            user_id (int): ID of the user who uploaded the receipt.
+            image_bytes (bytes): Preprocessed image bytes.
+
+        Returns:
+            ResultDTO: The queued ReceiptJobDTO (code 202).
+        """
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+
+        created = self._repo.create(user_id, image_bytes)
+        if not created.success:
+            return created
+
+        try:
+            self._queue.submit(created.data.job_id)
+        except Exception as err:  # pylint: disable=broad-except
+            # The job stays queued in the database and is picked up by resume_pending()
+            log.warning("Failed to enqueue job", job_id=created.data.job_id, error=repr(err))
+        return created
+
+    def get_job(self, job_id: str) -> ResultDTO:
+        """Return the current state of a job."""
+        if not job_id:
+            return ResultDTO.fail("Job ID is required.")
+        return self._repo.get_by_id(job_id)
+
+    def list_jobs(self, user_id: int) -> ResultDTO:
+        """Return the most recent jobs of a user."""
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+        return self._repo.list_by_user(user_id)
+
+    def run_job(self, job_id: str) -> ResultDTO:
+        """
+        Claim a job and run the receipt pipeline for it.
+
+        Args:
+            job_id (str): Job identifier delivered by the queue.
+
+        Returns:
+            ResultDTO: Outcome of the job.
+        """
+        claimed = self._repo.claim(job_id)
+        if not claimed.success:
+            # Already running/finished elsewhere (duplicate delivery) or missing
+            return claimed
+
+        job = claimed.data
+        try:
+            with self._heartbeat(job_id):
+                result = self._receipt_service.process_receipt(job["user_id"], job["image"])
+        except Exception as err:  # pylint: disable=broad-except
+            self._fail_attempt(job_id, job["attempts"], f"Worker error: {repr(err)}", transient=True)
+            return ResultDTO.fail(f"Receipt job {job_id} crashed: {repr(err)}")
+
+        if not result.success:
+            # 503: the extraction timed out, was rate limited or the provider was down
+            self._fail_attempt(job_id, job["attempts"], result.message, transient=result.code == 503)
+            return result
+
+        data = result.data.model_dump(mode="json") if hasattr(result.data, "model_dump") else result.data
+        self._repo.complete(job_id, json.dumps(data, default=str))
+        log.info("Job succeeded", job_id=job_id)
+        return ResultDTO.ok("Receipt job succeeded", data)
+
+    @contextmanager
+    def _heartbeat(self, job_id: str):
+        """
+        Refresh the job's ``updated_at`` every third of the stale threshold while
+        it runs, so resume_pending() only re-queues jobs whose worker is gone
+        (an extraction with provider retries can outlast the threshold).
+        """
+        stop = threading.Event()
+        interval = max(1.0, self._stale_after_seconds / 3)
+
+        def beat() -> None:
+            while not stop.wait(interval):
+                self._repo.heartbeat(job_id)
+
+        thread = threading.Thread(target=beat, name="receipt-job-heartbeat", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _fail_attempt(self, job_id: str, attempts: int, error: str, transient: bool) -> None:
+        """Re-queue a transient failure with backoff while attempts remain; otherwise fail the job for good."""
+        retry = transient and attempts < self._max_attempts
+        self._repo.fail(job_id, error, retry=retry)
+        if retry:
+            # Past the stale threshold resume_pending() would resubmit the job anyway
+            delay = min(
+                self._retry_delay_seconds * 2 ** (attempts - 1),
+                self._stale_after_seconds,
+                SQS_MAX_DELAY_SECONDS,
+            )
+            log.warning("Retrying receipt job", job_id=job_id, attempt=attempts, delay_s=delay, error=error[:200])
+            self._queue.submit(job_id, delay_seconds=delay)
+
+    def resume_pending(self) -> ResultDTO:
+        """
+        Re-submit queued jobs whose delivery was lost and jobs abandoned by a
+        crashed worker; abandoned jobs out of attempts are failed instead.
+
+        Returns:
+            ResultDTO: List of job IDs that were re-submitted.
+        """
+        pending = self._repo.list_resumable(self._stale_after_seconds, self._max_attempts)
+        if not pending.success:
+            return pending
+
+        for job_id in pending.data:
+            self._queue.submit(job_id)
+        if pending.data:
+            log.info("Resumed pending receipt jobs", jobs=len(pending.data))
+        return ResultDTO.ok("Pending receipt jobs resumed", pending.data)
@@ -1,38 +1,41 @@
 """
-ReceiptService (GPT-4o only)
+ReceiptService
 Refactored for clarity, maintainability, and database consistency.
 Handles single receipt-level expense with multiple grocery items.
 """
 
 # --- Standard library imports ---
-import os
-import base64
-import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable
 from datetime import datetime
-from io import BytesIO
-from PIL import Image
-
-# --- Third-party imports ---
-from openai import OpenAI
 
 # --- First-party imports ---
 from kaihelper.business.interfaces.i_receipt_service import IReceiptService
 from kaihelper.business.interfaces.i_category_service import ICategoryService
 from kaihelper.business.interfaces.i_grocery_service import IGroceryService
 from kaihelper.business.interfaces.i_expense_service import IExpenseService
+from kaihelper.business.interfaces.i_receipt_extractor import IReceiptExtractor
+from kaihelper.business.services.receipt_extractors import build_receipt_extractor, is_transient_error
+from kaihelper.domain.interfaces.i_receipt_repository import IReceiptRepository
 from kaihelper.contracts.receipt_dto import ReceiptUploadResponseDTO, ExtractedItemDTO
-from kaihelper.contracts.category_dto import CategoryDTO
 from kaihelper.contracts.expense_dto import ExpenseDTO
 from kaihelper.contracts.grocery_dto import GroceryDTO
 from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.config.settings import settings
+from kaihelper.domain.core.logger import get_logger
+from kaihelper.domain.core.tracing import span
+from kaihelper.utils.extraction_cache import ExtractionCache
+from kaihelper.utils.response_cache import BUDGETS, EXPENSES, GROCERIES, ResponseCache
 from datetime import datetime, date
 
+log = get_logger("ReceiptService")
+
 class ReceiptService(IReceiptService):
     """
-    Processes receipts using GPT-4o and synchronizes categories, groceries,
-    and a single receipt-level expense.
+    Processes receipts with a pluggable extraction engine (IReceiptExtractor) and
+    synchronizes categories, groceries, and a single receipt-level expense.
     """
 
     def __init__(
@@ -40,17 +43,29 @@ class ReceiptService(IReceiptService):
         category_service: ICategoryService,
         grocery_service: IGroceryService,
         expense_service: IExpenseService,
+        receipt_repository: IReceiptRepository | None = None,
+        extraction_cache: ExtractionCache | None = None,
+        extractor: IReceiptExtractor | None = None,
+        response_cache: ResponseCache | None = None,
     ) -> None:
-        """Initialize the receipt service and verify OpenAI API key."""
+        """Initialize the receipt service with the configured extraction engine."""
         self.category_service = category_service
         self.grocery_service = grocery_service
         self.expense_service = expense_service
-
-        if not settings.OPENAI_API_KEY:
-            raise RuntimeError("Missing OPENAI_API_KEY in .env or environment.")
-
-        os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
-        self.client = OpenAI()
+        self.receipt_repository = receipt_repository
+        self.extraction_cache = extraction_cache
+        self._extractor = extractor
+        self._extractor_lock = Lock()
+        self._response_cache = response_cache
+
+    @property
+    def extractor(self) -> IReceiptExtractor:
+        """Extraction engine, built on first use so the vision SDK stays off the cold-start path."""
+        if self._extractor is None:
+            with self._extractor_lock:
+                if self._extractor is None:
+                    self._extractor = build_receipt_extractor(settings)
+        return self._extractor
 
     def process_receipt(self, user_id: int, image_bytes: bytes) -> ResultDTO:
         """
@@ -60,47 +75,267 @@ class ReceiptService(IReceiptService):
         - Sync groceries under that expense.
         """
         start_time = time.time()
+        with span("receipt.process", user_id=user_id, image_bytes=len(image_bytes)) as current:
+            try:
+                parsed = self._extract_cached(image_bytes)
+                items = [ExtractedItemDTO(**item) for item in parsed.get("items", [])]
+                category_name = parsed.get("category", "Groceries")
+                current.set_attribute("items", len(items))
+
+                if self._use_bulk_persist():
+                    prepared = self._prepare_bulk_receipt(user_id, category_name, parsed, items)
+                    saved = (
+                        self.receipt_repository.save_receipt(*prepared.data)
+                        if prepared.success else prepared
+                    )
+                    if saved.success:
+                        self._log_bulk_save(saved.data)
+                else:
+                    saved = self._save_receipt_legacy(user_id, category_name, parsed, items)
+
+                if not saved.success:
+                    current.set_attribute("error", saved.message)
+                    return ResultDTO.fail(f"Failed to record receipt expense: {saved.message}")
+                self._invalidate_responses(user_id)
+
+                log.info(
+                    "Processed receipt",
+                    category=category_name,
+                    items=len(items),
+                    elapsed_ms=round((time.time() - start_time) * 1000, 2),
+                )
+
+                return ResultDTO.ok(
+                    "Receipt processed successfully",
+                    self._build_response(parsed, items),
+                )
+
+            except Exception as err:  # pylint: disable=broad-except
+                current.set_attribute("error", repr(err))
+                return self._processing_failure(err)
+
+    def process_receipts(self, user_id: int, images: list[tuple[str, bytes]]) -> ResultDTO:
+        """
+        Process a batch of receipts:
+        - Extract all receipts concurrently (bounded by RECEIPT_BATCH_CONCURRENCY).
+        - Persist every successful extraction through one batched transaction.
+        - Report a per-file outcome.
+        """
+        start_time = time.time()
+        if not images:
+            return ResultDTO.fail("No receipt images provided.")
+
+        workers = max(1, min(settings.RECEIPT_BATCH_CONCURRENCY, len(images)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="receipt-extract") as pool:
+            extracted = list(pool.map(self._try_extract, [image for _, image in images]))
+
+        outcomes: list[dict | None] = [None] * len(images)
+        prepared_batch: list[tuple[int, dict, list[ExtractedItemDTO], tuple]] = []
+        for index, ((filename, _), (parsed, error)) in enumerate(zip(images, extracted)):
+            if error:
+                outcomes[index] = self._batch_outcome(filename, ResultDTO.fail(error))
+                continue
+            try:
+                items = [ExtractedItemDTO(**item) for item in parsed.get("items", [])]
+                category_name = parsed.get("category", "Groceries")
+            except Exception as err:  # pylint: disable=broad-except
+                outcomes[index] = self._batch_outcome(
+                    filename, ResultDTO.fail(f"Failed to process receipt: {repr(err)}")
+                )
+                continue
+
+            if not self._use_bulk_persist():
+                saved = self._save_receipt_legacy(user_id, category_name, parsed, items)
+                outcomes[index] = self._batch_outcome(filename, saved, parsed, items)
+                continue
+
+            prepared = self._prepare_bulk_receipt(user_id, category_name, parsed, items)
+            if not prepared.success:
+                outcomes[index] = self._batch_outcome(filename, prepared)
+                continue
+            prepared_batch.append((index, parsed, items, prepared.data))
+
+        if prepared_batch:
+            results = self.receipt_repository.save_receipts([entry[3] for entry in prepared_batch])
+            for (index, parsed, items, _), saved in zip(prepared_batch, results):
+                if saved.success:
+                    self._log_bulk_save(saved.data)
+                outcomes[index] = self._batch_outcome(images[index][0], saved, parsed, items)
+
+        succeeded = sum(1 for outcome in outcomes if outcome["success"])
+        if succeeded:
+            self._invalidate_responses(user_id)
+        log.info(
+            "Processed receipt batch",
+            receipts=len(images),
+            succeeded=succeeded,
+            concurrency=workers,
+            elapsed_ms=round((time.time() - start_time) * 1000, 2),
+        )
+        return ResultDTO.ok(
+            f"Processed {succeeded} of {len(images)} receipts",
+            {
+                "total": len(images),
+                "succeeded": succeeded,
+                "failed": len(images) - succeeded,
+                "results": outcomes,
+            },
+        )
+
+    def process_receipt_stream(
+        self,
+        user_id: int,
+        image_bytes: bytes,
+        on_event: Callable[[str, dict], None],
+    ) -> ResultDTO:
+        """
+        Process a receipt while the extraction streams in:
+        - Each completed line item is reported as soon as it arrives.
+        - The expense and groceries are written in one short transaction once the receipt is complete.
+        - Progress is reported through ``on_event(event, payload)``.
+        """
+        if not self._use_bulk_persist():
+            # The legacy per-item path is not streamed; no per-item events
+            on_event("started", {"streaming": False})
+            return self.process_receipt(user_id, image_bytes)
+
+        start_time = time.time()
+        on_event("started", {"streaming": True})
         try:
-            parsed = self._extract_with_gpt(image_bytes)
-            #parsed = self._extract_with_gpt_opt(image_bytes)
+            def on_item(item: dict, header: dict) -> None:  # pylint: disable=unused-argument
+                extracted = ExtractedItemDTO(**item)
+                on_event("item", {
+                    "item_name": extracted.item_name,
+                    "quantity": extracted.quantity,
+                    "unit_price": extracted.unit_price,
+                    "total_price": extracted.total_price,
+                })
+
+            if (parsed := self._cache_get(image_bytes)) is not None:
+                for item in parsed.get("items", []):
+                    on_item(dict(item), parsed)
+            else:
+                result = self.extractor.extract_stream(image_bytes, on_item)
+                log.info("Extracted receipt", engine=result.engine, confidence=round(result.confidence, 2))
+                parsed = result.data
+                self._cache_put(image_bytes, parsed)
+
             items = [ExtractedItemDTO(**item) for item in parsed.get("items", [])]
-            total_amount = float(parsed.get("total_amount", 0.0))
-            suggestion = parsed.get("suggestion", "")
             category_name = parsed.get("category", "Groceries")
-            category_id = self._ensure_category(category_name)
+            on_event("extracted", {"category": category_name, "items": len(items)})
 
-            #Pass all GPT fields into _save_receipt_expense
-            expense_result = self._save_receipt_expense(user_id, category_id, parsed)
+            # Nothing is written until the receipt is complete: one short transaction
+            prepared = self._prepare_bulk_receipt(user_id, category_name, parsed, items)
+            saved = self.receipt_repository.save_receipt(*prepared.data) if prepared.success else prepared
+        except Exception as err:  # pylint: disable=broad-except
+            return self._processing_failure(err)
+
+        if not saved.success:
+            return ResultDTO.fail(f"Failed to record receipt expense: {saved.message}")
+
+        self._log_bulk_save(saved.data)
+        self._invalidate_responses(user_id)
+        log.info(
+            "Streamed receipt",
+            category=category_name,
+            items=len(items),
+            elapsed_ms=round((time.time() - start_time) * 1000, 2),
+        )
+        return ResultDTO.ok("Receipt processed successfully", self._build_response(parsed, items))
 
-            if not expense_result.success:
-                return ResultDTO.fail(
-                    f"Failed to record receipt expense: {expense_result.message}"
-                )
+    @staticmethod
+    def _processing_failure(err: Exception) -> ResultDTO:
+        """Failed result for an exception; code 503 when retrying later may succeed (timeouts, rate limits)."""
+        return ResultDTO.fail(f"Failed to process receipt: {repr(err)}", code=503 if is_transient_error(err) else 400)
 
-            expense_id = getattr(expense_result.data, "expense_id", None)
-            paurchase_date = getattr(expense_result.data, "expense_date", datetime.now().date())
-            for item in items:
-                self._process_item(user_id, item, category_id, expense_id, paurchase_date)
+    def _invalidate_responses(self, user_id: int) -> None:
+        """A saved receipt writes an expense, its groceries and a budget charge."""
+        if self._response_cache is not None:
+            self._response_cache.invalidate(user_id, EXPENSES, GROCERIES, BUDGETS)
 
-            elapsed = round((time.time() - start_time) * 1000, 2)
-            print(
-                f"[ReceiptService] Processed receipt ({category_name}) with "
-                f"{len(items)} items in {elapsed} ms"
-            )
+    def _use_bulk_persist(self) -> bool:
+        """Whether the unit-of-work persistence path is available and enabled."""
+        return self.receipt_repository is not None and settings.RECEIPT_BULK_PERSIST
 
-            return ResultDTO.ok(
-                "Receipt processed successfully",
-                ReceiptUploadResponseDTO(
-                    category=category_name,
-                    total_amount=total_amount,
-                    suggestion=suggestion,
-                    items=items,
-                ),
-            )
+    def _try_extract(self, image_bytes: bytes) -> tuple[dict | None, str | None]:
+        """Extraction wrapper for thread pools: returns ``(parsed, error)``."""
+        try:
+            return self._extract_cached(image_bytes), None
+        except Exception as err:  # pylint: disable=broad-except
+            return None, f"Failed to process receipt: {repr(err)}"
+
+    def _batch_outcome(
+        self,
+        filename: str,
+        result: ResultDTO,
+        parsed: dict | None = None,
+        items: list[ExtractedItemDTO] | None = None,
+    ) -> dict:
+        """Build the per-file entry of a batch response."""
+        if not result.success:
+            return {"filename": filename, "success": False, "message": result.message, "data": None}
+        return {
+            "filename": filename,
+            "success": True,
+            "message": "Receipt processed successfully",
+            "data": self._build_response(parsed, items),
+        }
+
+    @staticmethod
+    def _build_response(parsed: dict, items: list[ExtractedItemDTO]) -> ReceiptUploadResponseDTO:
+        """Summarize a processed receipt for the API response."""
+        return ReceiptUploadResponseDTO(
+            category=parsed.get("category", "Groceries"),
+            total_amount=float(parsed.get("total_amount", 0.0)),
+            suggestion=parsed.get("suggestion", ""),
+            items=items,
+        )
 
+    def get_cache_stats(self) -> ResultDTO:
+        """Return hit/miss counters of the extraction cache."""
+        if self.extraction_cache is None:
+            return ResultDTO.ok("Extraction cache disabled", {"enabled": False})
+        return ResultDTO.ok(
+            "Extraction cache statistics",
+            {"enabled": True, **self.extraction_cache.stats()},
+        )
+
+    def _extract_cached(self, image_bytes: bytes) -> dict:
+        """Return the extraction for an image, reusing a cached result for re-uploads."""
+        if (cached := self._cache_get(image_bytes)) is not None:
+            return cached
+
+        parsed = self._extract(image_bytes)
+        self._cache_put(image_bytes, parsed)
+        return parsed
+
+    def _cache_get(self, image_bytes: bytes) -> dict | None:
+        """Cached extraction for an image, or None (cache errors are never fatal)."""
+        if self.extraction_cache is None:
+            return None
+        try:
+            if (cached := self.extraction_cache.get(image_bytes)) is not None:
+                log.info("Extraction cache hit")
+                return cached
         except Exception as err:  # pylint: disable=broad-except
-            return ResultDTO.fail(f"Failed to process receipt: {repr(err)}")
-        
+            log.warning("Extraction cache lookup failed", error=repr(err))
+        return None
+
+    def _cache_put(self, image_bytes: bytes, parsed: dict) -> None:
+        """Store an extraction in the cache, ignoring cache errors."""
+        if self.extraction_cache is None:
+            return
+        try:
+            self.extraction_cache.put(image_bytes, parsed)
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("Extraction cache store failed", error=repr(err))
+
+    def _extract(self, image_bytes: bytes) -> dict:
+        """Run the configured extraction engine and return the parsed receipt."""
+        result = self.extractor.extract(image_bytes)
+        log.info("Extracted receipt", engine=result.engine, confidence=round(result.confidence, 2))
+        return result.data
+
     # --- Safely parse any date-like fields ---
     @staticmethod
     def safe_date(value):
@@ -115,45 +350,114 @@ class ReceiptService(IReceiptService):
                     continue
         return None
 
+    def _build_expense_dto(self, user_id: int, category_id: int | None, parsed: dict) -> ExpenseDTO:
+        """Convert the parsed receipt header into a receipt-level ExpenseDTO."""
+        # Use self.safe_date to access static method
+        receipt_date = self.safe_date(parsed.get("receipt_date"))
+        created_at = self.safe_date(parsed.get("created_at")) or datetime.now().date()
+        updated_at = self.safe_date(parsed.get("updated_at")) or datetime.now().date()
+        due_date = self.safe_date(parsed.get("due_date"))
+
+        # Build ExpenseDTO using properly converted date fields
+        return ExpenseDTO(
+            expense_id=None,
+            user_id=user_id,
+            category_id=category_id,
+            amount=float(parsed.get("total_amount", 0.0)),
+            description=parsed.get("suggestion") or "Auto-added from receipt scan",
+
+            # expense_date from receipt_date
+            expense_date=receipt_date or datetime.now().date(),
+
+            notes="Auto-added from receipt scan",
+
+            # --- mapped new fields ---
+            store_name=parsed.get("store_name"),
+            store_address=parsed.get("store_address"),
+            receipt_number=parsed.get("receipt_number"),
+            payment_method=parsed.get("payment_method"),
+            currency=parsed.get("currency"),
+            subtotal_amount=parsed.get("subtotal_amount"),
+            tax_amount=parsed.get("tax_amount"),
+            discount_amount=parsed.get("discount_amount"),
+
+            # fixed — pass date objects, not raw strings
+            due_date=due_date,
+            created_at=created_at,
+            updated_at=updated_at,
+
+            suggestion=parsed.get("suggestion"),
+        )
+
+    def _prepare_bulk_receipt(
+        self, user_id: int, category_name: str, parsed: dict, items: list[ExtractedItemDTO]
+    ) -> ResultDTO:
+        """
+        Validate a parsed receipt and build the ``(category_name, expense, groceries,
+        category_id)`` tuple consumed by the unit-of-work repository.
+
+        The category ID comes from the category service (cached by name); when
+        that fails it is None and the repository resolves the name itself.
+        """
+        category_name = category_name.strip().capitalize()
+        expense_dto = self._build_expense_dto(user_id, None, parsed)
+
+        if expense_dto.amount <= 0:
+            return ResultDTO.fail("Expense amount must be greater than zero.")
+        if expense_dto.expense_date > date.today():
+            return ResultDTO.fail("Invalid expense date.")
+
+        groceries = []
+        for item in items:
+            dto = self._build_grocery_dto(user_id, item, None, None, expense_dto.expense_date)
+            # Same rule GroceryService.add_grocery applies on the per-item path
+            if not dto.item_name or dto.unit_price <= 0 or dto.quantity <= 0:
+                log.info("Skipped item: invalid price or quantity", item=item.item_name)
+                continue
+            groceries.append(dto)
+
+        with span("receipt.category", category=category_name):
+            category_id = self._ensure_category(category_name)
+        return ResultDTO.ok("Receipt prepared", (category_name, expense_dto, groceries, category_id))
+
+    @staticmethod
+    def _log_bulk_save(saved) -> None:
+        """Log the outcome of a unit-of-work save."""
+        log.info(
+            "Saved receipt in one transaction",
+            expense_id=saved.expense.expense_id,
+            groceries=len(saved.groceries),
+        )
+
+    def _save_receipt_legacy(
+        self, user_id: int, category_name: str, parsed: dict, items: list[ExtractedItemDTO]
+    ) -> ResultDTO:
+        """Persist a receipt through the per-item service calls (RECEIPT_BULK_PERSIST=false)."""
+        with span("receipt.category", category=category_name):
+            category_id = self._ensure_category(category_name)
+
+        #Pass all GPT fields into _save_receipt_expense
+        with span("receipt.expense", legacy=True):
+            expense_result = self._save_receipt_expense(user_id, category_id, parsed)
+        if not expense_result.success:
+            return expense_result
+
+        expense_id = getattr(expense_result.data, "expense_id", None)
+        paurchase_date = getattr(expense_result.data, "expense_date", datetime.now().date())
+        saved = []
+        for item in items:
+            if (grocery := self._process_item(user_id, item, category_id, expense_id, paurchase_date)) is not None:
+                saved.append(grocery)
+
+        recorded = self.grocery_service.record_purchases(expense_id, parsed.get("store_name"), saved)
+        if not recorded.success:
+            log.warning("Failed to record purchase lines", expense_id=expense_id, reason=recorded.message)
+        return expense_result
+
     def _save_receipt_expense(self, user_id: int, category_id: int | None, parsed: dict) -> ResultDTO:
         """Create a single expense record for the entire receipt, including metadata."""
         try:
-            # Use self.safe_date to access static method
-            receipt_date = self.safe_date(parsed.get("receipt_date"))
-            created_at = self.safe_date(parsed.get("created_at")) or datetime.now().date()
-            updated_at = self.safe_date(parsed.get("updated_at")) or datetime.now().date()
-            due_date = self.safe_date(parsed.get("due_date"))
-
-            # Build ExpenseDTO using properly converted date fields
-            expense_dto = ExpenseDTO(
-                expense_id=None,
-                user_id=user_id,
-                category_id=category_id,
-                amount=float(parsed.get("total_amount", 0.0)),
-                description=parsed.get("suggestion") or "Auto-added from receipt scan",
-
-                # expense_date from receipt_date
-                expense_date=receipt_date or datetime.now().date(),
-
-                notes="Auto-added from receipt scan",
-
-                # --- mapped new fields ---
-                store_name=parsed.get("store_name"),
-                store_address=parsed.get("store_address"),
-                receipt_number=parsed.get("receipt_number"),
-                payment_method=parsed.get("payment_method"),
-                currency=parsed.get("currency"),
-                subtotal_amount=parsed.get("subtotal_amount"),
-                tax_amount=parsed.get("tax_amount"),
-                discount_amount=parsed.get("discount_amount"),
-
-                # fixed — pass date objects, not raw strings
-                due_date=due_date,
-                created_at=created_at,
-                updated_at=updated_at,
-
-                suggestion=parsed.get("suggestion"),
-            )
+            expense_dto = self._build_expense_dto(user_id, category_id, parsed)
 
             # --- Try to find duplicate expense ---
             existing = self.expense_service.check_exist(user_id, expense_dto.store_name, expense_dto.expense_date)
@@ -161,15 +465,16 @@ class ReceiptService(IReceiptService):
             # --- If duplicate found, update it ---
             if existing and existing.success and existing.data:
                 existing_exp = existing.data
-                print(f"[ReceiptService] Updating existing expense for {existing} (same date/amount)")
+                log.info("Updating existing expense (same store and date)", expense_id=existing_exp.expense_id)
                 expense_dto.expense_id = existing_exp.expense_id
                 expense_dto.notes = f"{existing_exp.notes or ''} | Merged with new receipt data"
                 return self.expense_service.update_expense(expense_dto)
 
             # --- Otherwise, create a new one ---
-            print(
-                f"[ReceiptService] Creating receipt-level expense "
-                f"(Store: {parsed.get('store_name')}, Total: {parsed.get('total_amount')})"
+            log.info(
+                "Creating receipt-level expense",
+                store=parsed.get("store_name"),
+                total=parsed.get("total_amount"),
             )
             return self.expense_service.add_expense(expense_dto)
         except Exception as err:  # pylint: disable=broad-except
@@ -177,41 +482,32 @@ class ReceiptService(IReceiptService):
 
     def _process_item(
         self, user_id: int, item: ExtractedItemDTO, category_id: int | None, expense_id: int | None, paurchase_date: date | None = None
-    ) -> None:
-        """Add or update groceries belonging to a receipt."""
+    ) -> GroceryDTO | None:
+        """Add or update groceries belonging to a receipt; returns the saved grocery."""
         grocery_dto = self._build_grocery_dto(user_id, item, category_id, expense_id, paurchase_date)
-        grocery_result = self._save_grocery(user_id, grocery_dto)
+        with span("receipt.grocery", legacy=True):
+            grocery_result = self._save_grocery(user_id, grocery_dto)
 
         if grocery_result.success:
-            print(f"[ReceiptService] Added grocery '{item.item_name}' under expense #{expense_id}")
-        else:
-            print(f"[ReceiptService] Skipped item '{item.item_name}' – {grocery_result.message}")
+            log.debug("Saved grocery", item=item.item_name, expense_id=expense_id)
+            return grocery_result.data
+        log.info("Skipped item", item=item.item_name, reason=grocery_result.message)
+        return None
 
     def _ensure_category(self, name: str) -> int | None:
         """Ensure a category exists or create it if missing."""
         try:
             name = name.strip().capitalize()
-            result = self.category_service.get_category(name)
-            if result.success and result.data:
-                category_id = getattr(result.data, "category_id", None)
-                print(f"[ReceiptService] Using existing category '{name}' (ID: {category_id})")
-                return category_id
-
-            category_dto = CategoryDTO(
-                category_id=None,
-                name=name,
-                description=f"Auto-added category from receipt import: {name}",
+            result = self.category_service.ensure_category(
+                name, f"Auto-added category from receipt import: {name}",
             )
-            created = self.category_service.add_category(category_dto)
-            if created.success and created.data:
-                category_id = getattr(created.data, "category_id", None)
-                print(f"[ReceiptService] Created new category '{name}' (ID: {category_id})")
-                return category_id
+            if result.success and result.data:
+                return getattr(result.data, "category_id", None)
 
-            print(f"[ReceiptService] Failed to create category '{name}'")
+            log.warning("Failed to ensure category", category=name, reason=result.message)
             return None
         except Exception as err:  # pylint: disable=broad-except
-            print(f"[ReceiptService] Failed to ensure category '{name}': {repr(err)}")
+            log.warning("Failed to ensure category", category=name, error=repr(err))
             return None
 
     def _build_grocery_dto(
@@ -235,196 +531,11 @@ class ReceiptService(IReceiptService):
         """Add or update a grocery entry."""
         existing = self.grocery_service.find_by_name(user_id, dto.item_name)
         if existing and existing.success and existing.data:
+            # Matched by canonical name: the item keeps the spelling it was first saved with
             dto.grocery_id = existing.data.grocery_id
-            print(f"[ReceiptService] Updating grocery '{dto.item_name}'")
+            dto.item_name = existing.data.item_name
+            log.debug("Updating grocery", item=dto.item_name)
             return self.grocery_service.update_grocery(dto)
 
-        print(f"[ReceiptService] Adding grocery '{dto.item_name}'")
+        log.debug("Adding grocery", item=dto.item_name)
         return self.grocery_service.add_grocery(dto)
-
-    def _extract_with_gpt(self, image_bytes: bytes) -> dict:
-        """
-        Use GPT-4o Vision to extract structured receipt data.
-        Returns category, items, total amount, and suggestion.
-        """
-        try:
-            #b64_image = base64.b64encode(image_bytes).decode("utf-8")
-            with Image.open(BytesIO(image_bytes)) as _img:
-                _img = _img.convert("RGB")
-                _buf = BytesIO()
-                _img.save(_buf, format="JPEG", quality=90, optimize=True)
-                jpeg_bytes = _buf.getvalue()
-
-            b64_image = base64.b64encode(jpeg_bytes).decode("ascii")
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages = [
-                            {
-                                "role": "system",
-                                "content": (
-                                    "You are an intelligent receipt analysis assistant.\n"
-                                    "Your job is to extract clean, structured JSON data from an image of a purchase receipt.\n"
-                                    "\n"
-                                    "=== OUTPUT RULES ===\n"
-                                    "- Return ONLY valid JSON (no explanations, markdown, or code fences).\n"
-                                    "- All date fields must use ISO format: \"YYYY-MM-DD\".\n"
-                                    "  • Recognize compact or unusual formats like '22NOV25' → '2025-11-22'.\n"
-                                    "  • Convert variants such as '22 November 2025', '22/11/25', or 'Nov 22, 2025'.\n"
-                                    "  • Keep only the date (ignore time). If missing, use current date.\n"
-                                    "- Trim all strings and apply reasonable capitalization (e.g., title case for store and item names).\n"
-                                    "- Numeric fields (unit_price, quantity, subtotal_amount, tax_amount, discount_amount, total_amount) must be floats.\n"
-                                    "- If a field is missing, include it as null — except `items`, which must never be empty.\n"
-                                    "\n"
-                                    "=== ITEM RULES ===\n"
-                                    "- The 'items' array must ALWAYS contain at least one item.\n"
-                                    "- If the receipt is a bill, invoice, or payment to a company/person, create an item that represents the service or purpose — e.g., "
-                                    "company name, account, or description of what was paid for.\n"
-                                    "- Include taxes, service fees, or any charges as an items when they have value.\n"
-                                    "- Each item must have: item_name, quantity, unit_price, total_price, and local.\n"
-                                    "- If only a total amount is shown, set quantity = 1 and unit_price = total_amount.\n"
-                                    "- Never leave the 'items' list empty or null. Include at least one descriptive item.\n"
-                                    "\n"
-                                    "=== FIELD INTERPRETATION ===\n"
-                                    "- 'local' = true if the product or service appears to be New Zealand–made or associated with brands such as "
-                                    "'NZ', 'Kiwi', 'Aotearoa', 'Pams', 'Rolling Meadow'.\n"
-                                    "- 'local' = false for imported or international brands (e.g., Maggi, McCain, Nestlé). Default to false if uncertain.\n"
-                                    "\n"
-                                    "=== REQUIRED JSON STRUCTURE ===\n"
-                                    "{\n"
-                                    "  \"store_name\": string | null,\n"
-                                    "  \"store_address\": string | null,\n"
-                                    "  \"receipt_number\": string | null,\n"
-                                    "  \"receipt_date\": \"YYYY-MM-DD\" | null,\n"
-                                    "  \"due_date\": \"YYYY-MM-DD\" | null,\n"
-                                    "  \"payment_method\": string | null,\n"
-                                    "  \"category\": string,\n"
-                                    "  \"currency\": string | null,\n"
-                                    "  \"items\": [\n"
-                                    "    {\n"
-                                    "      \"item_name\": string,\n"
-                                    "      \"quantity\": float,\n"
-                                    "      \"unit_price\": float,\n"
-                                    "      \"total_price\": float | null,\n"
-                                    "      \"local\": boolean\n"
-                                    "    }\n"
-                                    "  ],\n"
-                                    "  \"subtotal_amount\": float | null,\n"
-                                    "  \"tax_amount\": float | null,\n"
-                                    "  \"discount_amount\": float | null,\n"
-                                    "  \"total_amount\": float,\n"
-                                    "  \"suggestion\": string\n"
-                                    "}\n"
-                                    "\n"
-                                    "=== SUGGESTION RULE ===\n"
-                                    "- Provide a short, friendly suggestion for how to categorize or tag this receipt, "
-                                    "for example: \"Consider categorizing this as Utilities since it appears to be an electricity bill.\""
-                                ),
-                            },
-                            {
-                                "role": "user",
-                                "content": [
-                                    {"type": "text", "text": "Extract and format this receipt as JSON only."},
-                                    {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_image}"}},
-                                ],
-                            },
-                        ],
-                response_format={"type": "json_object"},
-                temperature=0,
-            )
-
-            content = response.choices[0].message.content
-            parsed = json.loads(content)
-
-            parsed["category"] = str(parsed.get("category", "Groceries")).strip().capitalize()
-            for item in parsed.get("items", []):
-                item["item_name"] = str(item.get("item_name", "Unknown item")).strip().capitalize()
-
-            parsed.setdefault(
-                "suggestion",
-                "You can save this receipt under 'Groceries' or tag it by store name for tracking.",
-            )
-
-            print(
-                f"[GPT-4o] Category: {parsed.get('category')} | "
-                f"Items: {len(parsed.get('items', []))} | "
-                f"Total: {parsed.get('total_amount', 'N/A')} | "
-                f"Suggestion: {parsed.get('suggestion')}"
-            )
-            return parsed
-        except Exception as err:  # pylint: disable=broad-except
-            raise RuntimeError(f"GPT-4o extraction failed: {repr(err)}") from err
-
-    def _extract_with_gpt_opt(self, image_bytes: bytes) -> dict:
-        """
-        Optimized GPT-4o-mini Vision extraction (no local OCR dependency).
-        Compresses image for faster upload, ensures clean JSON output,
-        and enforces consistent normalization of items and dates.
-        """
-        try:
-            # --- Compress image for faster transfer ---
-            with Image.open(BytesIO(image_bytes)) as img:
-                img = img.convert("RGB")
-                max_w = 1280
-                if img.width > max_w:
-                    ratio = max_w / img.width
-                    img = img.resize((max_w, int(img.height * ratio)))
-                buf = BytesIO()
-                img.save(buf, format="JPEG", quality=75, optimize=True)
-                jpeg_bytes = buf.getvalue()
-
-            # --- Encode image to base64 for GPT Vision ---
-            b64_image = base64.b64encode(jpeg_bytes).decode("ascii")
-
-            # --- Compact but precise system prompt ---
-            system_prompt = (
-                "You are a receipt analysis AI. Extract structured JSON only (no text/markdown). "
-                "Dates → ISO (YYYY-MM-DD). Normalize all formats (22NOV25→2025-11-22). "
-                "Each receipt must have ≥1 item (bills → company/service, taxes → items if costed). "
-                "All numeric values are floats. Missing fields = null (or [] for arrays). "
-                "Response JSON keys: store_name, store_address, receipt_number, receipt_date, due_date, "
-                "payment_method, category, currency, items, subtotal_amount, tax_amount, discount_amount, total_amount, suggestion. "
-                "Items: [{item_name, quantity, unit_price, total_price, local}]. "
-                "'local' = true if NZ-made ('NZ','Kiwi','Aotearoa','Pams','Rolling Meadow'), else false. "
-                "End with a brief categorization suggestion."
-            )
-
-            # --- GPT-4o-mini Vision call ---
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": "Extract and format this receipt as JSON only."},
-                            {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{b64_image}"}} ,
-                        ],
-                    },
-                ],
-                response_format={"type": "json_object"},
-                temperature=0,
-            )
-
-            # --- Parse and normalize response ---
-            parsed = json.loads(response.choices[0].message.content)
-
-            parsed["category"] = str(parsed.get("category", "Groceries")).strip().capitalize()
-            for item in parsed.get("items", []):
-                item["item_name"] = str(item.get("item_name", "Unknown item")).strip().capitalize()
-
-            parsed.setdefault(
-                "suggestion",
-                "You can save this receipt under 'Groceries' or tag it by store name for tracking."
-            )
-
-            print(
-                f"[GPT-fast] Category: {parsed.get('category')} | Items: {len(parsed.get('items', []))} | "
-                f"Total: {parsed.get('total_amount', 'N/A')} | Mode: Vision"
-            )
-
-            return parsed
-
-        except Exception as err:
-            raise RuntimeError(f"Fast GPT extraction failed: {repr(err)}") from err
-
-
@@ -0,0 +1,44 @@
+"""
+SearchService
+Validates search requests and delegates them to the full-text index.
+"""
+
+# --- First-party imports ---
+from kaihelper.business.interfaces.i_search_service import ISearchService
+from kaihelper.domain.repositories.search_repository import SearchRepository
+from kaihelper.contracts.search_dto import MAX_SEARCH_LIMIT, SEARCH_TYPES, SearchQueryDTO
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class SearchService(ISearchService):
+    """Service layer for full-text search."""
+
+    def __init__(self, repository: SearchRepository | None = None) -> None:
+        """
+        Initialize the SearchService with an optional repository.
+
+        Args:
+            repository (SearchRepository | None): Optional repository for dependency injection.
+        """
+        self._repo = repository or SearchRepository()
+
+    def search(self, user_id: int, query: SearchQueryDTO) -> ResultDTO:
+        """
+        Expenses and grocery items matching every word of ``query.q``, best first.
+
+        Args:
+            user_id (int): User identifier.
+            query (SearchQueryDTO): Words, document types, page size and cursor.
+
+        Returns:
+            ResultDTO: SearchPageDTO.
+        """
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+        if not query.q or not query.q.strip():
+            return ResultDTO.fail("Search query is required.")
+        unknown = sorted(set(query.types or ()) - set(SEARCH_TYPES))
+        if unknown:
+            return ResultDTO.fail(f"Unknown types: {', '.join(unknown)}. Allowed: {', '.join(SEARCH_TYPES)}.")
+        query.limit = max(1, min(query.limit, MAX_SEARCH_LIMIT))
+        return self._repo.search(user_id, query)
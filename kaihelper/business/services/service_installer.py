@@ -5,10 +5,13 @@ Ensures consistent dependency resolution across the business layer.
 """
 
 # --- Standard library imports ---
-from typing import Type, Dict, Any
+from threading import RLock
+from typing import Any, Callable, Dict, Optional, Type
 
 # --- First-party imports ---
 from kaihelper.domain.domain_installer import DomainInstaller
+from kaihelper.config.settings import settings
+from kaihelper.utils.response_cache import ResponseCache, build_response_cache
 
 # --- Service Interfaces ---
 from kaihelper.business.interfaces.i_user_service import IUserService
@@ -17,6 +20,10 @@ from kaihelper.business.interfaces.i_grocery_service import IGroceryService
 from kaihelper.business.interfaces.i_budget_service import IBudgetService
 from kaihelper.business.interfaces.i_expense_service import IExpenseService
 from kaihelper.business.interfaces.i_receipt_service import IReceiptService
+from kaihelper.business.interfaces.i_receipt_job_service import IReceiptJobService
+from kaihelper.business.interfaces.i_analytics_service import IAnalyticsService
+from kaihelper.business.interfaces.i_search_service import ISearchService
+from kaihelper.business.interfaces.i_sync_service import ISyncService
 
 # --- Repository Interfaces ---
 from kaihelper.domain.interfaces.i_user_repository import IUserRepository
@@ -24,6 +31,9 @@ from kaihelper.domain.interfaces.i_category_repository import ICategoryRepositor
 from kaihelper.domain.interfaces.i_grocery_repository import IGroceryRepository
 from kaihelper.domain.interfaces.i_budget_repository import IBudgetRepository
 from kaihelper.domain.interfaces.i_expense_repository import IExpenseRepository
+from kaihelper.domain.interfaces.i_analytics_repository import IAnalyticsRepository
+from kaihelper.domain.interfaces.i_search_repository import ISearchRepository
+from kaihelper.domain.interfaces.i_sync_repository import ISyncRepository
 
 
 class ServiceInstaller:
@@ -41,49 +51,124 @@ class ServiceInstaller:
         """
         self._domain = domain_installer
         self._service_map: Dict[Type, Any] = {}
+        self._factories: Dict[Type, Callable[[], Any]] = {}
+        # Re-entrant: a factory resolves the services it depends on
+        self._lock = RLock()
+        # Shared by the cached GET routes and the services whose writes invalidate them
+        self._response_cache = build_response_cache(settings)
         self._register_services()
 
     def _register_services(self) -> None:
         """
-        Register all services and wire them with their respective repositories.
-        Uses lazy imports to avoid circular dependencies between modules.
+        Register a factory per service interface.
+
+        Services are built on first ``resolve`` and then reused, so a cold
+        start that only serves e.g. /health never imports or constructs the
+        receipt/vision stack. Factories use lazy imports, which also avoids
+        circular dependencies between modules.
         """
-        # --- Lazy imports (to prevent circular references) ---
+        self._factories[IUserService] = self._build_user_service
+        self._factories[ICategoryService] = self._build_category_service
+        self._factories[IGroceryService] = self._build_grocery_service
+        self._factories[IBudgetService] = self._build_budget_service
+        self._factories[IExpenseService] = self._build_expense_service
+        self._factories[IReceiptService] = self._build_receipt_service
+        self._factories[IReceiptJobService] = self._build_receipt_job_service
+        self._factories[IAnalyticsService] = self._build_analytics_service
+        self._factories[ISearchService] = self._build_search_service
+        self._factories[ISyncService] = self._build_sync_service
+
+    # ------------------------------------------------------------------
+    # Factories
+    # ------------------------------------------------------------------
+
+    def _build_user_service(self) -> IUserService:
         from kaihelper.business.services.user_service import UserService
-        from kaihelper.business.services.category_service import CategoryService
-        from kaihelper.business.services.grocery_service import GroceryService
-        from kaihelper.business.services.budget_service import BudgetService
-        from kaihelper.business.services.expense_service import ExpenseService
-        from kaihelper.business.services.receipt_service import ReceiptService
 
-        # --- Repository bindings (from Domain Layer) ---
         user_repo: IUserRepository = self._domain.get_user_repository()
+        return UserService(user_repo)
+
+    def _build_category_service(self) -> ICategoryService:
+        from kaihelper.business.services.category_service import CategoryService
+        from kaihelper.config.settings import settings
+
         category_repo: ICategoryRepository = self._domain.get_category_repository()
+        return CategoryService(
+            category_repo,
+            cache_ttl_seconds=settings.CATEGORY_CACHE_TTL_SECONDS,
+            response_cache=self._response_cache,
+        )
+
+    def _build_grocery_service(self) -> IGroceryService:
+        from kaihelper.business.services.grocery_service import GroceryService
+
         grocery_repo: IGroceryRepository = self._domain.get_grocery_repository()
+        return GroceryService(grocery_repo, response_cache=self._response_cache)
+
+    def _build_budget_service(self) -> IBudgetService:
+        from kaihelper.business.services.budget_service import BudgetService
+
         budget_repo: IBudgetRepository = self._domain.get_budget_repository()
+        return BudgetService(budget_repo, response_cache=self._response_cache)
+
+    def _build_expense_service(self) -> IExpenseService:
+        from kaihelper.business.services.expense_service import ExpenseService
+
         expense_repo: IExpenseRepository = self._domain.get_expense_repository()
+        return ExpenseService(expense_repo, response_cache=self._response_cache)
+
+    def _build_analytics_service(self) -> IAnalyticsService:
+        from kaihelper.business.services.analytics_service import AnalyticsService
+
+        analytics_repo: IAnalyticsRepository = self._domain.get_analytics_repository()
+        return AnalyticsService(analytics_repo)
+
+    def _build_search_service(self) -> ISearchService:
+        from kaihelper.business.services.search_service import SearchService
+
+        search_repo: ISearchRepository = self._domain.get_search_repository()
+        return SearchService(search_repo)
+
+    def _build_sync_service(self) -> ISyncService:
+        from kaihelper.business.services.sync_service import SyncService
 
-        # --- Core service bindings ---
-        self._service_map[IUserService] = UserService(user_repo)
-        self._service_map[ICategoryService] = CategoryService(category_repo)
-        self._service_map[IGroceryService] = GroceryService(grocery_repo)
-        self._service_map[IBudgetService] = BudgetService(budget_repo)
-        self._service_map[IExpenseService] = ExpenseService(expense_repo)
-
-        # --- Receipt Service (multi-dependency injection) ---
-        category_service = self._service_map[ICategoryService]
-        grocery_service = self._service_map[IGroceryService]
-        expense_service = self._service_map[IExpenseService]
-
-        self._service_map[IReceiptService] = ReceiptService(
-            category_service=category_service,
-            grocery_service=grocery_service,
-            expense_service=expense_service,
+        sync_repo: ISyncRepository = self._domain.get_sync_repository()
+        return SyncService(sync_repo)
+
+    def _build_receipt_service(self) -> IReceiptService:
+        """Receipt Service (multi-dependency injection); its extractor is built on first use."""
+        from kaihelper.business.services.receipt_service import ReceiptService
+        from kaihelper.utils.extraction_cache import build_extraction_cache
+        from kaihelper.config.settings import settings
+
+        return ReceiptService(
+            category_service=self.resolve(ICategoryService),
+            grocery_service=self.resolve(IGroceryService),
+            expense_service=self.resolve(IExpenseService),
+            receipt_repository=self._domain.get_receipt_repository(),
+            extraction_cache=build_extraction_cache(settings),
+            response_cache=self._response_cache,
+        )
+
+    def _build_receipt_job_service(self) -> IReceiptJobService:
+        """Receipt Job Service (background ingestion)."""
+        from kaihelper.business.services.receipt_job_service import ReceiptJobService
+        from kaihelper.business.services.receipt_job_queue import build_receipt_job_queue
+        from kaihelper.config.settings import settings
+
+        return ReceiptJobService(
+            repository=self._domain.get_receipt_job_repository(),
+            receipt_service=self.resolve(IReceiptService),
+            queue=build_receipt_job_queue(settings),
+            max_attempts=settings.RECEIPT_JOB_MAX_ATTEMPTS,
+            stale_after_seconds=settings.RECEIPT_JOB_STALE_SECONDS,
+            retry_delay_seconds=settings.RECEIPT_JOB_RETRY_DELAY_SECONDS,
         )
 
     def resolve(self, interface: Type) -> Any:
         """
-        Retrieve a registered service implementation by its interface type.
+        Retrieve a registered service implementation by its interface type,
+        building it on first use.
 
         Args:
             interface (Type): Interface class to resolve.
@@ -96,7 +181,25 @@ class ServiceInstaller:
         """
         if (service := self._service_map.get(interface)) is not None:
             return service
-        raise ValueError(f"Service for {interface.__name__} not registered.")
+        if (factory := self._factories.get(interface)) is None:
+            raise ValueError(f"Service for {interface.__name__} not registered.")
+        with self._lock:
+            if (service := self._service_map.get(interface)) is None:
+                service = factory()
+                self._service_map[interface] = service
+            return service
+
+    def register(self, interface: Type, service: Any) -> None:
+        """
+        Bind a pre-built service to an interface, replacing any existing one
+        (e.g. a ReceiptService with an offline extractor in benchmarks).
+
+        Args:
+            interface (Type): Interface class.
+            service (Any): Implementation to return from ``resolve``.
+        """
+        with self._lock:
+            self._service_map[interface] = service
 
     # ------------------------------------------------------------------
     # Convenience Getters
@@ -125,3 +228,23 @@ class ServiceInstaller:
     def get_receipt_service(self) -> IReceiptService:
         """Return the registered ReceiptService instance."""
         return self.resolve(IReceiptService)
+
+    def get_receipt_job_service(self) -> IReceiptJobService:
+        """Return the registered ReceiptJobService instance."""
+        return self.resolve(IReceiptJobService)
+
+    def get_analytics_service(self) -> IAnalyticsService:
+        """Return the registered AnalyticsService instance."""
+        return self.resolve(IAnalyticsService)
+
+    def get_search_service(self) -> ISearchService:
+        """Return the registered SearchService instance."""
+        return self.resolve(ISearchService)
+
+    def get_sync_service(self) -> ISyncService:
+        """Return the registered SyncService instance."""
+        return self.resolve(ISyncService)
+
+    def get_response_cache(self) -> Optional[ResponseCache]:
+        """Return the per-user GET response cache (None when disabled)."""
+        return self._response_cache
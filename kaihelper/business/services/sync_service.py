@@ -0,0 +1,39 @@
+"""
+SyncService
+Validates delta sync requests and delegates them to the change feed.
+"""
+
+# --- First-party imports ---
+from kaihelper.business.interfaces.i_sync_service import ISyncService
+from kaihelper.domain.repositories.sync_repository import SyncRepository
+from kaihelper.contracts.sync_dto import MAX_SYNC_LIMIT, SyncQueryDTO
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class SyncService(ISyncService):
+    """Service layer for delta sync."""
+
+    def __init__(self, repository: SyncRepository | None = None) -> None:
+        """
+        Initialize the SyncService with an optional repository.
+
+        Args:
+            repository (SyncRepository | None): Optional repository for dependency injection.
+        """
+        self._repo = repository or SyncRepository()
+
+    def changes(self, user_id: int, query: SyncQueryDTO) -> ResultDTO:
+        """
+        The user's expenses and grocery items created, updated or deleted since ``query.since``.
+
+        Args:
+            user_id (int): User identifier.
+            query (SyncQueryDTO): Token of the previous batch and batch size.
+
+        Returns:
+            ResultDTO: SyncBatchDTO.
+        """
+        if not user_id:
+            return ResultDTO.fail("User ID is required.")
+        query.limit = max(1, min(query.limit, MAX_SYNC_LIMIT))
+        return self._repo.changes(user_id, query)
@@ -23,9 +23,29 @@ class Settings:
     DB_USER: str = os.getenv("DB_USER", "")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "")
 
+    # 🔌 Connection pool (queue = in-process pool | null = external pooler such as RDS Proxy)
+    DB_POOL_MODE: str = os.getenv("DB_POOL_MODE", "queue").lower()
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    # Recycle before MySQL/RDS Proxy idle timeouts drop the socket underneath us
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "280"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    DB_CONNECT_TIMEOUT: int = int(os.getenv("DB_CONNECT_TIMEOUT", "10"))
+    # SQL statement logging (independent of ENV)
+    SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+    # 🧬 Schema migrations: the API only checks the revision at startup unless this is on.
+    # Defaults to on for local SQLite so a fresh checkout still serves without a manual step.
+    DB_AUTO_MIGRATE: bool = os.getenv(
+        "DB_AUTO_MIGRATE", "true" if os.getenv("DB_ENGINE", "mysql").lower() == "sqlite" else "false"
+    ).lower() in ("1", "true", "yes")
+
     # 💾 Optional paths (only when using SQLite)
     SQLITE_DIR: str = os.getenv("SQLITE_DIR", ".")
     SQLITE_FILE: str = os.getenv("SQLITE_FILE", "kaihelper.db")
+    SQLITE_WAL: bool = os.getenv("SQLITE_WAL", "true").lower() in ("1", "true", "yes")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
 
     # ✉️ SMTP (optional, for notifications or password recovery)
     SMTP_HOST: str = os.getenv("SMTP_HOST", "smtp.gmail.com")
@@ -35,8 +55,88 @@ class Settings:
 
     # 🤖 OpenAI configuration
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
+    # Optional alternative endpoint (proxy, or a local mock server in tests)
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL", "")
     USE_GPT4O: bool = os.getenv("USE_GPT4O", "true").lower() in ("1", "true", "yes")
 
+    # 🧾 Receipt ingestion
+    # Persist category, expense and groceries in one transaction (False = legacy per-item path)
+    RECEIPT_BULK_PERSIST: bool = os.getenv("RECEIPT_BULK_PERSIST", "true").lower() in ("1", "true", "yes")
+    # Parallel vision calls per batch upload, and the maximum files accepted per batch
+    RECEIPT_BATCH_CONCURRENCY: int = int(os.getenv("RECEIPT_BATCH_CONCURRENCY", "4"))
+    RECEIPT_BATCH_MAX_FILES: int = int(os.getenv("RECEIPT_BATCH_MAX_FILES", "100"))
+    # Uncompressed bytes a batch's zip archives may expand to (checked before anything is unpacked)
+    RECEIPT_BATCH_MAX_BYTES: int = int(os.getenv("RECEIPT_BATCH_MAX_BYTES", str(200 * 1024 * 1024)))
+
+    # 🔎 Receipt extraction engine (llm | tesseract | routed | fake | replay)
+    # routed (opt-in) = local Tesseract first, escalating to the LLM below RECEIPT_OCR_MIN_CONFIDENCE
+    RECEIPT_EXTRACTOR: str = os.getenv("RECEIPT_EXTRACTOR", "llm").lower()
+    RECEIPT_OCR_MIN_CONFIDENCE: float = float(os.getenv("RECEIPT_OCR_MIN_CONFIDENCE", "0.8"))
+    RECEIPT_OCR_LANG: str = os.getenv("RECEIPT_OCR_LANG", "eng")
+    # replay = recorded model responses (.json/.jsonl file or directory) served after a simulated latency
+    RECEIPT_REPLAY_PATH: str = os.getenv("RECEIPT_REPLAY_PATH", "")
+    RECEIPT_REPLAY_LATENCY_MS: float = float(os.getenv("RECEIPT_REPLAY_LATENCY_MS", "0"))
+
+    # 🖼️ Receipt image preprocessing (decode once, encode once before the vision call)
+    IMAGE_MAX_LONG_EDGE: int = int(os.getenv("IMAGE_MAX_LONG_EDGE", "1600"))
+    IMAGE_FORMAT: str = os.getenv("IMAGE_FORMAT", "JPEG").upper()
+    IMAGE_QUALITY: int = int(os.getenv("IMAGE_QUALITY", "80"))
+    IMAGE_GRAYSCALE: bool = os.getenv("IMAGE_GRAYSCALE", "true").lower() in ("1", "true", "yes")
+    IMAGE_AUTOCROP: bool = os.getenv("IMAGE_AUTOCROP", "true").lower() in ("1", "true", "yes")
+
+    # 🗃️ Extraction cache (memory | file | db | none)
+    EXTRACTION_CACHE_BACKEND: str = os.getenv("EXTRACTION_CACHE_BACKEND", "memory").lower()
+    EXTRACTION_CACHE_DIR: str = os.getenv("EXTRACTION_CACHE_DIR", ".cache/receipts")
+    EXTRACTION_CACHE_TTL_SECONDS: int = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", "604800"))
+    EXTRACTION_CACHE_MAX_ENTRIES: int = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "512"))
+
+    # 🏷️ Categories: per-process name -> category map (0 disables it)
+    CATEGORY_CACHE_TTL_SECONDS: int = int(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300"))
+
+    # 💰 Budgets: per-process cache of each user's current budget period
+    # (budget writes in this process invalidate it; the TTL bounds staleness across workers)
+    BUDGET_CACHE_TTL_SECONDS: int = int(os.getenv("BUDGET_CACHE_TTL_SECONDS", "60"))
+    BUDGET_CACHE_MAX_USERS: int = int(os.getenv("BUDGET_CACHE_MAX_USERS", "1024"))
+
+    # 🥛 Grocery item matching: receipt names are matched to a user's items by canonical key,
+    # then as misspellings (same words and sizes; each differing word's edit similarity 0-1;
+    # 1 = exact keys only) through a per-process index per user
+    ITEM_MATCH_THRESHOLD: float = float(os.getenv("ITEM_MATCH_THRESHOLD", "0.8"))
+    ITEM_INDEX_TTL_SECONDS: int = int(os.getenv("ITEM_INDEX_TTL_SECONDS", "300"))
+    ITEM_INDEX_MAX_USERS: int = int(os.getenv("ITEM_INDEX_MAX_USERS", "256"))
+
+    # 📮 Response cache for per-user GET lists and profiles (memory | redis | none).
+    # memory is per worker (other workers and instances serve stale lists until the TTL);
+    # redis is shared, and without RESPONSE_CACHE_REDIS_URL runs against an in-process stand-in.
+    # Off unless a shared Redis is configured.
+    RESPONSE_CACHE_BACKEND: str = os.getenv(
+        "RESPONSE_CACHE_BACKEND", "redis" if os.getenv("RESPONSE_CACHE_REDIS_URL") else "none"
+    ).lower()
+    RESPONSE_CACHE_REDIS_URL: str = os.getenv("RESPONSE_CACHE_REDIS_URL", "")
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "4096"))
+
+    # 🔄 Delta sync API: changes younger than SYNC_SETTLE_SECONDS wait for the next sync, so a
+    # transaction still committing (or a worker clock slightly behind) cannot land behind a client's
+    # token. Tokens older than the tombstone retention must sync from scratch.
+    SYNC_SETTLE_SECONDS: int = int(os.getenv("SYNC_SETTLE_SECONDS", "10"))
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+    # ⏳ Asynchronous receipt jobs (inprocess | sqs)
+    RECEIPT_JOB_QUEUE: str = os.getenv("RECEIPT_JOB_QUEUE", "inprocess").lower()
+    RECEIPT_JOB_WORKERS: int = int(os.getenv("RECEIPT_JOB_WORKERS", "2"))
+    RECEIPT_JOB_MAX_ATTEMPTS: int = int(os.getenv("RECEIPT_JOB_MAX_ATTEMPTS", "3"))
+    RECEIPT_JOB_STALE_SECONDS: int = int(os.getenv("RECEIPT_JOB_STALE_SECONDS", "300"))
+    RECEIPT_JOB_RETRY_DELAY_SECONDS: int = int(os.getenv("RECEIPT_JOB_RETRY_DELAY_SECONDS", "15"))
+    RECEIPT_JOB_SQS_URL: str = os.getenv("RECEIPT_JOB_SQS_URL", "")
+    RECEIPT_JOB_SQS_ENDPOINT: str = os.getenv("RECEIPT_JOB_SQS_ENDPOINT", "")
+
+    # 📈 Observability
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+    # Pipeline spans: none (metrics only) | otel (OpenTelemetry API; install and configure the SDK/exporter)
+    TRACER: str = os.getenv("TRACER", "none").lower()
+
     # 🌐 Environment
     ENV: str = os.getenv("ENV", "development")
 
@@ -0,0 +1,119 @@
+"""
+Analytics DTOs
+Request and response shapes for the spending analytics endpoints. Every
+response is an aggregate computed by the database, never raw rows.
+"""
+
+# --- Standard library imports ---
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+DEFAULT_TOP_N = 10
+MAX_TOP_N = 100
+
+
+@dataclass
+class AnalyticsQueryDTO:
+    """
+    Filters shared by the analytics queries.
+
+    Attributes:
+        date_from (date | None): Inclusive lower bound on the expense/purchase date.
+        date_to (date | None): Inclusive upper bound on the expense/purchase date.
+        limit (int): Maximum rows for ranked results (stores, top items).
+    """
+
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    limit: int = DEFAULT_TOP_N
+
+
+@dataclass
+class CategoryMonthTotalDTO:
+    """
+    Spend of one category in one month.
+
+    Attributes:
+        month (str): Calendar month, ``YYYY-MM``.
+        category_id (int): Category identifier.
+        category_name (str | None): Category name (None if the category was deleted).
+        total (float): Sum of expense amounts.
+        expense_count (int): Number of expenses.
+    """
+
+    month: str
+    category_id: int
+    category_name: Optional[str]
+    total: float
+    expense_count: int
+
+
+@dataclass
+class StoreTotalDTO:
+    """
+    Spend at one store.
+
+    Attributes:
+        store_name (str | None): Store name; None groups expenses without one.
+        total (float): Sum of expense amounts.
+        expense_count (int): Number of expenses.
+    """
+
+    store_name: Optional[str]
+    total: float
+    expense_count: int
+
+
+@dataclass
+class LocalShareDTO:
+    """
+    Grocery spend split by origin (``Grocery.local``).
+
+    Attributes:
+        local_total (float): Spend on items marked local.
+        imported_total (float): Spend on items marked imported.
+        unknown_total (float): Spend on items whose origin was not extracted.
+        local_share (float | None): local / (local + imported); None when neither is known.
+    """
+
+    local_total: float = 0.0
+    imported_total: float = 0.0
+    unknown_total: float = 0.0
+    local_share: Optional[float] = None
+
+
+@dataclass
+class TopItemDTO:
+    """
+    One grocery item ranked by total cost.
+
+    Attributes:
+        item_name (str): Item name.
+        total_cost (float): Sum of line totals.
+        quantity (float): Sum of quantities.
+        purchase_count (int): Number of grocery lines.
+    """
+
+    item_name: str
+    total_cost: float
+    quantity: float
+    purchase_count: int
+
+
+@dataclass
+class AnalyticsSummaryDTO:
+    """
+    Everything a dashboard needs in one response.
+
+    Attributes:
+        category_months (list[CategoryMonthTotalDTO]): Spend per category per month.
+        stores (list[StoreTotalDTO]): Top stores by spend.
+        local_share (LocalShareDTO): Local vs imported grocery spend.
+        top_items (list[TopItemDTO]): Top items by total cost.
+    """
+
+    category_months: List[CategoryMonthTotalDTO] = field(default_factory=list)
+    stores: List[StoreTotalDTO] = field(default_factory=list)
+    local_share: LocalShareDTO = field(default_factory=LocalShareDTO)
+    top_items: List[TopItemDTO] = field(default_factory=list)
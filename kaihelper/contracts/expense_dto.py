@@ -7,6 +7,8 @@ Data Transfer Object representing an expense entry for API and business layers.
 from dataclasses import dataclass
 from datetime import date
 
+from kaihelper.contracts.grocery_dto import GroceryDTO
+
 
 @dataclass
 class ExpenseDTO:
@@ -36,6 +38,8 @@ class ExpenseDTO:
         discount_amount (float | None): Discount applied to the total.
         due_date (date | None): Optional due date (for bill/invoice expenses).
         suggestion (str | None): AI-provided categorization or budgeting hint.
+        category_name (str | None): Name of the linked category (read-only).
+        groceries (list[GroceryDTO] | None): Line items; only loaded when requested (include=groceries).
     """
     expense_id: int | None = None
     user_id: int = 0
@@ -59,4 +63,5 @@ class ExpenseDTO:
     discount_amount: float | None = None
     due_date: date | None = None
     suggestion: str | None = None
-    category_name: str | None = None
\ No newline at end of file
+    category_name: str | None = None
+    groceries: list[GroceryDTO] | None = None
\ No newline at end of file
@@ -4,9 +4,9 @@ Data Transfer Object representing grocery item details for budgeting and receipt
 """
 
 # --- Standard library imports ---
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -42,3 +42,83 @@ class GroceryDTO:
     receipt_image: Optional[str] = None
     total_cost: Optional[float] = None
     local: Optional[bool] = None
+
+
+DEFAULT_PRICE_POINTS = 500
+MAX_PRICE_POINTS = 5000
+
+
+@dataclass
+class PriceHistoryQueryDTO:
+    """
+    Filters for a grocery item's price history.
+
+    Attributes:
+        date_from (date | None): Inclusive lower bound on the purchase date.
+        date_to (date | None): Inclusive upper bound on the purchase date.
+        store_name (str | None): Only purchases at this store.
+        limit (int): Maximum price points returned (the most recent ones).
+    """
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    store_name: Optional[str] = None
+    limit: int = DEFAULT_PRICE_POINTS
+
+
+@dataclass
+class PricePointDTO:
+    """
+    One purchase of an item.
+
+    Attributes:
+        purchase_date (date): Date of the purchase.
+        store_name (str | None): Store it was bought at.
+        unit_price (float): Price per unit paid.
+        quantity (float): Quantity bought.
+        total_cost (float): Line total.
+        expense_id (int | None): Receipt-level expense the line belongs to.
+    """
+    purchase_date: date
+    store_name: Optional[str]
+    unit_price: float
+    quantity: float
+    total_cost: float
+    expense_id: Optional[int] = None
+
+
+@dataclass
+class StorePriceDTO:
+    """
+    Unit-price statistics of an item at one store over the queried range.
+
+    Attributes:
+        store_name (str | None): Store name; None groups purchases without one.
+        purchase_count (int): Number of purchases.
+        min_unit_price (float): Lowest unit price paid.
+        max_unit_price (float): Highest unit price paid.
+        avg_unit_price (float): Mean unit price.
+        last_purchase_date (date): Most recent purchase.
+    """
+    store_name: Optional[str]
+    purchase_count: int
+    min_unit_price: float
+    max_unit_price: float
+    avg_unit_price: float
+    last_purchase_date: date
+
+
+@dataclass
+class PriceHistoryDTO:
+    """
+    Price time series of one grocery item.
+
+    Attributes:
+        grocery_id (int): Item identifier.
+        item_name (str): Item name.
+        points (list[PricePointDTO]): Purchases, oldest first.
+        stores (list[StorePriceDTO]): Per-store statistics, cheapest average first.
+    """
+    grocery_id: int
+    item_name: str
+    points: List[PricePointDTO] = field(default_factory=list)
+    stores: List[StorePriceDTO] = field(default_factory=list)
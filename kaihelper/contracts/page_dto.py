@@ -0,0 +1,63 @@
+"""
+Page DTOs
+Request and response shapes for keyset-paginated list endpoints.
+"""
+
+# --- Standard library imports ---
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class PageQueryDTO:
+    """
+    Parameters of one list page.
+
+    Attributes:
+        limit (int | None): Maximum rows in the page (1..MAX_PAGE_SIZE); None returns
+            every matching row in one response (the unpaginated list older clients expect).
+        cursor (str | None): Opaque ``next_cursor`` of the previous page; None for the first page.
+        date_from (date | None): Inclusive lower bound on the list's date column.
+        date_to (date | None): Inclusive upper bound on the list's date column.
+        fields (list[str] | None): Columns to return; None returns every field.
+        include (list[str] | None): Related collections to embed (e.g. ``groceries``).
+    """
+
+    limit: Optional[int] = DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    fields: Optional[List[str]] = None
+    include: Optional[List[str]] = None
+
+    @staticmethod
+    def parse_list(raw: Optional[str]) -> Optional[List[str]]:
+        """Split a comma-separated query value (``fields=a,b,c``); blank means not given."""
+        if not raw or not raw.strip():
+            return None
+        return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def page_size(limit: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """Page size of a list request: None (the full list) only when neither limit nor cursor is given."""
+    if limit is None and cursor:
+        return DEFAULT_PAGE_SIZE
+    return limit
+
+
+@dataclass
+class PageDTO:
+    """
+    One page of a keyset-paginated list, newest first.
+
+    Attributes:
+        items (list[dict]): Rows restricted to the requested fields.
+        next_cursor (str | None): Cursor for the following page; None on the last page.
+    """
+
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    next_cursor: Optional[str] = None
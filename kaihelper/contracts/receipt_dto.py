@@ -4,11 +4,16 @@ Defines data structures for receipt extraction and upload responses.
 """
 
 # --- Standard library imports ---
+from dataclasses import dataclass, field
 from typing import List, Optional
 from datetime import date
 # --- Third-party imports ---
 from pydantic import BaseModel, Field
 
+# --- First-party imports ---
+from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO
+
 
 class ExtractedItemDTO(BaseModel):
     """
@@ -64,3 +69,33 @@ class ReceiptUploadResponseDTO(BaseModel):
     total_amount: float = Field(..., description="Final total amount from receipt")
     suggestion: Optional[str] = Field(None, description="AI suggestion for tagging or budgeting")
     items: List[ExtractedItemDTO] = Field(..., description="List of items parsed from receipt")
+
+
+@dataclass
+class SavedReceiptDTO:
+    """
+    Represents the rows written by a single unit-of-work receipt save.
+
+    Attributes:
+        category_id (int | None): Resolved (or newly created) category ID.
+        expense (ExpenseDTO): Receipt-level expense that was inserted or merged.
+        groceries (list[GroceryDTO]): Grocery rows inserted or updated under the expense.
+    """
+    category_id: Optional[int] = None
+    expense: Optional[ExpenseDTO] = None
+    groceries: List[GroceryDTO] = field(default_factory=list)
+
+
+@dataclass
+class ReceiptExtractionDTO:
+    """
+    Represents the raw output of a receipt extraction engine.
+
+    Attributes:
+        data (dict): Parsed receipt in the vision-prompt JSON shape (store_name, items, total_amount, ...).
+        confidence (float): Engine's confidence in ``data`` between 0.0 and 1.0.
+        engine (str): Name of the engine that produced ``data``.
+    """
+    data: dict = field(default_factory=dict)
+    confidence: float = 0.0
+    engine: str = ""
@@ -0,0 +1,38 @@
+"""
+ReceiptJobDTO
+Data Transfer Object describing the state of an asynchronous receipt job.
+"""
+
+# --- Standard library imports ---
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+
+@dataclass
+class ReceiptJobDTO:
+    """
+    Represents a receipt ingestion job as reported to API clients.
+
+    Attributes:
+        job_id (str): Unique job identifier used for status polling.
+        user_id (int): Owner of the uploaded receipt.
+        status (str): queued | running | succeeded | failed.
+        attempts (int): How many times a worker has picked up the job.
+        result (Any | None): Parsed receipt summary once the job succeeded.
+        error (str | None): Failure reason once the job failed.
+        created_at (datetime | None): When the job was queued.
+        updated_at (datetime | None): Last state change.
+        started_at (datetime | None): When the latest attempt started.
+        finished_at (datetime | None): When the job reached a final state.
+    """
+    job_id: str = ""
+    user_id: int = 0
+    status: str = "queued"
+    attempts: int = 0
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,68 @@
+"""
+Search DTOs
+Request and response shapes for full-text search over expenses and groceries.
+"""
+
+# --- Standard library imports ---
+from dataclasses import dataclass, field
+from datetime import date
+from typing import List, Optional
+
+SEARCH_TYPES = ("expense", "grocery")
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+@dataclass
+class SearchQueryDTO:
+    """
+    One page of a search.
+
+    Attributes:
+        q (str): Words to find; every word must match (as a prefix: "coff" finds "coffee").
+        types (list[str] | None): Document types to search (SEARCH_TYPES); None searches all.
+        limit (int): Maximum hits in the page (1..MAX_SEARCH_LIMIT).
+        cursor (str | None): ``next_cursor`` of the previous page; None for the first page.
+    """
+
+    q: str
+    types: Optional[List[str]] = None
+    limit: int = DEFAULT_SEARCH_LIMIT
+    cursor: Optional[str] = None
+
+
+@dataclass
+class SearchHitDTO:
+    """
+    One matching expense or grocery item.
+
+    Attributes:
+        type (str): ``expense`` or ``grocery``.
+        id (int): ``expense_id`` or ``grocery_id``.
+        date (date | None): Expense date, or the item's last purchase date.
+        title (str): Store name (expense) or item name (grocery).
+        text (str): The other indexed text: description, notes, receipt number and
+            items on the receipt (expense); canonical name and notes (grocery).
+        score (float): Relevance, higher is better (0 where the database cannot rank).
+    """
+
+    type: str
+    id: int
+    date: Optional[date]
+    title: str
+    text: str
+    score: float
+
+
+@dataclass
+class SearchPageDTO:
+    """
+    Hits ranked best first.
+
+    Attributes:
+        hits (list[SearchHitDTO]): Hits of this page.
+        next_cursor (str | None): Cursor for the following page; None on the last page.
+    """
+
+    hits: List[SearchHitDTO] = field(default_factory=list)
+    next_cursor: Optional[str] = None
@@ -0,0 +1,60 @@
+"""
+Sync DTOs
+Request and response shapes for the mobile client's delta sync.
+"""
+
+# --- Standard library imports ---
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+
+@dataclass
+class SyncQueryDTO:
+    """
+    One batch of a delta sync.
+
+    Attributes:
+        since (str | None): ``next_token`` of the previous batch; None for a full sync.
+        limit (int): Maximum rows per stream (expenses, groceries, deletions) in the batch.
+    """
+
+    since: Optional[str] = None
+    limit: int = DEFAULT_SYNC_LIMIT
+
+
+@dataclass
+class SyncTableDTO:
+    """
+    Changed rows of one table, as positional rows under a shared column list.
+
+    Attributes:
+        columns (list[str]): Column names, in row order.
+        rows (list[list]): One list of values per created or updated row, oldest change first.
+    """
+
+    columns: List[str] = field(default_factory=list)
+    rows: List[List[Any]] = field(default_factory=list)
+
+
+@dataclass
+class SyncBatchDTO:
+    """
+    Changes since the client's token.
+
+    Attributes:
+        expenses (SyncTableDTO): Created or updated expenses.
+        groceries (SyncTableDTO): Created or updated grocery items.
+        deleted (dict[str, list[int]]): IDs of deleted ``expenses`` and ``groceries``;
+            clients apply them before the upserts.
+        next_token (str): Token for the next call.
+        has_more (bool): True when the next call should follow straight away.
+    """
+
+    expenses: SyncTableDTO
+    groceries: SyncTableDTO
+    deleted: Dict[str, List[int]]
+    next_token: str
+    has_more: bool = False
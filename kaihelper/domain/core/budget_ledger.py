@@ -0,0 +1,150 @@
+"""
+Budget balance adjustments.
+
+Expense writes charge (or refund) the budget covering the expense date inside
+their own session, so the balance moves in the same transaction as the
+expense. The change is one conditional UPDATE:
+
+    UPDATE budgets SET remaining_balance = remaining_balance - :amount
+    WHERE budget_id = :id AND remaining_balance >= :amount
+
+The database applies it to the current row under its write lock, so
+concurrent writers never lose each other's updates and never overdraw.
+
+The budget an expense belongs to is the newest one whose period covers the
+expense date, found through ``ix_budgets_user_dates``. Most expenses are
+dated today, so each user's answer for a date is kept in ``current_budgets``
+(only the budget ID and period; the balance is always read and written in
+SQL). ``BudgetRepository`` invalidates a user's entry on every budget write.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update
+
+from kaihelper.config.settings import settings
+from kaihelper.domain.models.budget import Budget
+
+
+class InsufficientBudget(Exception):
+    """Raised inside a unit of work when a charge would overdraw the budget; the caller rolls back."""
+
+
+def covering_budgets_query(user_id: int, on_date: date):
+    """SELECT of the user's budgets whose period contains ``on_date``, newest first."""
+    return (
+        select(Budget)
+        .where(Budget.user_id == user_id, Budget.start_date <= on_date, Budget.end_date >= on_date)
+        .order_by(Budget.budget_id.desc())
+    )
+
+
+class CurrentBudgetCache:
+    """
+    Thread-safe, size-bounded map of ``user_id -> (date, budget_id | None)``.
+
+    One entry per user: the covering budget for the last date looked up.
+    Entries expire after ``ttl_seconds`` so budgets created by other
+    processes are picked up.
+    """
+
+    def __init__(self, ttl_seconds: int, max_users: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[date, Optional[int], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, on_date: date) -> Tuple[bool, Optional[int]]:
+        """Return ``(found, budget_id)``; ``budget_id`` may be None for "no budget"."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] != on_date or time.monotonic() - entry[2] > self.ttl_seconds:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, user_id: int, on_date: date, budget_id: Optional[int]) -> None:
+        if self.ttl_seconds <= 0 or self.max_users <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (on_date, budget_id, time.monotonic())
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget a user's entry (after any write to their budgets)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+current_budgets = CurrentBudgetCache(settings.BUDGET_CACHE_TTL_SECONDS, settings.BUDGET_CACHE_MAX_USERS)
+
+
+def covering_budget_id(db_session, user_id: int, on_date: date) -> Optional[int]:
+    """
+    The budget an expense on ``on_date`` is charged to: the user's newest
+    budget whose period covers the date (cached per user).
+
+    Returns:
+        int | None: Budget ID, or None when no budget applies.
+    """
+    found, budget_id = current_budgets.get(user_id, on_date)
+    if found:
+        return budget_id
+    budget_id = db_session.execute(
+        covering_budgets_query(user_id, on_date).with_only_columns(Budget.budget_id).limit(1)
+    ).scalar()
+    current_budgets.put(user_id, on_date, budget_id)
+    return budget_id
+
+
+def charge_budget(db_session, user_id: int, on_date: date, amount: float) -> bool:
+    """
+    Atomically subtract ``amount`` (negative to refund) from the budget covering ``on_date``.
+
+    Args:
+        db_session: Session writing the expense (not committed here).
+        user_id (int): Budget owner.
+        on_date (date): Expense date.
+        amount (float): Amount to charge; refunds are never refused.
+
+    Returns:
+        bool: True if a budget was adjusted, False if none covers the date.
+
+    Raises:
+        InsufficientBudget: The charge exceeds the remaining balance.
+    """
+    budget_id = covering_budget_id(db_session, user_id, on_date)
+    if budget_id is None:
+        return False
+    if not amount:
+        return True
+
+    stmt = (
+        update(Budget)
+        .where(Budget.budget_id == budget_id)
+        .values(remaining_balance=Budget.remaining_balance - amount)
+        .execution_options(synchronize_session=False)
+    )
+    if amount > 0:
+        stmt = stmt.where(Budget.remaining_balance >= amount)
+    if db_session.execute(stmt).rowcount == 0:
+        raise InsufficientBudget()
+    return True
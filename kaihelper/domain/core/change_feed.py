@@ -0,0 +1,208 @@
+"""
+Change feed behind the delta sync API.
+
+A sync token records how far a client has read three per-user streams, each
+ordered by a timestamp and the row's primary key:
+
+* ``expenses`` and ``groceries`` by ``(updated_at, id)``: every write stamps
+  ``updated_at`` with the server's clock (see the mappers);
+* ``deleted`` (``sync_tombstones``) by ``(deleted_at, tombstone_id)``: every
+  delete records a tombstone in its own transaction (``record_deletions``).
+
+Each stream is one range scan on a ``(user_id, timestamp, id)`` index, so a
+sync reads the rows changed since the token and nothing older, however long
+the user's history.
+
+A sync round stops at a horizon, ``now - SYNC_SETTLE_SECONDS``: rows stamped
+later wait for the next round, by which time every transaction that stamped
+an earlier time has committed. A round is served in batches; the token of an
+unfinished round carries its horizon and each stream's position, the token of
+a finished round only the horizon (the next round reads strictly after it).
+
+Tombstones older than ``SYNC_TOMBSTONE_RETENTION_DAYS`` can be pruned (tokens
+that old must sync from scratch):
+
+    python -m kaihelper.domain.core.change_feed prune [--days 90]
+"""
+
+import argparse
+import base64
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, or_, select
+
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.sync_tombstone import SyncTombstone
+
+EXPENSE = "expense"
+GROCERY = "grocery"
+
+EXPENSES = "expenses"
+GROCERIES = "groceries"
+DELETED = "deleted"
+STREAMS = (EXPENSES, GROCERIES, DELETED)
+
+# (timestamp, id): after that row; (timestamp, None): strictly after the timestamp
+Position = Tuple[datetime, Optional[int]]
+
+# Columns sent to clients: the owner is implied and the canonical item key is internal
+_HIDDEN = {"user_id", "canonical_name"}
+
+
+@dataclass(frozen=True)
+class _Stream:
+    table: object
+    timestamp: object
+    row_id: object
+    user_id: object
+
+
+_STREAMS: Dict[str, _Stream] = {
+    EXPENSES: _Stream(Expense.__table__, Expense.updated_at, Expense.expense_id, Expense.user_id),
+    GROCERIES: _Stream(Grocery.__table__, Grocery.updated_at, Grocery.grocery_id, Grocery.user_id),
+    DELETED: _Stream(SyncTombstone.__table__, SyncTombstone.deleted_at, SyncTombstone.tombstone_id,
+                     SyncTombstone.user_id),
+}
+
+
+def stream_columns(stream: str) -> List[str]:
+    """Column names sent for a row stream (``expenses`` / ``groceries``), in table order."""
+    return [column.name for column in _STREAMS[stream].table.columns if column.name not in _HIDDEN]
+
+
+@dataclass
+class SyncToken:
+    """
+    Decoded sync token.
+
+    Attributes:
+        horizon (datetime): Upper bound of the round (inclusive).
+        positions (dict[str, Position | None] | None): Per-stream position within
+            an unfinished round (None = from the beginning); None once the round is finished.
+    """
+
+    horizon: datetime
+    positions: Optional[Dict[str, Optional[Position]]] = None
+
+    def encode(self) -> str:
+        """Opaque, URL-safe form of the token."""
+        raw: dict = {"h": self.horizon.isoformat()}
+        if self.positions is not None:
+            raw["p"] = {
+                name: None if position is None else [position[0].isoformat(), position[1]]
+                for name, position in self.positions.items()
+            }
+        return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "SyncToken":
+        """
+        Inverse of ``encode``.
+
+        Raises:
+            ValueError: If the token was not produced by ``encode``.
+        """
+        try:
+            raw = json.loads(base64.urlsafe_b64decode((token + "=" * (-len(token) % 4)).encode()))
+            horizon = datetime.fromisoformat(raw["h"])
+            positions = None
+            if "p" in raw:
+                positions = {}
+                for name in STREAMS:
+                    value = raw["p"][name]
+                    positions[name] = None if value is None else (
+                        datetime.fromisoformat(value[0]), None if value[1] is None else int(value[1]),
+                    )
+            return cls(horizon, positions)
+        except (ValueError, TypeError, KeyError, AttributeError, IndexError) as err:
+            raise ValueError("Invalid sync token.") from err
+
+
+def record_deletions(db, entity_type: str, user_id: int, entity_ids: Iterable[int]) -> None:
+    """Write tombstones for deleted expenses or grocery items, within ``db``'s transaction."""
+    now = datetime.now()
+    rows = [
+        {"user_id": user_id, "entity_type": entity_type, "entity_id": entity_id, "deleted_at": now}
+        for entity_id in entity_ids
+    ]
+    if rows:
+        db.execute(insert(SyncTombstone), rows)
+
+
+def read_stream(db, stream: str, user_id: int, after: Optional[Position], horizon: datetime, limit: int):
+    """
+    Rows of one stream after ``after`` and up to ``horizon``, oldest first.
+
+    ``(ts, id) > (t, i)`` is spelled ``ts >= t AND (ts > t OR id > i)`` so it
+    stays one ordered range scan on the ``(user_id, ts, id)`` index (see
+    ``pagination.keyset_filters``).
+
+    Returns:
+        list[Row]: At most ``limit`` rows; each carries every table column.
+    """
+    spec = _STREAMS[stream]
+    stmt = select(spec.table).where(spec.user_id == user_id, spec.timestamp <= horizon)
+    if after is not None:
+        timestamp, row_id = after
+        if row_id is None:
+            stmt = stmt.where(spec.timestamp > timestamp)
+        else:
+            stmt = stmt.where(spec.timestamp >= timestamp, or_(spec.timestamp > timestamp, spec.row_id > row_id))
+    return db.execute(stmt.order_by(spec.timestamp, spec.row_id).limit(limit)).all()
+
+
+def row_position(stream: str, row) -> Position:
+    """Stream position just after ``row``."""
+    spec = _STREAMS[stream]
+    mapping = row._mapping
+    return mapping[spec.timestamp.key], mapping[spec.row_id.key]
+
+
+def reused_ids(db, entity_type: str, entity_ids: Iterable[int]) -> set:
+    """
+    IDs among ``entity_ids`` that belong to a live row again.
+
+    SQLite can hand a deleted row's ID to the next insert; that row's upsert
+    replaces the client's copy, so its tombstone must not be applied.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return set()
+    spec = _STREAMS[EXPENSES if entity_type == EXPENSE else GROCERIES]
+    return set(db.execute(select(spec.row_id).where(spec.row_id.in_(entity_ids))).scalars())
+
+
+def prune_tombstones(db, before: datetime) -> int:
+    """Delete tombstones recorded before ``before``; returns the count removed."""
+    return db.execute(delete(SyncTombstone).where(SyncTombstone.deleted_at < before)).rowcount or 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (``kaihelper-sync``)."""
+    from kaihelper.config.settings import settings
+
+    parser = argparse.ArgumentParser(description="KaiHelper sync change feed")
+    parser.add_argument("command", choices=("prune",))
+    parser.add_argument("--days", type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS,
+                        help="keep tombstones this many days")
+    args = parser.parse_args(argv)
+
+    from kaihelper.domain.core.database import SessionLocal
+    # Expense's and Grocery's relationships resolve by name
+    import kaihelper.domain.models.category  # noqa: F401
+    import kaihelper.domain.models.user      # noqa: F401
+
+    with SessionLocal() as db_session:
+        removed = prune_tombstones(db_session, datetime.now() - timedelta(days=args.days))
+        db_session.commit()
+    print(f"[Sync] Pruned {removed} tombstones older than {args.days} days")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
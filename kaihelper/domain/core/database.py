@@ -1,12 +1,24 @@
 """
 Database Configuration
 Supports SQLite (default) and MySQL (via PyMySQL).
+
+The engine is built by ``build_engine`` from Settings: pool sizing, recycle,
+pre-ping and connect timeout for MySQL; NullPool when an external pooler
+(e.g. RDS Proxy) owns the connections; WAL and busy-timeout pragmas for SQLite.
+Pool checkout and connect timings are collected in ``pool_metrics``; statements
+are counted per thread for the pipeline spans (``tracing``).
 """
 
 import os
-from sqlalchemy import create_engine
+import time
+from threading import Lock
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool
 from kaihelper.config.settings import settings
+from kaihelper.domain.core.tracing import record_statement
 
 if settings.DB_ENGINE == "sqlite":
     # Use file in configured dir
@@ -19,6 +31,185 @@ else:
         f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
     )
 
-engine = create_engine(DB_URL, echo=(settings.ENV == "development"), future=True)
+
+class PoolMetrics:
+    """Thread-safe counters for pool checkouts and new DBAPI connections."""
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checkout_ms_total = 0.0
+            self.checkout_ms_max = 0.0
+            self.checkins = 0
+            self.connects = 0
+            self.connect_ms_total = 0.0
+            self.invalidations = 0
+
+    def observe_checkout(self, elapsed_ms: float, failed: bool = False) -> None:
+        with self._lock:
+            if failed:
+                self.checkout_failures += 1
+                return
+            self.checkouts += 1
+            self.checkout_ms_total += elapsed_ms
+            self.checkout_ms_max = max(self.checkout_ms_max, elapsed_ms)
+
+    def observe_connect(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.connects += 1
+            self.connect_ms_total += elapsed_ms
+
+    def observe_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def observe_invalidate(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self, pool=None) -> dict:
+        """
+        Current counters, plus live pool occupancy when ``pool`` is a QueuePool.
+
+        Checkout time covers waiting for a free slot, opening a new connection
+        when needed and the pre-ping round trip.
+        """
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "checkout_ms_avg": round(self.checkout_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "checkout_ms_max": round(self.checkout_ms_max, 3),
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "connect_ms_avg": round(self.connect_ms_total / self.connects, 3) if self.connects else 0.0,
+                "invalidations": self.invalidations,
+            }
+        if pool is not None:
+            data["pool_class"] = type(pool).__name__
+            if isinstance(pool, QueuePool):
+                data.update(
+                    pool_size=pool.size(),
+                    checked_out=pool.checkedout(),
+                    checked_in=pool.checkedin(),
+                    overflow=pool.overflow(),
+                )
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+def _timed_pool(pool_class):
+    """Subclass ``pool_class`` so every checkout (including the wait for a slot) is timed."""
+
+    class TimedPool(pool_class):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except Exception:
+                pool_metrics.observe_checkout(0.0, failed=True)
+                raise
+            pool_metrics.observe_checkout((time.perf_counter() - started) * 1000)
+            return connection
+
+    TimedPool.__name__ = f"Timed{pool_class.__name__}"
+    # SQLAlchemy names pool loggers after the class; stay under ``sqlalchemy.pool``
+    TimedPool.__module__ = pool_class.__module__
+    return TimedPool
+
+
+def _instrument(db_engine: Engine) -> None:
+    """Attach connect/checkin/invalidate listeners feeding ``pool_metrics``, and the span statement counter."""
+
+    @event.listens_for(db_engine, "do_connect")
+    def _before_connect(dialect, conn_rec, cargs, cparams):  # pylint: disable=unused-argument
+        conn_rec.info["connect_started"] = time.perf_counter()
+
+    @event.listens_for(db_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+        started = connection_record.info.pop("connect_started", None)
+        pool_metrics.observe_connect((time.perf_counter() - started) * 1000 if started else 0.0)
+
+    @event.listens_for(db_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+        pool_metrics.observe_checkin()
+
+    @event.listens_for(db_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):  # pylint: disable=unused-argument
+        pool_metrics.observe_invalidate()
+
+    @event.listens_for(db_engine, "before_cursor_execute")
+    def _on_execute(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        record_statement()
+
+
+def _enable_sqlite_wal(db_engine: Engine) -> None:
+    """WAL lets readers run alongside the single writer; NORMAL sync is safe under WAL."""
+
+    @event.listens_for(db_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+
+
+def build_engine(url: str, config) -> Engine:
+    """
+    Create the SQLAlchemy engine for ``url`` from pool/logging Settings.
+
+    Args:
+        url (str): Database URL.
+        config (Settings): Application settings.
+
+    Returns:
+        Engine: Configured and instrumented engine.
+    """
+    kwargs: dict = {"echo": config.SQL_ECHO, "future": True}
+    is_sqlite = url.startswith("sqlite")
+
+    if config.DB_POOL_MODE == "null":
+        # An external pooler owns the connections; open/close per checkout
+        kwargs["poolclass"] = _timed_pool(NullPool)
+    else:
+        kwargs.update(
+            poolclass=_timed_pool(QueuePool),
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+        )
+        if not is_sqlite:
+            kwargs.update(pool_pre_ping=config.DB_POOL_PRE_PING, pool_recycle=config.DB_POOL_RECYCLE)
+
+    if is_sqlite:
+        # sqlite3's timeout is its busy handler: wait for the writer lock instead of failing
+        kwargs["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    else:
+        kwargs["connect_args"] = {"connect_timeout": config.DB_CONNECT_TIMEOUT}
+
+    db_engine = create_engine(url, **kwargs)
+    _instrument(db_engine)
+    if is_sqlite and config.SQLITE_WAL:
+        _enable_sqlite_wal(db_engine)
+    return db_engine
+
+
+def get_pool_metrics() -> dict:
+    """Pool checkout/connect metrics of the application engine."""
+    return pool_metrics.snapshot(engine.pool)
+
+
+engine = build_engine(DB_URL, settings)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
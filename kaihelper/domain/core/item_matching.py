@@ -0,0 +1,406 @@
+"""
+Grocery item-name matching.
+
+Receipts spell the same product many ways ("Pams milk 2l", "PAMS MILK 2 L",
+"Pams Mlk 2000ml"). ``canonical_item_name`` reduces a name to a key:
+
+* lowercase, accents and punctuation dropped, ``&`` -> ``and``;
+* sizes normalized (``2 L``, ``2ltr``, ``2000ml`` -> ``2l``; ``500 gm`` -> ``500g``;
+  ``6 x 330ml`` -> ``6pk 330ml``);
+* till abbreviations expanded (``mlk`` -> ``milk``, ``choc`` -> ``chocolate``,
+  ``pns`` -> ``pak n save``) and simple plurals folded.
+
+The key is stored in ``groceries.canonical_name`` (indexed with ``user_id``) for
+exact matches in SQL. Keys that differ only by typos ("pams mlik 2l") are matched
+through each user's ``ItemNameIndex``, held in memory and rebuilt from the
+persisted keys with one grouped covering-index read. A fuzzy match is
+deliberately narrow: both keys have the same number of words, sizes and other
+numbers are identical, and each differing word is a misspelling of its
+counterpart (edit similarity at least the threshold). An extra or different
+word ("coca cola" / "coca cola zero", "milk chocolate" / "dark chocolate")
+names a different product and never matches.
+
+Keys of rows written before migration 0008 are filled in by the migration;
+when it was applied as an offline script (``kaihelper-migrate upgrade --sql``)
+run the backfill afterwards:
+
+    python -m kaihelper.domain.core.item_matching backfill
+"""
+
+import argparse
+import re
+import sys
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+
+from kaihelper.config.settings import settings
+from kaihelper.domain.models.grocery import Grocery
+
+# Length of groceries.canonical_name
+MAX_KEY_LENGTH = 100
+
+# Abbreviations printed by NZ supermarket tills, and store/house-brand shorthands
+ABBREVIATIONS: Dict[str, str] = {
+    "mlk": "milk", "brd": "bread", "chkn": "chicken", "chk": "chicken", "ckn": "chicken",
+    "bf": "beef", "lmb": "lamb", "prk": "pork", "mnc": "mince", "saus": "sausage",
+    "chs": "cheese", "chz": "cheese", "btr": "butter", "yog": "yoghurt", "yogurt": "yoghurt",
+    "choc": "chocolate", "bisc": "biscuit", "org": "organic", "frsh": "fresh", "frz": "frozen",
+    "wht": "white", "whl": "wholemeal", "wml": "wholemeal", "skm": "skim", "lite": "light",
+    "veg": "vegetable", "veges": "vegetable", "tom": "tomato", "pot": "potato", "bnls": "boneless",
+    "sknls": "skinless", "fr": "free range", "ff": "free flow", "gf": "gluten free",
+    "pns": "pak n save", "paknsave": "pak n save", "ww": "woolworths", "cd": "countdown",
+    "nw": "new world", "hb": "homebrand",
+}
+
+_UNITS: Dict[str, Tuple[str, float]] = {
+    **{unit: ("ml", 1) for unit in ("ml", "mls", "millilitre", "millilitres", "milliliter", "milliliters")},
+    **{unit: ("ml", 1000) for unit in ("l", "lt", "ltr", "ltrs", "litre", "litres", "liter", "liters")},
+    **{unit: ("g", 1) for unit in ("g", "gm", "gms", "gr", "gram", "grams")},
+    **{unit: ("g", 1000) for unit in ("kg", "kgs", "kilo", "kilos")},
+    **{unit: ("pk", 1) for unit in ("pk", "pks", "pkt", "pack", "packs")},
+}
+_SIZE = re.compile(
+    r"(\d+(?:[.,]\d+)?)\s*(" + "|".join(sorted(_UNITS, key=len, reverse=True)) + r")(?![a-z])"
+)
+_MULTIPACK = re.compile(r"(\d+)\s*x\s*(?=\d)")
+_TOKEN = re.compile(r"[a-z]+|\d+(?:\.\d+)?[a-z]*")
+
+
+def _size_token(amount: str, unit: str) -> str:
+    base_unit, factor = _UNITS[unit]
+    value = float(amount.replace(",", ".")) * factor
+    if base_unit == "pk":
+        return f"{value:g}pk"
+    if value >= 1000:
+        return f"{value / 1000:g}{'l' if base_unit == 'ml' else 'kg'}"
+    return f"{value:g}{base_unit}"
+
+
+def _fold_plural(token: str) -> str:
+    if len(token) > 4 and token.endswith("oes"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def canonical_item_name(name: str) -> str:
+    """
+    Matching key of an item name.
+
+    Args:
+        name (str): Item name as extracted from a receipt or typed by the user.
+
+    Returns:
+        str: Space-separated canonical tokens (the lowercased text for a name
+        without letters or digits, '' for a blank one).
+    """
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode("ascii").lower()
+    text = text.replace("&", " and ").replace("'", "").replace("’", "")
+    text = _MULTIPACK.sub(lambda match: f"{match.group(1)}pk ", text)
+    text = _SIZE.sub(lambda match: " " + _size_token(match.group(1), match.group(2)) + " ", text)
+    tokens = []
+    for token in _TOKEN.findall(text):
+        if token[0].isdigit():
+            tokens.append(token)
+            continue
+        tokens.extend(ABBREVIATIONS.get(token, _fold_plural(token)).split())
+    key = " ".join(tokens) or " ".join(text.split())
+    return key[:MAX_KEY_LENGTH].rstrip()
+
+
+def trigrams(key: str) -> FrozenSet[str]:
+    """Word trigrams of a canonical key, each word padded like ``pg_trgm`` ("  w ")."""
+    grams: Set[str] = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _sizes(key: str) -> FrozenSet[str]:
+    return frozenset(token for token in key.split() if token[0].isdigit())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance: insertions, deletions, substitutions and adjacent swaps."""
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[len(b)]
+
+
+def typo_similarity(words: Sequence[str], other: Sequence[str], threshold: float) -> Optional[float]:
+    """
+    Similarity of two canonical keys (as word lists) that differ only by misspellings.
+
+    Words are compared position by position; each pair must be equal or, for
+    words without digits, have an edit similarity (``1 - distance / longer length``)
+    of at least ``threshold``.
+
+    Returns:
+        float | None: Mean word similarity, or None when the word counts differ
+        or any word pair falls below ``threshold``.
+    """
+    if len(words) != len(other):
+        return None
+    total = 0.0
+    for word, candidate in zip(words, other):
+        if word == candidate:
+            total += 1.0
+            continue
+        if word[0].isdigit() or candidate[0].isdigit():
+            return None
+        longest = max(len(word), len(candidate))
+        if abs(len(word) - len(candidate)) > (1 - threshold) * longest:
+            return None
+        score = 1 - edit_distance(word, candidate) / longest
+        if score < threshold:
+            return None
+        total += score
+    return total / len(words)
+
+
+class ItemNameIndex:
+    """
+    Index over one user's canonical item names.
+
+    ``match`` returns the exact key, or else the best item for which
+    ``typo_similarity`` reaches the threshold. Postings are partitioned by
+    shape (size signature and word count: only same-shape items can match)
+    and hold each word's trigrams by position. An edit changes at most four
+    trigrams of a word, so a word within ``e`` edits shares one of any
+    ``4e + 1`` of the query word's trigrams: candidates are the items that do
+    so, using the rarest trigrams, at every position.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        # shape -> word position -> trigram -> keys
+        self._postings: Dict[Tuple[FrozenSet[str], int], List[Dict[str, Set[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, grocery_id: int, key: str) -> None:
+        """Index ``key`` for ``grocery_id``; a key keeps its oldest (lowest) grocery ID."""
+        if not key:
+            return
+        with self._lock:
+            current = self._ids.get(key)
+            if current is not None:
+                self._ids[key] = min(current, grocery_id)
+                return
+            words = tuple(key.split())
+            self._ids[key] = grocery_id
+            self._words[key] = words
+            positions = self._postings.setdefault(
+                (_sizes(key), len(words)), [{} for _ in words],
+            )
+            for position, word in enumerate(words):
+                for gram in trigrams(word):
+                    positions[position].setdefault(gram, set()).add(key)
+
+    def match(self, key: str, threshold: float) -> Optional[Tuple[int, str, float]]:
+        """
+        Best indexed item for ``key``.
+
+        Returns:
+            tuple[int, str, float] | None: ``(grocery_id, indexed key, similarity)``,
+            or None when no item is the same key or a misspelling of it.
+        """
+        if not key:
+            return None
+        with self._lock:
+            if (grocery_id := self._ids.get(key)) is not None:
+                return grocery_id, key, 1.0
+            words = key.split()
+            positions = self._postings.get((_sizes(key), len(words)))
+            if not positions or not 0 < threshold < 1:
+                return None
+            # Per position, the items sharing one of the word's rarest 4e + 1 trigrams
+            # (e = most edits allowed); a match is in every position's set
+            sets: List[Set[str]] = []
+            for word, postings in zip(words, positions):
+                edits = int((1 - threshold) * len(word) / threshold)
+                grams = sorted(trigrams(word), key=lambda gram: len(postings.get(gram, ())))
+                found: Set[str] = set()
+                for gram in grams[:4 * edits + 1]:
+                    found.update(postings.get(gram, ()))
+                sets.append(found)
+            sets.sort(key=len)
+            candidates = sets[0].intersection(*sets[1:])
+
+            best: Optional[Tuple[int, str, float]] = None
+            for candidate in candidates:
+                score = typo_similarity(words, self._words[candidate], threshold)
+                if score is not None and (best is None or score > best[2]):
+                    best = (self._ids[candidate], candidate, score)
+            return best
+
+
+class ItemIndexCache:
+    """
+    Per-process, size-bounded map of ``user_id -> ItemNameIndex``.
+
+    An index is loaded from ``groceries.canonical_name`` on first use and
+    reloaded after ``ttl_seconds`` (so items written by other processes are
+    picked up). Writers in this process add their new items; deletes and
+    renames invalidate the user's index.
+    """
+
+    def __init__(self, ttl_seconds: int, max_users: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, Tuple[ItemNameIndex, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.lookups = 0
+        self.fuzzy_matches = 0
+
+    def get(self, db_session, user_id: int) -> ItemNameIndex:
+        """The user's index, loading it with ``db_session`` when missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() - entry[1] <= self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+
+        index = ItemNameIndex()
+        rows = db_session.execute(
+            select(func.min(Grocery.grocery_id), Grocery.canonical_name)
+            .where(Grocery.user_id == user_id, Grocery.canonical_name.is_not(None))
+            .group_by(Grocery.canonical_name)
+        ).all()
+        for grocery_id, key in rows:
+            index.add(grocery_id, key)
+
+        with self._lock:
+            self.loads += 1
+            if self.ttl_seconds > 0 and self.max_users > 0:
+                self._entries[user_id] = (index, time.monotonic())
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_users:
+                    self._entries.popitem(last=False)
+        return index
+
+    def match(self, db_session, user_id: int, key: str,
+              threshold: Optional[float] = None) -> Optional[Tuple[int, str]]:
+        """
+        The user's item matching ``key`` exactly or fuzzily.
+
+        Callers load the row and check its ``canonical_name`` against the
+        returned key: a mismatch means the index is stale (the item was renamed
+        or deleted elsewhere, or its insert rolled back) and should be invalidated.
+
+        Returns:
+            tuple[int, str] | None: ``(grocery_id, indexed key)``, or None.
+        """
+        found = self.get(db_session, user_id).match(
+            key, settings.ITEM_MATCH_THRESHOLD if threshold is None else threshold,
+        )
+        with self._lock:
+            self.lookups += 1
+            if found is not None and found[2] < 1.0:
+                self.fuzzy_matches += 1
+        return found[:2] if found else None
+
+    def add(self, user_id: int, items: Iterable[Tuple[int, str]]) -> None:
+        """Record ``(grocery_id, key)`` pairs written by this process (if the user's index is loaded)."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry is not None:
+            for grocery_id, key in items:
+                entry[0].add(grocery_id, key)
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget a user's index (after a rename or delete)."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._entries),
+                "items": sum(len(index) for index, _ in self._entries.values()),
+                "loads": self.loads,
+                "lookups": self.lookups,
+                "fuzzy_matches": self.fuzzy_matches,
+            }
+
+
+item_indexes = ItemIndexCache(settings.ITEM_INDEX_TTL_SECONDS, settings.ITEM_INDEX_MAX_USERS)
+
+
+def backfill_canonical_names(db_session, batch_size: int = 1000) -> int:
+    """
+    Set ``canonical_name`` on grocery rows that have none; returns the count updated.
+
+    Rows are read in primary-key order, ``batch_size`` at a time, and updated
+    with one executemany statement per batch.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        rows = db_session.execute(
+            select(Grocery.grocery_id, Grocery.item_name)
+            .where(Grocery.canonical_name.is_(None), Grocery.grocery_id > last_id)
+            .order_by(Grocery.grocery_id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return updated
+        params = [
+            {"row_id": grocery_id, "key": canonical_item_name(item_name) or None}
+            for grocery_id, item_name in rows
+        ]
+        db_session.connection().execute(
+            update(Grocery.__table__)
+            .where(Grocery.__table__.c.grocery_id == bindparam("row_id"))
+            .values(canonical_name=bindparam("key")),
+            params,
+        )
+        updated += len(rows)
+        last_id = rows[-1][0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (``kaihelper-item-names``)."""
+    parser = argparse.ArgumentParser(description="KaiHelper grocery item-name keys")
+    parser.add_argument("command", choices=("backfill",))
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    from kaihelper.domain.core.database import SessionLocal
+    # Grocery's relationships resolve by name
+    import kaihelper.domain.models.category  # noqa: F401
+    import kaihelper.domain.models.expense   # noqa: F401
+    import kaihelper.domain.models.user      # noqa: F401
+
+    with SessionLocal() as db_session:
+        updated = backfill_canonical_names(db_session, args.batch_size)
+        db_session.commit()
+    print(f"[Items] Backfilled {updated} canonical item names")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
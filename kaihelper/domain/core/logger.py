@@ -0,0 +1,123 @@
+"""
+Structured logging.
+
+``get_logger("ReceiptService")`` returns a logger whose records go to stdout
+as one JSON object per line (``LOG_FORMAT=json``, the default; CloudWatch
+and most log shippers index the fields) or as readable text
+(``LOG_FORMAT=text``). Keyword arguments become fields:
+
+    log = get_logger("ReceiptService")
+    log.info("Receipt processed", items=12, elapsed_ms=843.2)
+    # {"ts": "...", "level": "INFO", "logger": "kaihelper.ReceiptService",
+    #  "message": "Receipt processed", "items": 12, "elapsed_ms": 843.2}
+"""
+
+import json
+import logging
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+from kaihelper.config.settings import settings
+
+ROOT_LOGGER = "kaihelper"
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object including its ``fields``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        payload.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """``[logger] message key=value ...`` for local development."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        name = record.name.removeprefix(f"{ROOT_LOGGER}.")
+        fields = " ".join(f"{key}={value}" for key, value in getattr(record, "fields", {}).items())
+        line = f"[{name}] {record.getMessage()}" + (f" | {fields}" if fields else "")
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stdout`` is at emit time (so ``redirect_stdout`` applies)."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, _value) -> None:
+        pass
+
+
+def _configure() -> None:
+    """Attach the stdout handler to the ``kaihelper`` logger (once per process)."""
+    global _configured  # pylint: disable=global-statement
+    with _configure_lock:
+        if _configured:
+            return
+        handler = _StdoutHandler()
+        handler.setFormatter(TextFormatter() if settings.LOG_FORMAT == "text" else JsonFormatter())
+        root = logging.getLogger(ROOT_LOGGER)
+        root.addHandler(handler)
+        root.setLevel(settings.LOG_LEVEL)
+        root.propagate = False
+        _configured = True
+
+
+class StructuredLogger:
+    """Thin wrapper over ``logging.Logger`` taking fields as keyword arguments."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+
+    def _log(self, level: int, message: str, exc_info: bool, fields: dict) -> None:
+        if self._logger.isEnabledFor(level):
+            self._logger.log(level, message, exc_info=exc_info, extra={"fields": fields})
+
+    def debug(self, message: str, **fields: Any) -> None:
+        self._log(logging.DEBUG, message, False, fields)
+
+    def info(self, message: str, **fields: Any) -> None:
+        self._log(logging.INFO, message, False, fields)
+
+    def warning(self, message: str, **fields: Any) -> None:
+        self._log(logging.WARNING, message, False, fields)
+
+    def error(self, message: str, **fields: Any) -> None:
+        self._log(logging.ERROR, message, False, fields)
+
+    def exception(self, message: str, **fields: Any) -> None:
+        """Log at ERROR with the active exception's traceback."""
+        self._log(logging.ERROR, message, True, fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    Logger for a component, e.g. ``get_logger("ReceiptService")``.
+
+    Args:
+        name (str): Component name (nested under the ``kaihelper`` logger).
+
+    Returns:
+        StructuredLogger: Logger accepting keyword fields.
+    """
+    _configure()
+    return StructuredLogger(logging.getLogger(f"{ROOT_LOGGER}.{name}"))
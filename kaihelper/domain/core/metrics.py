@@ -0,0 +1,179 @@
+"""
+Process metrics in the Prometheus text exposition format.
+
+A deliberately small registry (no client library dependency) behind the
+``/metrics`` endpoint:
+
+* ``registry.counter`` / ``registry.histogram`` create labelled series that
+  code updates as it runs (pipeline spans, see ``tracing``);
+* ``registry.register_collector`` adds a callable read at scrape time, for
+  values that already live elsewhere (pool counters, cache statistics).
+
+    registry.register_collector(lambda: [
+        gauge("kaihelper_budget_cache_entries", "Users in the budget cache.", current_budgets.stats()["entries"]),
+    ])
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; pipeline stages range from sub-millisecond parsing to multi-second vision calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamily:
+    """One rendered metric: ``# HELP``/``# TYPE`` lines and its samples."""
+
+    def __init__(self, name: str, metric_type: str, help_text: str,
+                 samples: Iterable[Tuple[str, Dict[str, object], float]]) -> None:
+        self.name = name
+        self.metric_type = metric_type
+        self.help_text = help_text
+        self.samples = list(samples)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for sample_name, labels, value in self.samples:
+            lines.append(f"{sample_name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return lines
+
+
+def gauge(name: str, help_text: str, value: float, **labels) -> MetricFamily:
+    """Single-sample gauge family, for collectors."""
+    return MetricFamily(name, "gauge", help_text, [(name, labels, value)])
+
+
+def counter_value(name: str, help_text: str, value: float, **labels) -> MetricFamily:
+    """Single-sample counter family (a total maintained elsewhere), for collectors."""
+    return MetricFamily(name, "counter", help_text, [(name, labels, value)])
+
+
+class Counter:
+    """Monotonic total per label combination."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = sorted(self._values.items())
+        return MetricFamily(self.name, "counter", self.help_text, [
+            (self.name, dict(zip(self.labelnames, key)), value) for key, value in items
+        ])
+
+
+class Histogram:
+    """Cumulative buckets, sum and count per label combination."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        samples = []
+        for key, series in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _number(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, series[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return MetricFamily(self.name, "histogram", self.help_text, samples)
+
+
+class MetricsRegistry:
+    """Owns the process's metrics and renders them for ``/metrics``."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+        self._lock = threading.Lock()
+
+    def _get_or_add(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Counter ``name`` (created on first use, shared afterwards)."""
+        return self._get_or_add(name, lambda: Counter(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Histogram ``name`` (created on first use, shared afterwards)."""
+        return self._get_or_add(name, lambda: Histogram(name, help_text, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a callable evaluated on every scrape."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            families.extend(collector())
+        lines: List[str] = []
+        for family in families:
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,195 @@
+"""
+Schema migrations (Alembic).
+
+Versioned migrations live in ``kaihelper/domain/migrations/versions``. They are
+applied out of band, before new code is rolled out, never by the API on every
+container start:
+
+    python -m kaihelper.domain.core.migrations upgrade            # to head
+    python -m kaihelper.domain.core.migrations current            # applied revision
+    python -m kaihelper.domain.core.migrations check              # exit 1 if behind head
+    python -m kaihelper.domain.core.migrations downgrade -1
+    python -m kaihelper.domain.core.migrations revision -m "add x" # autogenerate
+
+(``kaihelper-migrate`` is the same CLI once the package is installed.)
+
+At startup the API only calls ``check_schema_version``: one
+``SELECT version_num FROM alembic_version`` compared with the head revision,
+which is read from the migration files without importing Alembic.
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from kaihelper.domain.core.logger import get_logger
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+VERSIONS_DIR = os.path.join(MIGRATIONS_DIR, "versions")
+
+# Revision matching the schema ``Base.metadata.create_all`` produced before
+# migrations existed; such databases are stamped with it instead of re-created.
+BASELINE_REVISION = "0001_initial_schema"
+
+log = get_logger("Migrations")
+
+_REVISION = re.compile(r"^revision(?:\s*:\s*[^=]+)?\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision(?:\s*:\s*[^=]+)?\s*=\s*(.+)$", re.MULTILINE)
+
+
+def head_revisions(versions_dir: str = VERSIONS_DIR) -> List[str]:
+    """
+    Head revision(s) of the migration scripts, found by scanning their
+    ``revision`` / ``down_revision`` assignments.
+
+    Returns:
+        list[str]: Revisions no other script revises (one unless the history branched).
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(versions_dir):
+        if not name.endswith(".py") or name.startswith("_"):
+            continue
+        with open(os.path.join(versions_dir, name), encoding="utf-8") as handle:
+            source = handle.read()
+        if match := _REVISION.search(source):
+            revisions.add(match[1])
+        if match := _DOWN_REVISION.search(source):
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", match[1]))
+    return sorted(revisions - parents)
+
+
+def current_revision(db_engine: Engine) -> Optional[str]:
+    """
+    Revision recorded in ``alembic_version``.
+
+    Returns:
+        str | None: The applied revision, or None for an unversioned database.
+    """
+    try:
+        with db_engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def check_schema_version(db_engine: Engine) -> Dict:
+    """
+    Compare the database revision with the code's head revision.
+
+    Returns:
+        dict: ``{"current", "head", "up_to_date"}``.
+    """
+    heads = head_revisions()
+    current = current_revision(db_engine)
+    return {
+        "current": current,
+        "head": heads[0] if len(heads) == 1 else heads,
+        "up_to_date": current is not None and [current] == heads,
+    }
+
+
+def _next_revision_id(message: str) -> str:
+    """Sequential, readable revision ids: ``0002_add_expense_indexes``."""
+    numbers = [int(match[1]) for name in os.listdir(VERSIONS_DIR) if (match := re.match(r"(\d+)_", name))]
+    slug = re.sub(r"[^a-z0-9]+", "_", message.lower()).strip("_")
+    # alembic_version.version_num is VARCHAR(32)
+    return f"{max(numbers, default=0) + 1:04d}_{slug}"[:32].rstrip("_")
+
+
+def _alembic_config(db_engine: Engine):
+    # Alembic is only needed when migrating, not when serving requests
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", MIGRATIONS_DIR)
+    config.set_main_option("file_template", "%%(rev)s")
+    config.set_main_option("sqlalchemy.url", db_engine.url.render_as_string(hide_password=False).replace("%", "%%"))
+    return config
+
+
+def upgrade_database(db_engine: Engine, revision: str = "head") -> Optional[str]:
+    """
+    Apply migrations up to ``revision``.
+
+    A database created by the old ``create_all`` startup hook (tables present,
+    no ``alembic_version``) is first stamped with ``BASELINE_REVISION`` so the
+    initial migration is not run against existing tables.
+
+    Returns:
+        str | None: The revision the database is at afterwards.
+    """
+    from alembic import command
+
+    config = _alembic_config(db_engine)
+    if current_revision(db_engine) is None and inspect(db_engine).has_table("users"):
+        log.info("Existing unversioned schema: stamping baseline", revision=BASELINE_REVISION)
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+    return current_revision(db_engine)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (``kaihelper-migrate``)."""
+    parser = argparse.ArgumentParser(description="KaiHelper schema migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    upgrade = sub.add_parser("upgrade", help="apply migrations (default: to head)")
+    upgrade.add_argument("revision", nargs="?", default="head")
+    upgrade.add_argument("--sql", action="store_true", help="print the SQL instead of running it")
+
+    downgrade = sub.add_parser("downgrade", help="revert migrations, e.g. -1 or a revision id")
+    downgrade.add_argument("revision")
+
+    stamp = sub.add_parser("stamp", help="record a revision without running migrations")
+    stamp.add_argument("revision")
+
+    revision = sub.add_parser("revision", help="create a new migration script")
+    revision.add_argument("-m", "--message", required=True)
+    revision.add_argument("--empty", action="store_true", help="skip autogenerate")
+
+    sub.add_parser("current", help="show the applied revision")
+    sub.add_parser("check", help="exit 1 unless the database is at head")
+    sub.add_parser("history", help="list revisions")
+
+    args = parser.parse_args(argv)
+
+    from kaihelper.domain.core.database import engine
+
+    if args.command == "current":
+        print(current_revision(engine) or "<unversioned>")
+        return 0
+    if args.command == "check":
+        status = check_schema_version(engine)
+        print(f"current={status['current']} head={status['head']} up_to_date={status['up_to_date']}")
+        return 0 if status["up_to_date"] else 1
+    if args.command == "upgrade" and not args.sql:
+        print(f"[Migrations] Database at {upgrade_database(engine, args.revision)}")
+        return 0
+
+    from alembic import command
+
+    config = _alembic_config(engine)
+    if args.command == "upgrade":
+        command.upgrade(config, args.revision, sql=True)
+    elif args.command == "downgrade":
+        command.downgrade(config, args.revision)
+    elif args.command == "stamp":
+        command.stamp(config, args.revision)
+    elif args.command == "revision":
+        command.revision(
+            config, message=args.message, autogenerate=not args.empty,
+            rev_id=_next_revision_id(args.message),
+        )
+    elif args.command == "history":
+        command.history(config)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Keyset pagination helpers shared by the list repositories.
+
+Lists are ordered newest first by ``(date column, primary key)``. A page is
+``WHERE user_id = ? AND (date, id) < (cursor date, cursor id) ORDER BY date
+DESC, id DESC LIMIT n + 1`` on a ``(user_id, date, id)`` index, so every page
+costs the same no matter how deep into the history it is. The cursor is the
+last row's key, base64-encoded so clients treat it as opaque.
+"""
+
+import base64
+import json
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from kaihelper.contracts.page_dto import PageDTO, PageQueryDTO
+
+
+def encode_cursor(sort_value: date, row_id: int) -> str:
+    """Opaque cursor pointing just after ``(sort_value, row_id)``."""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """
+    Inverse of ``encode_cursor``.
+
+    Raises:
+        ValueError: If the cursor was not produced by ``encode_cursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return date.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError) as err:
+        raise ValueError("Invalid cursor.") from err
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for lists ranked by relevance, which have no stable key: the rows already returned."""
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Inverse of ``encode_offset_cursor``.
+
+    Raises:
+        ValueError: If the cursor was not produced by ``encode_offset_cursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))["offset"])
+    except (ValueError, TypeError, KeyError) as err:
+        raise ValueError("Invalid cursor.") from err
+    if offset < 0:
+        raise ValueError("Invalid cursor.")
+    return offset
+
+
+def resolve_fields(
+    requested: Optional[Sequence[str]],
+    available: Dict[str, ColumnElement],
+    always: Sequence[str],
+) -> List[str]:
+    """
+    Validate a ``fields=`` projection.
+
+    Args:
+        requested: Field names asked for, or None for every field.
+        available: Projectable field name -> column expression.
+        always: Fields returned even when not requested (the row's identity).
+
+    Returns:
+        list[str]: Output field names, in ``available`` order.
+
+    Raises:
+        ValueError: If a requested field is unknown.
+    """
+    if requested is None:
+        return list(available)
+    unknown = sorted(set(requested) - set(available))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(available)}.")
+    wanted = set(requested) | set(always)
+    return [name for name in available if name in wanted]
+
+
+def resolve_includes(requested: Optional[Sequence[str]], allowed: Sequence[str]) -> set:
+    """
+    Validate an ``include=`` list of related collections.
+
+    Raises:
+        ValueError: If an include is not supported by the list.
+    """
+    unknown = sorted(set(requested or ()) - set(allowed))
+    if unknown:
+        supported = ", ".join(allowed) or "none"
+        raise ValueError(f"Unknown include: {', '.join(unknown)}. Supported: {supported}.")
+    return set(requested or ())
+
+
+def keyset_filters(query: PageQueryDTO, sort_column, id_column) -> List[ColumnElement]:
+    """
+    WHERE clauses for the date range and the cursor position (descending order).
+
+    The row-value comparison ``(date, id) < (d, i)`` is spelled out as
+    ``date <= d AND (date < d OR id < i)``: the sargable ``date <= d`` keeps it
+    a single ordered range scan on the composite index in both SQLite and MySQL,
+    where a top-level OR would turn into an index merge plus a sort.
+
+    Raises:
+        ValueError: On an invalid cursor or an inverted date range.
+    """
+    clauses: List[ColumnElement] = []
+    if query.date_from and query.date_to and query.date_from > query.date_to:
+        raise ValueError("date_from must not be after date_to.")
+    if query.date_from:
+        clauses.append(sort_column >= query.date_from)
+    if query.date_to:
+        clauses.append(sort_column <= query.date_to)
+    if query.cursor:
+        sort_value, row_id = decode_cursor(query.cursor)
+        clauses.append(sort_column <= sort_value)
+        clauses.append(or_(sort_column < sort_value, id_column < row_id))
+    return clauses
+
+
+def build_page(rows, limit: Optional[int], fields: Sequence[str], sort_key: str, id_key: str) -> PageDTO:
+    """
+    Turn ``limit + 1`` fetched rows into a page; the extra row only signals that more exist.
+
+    Args:
+        rows: Result rows exposing ``_mapping`` with every output field plus the sort keys.
+        limit: Page size requested; None when every row was fetched (no next page).
+        fields: Output field names.
+        sort_key / id_key: Labels of the cursor columns in each row.
+    """
+    if limit is None:
+        return PageDTO(items=[{name: row._mapping[name] for name in fields} for row in rows])
+    page_rows = rows[:limit]
+    items = [{name: row._mapping[name] for name in fields} for row in page_rows]
+    next_cursor = None
+    if len(rows) > limit and page_rows:
+        last = page_rows[-1]._mapping
+        next_cursor = encode_cursor(last[sort_key], last[id_key])
+    return PageDTO(items=items, next_cursor=next_cursor)
@@ -0,0 +1,239 @@
+"""
+Monthly spending rollups.
+
+``rollup_category_months`` and ``rollup_store_months`` hold per-user monthly
+expense totals. Every expense write calls ``apply_expense_change`` inside its
+own session, so the rollup moves in the same transaction as the expense; the
+increments are single atomic upserts, so concurrent writers cannot lose
+updates.
+
+The tables can always be recomputed from ``expenses``:
+
+    python -m kaihelper.domain.core.rollups rebuild [--user-id 7]
+    python -m kaihelper.domain.core.rollups check   [--user-id 7]   # exit 1 on drift
+
+(``kaihelper-rollups`` is the same CLI once the package is installed.)
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select
+
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.spending_rollup import CategoryMonthRollup, StoreMonthRollup
+
+# Totals are floats summed in different orders; smaller differences are not drift
+ROLLUP_TOLERANCE = 0.005
+
+_CATEGORY = CategoryMonthRollup.__table__
+_STORE = StoreMonthRollup.__table__
+
+
+def month_key(value) -> str:
+    """``YYYY-MM`` for a date, datetime or ISO date string."""
+    return str(value)[:7]
+
+
+def month_bucket(column, dialect_name: str):
+    """SQL expression truncating a DATE column to ``YYYY-MM`` on the given dialect."""
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    if dialect_name == "postgresql":
+        return func.to_char(column, "YYYY-MM")
+    return func.date_format(column, "%Y-%m")
+
+
+@dataclass(frozen=True)
+class ExpenseFacts:
+    """The columns of an expense that its rollup rows depend on."""
+
+    user_id: int
+    month: str
+    category_id: int
+    store_name: str
+    amount: float
+
+    @classmethod
+    def of(cls, expense: Expense) -> "ExpenseFacts":
+        return cls(
+            user_id=expense.user_id,
+            month=month_key(expense.expense_date),
+            category_id=expense.category_id,
+            store_name=expense.store_name or "",
+            amount=expense.amount or 0.0,
+        )
+
+
+def _increment(db_session, table, keys: Dict, total: float, count: int) -> None:
+    """Atomically add ``total``/``count`` to one rollup row, creating it if missing."""
+    dialect = db_session.get_bind().dialect.name
+    row = {**keys, "total": total, "expense_count": count}
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as upsert
+
+        stmt = upsert(table).values(row)
+        stmt = stmt.on_duplicate_key_update(
+            total=table.c.total + stmt.inserted.total,
+            expense_count=table.c.expense_count + stmt.inserted.expense_count,
+        )
+    else:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as upsert
+
+        stmt = upsert(table).values(row)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={
+                "total": table.c.total + stmt.excluded.total,
+                "expense_count": table.c.expense_count + stmt.excluded.expense_count,
+            },
+        )
+    db_session.execute(stmt)
+    if count < 0:
+        # The last expense of the group went away: drop the row instead of keeping zeros
+        db_session.execute(
+            delete(table).where(*(table.c[key] == value for key, value in keys.items()), table.c.expense_count <= 0)
+        )
+
+
+def apply_expense_change(
+    db_session,
+    before: Optional[ExpenseFacts],
+    after: Optional[ExpenseFacts],
+) -> None:
+    """
+    Move the rollups from ``before`` to ``after`` within ``db_session``'s transaction.
+
+    Args:
+        db_session: Session that is writing the expense (not committed here).
+        before (ExpenseFacts | None): The expense as it was; None for an insert.
+        after (ExpenseFacts | None): The expense as it is now; None for a delete.
+    """
+    deltas: Dict[Tuple, List] = {}
+    for facts, sign in ((before, -1), (after, 1)):
+        if facts is None:
+            continue
+        for key in (
+            (_CATEGORY, ("user_id", facts.user_id), ("month", facts.month), ("category_id", facts.category_id)),
+            (_STORE, ("user_id", facts.user_id), ("month", facts.month), ("store_name", facts.store_name)),
+        ):
+            delta = deltas.setdefault(key, [0.0, 0])
+            delta[0] += sign * facts.amount
+            delta[1] += sign
+
+    for (table, *keys), (total, count) in deltas.items():
+        if count or total:
+            _increment(db_session, table, dict(keys), total, count)
+
+
+# ---------------------------------------------------------------------------
+# Rebuild / consistency check
+# ---------------------------------------------------------------------------
+
+def _raw_groups(db_session, table, user_id: Optional[int]):
+    """SELECT computing ``table``'s rows from ``expenses``."""
+    month = month_bucket(Expense.expense_date, db_session.get_bind().dialect.name)
+    key = Expense.category_id if table is _CATEGORY else func.coalesce(Expense.store_name, "")
+    stmt = (
+        select(
+            Expense.user_id.label("user_id"), month.label("month"), key.label(table.c.keys()[2]),
+            func.sum(Expense.amount).label("total"), func.count().label("expense_count"),
+        )
+        .group_by(Expense.user_id, month, key)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Expense.user_id == user_id)
+    return stmt
+
+
+def rebuild_rollups(db_session, user_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Recompute the rollup tables (or one user's rows) from ``expenses``.
+
+    Runs in ``db_session``'s transaction; the caller commits.
+
+    Returns:
+        dict[str, int]: Rows written per rollup table.
+    """
+    written: Dict[str, int] = {}
+    for table in (_CATEGORY, _STORE):
+        clear = delete(table)
+        if user_id is not None:
+            clear = clear.where(table.c.user_id == user_id)
+        db_session.execute(clear)
+        source = _raw_groups(db_session, table, user_id)
+        db_session.execute(insert(table).from_select(list(source.selected_columns.keys()), source))
+        count = select(func.count()).select_from(table)
+        if user_id is not None:
+            count = count.where(table.c.user_id == user_id)
+        written[table.name] = db_session.execute(count).scalar()
+    return written
+
+
+@dataclass
+class RollupMismatch:
+    """A rollup row that disagrees with the expenses it summarizes."""
+
+    table: str
+    key: Tuple
+    expected: Optional[Tuple[float, int]]
+    actual: Optional[Tuple[float, int]]
+
+
+def check_rollups(db_session, user_id: Optional[int] = None) -> List[RollupMismatch]:
+    """
+    Compare the rollup tables with aggregates recomputed from ``expenses``.
+
+    Returns:
+        list[RollupMismatch]: Missing, extra or wrong rows (empty when consistent).
+    """
+    mismatches: List[RollupMismatch] = []
+    for table in (_CATEGORY, _STORE):
+        expected = {tuple(row[:3]): (row.total, row.expense_count)
+                    for row in db_session.execute(_raw_groups(db_session, table, user_id))}
+        stored = select(table)
+        if user_id is not None:
+            stored = stored.where(table.c.user_id == user_id)
+        actual = {tuple(row[:3]): (row.total, row.expense_count) for row in db_session.execute(stored)}
+
+        for key in sorted(expected.keys() | actual.keys(), key=str):
+            want, have = expected.get(key), actual.get(key)
+            if want is None or have is None or want[1] != have[1] or abs(want[0] - have[0]) > ROLLUP_TOLERANCE:
+                mismatches.append(RollupMismatch(table.name, key, want, have))
+    return mismatches
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (``kaihelper-rollups``)."""
+    parser = argparse.ArgumentParser(description="KaiHelper monthly spending rollups")
+    parser.add_argument("command", choices=("rebuild", "check"))
+    parser.add_argument("--user-id", type=int, help="only this user's rows")
+    parser.add_argument("--limit", type=int, default=20, help="mismatches to print (check)")
+    args = parser.parse_args(argv)
+
+    from kaihelper.domain.core.database import SessionLocal
+    # Expense's relationships resolve by name
+    import kaihelper.domain.models.category  # noqa: F401
+    import kaihelper.domain.models.grocery   # noqa: F401
+
+    with SessionLocal() as db_session:
+        if args.command == "rebuild":
+            written = rebuild_rollups(db_session, args.user_id)
+            db_session.commit()
+            print(f"[Rollups] Rebuilt {written}")
+            return 0
+
+        mismatches = check_rollups(db_session, args.user_id)
+        for mismatch in mismatches[:args.limit]:
+            print(f"[Rollups] {mismatch.table} {mismatch.key}: expected={mismatch.expected} actual={mismatch.actual}")
+        print(f"[Rollups] {len(mismatches)} mismatched rows")
+        return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
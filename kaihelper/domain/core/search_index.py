@@ -0,0 +1,322 @@
+"""
+Full-text search index over expenses and grocery items.
+
+``search_documents`` holds one document per expense (store name as the title;
+description, notes, receipt number and the names of the items on the receipt
+as the body) and one per grocery item (item name, plus its canonical key so
+"milk" also finds "PAMS MLK 2L"). It is a full-text index of the database in use:
+
+* SQLite: an FTS5 virtual table (``rowid`` = document key), ranked with bm25;
+* MySQL: an InnoDB table with a FULLTEXT index, ranked by ``MATCH ... AGAINST``.
+  InnoDB does not index words shorter than ``innodb_ft_min_token_size`` (3 by
+  default) or on its stopword list, so a required ``+term`` of that kind would
+  match nothing: such terms are matched with ``LIKE`` over the rows the other
+  terms found (``MYSQL_MIN_TOKEN_SIZE`` / ``MYSQL_STOPWORDS`` mirror the
+  server defaults; change them with the server settings);
+* anything else: the same plain table, matched with ``LIKE`` (no ranking).
+
+Each document also carries an owner token (``owner<user_id>``) in an indexed
+column. A search matches it together with the query terms, so the full-text
+engine intersects the user's posting list with the terms' instead of finding
+every user's matches and filtering them afterwards.
+
+Every expense/grocery write calls ``index_expenses`` / ``index_groceries`` /
+``index_receipt`` / ``remove_documents`` inside its own session, so the index moves in the same
+transaction as the rows (like the rollups). The index can always be rebuilt:
+
+    python -m kaihelper.domain.core.search_index rebuild [--user-id 7]
+"""
+
+import argparse
+import re
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select, text
+
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.grocery_purchase import GroceryPurchase
+
+EXPENSE = "expense"
+GROCERY = "grocery"
+DOC_TYPES = (EXPENSE, GROCERY)
+
+# Words of a query that are matched (each as a prefix); the rest are ignored
+MAX_TERMS = 8
+# bm25 column weights (owner, title, body): a store or item name outranks a note
+_BM25 = "bm25(search_documents, 0.0, 4.0, 1.0)"
+_TERM = re.compile(r"\w+", re.UNICODE)
+_REBUILD_CHUNK = 1000
+_COLUMNS = ("owner", "title", "body", "doc_type", "doc_id", "user_id", "doc_date")
+
+# InnoDB full-text defaults (innodb_ft_min_token_size, INNODB_FT_DEFAULT_STOPWORD)
+MYSQL_MIN_TOKEN_SIZE = 3
+MYSQL_STOPWORDS = frozenset((
+    "a", "about", "an", "are", "as", "at", "be", "by", "com", "de", "en", "for", "from", "how", "i",
+    "in", "is", "it", "la", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when",
+    "where", "who", "will", "with", "und", "www",
+))
+
+
+def _dialect(db) -> str:
+    """Dialect name of a Session or Connection."""
+    bind = db if hasattr(db, "dialect") else db.get_bind()
+    return bind.dialect.name
+
+
+def _key_column(dialect: str) -> str:
+    return "rowid" if dialect == "sqlite" else "doc_key"
+
+
+def document_key(doc_type: str, doc_id: int) -> int:
+    """Key of a document: expenses on even keys, grocery items on odd ones."""
+    return doc_id * 2 + (1 if doc_type == GROCERY else 0)
+
+
+def owner_token(user_id: int) -> str:
+    return f"owner{user_id}"
+
+
+def query_terms(query: str) -> List[str]:
+    """Lowercased words of a search query (at most ``MAX_TERMS``)."""
+    return [term.lower() for term in _TERM.findall(query or "")][:MAX_TERMS]
+
+
+def _join(*parts) -> str:
+    return " ".join(str(part) for part in parts if part)
+
+
+def _expense_document(expense, items: Iterable[str]) -> dict:
+    return {
+        "key": document_key(EXPENSE, expense.expense_id),
+        "owner": owner_token(expense.user_id),
+        "title": (expense.store_name or "")[:255],
+        "body": _join(expense.description, expense.notes, expense.receipt_number, *items),
+        "doc_type": EXPENSE,
+        "doc_id": expense.expense_id,
+        "user_id": expense.user_id,
+        "doc_date": expense.expense_date,
+    }
+
+
+def _grocery_document(grocery) -> dict:
+    canonical = getattr(grocery, "canonical_name", None)
+    return {
+        "key": document_key(GROCERY, grocery.grocery_id),
+        "owner": owner_token(grocery.user_id),
+        "title": (grocery.item_name or "")[:255],
+        "body": _join(canonical if canonical != (grocery.item_name or "").lower() else None, grocery.notes),
+        "doc_type": GROCERY,
+        "doc_id": grocery.grocery_id,
+        "user_id": grocery.user_id,
+        "doc_date": grocery.purchase_date,
+    }
+
+
+def _delete_keys(db, keys: Sequence[int]) -> None:
+    if not keys:
+        return
+    key_column = _key_column(_dialect(db))
+    params = {f"k{i}": key for i, key in enumerate(keys)}
+    placeholders = ", ".join(f":{name}" for name in params)
+    db.execute(text(f"DELETE FROM search_documents WHERE {key_column} IN ({placeholders})"), params)
+
+
+def _insert(db, documents: List[dict]) -> None:
+    key_column = _key_column(_dialect(db))
+    db.execute(
+        text(
+            f"INSERT INTO search_documents ({key_column}, {', '.join(_COLUMNS)}) "
+            f"VALUES (:key, {', '.join(':' + column for column in _COLUMNS)})"
+        ),
+        documents,
+    )
+
+
+def _write(db, documents: List[dict]) -> None:
+    """Replace ``documents`` (by key): one DELETE and one executemany INSERT."""
+    if not documents:
+        return
+    _delete_keys(db, [document["key"] for document in documents])
+    _insert(db, documents)
+
+
+def _receipt_items(db, expense_ids: Sequence[int]) -> Dict[int, List[str]]:
+    """Item names on each receipt, from its purchase lines."""
+    items: Dict[int, List[str]] = {expense_id: [] for expense_id in expense_ids}
+    if not expense_ids:
+        return items
+    rows = db.execute(
+        select(GroceryPurchase.expense_id, Grocery.item_name)
+        .join(Grocery, Grocery.grocery_id == GroceryPurchase.grocery_id)
+        .where(GroceryPurchase.expense_id.in_(list(expense_ids)))
+        .order_by(GroceryPurchase.purchase_id)
+    ).all()
+    for expense_id, item_name in rows:
+        items[expense_id].append(item_name)
+    return items
+
+
+def index_expenses(db, expenses: Iterable, items: Optional[Dict[int, Iterable[str]]] = None) -> None:
+    """
+    (Re)index expenses within ``db``'s transaction.
+
+    Args:
+        db: Session (or Connection) that is writing the expenses (not committed here).
+        expenses (Iterable[Expense]): Flushed expenses (``expense_id`` set).
+        items (dict[int, Iterable[str]] | None): Item names per expense ID; None
+            reads them from the receipts' purchase lines (one SELECT).
+    """
+    expenses = list(expenses)
+    if items is None:
+        items = _receipt_items(db, [expense.expense_id for expense in expenses])
+    _write(db, [_expense_document(expense, items.get(expense.expense_id, ())) for expense in expenses])
+
+
+def index_groceries(db, groceries: Iterable) -> None:
+    """(Re)index grocery items (Grocery models or DTOs with ``grocery_id`` set) within ``db``'s transaction."""
+    _write(db, [_grocery_document(grocery) for grocery in groceries])
+
+
+def index_receipt(db, expense, groceries: Sequence) -> None:
+    """(Re)index a saved receipt: its expense and its grocery items, in one DELETE and one INSERT."""
+    documents = [_expense_document(expense, [grocery.item_name for grocery in groceries])]
+    documents += [_grocery_document(grocery) for grocery in groceries]
+    _write(db, documents)
+
+
+def remove_documents(db, doc_type: str, doc_ids: Iterable[int]) -> None:
+    """Drop the documents of deleted expenses or grocery items."""
+    _delete_keys(db, [document_key(doc_type, doc_id) for doc_id in doc_ids])
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+def _likes(terms: Sequence[str], params: dict) -> str:
+    """``LIKE`` conditions requiring every term in the title or body (parameters added to ``params``)."""
+    likes = []
+    for i, term in enumerate(terms):
+        params[f"w{i}"] = f"%{term}%"
+        likes.append(f"(LOWER(title) LIKE :w{i} OR LOWER(body) LIKE :w{i})")
+    return " AND ".join(likes)
+
+
+def search(db, user_id: int, terms: Sequence[str], doc_types: Sequence[str], limit: int, offset: int = 0):
+    """
+    Rank the user's documents matching every term (as a prefix).
+
+    Args:
+        db: Session to read with.
+        user_id (int): Owner of the documents.
+        terms (Sequence[str]): Words from ``query_terms``; must not be empty.
+        doc_types (Sequence[str]): Subset of ``DOC_TYPES``.
+        limit (int): Rows to return.
+        offset (int): Rows to skip (pagination).
+
+    Returns:
+        list[Row]: ``doc_type, doc_id, doc_date, title, body, score`` rows, best first.
+    """
+    dialect = _dialect(db)
+    params = {"user_id": user_id, "limit": limit, "offset": offset}
+    params.update({f"t{i}": doc_type for i, doc_type in enumerate(doc_types)})
+    types = ", ".join(f":t{i}" for i in range(len(doc_types)))
+    columns = "doc_type, doc_id, doc_date, title, body"
+
+    if dialect == "sqlite":
+        # Terms are \w+ words, so quoting each one is enough to keep them literal
+        params["match"] = (
+            f'owner:"{owner_token(user_id)}" AND {{title body}}: ('
+            + " AND ".join(f'"{term}"*' for term in terms) + ")"
+        )
+        sql = (
+            f"SELECT {columns}, -{_BM25} AS score FROM search_documents "
+            f"WHERE search_documents MATCH :match AND doc_type IN ({types}) "
+            f"ORDER BY {_BM25}, rowid DESC LIMIT :limit OFFSET :offset"
+        )
+    elif dialect in ("mysql", "mariadb"):
+        indexed = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE and term not in MYSQL_STOPWORDS]
+        unindexed = [term for term in terms if term not in indexed]
+        params["match"] = " ".join([f"+{owner_token(user_id)}"] + [f"+{term}*" for term in indexed])
+        against = "MATCH(owner, title, body) AGAINST (:match IN BOOLEAN MODE)"
+        likes = f"AND {_likes(unindexed, params)} " if unindexed else ""
+        sql = (
+            f"SELECT {columns}, {against} AS score FROM search_documents "
+            f"WHERE {against} AND user_id = :user_id AND doc_type IN ({types}) {likes}"
+            f"ORDER BY score DESC, doc_key DESC LIMIT :limit OFFSET :offset"
+        )
+    else:
+        sql = (
+            f"SELECT {columns}, 0.0 AS score FROM search_documents "
+            f"WHERE user_id = :user_id AND doc_type IN ({types}) AND {_likes(terms, params)} "
+            f"ORDER BY doc_date DESC, doc_key DESC LIMIT :limit OFFSET :offset"
+        )
+    return db.execute(text(sql), params).all()
+
+
+# ---------------------------------------------------------------------------
+# Rebuild
+# ---------------------------------------------------------------------------
+
+def rebuild_search_index(db, user_id: Optional[int] = None) -> Dict[str, int]:
+    """
+    Re-create every document (or one user's) from ``expenses`` and ``groceries``.
+
+    Runs in ``db``'s transaction; the caller commits. Rows are read and written
+    in keyset chunks, so memory stays bounded on large tables.
+
+    Returns:
+        dict[str, int]: Documents written per type.
+    """
+    if user_id is None:
+        db.execute(text("DELETE FROM search_documents"))
+    elif _dialect(db) == "sqlite":
+        db.execute(text("DELETE FROM search_documents WHERE search_documents MATCH :owner"),
+                   {"owner": f'owner:"{owner_token(user_id)}"'})
+    else:
+        db.execute(text("DELETE FROM search_documents WHERE user_id = :user_id"), {"user_id": user_id})
+
+    written = {EXPENSE: 0, GROCERY: 0}
+    for model, key, doc_type in ((Expense, Expense.expense_id, EXPENSE), (Grocery, Grocery.grocery_id, GROCERY)):
+        last_id = 0
+        while True:
+            stmt = select(model).where(key > last_id).order_by(key).limit(_REBUILD_CHUNK)
+            if user_id is not None:
+                stmt = stmt.where(model.user_id == user_id)
+            rows = db.execute(stmt).scalars().all()
+            if not rows:
+                break
+            if doc_type == EXPENSE:
+                items = _receipt_items(db, [row.expense_id for row in rows])
+                documents = [_expense_document(row, items[row.expense_id]) for row in rows]
+            else:
+                documents = [_grocery_document(row) for row in rows]
+            _insert(db, documents)
+            written[doc_type] += len(rows)
+            last_id = getattr(rows[-1], key.key)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (``kaihelper-search-index``)."""
+    parser = argparse.ArgumentParser(description="KaiHelper full-text search index")
+    parser.add_argument("command", choices=("rebuild",))
+    parser.add_argument("--user-id", type=int, help="only this user's documents")
+    args = parser.parse_args(argv)
+
+    from kaihelper.domain.core.database import SessionLocal
+    # Expense's and Grocery's relationships resolve by name
+    import kaihelper.domain.models.category  # noqa: F401
+    import kaihelper.domain.models.user      # noqa: F401
+
+    with SessionLocal() as db_session:
+        written = rebuild_search_index(db_session, args.user_id)
+        db_session.commit()
+    print(f"[Search] Rebuilt {written}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
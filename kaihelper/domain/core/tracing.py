@@ -0,0 +1,168 @@
+"""
+Per-stage spans for the receipt pipeline.
+
+Each stage (image decode and re-encode, base64, the vision request, JSON
+parsing, category resolution, the expense save and the grocery upserts) runs
+inside ``span(name, **attributes)``. A span:
+
+* is forwarded to the active tracer: ``NoopTracer`` by default, or
+  ``OpenTelemetryTracer`` (``TRACER=otel``), which only needs
+  ``opentelemetry-api`` and exports through whatever SDK/exporter the
+  deployment configures;
+* records its duration, errors and the number of SQL statements the current
+  thread executed inside it into the ``/metrics`` registry, whatever the tracer.
+
+    with span("vision.request", model="gpt-4o-mini", bytes_sent=len(b64)) as current:
+        response = client.chat.completions.create(...)
+        current.set_attribute("items", len(items))
+
+Another tracer (a test double, a different backend) can be installed with
+``set_tracer``.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+from kaihelper.domain.core.metrics import registry
+
+# Attribute names shared by the stages
+ATTR_DB_STATEMENTS = "db.statements"
+
+SPAN_SECONDS = registry.histogram(
+    "kaihelper_span_duration_seconds",
+    "Duration of receipt pipeline stages.",
+    ("span",),
+)
+SPAN_ERRORS = registry.counter(
+    "kaihelper_span_errors_total",
+    "Pipeline stages that raised.",
+    ("span",),
+)
+SPAN_STATEMENTS = registry.counter(
+    "kaihelper_span_db_statements_total",
+    "SQL statements executed inside pipeline stages.",
+    ("span",),
+)
+
+_statements = threading.local()
+
+
+def record_statement() -> None:
+    """Count one SQL statement on the current thread (engine ``before_cursor_execute`` hook)."""
+    _statements.count = getattr(_statements, "count", 0) + 1
+
+
+def statements_executed() -> int:
+    """SQL statements executed so far by the current thread."""
+    return getattr(_statements, "count", 0)
+
+
+class Span(ABC):
+    """The part of a span the pipeline uses: attributes set while it runs."""
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach ``key=value`` (str, bool, int or float) to the span."""
+
+
+class Tracer(ABC):
+    """Starts spans; implementations must be thread-safe."""
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: dict):
+        """Context manager yielding a ``Span`` for the duration of the block."""
+
+
+class _NoopSpan(Span):
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(Tracer):
+    """Default tracer: spans only feed the metrics registry."""
+
+    @contextmanager
+    def start_span(self, name: str, attributes: dict) -> Iterator[Span]:
+        yield _NOOP_SPAN
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Forwards spans to OpenTelemetry through ``opentelemetry.trace``.
+
+    Without a configured SDK the OpenTelemetry API is itself a no-op, so this
+    is safe to enable before an exporter is wired up.
+    """
+
+    def __init__(self, instrumentation_name: str = "kaihelper") -> None:
+        from opentelemetry import trace  # pylint: disable=import-outside-toplevel
+
+        self._tracer = trace.get_tracer(instrumentation_name)
+
+    @contextmanager
+    def start_span(self, name: str, attributes: dict) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(name, attributes=attributes) as otel_span:
+            yield otel_span
+
+
+_tracer: Tracer = NoopTracer()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install ``tracer`` process-wide (None restores the no-op tracer)."""
+    global _tracer  # pylint: disable=global-statement
+    _tracer = tracer or NoopTracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def build_tracer(config) -> Tracer:
+    """
+    Tracer selected by ``TRACER`` (``none`` | ``otel``).
+
+    Raises:
+        ValueError: Unknown tracer name.
+    """
+    name = config.TRACER
+    if name in ("", "none", "noop"):
+        return NoopTracer()
+    if name in ("otel", "opentelemetry"):
+        return OpenTelemetryTracer()
+    raise ValueError(f"Unknown TRACER '{name}' (expected none or otel)")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Run the block as pipeline stage ``name``.
+
+    Args:
+        name (str): Stage name, dotted by component (``vision.request``).
+        **attributes: Initial span attributes; None values are dropped.
+
+    Yields:
+        Span: Use ``set_attribute`` for values known only after the work.
+    """
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    statements_before = statements_executed()
+    started = time.perf_counter()
+    with _tracer.start_span(name, attributes) as current:
+        try:
+            yield current
+        except BaseException:
+            SPAN_ERRORS.inc(span=name)
+            raise
+        finally:
+            statements = statements_executed() - statements_before
+            if statements:
+                current.set_attribute(ATTR_DB_STATEMENTS, statements)
+                SPAN_STATEMENTS.inc(statements, span=name)
+            SPAN_SECONDS.observe(time.perf_counter() - started, span=name)
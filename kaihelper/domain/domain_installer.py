@@ -12,12 +12,22 @@ from kaihelper.domain.repositories.category_repository import CategoryRepository
 from kaihelper.domain.repositories.grocery_repository import GroceryRepository
 from kaihelper.domain.repositories.budget_repository import BudgetRepository
 from kaihelper.domain.repositories.expense_repository import ExpenseRepository
+from kaihelper.domain.repositories.receipt_repository import ReceiptRepository
+from kaihelper.domain.repositories.receipt_job_repository import ReceiptJobRepository
+from kaihelper.domain.repositories.analytics_repository import AnalyticsRepository
+from kaihelper.domain.repositories.search_repository import SearchRepository
+from kaihelper.domain.repositories.sync_repository import SyncRepository
 
 # New repository interfaces
 from kaihelper.domain.interfaces.i_category_repository import ICategoryRepository
 from kaihelper.domain.interfaces.i_grocery_repository import IGroceryRepository
 from kaihelper.domain.interfaces.i_budget_repository import IBudgetRepository
 from kaihelper.domain.interfaces.i_expense_repository import IExpenseRepository
+from kaihelper.domain.interfaces.i_receipt_repository import IReceiptRepository
+from kaihelper.domain.interfaces.i_receipt_job_repository import IReceiptJobRepository
+from kaihelper.domain.interfaces.i_analytics_repository import IAnalyticsRepository
+from kaihelper.domain.interfaces.i_search_repository import ISearchRepository
+from kaihelper.domain.interfaces.i_sync_repository import ISyncRepository
 
 
 class DomainInstaller:
@@ -34,6 +44,11 @@ class DomainInstaller:
         self._repo_map[IGroceryRepository] = GroceryRepository()
         self._repo_map[IBudgetRepository] = BudgetRepository()
         self._repo_map[IExpenseRepository] = ExpenseRepository()
+        self._repo_map[IReceiptRepository] = ReceiptRepository()
+        self._repo_map[IReceiptJobRepository] = ReceiptJobRepository()
+        self._repo_map[IAnalyticsRepository] = AnalyticsRepository()
+        self._repo_map[ISearchRepository] = SearchRepository()
+        self._repo_map[ISyncRepository] = SyncRepository()
 
     def resolve(self, interface: Type) -> Any:
         """Resolves a repository implementation by its interface."""
@@ -56,3 +71,18 @@ class DomainInstaller:
 
     def get_expense_repository(self) -> IExpenseRepository:
         return self.resolve(IExpenseRepository)
+
+    def get_receipt_repository(self) -> IReceiptRepository:
+        return self.resolve(IReceiptRepository)
+
+    def get_receipt_job_repository(self) -> IReceiptJobRepository:
+        return self.resolve(IReceiptJobRepository)
+
+    def get_analytics_repository(self) -> IAnalyticsRepository:
+        return self.resolve(IAnalyticsRepository)
+
+    def get_search_repository(self) -> ISearchRepository:
+        return self.resolve(ISearchRepository)
+
+    def get_sync_repository(self) -> ISyncRepository:
+        return self.resolve(ISyncRepository)
@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.analytics_dto import AnalyticsQueryDTO
+
+
+class IAnalyticsRepository(ABC):
+    """Interface for spending aggregates computed in the database."""
+
+    @abstractmethod
+    def category_monthly_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Expense totals per category per month (list[CategoryMonthTotalDTO])."""
+        pass
+
+    @abstractmethod
+    def store_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Expense totals per store, highest first (list[StoreTotalDTO])."""
+        pass
+
+    @abstractmethod
+    def local_share(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Grocery spend split into local, imported and unknown (LocalShareDTO)."""
+        pass
+
+    @abstractmethod
+    def top_items(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """Grocery items ranked by total cost (list[TopItemDTO])."""
+        pass
@@ -24,3 +24,7 @@ class ICategoryRepository(ABC):
     @abstractmethod
     def delete(self, category_id: int) -> ResultDTO:
         pass
+
+    @abstractmethod
+    def get_or_create(self, name: str, description: str | None = None) -> ResultDTO:
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 from datetime import date
 
 
@@ -18,13 +19,18 @@ class IExpenseRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self, user_id: int) -> ResultDTO:
-        """Retrieve all expenses for a specific user."""
+    def get_all(self, user_id: int, include_groceries: bool = False) -> ResultDTO:
+        """Retrieve all expenses for a specific user (groceries only when requested)."""
         pass
 
     @abstractmethod
-    def get_by_id(self, expense_id: int) -> ResultDTO:
-        """Retrieve an expense by its ID."""
+    def get_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """Retrieve one keyset page of a user's expenses (PageDTO), newest first."""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, expense_id: int, include_groceries: bool = False) -> ResultDTO:
+        """Retrieve an expense by its ID (groceries only when requested)."""
         pass
 
     @abstractmethod
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from kaihelper.contracts.result_dto import ResultDTO
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO, PriceHistoryQueryDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 
 
 class IGroceryRepository(ABC):
@@ -16,6 +17,11 @@ class IGroceryRepository(ABC):
         """Retrieve all groceries for a specific user."""
         pass
 
+    @abstractmethod
+    def get_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """Retrieve one keyset page of a user's groceries (PageDTO), newest first."""
+        pass
+
     @abstractmethod
     def get_by_id(self, grocery_id: int) -> ResultDTO:
         """Retrieve a grocery record by its ID."""
@@ -36,6 +42,16 @@ class IGroceryRepository(ABC):
         """Delete a grocery record by ID."""
         pass
 
+    @abstractmethod
+    def add_purchases(self, expense_id: int | None, store_name: str | None, groceries: list[GroceryDTO]) -> ResultDTO:
+        """Record a receipt's purchase lines, replacing earlier lines of the same expense."""
+        pass
+
+    @abstractmethod
+    def get_price_history(self, grocery_id: int, query: PriceHistoryQueryDTO) -> ResultDTO:
+        """Retrieve an item's purchases and per-store price statistics (PriceHistoryDTO)."""
+        pass
+
     @abstractmethod
     def get_by_expense_id(self, expense_id: int) -> ResultDTO:
         """Retrieve a grocery record associated with a specific expense ID."""
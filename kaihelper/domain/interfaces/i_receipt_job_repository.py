@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class IReceiptJobRepository(ABC):
+    """Interface for durable receipt job state."""
+
+    @abstractmethod
+    def create(self, user_id: int, image_bytes: bytes) -> ResultDTO:
+        """Insert a new queued job holding the normalized image."""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, job_id: str) -> ResultDTO:
+        """Retrieve a job by its ID."""
+        pass
+
+    @abstractmethod
+    def list_by_user(self, user_id: int, limit: int = 20) -> ResultDTO:
+        """Retrieve the most recent jobs of a user."""
+        pass
+
+    @abstractmethod
+    def claim(self, job_id: str) -> ResultDTO:
+        """Mark a queued job as running and return its image bytes."""
+        pass
+
+    @abstractmethod
+    def heartbeat(self, job_id: str) -> ResultDTO:
+        """Refresh a running job's ``updated_at`` while its worker is alive."""
+        pass
+
+    @abstractmethod
+    def complete(self, job_id: str, result_json: str) -> ResultDTO:
+        """Mark a job as succeeded and store its result."""
+        pass
+
+    @abstractmethod
+    def fail(self, job_id: str, error: str, retry: bool = False) -> ResultDTO:
+        """Mark a job as failed, or put it back in the queue when ``retry`` is set."""
+        pass
+
+    @abstractmethod
+    def list_resumable(self, stale_after_seconds: int, max_attempts: int) -> ResultDTO:
+        """Return IDs of stale queued jobs and of running jobs whose worker went silent."""
+        pass
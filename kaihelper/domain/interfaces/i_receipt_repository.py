@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO
+
+
+class IReceiptRepository(ABC):
+    """Interface for unit-of-work receipt persistence."""
+
+    @abstractmethod
+    def save_receipt(
+        self,
+        category_name: str,
+        expense: ExpenseDTO,
+        groceries: List[GroceryDTO],
+        category_id: Optional[int] = None,
+    ) -> ResultDTO:
+        """Persist a receipt's category, expense and groceries in a single transaction."""
+        pass
+
+    @abstractmethod
+    def save_receipts(
+        self,
+        receipts: List[Tuple[str, ExpenseDTO, List[GroceryDTO], Optional[int]]],
+    ) -> List[ResultDTO]:
+        """Persist many receipts in one transaction, isolating failures per receipt."""
+        pass
+
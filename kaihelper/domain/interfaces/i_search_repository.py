@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.search_dto import SearchQueryDTO
+
+
+class ISearchRepository(ABC):
+    """Interface for full-text search over a user's expenses and groceries."""
+
+    @abstractmethod
+    def search(self, user_id: int, query: SearchQueryDTO) -> ResultDTO:
+        """Ranked page of matching documents (SearchPageDTO)."""
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.sync_dto import SyncQueryDTO
+
+
+class ISyncRepository(ABC):
+    """Interface for the change feed behind delta sync."""
+
+    @abstractmethod
+    def changes(self, user_id: int, query: SyncQueryDTO) -> ResultDTO:
+        """Rows created, updated or deleted since the query's token (SyncBatchDTO)."""
+        pass
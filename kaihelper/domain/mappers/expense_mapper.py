@@ -10,6 +10,7 @@ from datetime import datetime
 # --- First-party imports ---
 from kaihelper.domain.models.expense import Expense
 from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.domain.mappers.grocery_mapper import GroceryMapper
 
 
 
@@ -35,7 +36,8 @@ class ExpenseMapper:
             description=dto.description,
             expense_date=dto.expense_date,
             created_at=dto.created_at or datetime.now(),
-            updated_at=dto.updated_at or datetime.now(),
+            # Always the server's write time: the sync change feed is ordered by it
+            updated_at=datetime.now(),
             receipt_image=dto.receipt_image,
             notes=dto.notes,
             store_name=getattr(dto, "store_name", None),
@@ -51,12 +53,17 @@ class ExpenseMapper:
         )
 
     @staticmethod
-    def to_dto(model: Expense) -> ExpenseDTO:
+    def to_dto(model: Expense, include_groceries: bool = False) -> ExpenseDTO:
         """
         Convert an Expense ORM model to an ExpenseDTO.
 
+        Reads ``model.category``; the query should load it (joinedload) to avoid
+        one lazy load per expense. ``model.groceries`` is only touched when
+        ``include_groceries`` is set.
+
         Args:
             model (Expense): ORM model instance representing a database record.
+            include_groceries (bool): Also map the grocery lines (load them with selectinload).
 
         Returns:
             ExpenseDTO: Data transfer object representation of the model.
@@ -82,7 +89,8 @@ class ExpenseMapper:
             discount_amount=model.discount_amount,
             due_date=model.due_date,
             suggestion=model.suggestion,
-            category_name=getattr(model.category, "name", None)
+            category_name=getattr(model.category, "name", None),
+            groceries=[GroceryMapper.to_dto(grocery) for grocery in model.groceries] if include_groceries else None,
         )
 
     @staticmethod
@@ -113,5 +121,5 @@ class ExpenseMapper:
         model.discount_amount = getattr(dto, "discount_amount", model.discount_amount)
         model.due_date = getattr(dto, "due_date", model.due_date)
         model.suggestion = getattr(dto, "suggestion", model.suggestion)
-        model.updated_at = dto.updated_at or datetime.now()
+        model.updated_at = datetime.now()
         return model
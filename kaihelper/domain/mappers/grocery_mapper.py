@@ -7,8 +7,10 @@ Converts between Grocery ORM models and GroceryDTO objects.
 from datetime import datetime
 
 # --- First-party imports ---
+from kaihelper.domain.core.item_matching import canonical_item_name
 from kaihelper.domain.models.grocery import Grocery
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.domain.models.grocery_purchase import GroceryPurchase
+from kaihelper.contracts.grocery_dto import GroceryDTO, PricePointDTO
 
 
 class GroceryMapper:
@@ -31,13 +33,82 @@ class GroceryMapper:
             category_id=dto.category_id,
             expense_id=dto.expense_id,
             item_name=dto.item_name,
+            canonical_name=canonical_item_name(dto.item_name) or None,
             unit_price=dto.unit_price,
             quantity=dto.quantity,
             purchase_date=dto.purchase_date,
             notes=dto.notes,
             created_at=dto.created_at or datetime.now(),
-            updated_at=dto.updated_at or datetime.now(),
+            # Always the server's write time: the sync change feed is ordered by it
+            updated_at=datetime.now(),
             total_cost=dto.total_cost,
+            local=dto.local,
+        )
+
+    @staticmethod
+    def to_row(dto: GroceryDTO) -> dict:
+        """
+        Convert a GroceryDTO to a plain column mapping for bulk (executemany) inserts.
+
+        Args:
+            dto (GroceryDTO): Data transfer object representing grocery details.
+
+        Returns:
+            dict: Column name to value mapping for the ``groceries`` table.
+        """
+        now = datetime.now()
+        return {
+            "user_id": dto.user_id,
+            "category_id": dto.category_id,
+            "expense_id": dto.expense_id,
+            "item_name": dto.item_name,
+            "canonical_name": canonical_item_name(dto.item_name) or None,
+            "unit_price": dto.unit_price,
+            "quantity": dto.quantity,
+            "purchase_date": dto.purchase_date,
+            "notes": dto.notes,
+            "created_at": dto.created_at or now,
+            "updated_at": now,
+            "receipt_image": dto.receipt_image,
+            "total_cost": dto.total_cost,
+            "local": dto.local,
+        }
+
+    @staticmethod
+    def to_purchase_row(grocery, store_name: str | None, expense_id: int | None) -> dict:
+        """
+        Build a ``grocery_purchases`` row for bulk (executemany) inserts.
+
+        Args:
+            grocery (Grocery | GroceryDTO): Saved grocery line (``grocery_id`` set).
+            store_name (str | None): Store of the receipt.
+            expense_id (int | None): Receipt-level expense.
+
+        Returns:
+            dict: Column name to value mapping for the ``grocery_purchases`` table.
+        """
+        return {
+            "grocery_id": grocery.grocery_id,
+            "user_id": grocery.user_id,
+            "expense_id": expense_id,
+            "store_name": store_name,
+            "purchase_date": grocery.purchase_date,
+            "unit_price": grocery.unit_price,
+            "quantity": grocery.quantity,
+            "total_cost": grocery.total_cost or round(grocery.unit_price * grocery.quantity, 2),
+            "created_at": datetime.now(),
+        }
+
+    @staticmethod
+    def to_price_point(model: GroceryPurchase) -> PricePointDTO:
+        """Convert a purchase line to a PricePointDTO."""
+        return PricePointDTO(
+            purchase_date=model.purchase_date,
+            store_name=model.store_name,
+            unit_price=model.unit_price,
+            quantity=model.quantity,
+            total_cost=model.total_cost,
+            expense_id=model.expense_id,
         )
 
     @staticmethod
@@ -80,13 +151,14 @@ class GroceryMapper:
             Grocery: Updated ORM model instance.
         """
         model.item_name = dto.item_name
+        model.canonical_name = canonical_item_name(dto.item_name) or None
         model.unit_price = dto.unit_price
         model.quantity = dto.quantity
         model.category_id = dto.category_id
         model.expense_id = dto.expense_id
         model.purchase_date = dto.purchase_date
         model.notes = dto.notes
-        model.updated_at = dto.updated_at or datetime.now()
+        model.updated_at = datetime.now()
         model.total_cost = dto.total_cost or (dto.unit_price * dto.quantity)
         model.local = dto.local
         return model
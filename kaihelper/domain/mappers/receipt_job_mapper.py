@@ -0,0 +1,39 @@
+"""
+ReceiptJobMapper
+Converts ReceiptJob ORM models to ReceiptJobDTO objects.
+"""
+
+# --- Standard library imports ---
+import json
+
+# --- First-party imports ---
+from kaihelper.domain.models.receipt_job import ReceiptJob
+from kaihelper.contracts.receipt_job_dto import ReceiptJobDTO
+
+
+class ReceiptJobMapper:
+    """Mapper for converting between ReceiptJob model and ReceiptJobDTO."""
+
+    @staticmethod
+    def to_dto(model: ReceiptJob) -> ReceiptJobDTO:
+        """
+        Convert a ReceiptJob ORM model to a ReceiptJobDTO.
+
+        Args:
+            model (ReceiptJob): ORM model instance representing a job record.
+
+        Returns:
+            ReceiptJobDTO: Data transfer object with the decoded result payload.
+        """
+        return ReceiptJobDTO(
+            job_id=model.job_id,
+            user_id=model.user_id,
+            status=model.status,
+            attempts=model.attempts,
+            result=json.loads(model.result) if model.result else None,
+            error=model.error,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            started_at=model.started_at,
+            finished_at=model.finished_at,
+        )
@@ -0,0 +1,84 @@
+"""
+Alembic environment for KaiHelper.
+
+The target metadata is ``Base.metadata`` with every model imported, and the
+database URL comes from Settings (``DB_URL``) unless a caller put one in the
+Alembic config (``sqlalchemy.url``), e.g. ``alembic -x`` or the migrate CLI.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from kaihelper.domain.core.database import Base, DB_URL
+
+# Register every table on Base.metadata (autogenerate compares against it)
+import kaihelper.domain.models.user                   # noqa: F401
+import kaihelper.domain.models.category               # noqa: F401
+import kaihelper.domain.models.grocery                # noqa: F401
+import kaihelper.domain.models.grocery_purchase       # noqa: F401
+import kaihelper.domain.models.budget                 # noqa: F401
+import kaihelper.domain.models.expense                # noqa: F401
+import kaihelper.domain.models.extraction_cache       # noqa: F401
+import kaihelper.domain.models.receipt_job            # noqa: F401
+import kaihelper.domain.models.spending_rollup        # noqa: F401
+import kaihelper.domain.models.sync_tombstone         # noqa: F401
+import kaihelper.domain.models.EmailVerificationCode  # noqa: F401
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _include_name(name, type_, parent_names) -> bool:
+    """Skip the full-text search table (and FTS5's shadow tables): it has no model, see search_index."""
+    return not (type_ == "table" and name and name.startswith("search_documents"))
+
+
+def _url() -> str:
+    return config.get_main_option("sqlalchemy.url") or DB_URL
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL to stdout instead of executing it (``--sql``)."""
+    context.configure(
+        url=_url(),
+        target_metadata=target_metadata,
+        include_name=_include_name,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=_url().startswith("sqlite"),
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _run(connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_name=_include_name,
+        # SQLite cannot ALTER most constraints; batch mode recreates the table instead
+        render_as_batch=connection.dialect.name == "sqlite",
+        compare_type=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations on the caller's connection, or on a dedicated unpooled one."""
+    if (connection := config.attributes.get("connection")) is not None:
+        _run(connection)
+        return
+    with create_engine(_url(), poolclass=pool.NullPool).connect() as connection:
+        _run(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,112 @@
+"""Initial schema: exactly the tables the create_all startup hook used to create.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-17 20:52:40.390743
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0001_initial_schema'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('categories',
+    sa.Column('category_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('category_id')
+    )
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('username', sa.String(length=50), nullable=False),
+    sa.Column('email', sa.String(length=100), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('password', sa.String(length=255), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('budgets',
+    sa.Column('budget_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_budget', sa.Float(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('remaining_balance', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('budget_id')
+    )
+    op.create_table('email_verification_codes',
+    sa.Column('code_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('code', sa.String(length=10), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('code_id')
+    )
+    op.create_table('expenses',
+    sa.Column('expense_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('expense_date', sa.Date(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('receipt_image', sa.String(length=255), nullable=True),
+    sa.Column('notes', sa.String(length=500), nullable=True),
+    sa.Column('store_name', sa.String(length=150), nullable=True),
+    sa.Column('store_address', sa.String(length=255), nullable=True),
+    sa.Column('receipt_number', sa.String(length=100), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('currency', sa.String(length=10), nullable=True),
+    sa.Column('subtotal_amount', sa.Float(), nullable=True),
+    sa.Column('tax_amount', sa.Float(), nullable=True),
+    sa.Column('discount_amount', sa.Float(), nullable=True),
+    sa.Column('due_date', sa.Date(), nullable=True),
+    sa.Column('suggestion', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('expense_id')
+    )
+    op.create_table('groceries',
+    sa.Column('grocery_id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('expense_id', sa.Integer(), nullable=True),
+    sa.Column('item_name', sa.String(length=100), nullable=False),
+    sa.Column('unit_price', sa.Float(), nullable=False),
+    sa.Column('quantity', sa.Float(), nullable=False),
+    sa.Column('purchase_date', sa.Date(), nullable=False),
+    sa.Column('notes', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('receipt_image', sa.String(length=255), nullable=True),
+    sa.Column('total_cost', sa.Float(), nullable=False),
+    sa.Column('local', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.category_id'], ),
+    sa.ForeignKeyConstraint(['expense_id'], ['expenses.expense_id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('grocery_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('groceries')
+    op.drop_table('expenses')
+    op.drop_table('email_verification_codes')
+    op.drop_table('budgets')
+    op.drop_table('users')
+    op.drop_table('categories')
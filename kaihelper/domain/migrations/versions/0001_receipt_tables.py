@@ -0,0 +1,66 @@
+"""Receipt extraction cache and background receipt jobs.
+
+These tables are newer than the ``create_all`` baseline, so databases stamped
+with 0001_initial_schema get them here.
+
+Revision ID: 0001_receipt_tables
+Revises: 0001_initial_schema
+Create Date: 2026-10-17 20:53:10.114502
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '0001_receipt_tables'
+down_revision: Union[str, None] = '0001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _exists(table: str) -> bool:
+    # Earlier builds of 0001_initial_schema created both tables already
+    return not context.is_offline_mode() and sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade() -> None:
+    if not _exists('receipt_extraction_cache'):
+        op.create_table('receipt_extraction_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('phash', sa.String(length=16), nullable=True),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key')
+        )
+        op.create_index(op.f('ix_receipt_extraction_cache_last_hit_at'), 'receipt_extraction_cache', ['last_hit_at'], unique=False)
+        op.create_index(op.f('ix_receipt_extraction_cache_phash'), 'receipt_extraction_cache', ['phash'], unique=False)
+    if not _exists('receipt_jobs'):
+        op.create_table('receipt_jobs',
+        sa.Column('job_id', sa.String(length=36), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('image', sa.LargeBinary(length=16777216), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.String(length=500), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('job_id')
+        )
+        op.create_index(op.f('ix_receipt_jobs_status'), 'receipt_jobs', ['status'], unique=False)
+        op.create_index(op.f('ix_receipt_jobs_user_id'), 'receipt_jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_receipt_jobs_user_id'), table_name='receipt_jobs')
+    op.drop_index(op.f('ix_receipt_jobs_status'), table_name='receipt_jobs')
+    op.drop_table('receipt_jobs')
+    op.drop_index(op.f('ix_receipt_extraction_cache_phash'), table_name='receipt_extraction_cache')
+    op.drop_index(op.f('ix_receipt_extraction_cache_last_hit_at'), table_name='receipt_extraction_cache')
+    op.drop_table('receipt_extraction_cache')
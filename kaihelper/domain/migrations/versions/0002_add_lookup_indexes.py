@@ -0,0 +1,49 @@
+"""Secondary indexes for the repository lookup paths.
+
+Revision ID: 0002_add_lookup_indexes
+Revises: 0001_receipt_tables
+Create Date: 2026-10-17 20:54:28.846338
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0002_add_lookup_indexes'
+down_revision: Union[str, None] = '0001_receipt_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_budgets_user_id_budget_id', 'budgets', ['user_id', 'budget_id'], unique=False)
+    op.create_index('ix_categories_name', 'categories', ['name'], unique=False)
+    op.create_index(op.f('ix_email_verification_codes_user_id'), 'email_verification_codes', ['user_id'], unique=False)
+    op.create_index('ix_expenses_user_store_date', 'expenses', ['user_id', 'store_name', 'expense_date'], unique=False)
+    op.create_index('ix_expenses_category_id', 'expenses', ['category_id'], unique=False)
+    op.create_index('ix_groceries_user_item_name', 'groceries', ['user_id', 'item_name'], unique=False)
+    op.create_index('ix_groceries_expense_id', 'groceries', ['expense_id'], unique=False)
+    op.create_index('ix_groceries_category_id', 'groceries', ['category_id'], unique=False)
+
+    # Create the composites before dropping the single-column indexes:
+    # MySQL refuses to drop the last index backing the user_id foreign key.
+    op.create_index('ix_receipt_jobs_user_id_created_at', 'receipt_jobs', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_receipt_jobs_status_created_at', 'receipt_jobs', ['status', 'created_at'], unique=False)
+    op.drop_index(op.f('ix_receipt_jobs_user_id'), table_name='receipt_jobs')
+    op.drop_index(op.f('ix_receipt_jobs_status'), table_name='receipt_jobs')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_receipt_jobs_status'), 'receipt_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_receipt_jobs_user_id'), 'receipt_jobs', ['user_id'], unique=False)
+    op.drop_index('ix_receipt_jobs_status_created_at', table_name='receipt_jobs')
+    op.drop_index('ix_receipt_jobs_user_id_created_at', table_name='receipt_jobs')
+
+    op.drop_index('ix_groceries_category_id', table_name='groceries')
+    op.drop_index('ix_groceries_expense_id', table_name='groceries')
+    op.drop_index('ix_groceries_user_item_name', table_name='groceries')
+    op.drop_index('ix_expenses_category_id', table_name='expenses')
+    op.drop_index('ix_expenses_user_store_date', table_name='expenses')
+    op.drop_index(op.f('ix_email_verification_codes_user_id'), table_name='email_verification_codes')
+    op.drop_index('ix_categories_name', table_name='categories')
+    op.drop_index('ix_budgets_user_id_budget_id', table_name='budgets')
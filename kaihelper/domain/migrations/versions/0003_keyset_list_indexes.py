@@ -0,0 +1,25 @@
+"""Composite indexes for keyset-paginated expense and grocery lists.
+
+Revision ID: 0003_keyset_list_indexes
+Revises: 0002_add_lookup_indexes
+Create Date: 2026-10-17 21:20:11.502144
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0003_keyset_list_indexes'
+down_revision: Union[str, None] = '0002_add_lookup_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_expenses_user_date_id', 'expenses', ['user_id', 'expense_date', 'expense_id'], unique=False)
+    op.create_index('ix_groceries_user_date_id', 'groceries', ['user_id', 'purchase_date', 'grocery_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_groceries_user_date_id', table_name='groceries')
+    op.drop_index('ix_expenses_user_date_id', table_name='expenses')
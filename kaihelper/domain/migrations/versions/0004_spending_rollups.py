@@ -0,0 +1,63 @@
+"""Monthly spending rollup tables, backfilled from expenses.
+
+Revision ID: 0004_spending_rollups
+Revises: 0003_keyset_list_indexes
+Create Date: 2026-10-17 22:05:41.118205
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0004_spending_rollups'
+down_revision: Union[str, None] = '0003_keyset_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month(dialect_name: str) -> str:
+    if dialect_name == 'sqlite':
+        return "strftime('%Y-%m', expense_date)"
+    if dialect_name == 'postgresql':
+        return "to_char(expense_date, 'YYYY-MM')"
+    return "date_format(expense_date, '%Y-%m')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        'rollup_category_months',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('category_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'category_id'),
+    )
+    op.create_table(
+        'rollup_store_months',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('store_name', sa.String(length=150), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('expense_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'store_name'),
+    )
+
+    # Backfill from existing expenses (``kaihelper-rollups rebuild`` does the same later on)
+    month = _month(op.get_context().dialect.name)
+    op.execute(
+        f"INSERT INTO rollup_category_months (user_id, month, category_id, total, expense_count) "
+        f"SELECT user_id, {month}, category_id, SUM(amount), COUNT(*) FROM expenses "
+        f"GROUP BY user_id, {month}, category_id"
+    )
+    op.execute(
+        f"INSERT INTO rollup_store_months (user_id, month, store_name, total, expense_count) "
+        f"SELECT user_id, {month}, COALESCE(store_name, ''), SUM(amount), COUNT(*) FROM expenses "
+        f"GROUP BY user_id, {month}, COALESCE(store_name, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_store_months')
+    op.drop_table('rollup_category_months')
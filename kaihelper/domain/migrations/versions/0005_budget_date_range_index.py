@@ -0,0 +1,23 @@
+"""Composite index for the budget covering an expense date.
+
+Revision ID: 0005_budget_date_range_index
+Revises: 0004_spending_rollups
+Create Date: 2026-10-17 21:10:10.115776
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '0005_budget_date_range_index'
+down_revision: Union[str, None] = '0004_spending_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_budgets_user_dates', 'budgets', ['user_id', 'start_date', 'end_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_budgets_user_dates', table_name='budgets')
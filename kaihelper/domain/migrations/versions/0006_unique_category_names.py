@@ -0,0 +1,80 @@
+"""Unique category names; existing duplicates are merged into the oldest row.
+
+Revision ID: 0006_unique_category_names
+Revises: 0005_budget_date_range_index
+Create Date: 2026-10-17 21:42:37.904113
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0006_unique_category_names'
+down_revision: Union[str, None] = '0005_budget_date_range_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _month(dialect_name: str) -> str:
+    if dialect_name == 'sqlite':
+        return "strftime('%Y-%m', expense_date)"
+    if dialect_name == 'postgresql':
+        return "to_char(expense_date, 'YYYY-MM')"
+    return "date_format(expense_date, '%Y-%m')"
+
+
+# Categories that share their name with an older row
+_DUPLICATE_IDS = (
+    "SELECT c.category_id FROM categories c "
+    "JOIN categories k ON k.name = c.name AND k.category_id < c.category_id"
+)
+# The oldest category of each name that has duplicates
+_KEPT_IDS = "SELECT MIN(category_id) FROM categories GROUP BY name HAVING COUNT(*) > 1"
+
+
+def _merge_duplicates(dialect_name: str) -> None:
+    """
+    Point expenses/groceries at the oldest category of each name and drop the others.
+
+    Set-based statements only (no reads in Python), so ``upgrade --sql``
+    renders the same merge as an online upgrade.
+    """
+    oldest = (
+        "(SELECT MIN(k.category_id) FROM categories k JOIN categories c ON k.name = c.name "
+        "WHERE c.category_id = {table}.category_id)"
+    )
+    for table in ('expenses', 'groceries'):
+        op.execute(
+            f"UPDATE {table} SET category_id = {oldest.format(table=table)} "
+            f"WHERE category_id IN ({_DUPLICATE_IDS})"
+        )
+
+    # Recompute the category rollups of the merged categories
+    month = _month(dialect_name)
+    op.execute(
+        f"DELETE FROM rollup_category_months WHERE category_id IN ({_DUPLICATE_IDS}) "
+        f"OR category_id IN ({_KEPT_IDS})"
+    )
+    op.execute(
+        f"INSERT INTO rollup_category_months (user_id, month, category_id, total, expense_count) "
+        f"SELECT user_id, {month}, category_id, SUM(amount), COUNT(*) FROM expenses "
+        f"WHERE category_id IN ({_KEPT_IDS}) GROUP BY user_id, {month}, category_id"
+    )
+
+    # MySQL cannot delete from a table its subquery reads; the grouped derived table is materialized first
+    op.execute(
+        f"DELETE FROM categories WHERE category_id IN "
+        f"(SELECT category_id FROM ({_DUPLICATE_IDS} GROUP BY c.category_id) duplicates)"
+    )
+
+
+def upgrade() -> None:
+    _merge_duplicates(op.get_context().dialect.name)
+    op.drop_index('ix_categories_name', table_name='categories')
+    op.create_index('ix_categories_name', 'categories', ['name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_categories_name', table_name='categories')
+    op.create_index('ix_categories_name', 'categories', ['name'], unique=False)
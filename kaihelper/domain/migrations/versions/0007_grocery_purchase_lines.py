@@ -0,0 +1,55 @@
+"""Append-only grocery purchase lines, backfilled from groceries.
+
+Revision ID: 0007_grocery_purchase_lines
+Revises: 0006_unique_category_names
+Create Date: 2026-10-17 21:21:01.313448
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0007_grocery_purchase_lines'
+down_revision: Union[str, None] = '0006_unique_category_names'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'grocery_purchases',
+        sa.Column('purchase_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('grocery_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expense_id', sa.Integer(), nullable=True),
+        sa.Column('store_name', sa.String(length=150), nullable=True),
+        sa.Column('purchase_date', sa.Date(), nullable=False),
+        sa.Column('unit_price', sa.Float(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('total_cost', sa.Float(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['expense_id'], ['expenses.expense_id']),
+        sa.ForeignKeyConstraint(['grocery_id'], ['groceries.grocery_id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('purchase_id'),
+    )
+    op.create_index('ix_grocery_purchases_item_date', 'grocery_purchases', ['grocery_id', 'purchase_date'], unique=False)
+    op.create_index('ix_grocery_purchases_user_store_date', 'grocery_purchases', ['user_id', 'store_name', 'purchase_date'], unique=False)
+    op.create_index('ix_grocery_purchases_expense_id', 'grocery_purchases', ['expense_id'], unique=False)
+
+    # Earlier prices were overwritten; each grocery contributes its last known purchase
+    op.execute(
+        "INSERT INTO grocery_purchases "
+        "(grocery_id, user_id, expense_id, store_name, purchase_date, unit_price, quantity, total_cost, created_at) "
+        "SELECT g.grocery_id, g.user_id, g.expense_id, e.store_name, g.purchase_date, g.unit_price, g.quantity, "
+        "COALESCE(g.total_cost, g.unit_price * g.quantity), COALESCE(g.updated_at, g.created_at) "
+        "FROM groceries g LEFT JOIN expenses e ON e.expense_id = g.expense_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_grocery_purchases_expense_id', table_name='grocery_purchases')
+    op.drop_index('ix_grocery_purchases_user_store_date', table_name='grocery_purchases')
+    op.drop_index('ix_grocery_purchases_item_date', table_name='grocery_purchases')
+    op.drop_table('grocery_purchases')
@@ -0,0 +1,44 @@
+"""Canonical grocery item names for exact and fuzzy item matching.
+
+Revision ID: 0008_canonical_grocery_item_name
+Revises: 0007_grocery_purchase_lines
+Create Date: 2026-10-17 21:26:12.799464
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from kaihelper.domain.core.logger import get_logger
+
+
+revision: str = '0008_canonical_grocery_item_name'
+down_revision: Union[str, None] = '0007_grocery_purchase_lines'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _note_backfill() -> None:
+    """
+    canonical_name is left NULL here. The key is computed by application code
+    that keeps evolving (abbreviations, sizes), and a migration must not import
+    it; ``kaihelper-item-names backfill`` fills the column once the schema is
+    at this revision, and items stay unmatched until it has run.
+    """
+    note = "groceries.canonical_name is not backfilled: run kaihelper-item-names backfill after this migration"
+    if context.is_offline_mode():
+        op.execute(f"-- {note}")
+    else:
+        get_logger("Migrations").warning(note)
+
+
+def upgrade() -> None:
+    op.add_column('groceries', sa.Column('canonical_name', sa.String(length=100), nullable=True))
+    _note_backfill()
+    op.create_index('ix_groceries_user_canonical_name', 'groceries', ['user_id', 'canonical_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_groceries_user_canonical_name', table_name='groceries')
+    with op.batch_alter_table('groceries') as batch_op:
+        batch_op.drop_column('canonical_name')
@@ -0,0 +1,130 @@
+"""Full-text search documents for expenses and grocery items.
+
+SQLite gets an FTS5 virtual table, MySQL an InnoDB table with a FULLTEXT
+index, other databases a plain table (searched with LIKE). The table is
+filled from the existing rows with SQL local to this revision (documents as
+``search_index`` built them at the time), so later model changes cannot
+break it. An offline script (``upgrade --sql``) creates the table empty;
+run ``kaihelper-search-index rebuild`` after applying it.
+
+Revision ID: 0009_search_documents
+Revises: 0008_canonical_grocery_item_name
+Create Date: 2026-10-17 22:05:40.118274
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+revision: str = '0009_search_documents'
+down_revision: Union[str, None] = '0008_canonical_grocery_item_name'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_CHUNK = 1000
+_COLUMNS = ('owner', 'title', 'body', 'doc_type', 'doc_id', 'user_id', 'doc_date')
+
+
+def _join(*parts) -> str:
+    return " ".join(str(part) for part in parts if part)
+
+
+def _receipt_items(bind, expense_ids) -> dict:
+    items = {expense_id: [] for expense_id in expense_ids}
+    rows = bind.execute(
+        sa.text(
+            "SELECT p.expense_id, g.item_name FROM grocery_purchases p "
+            "JOIN groceries g ON g.grocery_id = p.grocery_id "
+            "WHERE p.expense_id IN :ids ORDER BY p.purchase_id"
+        ).bindparams(sa.bindparam('ids', expanding=True)),
+        {'ids': list(expense_ids)},
+    ).all()
+    for expense_id, item_name in rows:
+        items[expense_id].append(item_name)
+    return items
+
+
+def _expense_documents(bind, rows) -> list:
+    items = _receipt_items(bind, [row.expense_id for row in rows])
+    return [{
+        'key': row.expense_id * 2,
+        'owner': f"owner{row.user_id}",
+        'title': (row.store_name or "")[:255],
+        'body': _join(row.description, row.notes, row.receipt_number, *items[row.expense_id]),
+        'doc_type': 'expense',
+        'doc_id': row.expense_id,
+        'user_id': row.user_id,
+        'doc_date': row.expense_date,
+    } for row in rows]
+
+
+def _grocery_documents(bind, rows) -> list:
+    return [{
+        'key': row.grocery_id * 2 + 1,
+        'owner': f"owner{row.user_id}",
+        'title': (row.item_name or "")[:255],
+        'body': _join(
+            row.canonical_name if row.canonical_name != (row.item_name or "").lower() else None, row.notes,
+        ),
+        'doc_type': 'grocery',
+        'doc_id': row.grocery_id,
+        'user_id': row.user_id,
+        'doc_date': row.purchase_date,
+    } for row in rows]
+
+
+def _backfill(dialect: str) -> None:
+    """Index the existing expenses and grocery items, in keyset chunks."""
+    bind = op.get_bind()
+    insert = sa.text(
+        f"INSERT INTO search_documents ({'rowid' if dialect == 'sqlite' else 'doc_key'}, {', '.join(_COLUMNS)}) "
+        f"VALUES (:key, {', '.join(':' + column for column in _COLUMNS)})"
+    )
+    sources = (
+        ("SELECT expense_id, user_id, store_name, description, notes, receipt_number, expense_date "
+         "FROM expenses WHERE expense_id > :last_id ORDER BY expense_id LIMIT :chunk", _expense_documents),
+        ("SELECT grocery_id, user_id, item_name, canonical_name, notes, purchase_date "
+         "FROM groceries WHERE grocery_id > :last_id ORDER BY grocery_id LIMIT :chunk", _grocery_documents),
+    )
+    for query, documents in sources:
+        last_id = 0
+        while rows := bind.execute(sa.text(query), {'last_id': last_id, 'chunk': _CHUNK}).all():
+            bind.execute(insert, documents(bind, rows))
+            last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE search_documents USING fts5("
+            "owner, title, body, doc_type UNINDEXED, doc_id UNINDEXED, user_id UNINDEXED, doc_date UNINDEXED, "
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    else:
+        op.create_table(
+            'search_documents',
+            sa.Column('doc_key', sa.BigInteger(), autoincrement=False, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('doc_type', sa.String(length=10), nullable=False),
+            sa.Column('doc_id', sa.Integer(), nullable=False),
+            sa.Column('doc_date', sa.Date(), nullable=True),
+            sa.Column('owner', sa.String(length=32), nullable=False),
+            sa.Column('title', sa.String(length=255), nullable=True),
+            sa.Column('body', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('doc_key'),
+        )
+        op.create_index('ix_search_documents_user_id', 'search_documents', ['user_id'], unique=False)
+        if dialect in ('mysql', 'mariadb'):
+            op.execute("CREATE FULLTEXT INDEX ft_search_documents ON search_documents (owner, title, body)")
+
+    if context.is_offline_mode():
+        op.execute("-- search_documents is not backfilled: run kaihelper-search-index rebuild after this script")
+    else:
+        _backfill(dialect)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE search_documents")
@@ -0,0 +1,44 @@
+"""Change tracking for the sync API: updated_at indexes and deletion tombstones.
+
+Revision ID: 0010_sync_change_tracking
+Revises: 0009_search_documents
+Create Date: 2026-10-17 23:41:08.215730
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0010_sync_change_tracking'
+down_revision: Union[str, None] = '0009_search_documents'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows never updated have no updated_at; the change feed orders by it
+    op.execute("UPDATE groceries SET updated_at = created_at WHERE updated_at IS NULL")
+    op.create_index('ix_expenses_user_updated_id', 'expenses', ['user_id', 'updated_at', 'expense_id'], unique=False)
+    op.create_index('ix_groceries_user_updated_id', 'groceries', ['user_id', 'updated_at', 'grocery_id'], unique=False)
+
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('tombstone_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('tombstone_id'),
+    )
+    op.create_index('ix_sync_tombstones_user_deleted_id', 'sync_tombstones', ['user_id', 'deleted_at', 'tombstone_id'], unique=False)
+    op.create_index('ix_sync_tombstones_deleted_at', 'sync_tombstones', ['deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_tombstones_deleted_at', table_name='sync_tombstones')
+    op.drop_index('ix_sync_tombstones_user_deleted_id', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+    op.drop_index('ix_groceries_user_updated_id', table_name='groceries')
+    op.drop_index('ix_expenses_user_updated_id', table_name='expenses')
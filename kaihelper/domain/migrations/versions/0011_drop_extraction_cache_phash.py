@@ -0,0 +1,26 @@
+"""Drop the perceptual-hash column from the receipt extraction cache.
+
+Revision ID: 0011_drop_extraction_cache_phash
+Revises: 0010_sync_change_tracking
+Create Date: 2026-10-18 09:12:44.508117
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0011_drop_extraction_cache_phash'
+down_revision: Union[str, None] = '0010_sync_change_tracking'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_receipt_extraction_cache_phash'), table_name='receipt_extraction_cache')
+    op.drop_column('receipt_extraction_cache', 'phash')
+
+
+def downgrade() -> None:
+    op.add_column('receipt_extraction_cache', sa.Column('phash', sa.String(length=16), nullable=True))
+    op.create_index(op.f('ix_receipt_extraction_cache_phash'), 'receipt_extraction_cache', ['phash'], unique=False)
@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, Date
+from sqlalchemy import Column, Integer, Float, ForeignKey, Date, Index
 from kaihelper.domain.core.database import Base
 
 class Budget(Base):
     """Represents a user's budget period."""
     __tablename__ = "budgets"
+    __table_args__ = (
+        # Per-user lookups, newest budget first
+        Index("ix_budgets_user_id_budget_id", "user_id", "budget_id"),
+        # Budget(s) covering a date (expense charges, current budget)
+        Index("ix_budgets_user_dates", "user_id", "start_date", "end_date"),
+    )
 
     budget_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,10 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy import Column, Integer, String, DateTime, Index, func
 from kaihelper.domain.core.database import Base
 from sqlalchemy.orm import relationship
 
 class Category(Base):
     """Represents a grocery category."""
     __tablename__ = "categories"
+    # Unique: concurrent receipt imports must not create the same category twice
+    __table_args__ = (Index("ix_categories_name", "name", unique=True),)
 
     category_id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(100), nullable=False)
@@ -5,7 +5,7 @@ for receipt tracking and analytics.
 """
 
 # --- Third-party imports ---
-from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, Date, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 # --- First-party imports ---
 from kaihelper.domain.core.database import Base
@@ -43,6 +43,15 @@ class Expense(Base):
     """
 
     __tablename__ = "expenses"
+    __table_args__ = (
+        # check_exist / receipt merge lookup; its user_id prefix serves per-user listings
+        Index("ix_expenses_user_store_date", "user_id", "store_name", "expense_date"),
+        Index("ix_expenses_category_id", "category_id"),
+        # Keyset pages: WHERE user_id = ? ORDER BY expense_date DESC, expense_id DESC
+        Index("ix_expenses_user_date_id", "user_id", "expense_date", "expense_id"),
+        # Sync change feed: WHERE user_id = ? AND (updated_at, expense_id) > (?, ?)
+        Index("ix_expenses_user_updated_id", "user_id", "updated_at", "expense_id"),
+    )
 
     # --- Core fields ---
     expense_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -69,5 +78,7 @@ class Expense(Base):
     suggestion = Column(String(255), nullable=True)
 
     # --- Relationships ---
-    category = relationship("Category", back_populates="expenses", lazy="joined")
-    groceries = relationship("Grocery", back_populates="expense", lazy="joined")
\ No newline at end of file
+    # Loaded per query (joinedload for category, selectinload for groceries) rather than
+    # always: a default joined collection multiplies every expense row by its groceries.
+    category = relationship("Category", back_populates="expenses")
+    groceries = relationship("Grocery", back_populates="expense")
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+ExtractionCacheEntry ORM Model
+Stores parsed receipt extractions keyed by a hash of the normalized image bytes.
+"""
+
+from sqlalchemy import Column, String, Text, Integer, DateTime
+from kaihelper.domain.core.database import Base
+
+
+class ExtractionCacheEntry(Base):
+    """Cached vision extraction result for a normalized receipt image."""
+
+    __tablename__ = "receipt_extraction_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    payload = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    last_hit_at = Column(DateTime, nullable=False, index=True)
@@ -1,10 +1,22 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from kaihelper.domain.core.database import Base
 
 class Grocery(Base):
     """Represents a grocery item purchased by a user."""
     __tablename__ = "groceries"
+    __table_args__ = (
+        # get_by_name and the receipt upsert's IN (...) lookup; also serves get_all(user_id)
+        Index("ix_groceries_user_item_name", "user_id", "item_name"),
+        # Exact item matching by canonical key; covers loading a user's name index
+        Index("ix_groceries_user_canonical_name", "user_id", "canonical_name"),
+        Index("ix_groceries_expense_id", "expense_id"),
+        Index("ix_groceries_category_id", "category_id"),
+        # Keyset pages: WHERE user_id = ? ORDER BY purchase_date DESC, grocery_id DESC
+        Index("ix_groceries_user_date_id", "user_id", "purchase_date", "grocery_id"),
+        # Sync change feed: WHERE user_id = ? AND (updated_at, grocery_id) > (?, ?)
+        Index("ix_groceries_user_updated_id", "user_id", "updated_at", "grocery_id"),
+    )
 
     grocery_id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -12,6 +24,8 @@ class Grocery(Base):
     expense_id = Column(Integer, ForeignKey("expenses.expense_id"), nullable=True)
     
     item_name = Column(String(100), nullable=False)
+    # Matching key of item_name (kaihelper.domain.core.item_matching.canonical_item_name)
+    canonical_name = Column(String(100), nullable=True)
     unit_price = Column(Float, nullable=False)
     quantity = Column(Float, nullable=False)
     purchase_date = Column(Date, nullable=False)
@@ -0,0 +1,35 @@
+"""
+GroceryPurchase ORM Model
+Append-only purchase lines: one row per grocery item on a receipt, so the
+price an item was bought at is kept for every purchase instead of being
+overwritten on the per-user ``groceries`` row (the item dimension).
+"""
+
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, Date, DateTime, Index
+from kaihelper.domain.core.database import Base
+
+
+class GroceryPurchase(Base):
+    """One purchase of a grocery item: where, when, at what unit price and quantity."""
+
+    __tablename__ = "grocery_purchases"
+    __table_args__ = (
+        # Price trend of one item: WHERE grocery_id = ? AND purchase_date BETWEEN ? AND ?
+        Index("ix_grocery_purchases_item_date", "grocery_id", "purchase_date"),
+        # Price trend per store: WHERE user_id = ? AND store_name = ? AND purchase_date BETWEEN ? AND ?
+        Index("ix_grocery_purchases_user_store_date", "user_id", "store_name", "purchase_date"),
+        # Replacing a merged receipt's lines and deleting an expense's lines
+        Index("ix_grocery_purchases_expense_id", "expense_id"),
+    )
+
+    purchase_id = Column(Integer, primary_key=True, autoincrement=True)
+    grocery_id = Column(Integer, ForeignKey("groceries.grocery_id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    expense_id = Column(Integer, ForeignKey("expenses.expense_id"), nullable=True)
+
+    store_name = Column(String(150), nullable=True)
+    purchase_date = Column(Date, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    quantity = Column(Float, nullable=False)
+    total_cost = Column(Float, nullable=False)
+    created_at = Column(DateTime, nullable=False)
@@ -0,0 +1,41 @@
+"""
+ReceiptJob ORM Model
+Durable state for asynchronous receipt ingestion jobs.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, LargeBinary, Index
+from kaihelper.domain.core.database import Base
+
+
+class ReceiptJob(Base):
+    """
+    A queued receipt upload processed by a background worker.
+
+    Attributes:
+        job_id (str): UUID of the job (returned to the client for polling).
+        user_id (int): Owner of the uploaded receipt.
+        status (str): queued | running | succeeded | failed.
+        image (bytes | None): Preprocessed image bytes; cleared once the job finishes.
+        attempts (int): Number of times a worker has claimed the job.
+        result (str | None): JSON-encoded ReceiptUploadResponseDTO on success.
+        error (str | None): Failure message on error.
+    """
+
+    __tablename__ = "receipt_jobs"
+    __table_args__ = (
+        # list_by_user (newest first) and list_resumable (oldest queued first)
+        Index("ix_receipt_jobs_user_id_created_at", "user_id", "created_at"),
+        Index("ix_receipt_jobs_status_created_at", "status", "created_at"),
+    )
+
+    job_id = Column(String(36), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String(16), nullable=False, default="queued")
+    image = Column(LargeBinary(length=16 * 1024 * 1024), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text, nullable=True)
+    error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,33 @@
+"""
+Spending rollup ORM Models
+Per-user monthly expense totals, maintained incrementally by every expense
+write (see ``kaihelper.domain.core.rollups``) so analytics reads scale with
+the number of months rather than the number of expenses.
+"""
+
+from sqlalchemy import Column, Integer, Float, String
+from kaihelper.domain.core.database import Base
+
+
+class CategoryMonthRollup(Base):
+    """Expense total and count for one user, month and category."""
+
+    __tablename__ = "rollup_category_months"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    category_id = Column(Integer, primary_key=True, autoincrement=False)
+    total = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
+
+
+class StoreMonthRollup(Base):
+    """Expense total and count for one user, month and store ('' for expenses without a store)."""
+
+    __tablename__ = "rollup_store_months"
+
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    store_name = Column(String(150), primary_key=True)
+    total = Column(Float, nullable=False, default=0.0)
+    expense_count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,26 @@
+"""
+SyncTombstone ORM Model
+Records deleted expenses and grocery items, so the sync API can tell clients
+what to remove without them re-downloading their lists.
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index
+from kaihelper.domain.core.database import Base
+
+
+class SyncTombstone(Base):
+    """One deleted expense or grocery item of a user."""
+
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        # Change feed: WHERE user_id = ? AND (deleted_at, tombstone_id) > (?, ?) ORDER BY deleted_at, tombstone_id
+        Index("ix_sync_tombstones_user_deleted_id", "user_id", "deleted_at", "tombstone_id"),
+        # Pruning: WHERE deleted_at < ?
+        Index("ix_sync_tombstones_deleted_at", "deleted_at"),
+    )
+
+    tombstone_id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # expense | grocery
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False)
@@ -0,0 +1,226 @@
+"""
+AnalyticsRepository
+Spending aggregates computed with GROUP BY queries, so callers receive a few
+rows of totals instead of every expense and grocery. Expense totals over whole
+months are read from the monthly rollup tables.
+"""
+
+# --- Standard library imports ---
+from datetime import timedelta
+from typing import List
+
+# --- Third-party imports ---
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- First-party imports ---
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.spending_rollup import CategoryMonthRollup, StoreMonthRollup
+from kaihelper.domain.core.rollups import month_bucket, month_key
+from kaihelper.contracts.analytics_dto import (
+    AnalyticsQueryDTO, CategoryMonthTotalDTO, LocalShareDTO, StoreTotalDTO, TopItemDTO,
+)
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.domain.interfaces.i_analytics_repository import IAnalyticsRepository
+
+
+def _date_filters(column, query: AnalyticsQueryDTO) -> List:
+    filters = []
+    if query.date_from is not None:
+        filters.append(column >= query.date_from)
+    if query.date_to is not None:
+        filters.append(column <= query.date_to)
+    return filters
+
+
+def _rollup_filters(rollup, query: AnalyticsQueryDTO) -> List | None:
+    """
+    Month filters on a rollup table, or None when the date range does not
+    cover whole months (the rollups cannot answer it; read expenses instead).
+    """
+    if query.date_from is not None and query.date_from.day != 1:
+        return None
+    if query.date_to is not None and (query.date_to + timedelta(days=1)).day != 1:
+        return None
+    filters = []
+    if query.date_from is not None:
+        filters.append(rollup.month >= month_key(query.date_from))
+    if query.date_to is not None:
+        filters.append(rollup.month <= month_key(query.date_to))
+    return filters
+
+
+class AnalyticsRepository(IAnalyticsRepository):
+    """Read-only repository of per-user spending aggregates."""
+
+    def category_monthly_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Sum expenses per category per month.
+
+        Whole-month ranges read ``rollup_category_months``; other ranges group
+        the expenses first and join the (few) groups to categories afterwards,
+        so category names are read once per group.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Expense-date range.
+
+        Returns:
+            ResultDTO: list[CategoryMonthTotalDTO], by month then highest total.
+        """
+        try:
+            with SessionLocal() as db_session:
+                month = month_bucket(Expense.expense_date, db_session.get_bind().dialect.name)
+                if (rollup_filters := _rollup_filters(CategoryMonthRollup, query)) is not None:
+                    grouped = (
+                        select(
+                            CategoryMonthRollup.month, CategoryMonthRollup.category_id,
+                            CategoryMonthRollup.total, CategoryMonthRollup.expense_count,
+                        )
+                        .where(CategoryMonthRollup.user_id == user_id, *rollup_filters)
+                        .subquery()
+                    )
+                else:
+                    grouped = (
+                        select(
+                            month.label("month"),
+                            Expense.category_id.label("category_id"),
+                            func.sum(Expense.amount).label("total"),
+                            func.count().label("expense_count"),
+                        )
+                        .where(Expense.user_id == user_id, *_date_filters(Expense.expense_date, query))
+                        .group_by(month, Expense.category_id)
+                        .subquery()
+                    )
+                stmt = (
+                    select(grouped, Category.name.label("category_name"))
+                    .outerjoin(Category, Category.category_id == grouped.c.category_id)
+                    .order_by(grouped.c.month, grouped.c.total.desc())
+                )
+                data = [
+                    CategoryMonthTotalDTO(
+                        month=row.month, category_id=row.category_id, category_name=row.category_name,
+                        total=round(row.total or 0.0, 2), expense_count=row.expense_count,
+                    )
+                    for row in db_session.execute(stmt)
+                ]
+                return ResultDTO.ok("Category totals retrieved successfully", data)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to compute category totals: {repr(err)}")
+
+    def store_totals(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Sum expenses per store (from ``rollup_store_months`` for whole-month ranges).
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Expense-date range and number of stores.
+
+        Returns:
+            ResultDTO: list[StoreTotalDTO], highest total first.
+        """
+        if (rollup_filters := _rollup_filters(StoreMonthRollup, query)) is not None:
+            total = func.sum(StoreMonthRollup.total)
+            stmt = (
+                select(
+                    func.nullif(StoreMonthRollup.store_name, "").label("store_name"),
+                    total.label("total"),
+                    func.sum(StoreMonthRollup.expense_count).label("expense_count"),
+                )
+                .where(StoreMonthRollup.user_id == user_id, *rollup_filters)
+                .group_by(StoreMonthRollup.store_name)
+            )
+        else:
+            total = func.sum(Expense.amount)
+            stmt = (
+                select(Expense.store_name, total.label("total"), func.count().label("expense_count"))
+                .where(Expense.user_id == user_id, *_date_filters(Expense.expense_date, query))
+                .group_by(Expense.store_name)
+            )
+        stmt = stmt.order_by(total.desc()).limit(query.limit)
+        try:
+            with SessionLocal() as db_session:
+                data = [
+                    StoreTotalDTO(
+                        store_name=row.store_name, total=round(row.total or 0.0, 2),
+                        expense_count=row.expense_count,
+                    )
+                    for row in db_session.execute(stmt)
+                ]
+                return ResultDTO.ok("Store totals retrieved successfully", data)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to compute store totals: {repr(err)}")
+
+    def local_share(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Sum grocery spend by ``Grocery.local`` (True, False or unknown).
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Purchase-date range.
+
+        Returns:
+            ResultDTO: LocalShareDTO.
+        """
+        stmt = (
+            select(Grocery.local, func.sum(Grocery.total_cost).label("total"))
+            .where(Grocery.user_id == user_id, *_date_filters(Grocery.purchase_date, query))
+            .group_by(Grocery.local)
+        )
+        try:
+            with SessionLocal() as db_session:
+                share = LocalShareDTO()
+                for row in db_session.execute(stmt):
+                    total = round(row.total or 0.0, 2)
+                    if row.local is None:
+                        share.unknown_total = total
+                    elif row.local:
+                        share.local_total = total
+                    else:
+                        share.imported_total = total
+                known = share.local_total + share.imported_total
+                if known:
+                    share.local_share = round(share.local_total / known, 4)
+                return ResultDTO.ok("Local share retrieved successfully", share)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to compute local share: {repr(err)}")
+
+    def top_items(self, user_id: int, query: AnalyticsQueryDTO) -> ResultDTO:
+        """
+        Rank grocery items by total cost.
+
+        Args:
+            user_id (int): User identifier.
+            query (AnalyticsQueryDTO): Purchase-date range and number of items.
+
+        Returns:
+            ResultDTO: list[TopItemDTO], highest total cost first.
+        """
+        total = func.sum(Grocery.total_cost)
+        stmt = (
+            select(
+                Grocery.item_name,
+                total.label("total_cost"),
+                func.sum(Grocery.quantity).label("quantity"),
+                func.count().label("purchase_count"),
+            )
+            .where(Grocery.user_id == user_id, *_date_filters(Grocery.purchase_date, query))
+            .group_by(Grocery.item_name)
+            .order_by(total.desc(), Grocery.item_name)
+            .limit(query.limit)
+        )
+        try:
+            with SessionLocal() as db_session:
+                data = [
+                    TopItemDTO(
+                        item_name=row.item_name, total_cost=round(row.total_cost or 0.0, 2),
+                        quantity=row.quantity or 0.0, purchase_count=row.purchase_count,
+                    )
+                    for row in db_session.execute(stmt)
+                ]
+                return ResultDTO.ok("Top items retrieved successfully", data)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to compute top items: {repr(err)}")
@@ -4,13 +4,14 @@ Handles database persistence for Budget entities.
 """
 
 # --- Standard library imports ---
-# (none)
+from datetime import date
 
 # --- Third-party imports ---
 from sqlalchemy.exc import SQLAlchemyError
 
 # --- First-party imports ---
 from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.budget_ledger import covering_budgets_query, current_budgets
 from kaihelper.domain.models.budget import Budget
 from kaihelper.domain.mappers.budget_mapper import BudgetMapper
 from kaihelper.contracts.result_dto import ResultDTO
@@ -35,6 +36,8 @@ class BudgetRepository:
                 model = BudgetMapper.to_model(dto)
                 db_session.add(model)
                 db_session.commit()
+                # The new budget may now be the one covering the user's expenses
+                current_budgets.invalidate(model.user_id)
                 db_session.refresh(model)
                 return ResultDTO.ok(
                     "Budget created successfully",
@@ -63,3 +66,28 @@ class BudgetRepository:
                 )
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to retrieve budgets: {repr(err)}")
+
+    def get_covering_budgets(self, user_id: int, on_date: date) -> ResultDTO:
+        """
+        Retrieve the budgets whose period contains a date, newest first.
+
+        Uses ``ix_budgets_user_dates``; the first entry is the budget expenses
+        on that date are charged to.
+
+        Args:
+            user_id (int): Identifier of the user.
+            on_date (date): Date the period must contain.
+
+        Returns:
+            ResultDTO: Operation result with the (possibly empty) list of budgets.
+        """
+        try:
+            with SessionLocal() as db_session:
+                budgets = db_session.execute(covering_budgets_query(user_id, on_date)).scalars().all()
+                data = [BudgetMapper.to_dto(budget) for budget in budgets]
+                return ResultDTO.ok(
+                    "Budgets retrieved successfully",
+                    data,
+                )
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve budgets: {repr(err)}")
@@ -7,7 +7,8 @@ Handles database persistence and CRUD operations for Category entities.
 # (none)
 
 # --- Third-party imports ---
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 # --- First-party imports ---
 from kaihelper.domain.core.database import SessionLocal
@@ -17,6 +18,27 @@ from kaihelper.contracts.result_dto import ResultDTO
 from kaihelper.contracts.category_dto import CategoryDTO
 
 
+def get_or_create_category(db_session, name: str, description: str | None = None) -> Category:
+    """
+    Return the category called ``name`` within ``db_session``, creating it if missing.
+
+    Category names are unique, so when a concurrent writer inserts the same
+    name first, the insert fails inside its savepoint and the winner's row is
+    returned instead of a duplicate.
+    """
+    lookup = select(Category).where(Category.name == name)
+    category = db_session.execute(lookup).scalars().first()
+    if category:
+        return category
+    try:
+        with db_session.begin_nested():
+            category = Category(name=name, description=description)
+            db_session.add(category)
+        return category
+    except IntegrityError:
+        return db_session.execute(lookup).scalars().one()
+
+
 class CategoryRepository:
     """Repository for CRUD operations on Category entities."""
 
@@ -127,3 +149,24 @@ class CategoryRepository:
                 return ResultDTO.fail("Category not found")
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Error retrieving category: {repr(err)}")
+
+    def get_or_create(self, name: str, description: str | None = None) -> ResultDTO:
+        """
+        Retrieve a category by name, creating it if it does not exist yet.
+
+        Safe against concurrent callers creating the same name.
+
+        Args:
+            name (str): Exact category name.
+            description (str | None): Description used if the category is created.
+
+        Returns:
+            ResultDTO: Operation result containing the category.
+        """
+        try:
+            with SessionLocal() as db_session:
+                category = get_or_create_category(db_session, name, description)
+                db_session.commit()
+                return ResultDTO.ok("Category found", CategoryMapper.to_dto(category))
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to get or create category: {repr(err)}")
@@ -4,17 +4,27 @@ Handles database persistence for Expense entities.
 """
 
 # --- Third-party imports ---
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import SQLAlchemyError
 
 # --- First-party imports ---
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from kaihelper.domain.core.database import SessionLocal
 from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.grocery_purchase import GroceryPurchase
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.core.pagination import build_page, keyset_filters, resolve_fields, resolve_includes
+from kaihelper.domain.core.rollups import ExpenseFacts, apply_expense_change
+from kaihelper.domain.core.change_feed import record_deletions
+from kaihelper.domain.core.search_index import EXPENSE, index_expenses, remove_documents
+from kaihelper.domain.core.budget_ledger import InsufficientBudget, charge_budget
 from kaihelper.domain.mappers.expense_mapper import ExpenseMapper
 from kaihelper.contracts.expense_dto import ExpenseDTO
 from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 from kaihelper.domain.interfaces.i_expense_repository import IExpenseRepository
-from datetime import date
+from datetime import date, datetime
 
 
 class ExpenseRepository(IExpenseRepository):
@@ -24,6 +34,10 @@ class ExpenseRepository(IExpenseRepository):
         """
         Create a new expense record.
 
+        The covering budget is charged and the monthly rollups are updated in
+        the same transaction; if the budget cannot cover the amount nothing is
+        written.
+
         Args:
             dto (ExpenseDTO): Expense data transfer object.
 
@@ -34,12 +48,19 @@ class ExpenseRepository(IExpenseRepository):
             with SessionLocal() as db_session:
                 model = ExpenseMapper.to_model(dto)
                 db_session.add(model)
+                db_session.flush()
+                apply_expense_change(db_session, None, ExpenseFacts.of(model))
+                index_expenses(db_session, [model], {})
+                charged = charge_budget(db_session, model.user_id, model.expense_date, model.amount)
                 db_session.commit()
                 db_session.refresh(model)
                 return ResultDTO.ok(
-                    "Expense added successfully",
+                    "Expense added and budget updated." if charged
+                    else "Expense recorded, but no active budget found.",
                     ExpenseMapper.to_dto(model),
                 )
+        except InsufficientBudget:
+            return ResultDTO.fail("Insufficient budget balance.")
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to add expense: {repr(err)}")
 
@@ -47,6 +68,10 @@ class ExpenseRepository(IExpenseRepository):
         """
         Update an existing expense record.
 
+        The old amount is refunded to the budget covering the old date and the
+        new amount charged to the one covering the new date, and the monthly
+        rollups are moved, all in the same transaction.
+
         Args:
             dto (ExpenseDTO): Updated expense data.
 
@@ -59,48 +84,139 @@ class ExpenseRepository(IExpenseRepository):
                 if not expense:
                     return ResultDTO.fail("Expense not found")
 
+                before = ExpenseFacts.of(expense)
+                old_user_id, old_date, old_amount = expense.user_id, expense.expense_date, expense.amount
                 ExpenseMapper.apply_updates(expense, dto)
+                db_session.flush()
+                apply_expense_change(db_session, before, ExpenseFacts.of(expense))
+                index_expenses(db_session, [expense])
+                charge_budget(db_session, old_user_id, old_date, -old_amount)
+                charge_budget(db_session, expense.user_id, expense.expense_date, expense.amount)
                 db_session.commit()
                 db_session.refresh(expense)
                 return ResultDTO.ok(
-                    "Expense updated successfully",
+                    "Expense updated successfully.",
                     ExpenseMapper.to_dto(expense),
                 )
+        except InsufficientBudget:
+            return ResultDTO.fail("Insufficient budget balance.")
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to update expense: {repr(err)}")
 
-    def get_all(self, user_id: int) -> ResultDTO:
+    @staticmethod
+    def _load_options(include_groceries: bool) -> list:
+        """
+        Loader options per query: the category (many-to-one) rides along in the
+        same SELECT; groceries (one-to-many) come from one extra ``IN (...)``
+        SELECT, and only when asked for.
+        """
+        options = [joinedload(Expense.category)]
+        if include_groceries:
+            options.append(selectinload(Expense.groceries))
+        return options
+
+    def get_all(self, user_id: int, include_groceries: bool = False) -> ResultDTO:
         """
         Retrieve all expenses for a given user.
 
         Args:
             user_id (int): User identifier.
+            include_groceries (bool): Also load each expense's grocery lines.
 
         Returns:
             ResultDTO: List of expenses.
         """
         try:
             with SessionLocal() as db_session:
-                expenses = db_session.query(Expense).options(joinedload(Expense.category)).filter_by(user_id=user_id).all()
-                data = [ExpenseMapper.to_dto(expense) for expense in expenses]
+                expenses = (
+                    db_session.query(Expense)
+                    .options(*self._load_options(include_groceries))
+                    .filter_by(user_id=user_id)
+                    .all()
+                )
+                data = [ExpenseMapper.to_dto(expense, include_groceries) for expense in expenses]
                 return ResultDTO.ok("Expenses retrieved successfully", data)
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to retrieve expenses: {repr(err)}")
 
-    def get_by_id(self, expense_id: int) -> ResultDTO:
-        """Retrieve an expense by ID, with category eager loading."""
+    def get_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """
+        Retrieve one keyset page of a user's expenses, newest first.
+
+        Only the requested columns are selected (no ORM entities, no eager
+        loads); ``categories`` is joined only when ``category_name`` is asked for.
+        ``include=groceries`` embeds each expense's lines, fetched with one
+        extra ``IN (...)`` query over the page rather than a row-multiplying join.
+
+        Args:
+            user_id (int): User identifier.
+            query (PageQueryDTO): Page size, cursor, date range and field projection.
+
+        Returns:
+            ResultDTO: PageDTO of expense dicts, or a failure for invalid input.
+        """
+        available = {column.key: column for column in Expense.__table__.c}
+        available["category_name"] = Category.name
+        try:
+            fields = resolve_fields(query.fields, available, always=("expense_id",))
+            includes = resolve_includes(query.include, ("groceries",))
+            filters = keyset_filters(query, Expense.expense_date, Expense.expense_id)
+        except ValueError as err:
+            return ResultDTO.fail(str(err), code=400)
+
+        columns = [available[name].label(name) for name in fields]
+        if "expense_date" not in fields:
+            columns.append(Expense.expense_date.label("expense_date"))
+        stmt = (
+            select(*columns)
+            .select_from(Expense)
+            .where(Expense.user_id == user_id, *filters)
+            .order_by(Expense.expense_date.desc(), Expense.expense_id.desc())
+        )
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit + 1)
+        if "category_name" in fields:
+            stmt = stmt.outerjoin(Category, Category.category_id == Expense.category_id)
+
+        try:
+            with SessionLocal() as db_session:
+                rows = db_session.execute(stmt).all()
+                page = build_page(rows, query.limit, fields, "expense_date", "expense_id")
+                if "groceries" in includes:
+                    self._embed_groceries(db_session, page.items)
+                return ResultDTO.ok("Expenses retrieved successfully", page)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve expenses: {repr(err)}", code=500)
+
+    @staticmethod
+    def _embed_groceries(db_session, items: list) -> None:
+        """Attach ``groceries`` (list of column dicts) to each page item with a single query."""
+        by_expense = {item["expense_id"]: [] for item in items}
+        if by_expense:
+            rows = db_session.execute(
+                select(Grocery.__table__)
+                .where(Grocery.expense_id.in_(list(by_expense)))
+                .order_by(Grocery.grocery_id)
+            ).all()
+            for row in rows:
+                by_expense[row.expense_id].append(dict(row._mapping))
+        for item in items:
+            item["groceries"] = by_expense[item["expense_id"]]
+
+    def get_by_id(self, expense_id: int, include_groceries: bool = False) -> ResultDTO:
+        """Retrieve an expense by ID with its category, and its groceries when requested."""
         try:
             with SessionLocal() as db_session:
                 expense = (
                     db_session.query(Expense)
-                    .options(joinedload(Expense.category))
+                    .options(*self._load_options(include_groceries))
                     .filter(Expense.expense_id == expense_id)
                     .first()
                 )
                 if expense:
                     return ResultDTO.ok(
                         "Expense retrieved successfully",
-                        ExpenseMapper.to_dto(expense)
+                        ExpenseMapper.to_dto(expense, include_groceries)
                     )
                 return ResultDTO.fail("Expense not found")
         except SQLAlchemyError as err:
@@ -118,7 +234,14 @@ class ExpenseRepository(IExpenseRepository):
         """
         try:
             with SessionLocal() as db_session:
-                expense = db_session.query(Expense).options(joinedload(Expense.category)).filter_by(grocery_id=grocery_id).first()
+                # Expenses carry no grocery_id; the link is groceries.expense_id
+                expense = (
+                    db_session.query(Expense)
+                    .options(joinedload(Expense.category))
+                    .join(Grocery, Grocery.expense_id == Expense.expense_id)
+                    .filter(Grocery.grocery_id == grocery_id)
+                    .first()
+                )
                 if expense:
                     return ResultDTO.ok(
                         "Expense found",
@@ -130,13 +253,14 @@ class ExpenseRepository(IExpenseRepository):
 
     def delete(self, expense_id: int) -> ResultDTO:
         """
-        Delete an expense record by ID.
+        Delete an expense record by ID, refunding its budget and taking it out
+        of the monthly rollups in the same transaction.
 
         Args:
             expense_id (int): Expense identifier.
 
         Returns:
-            ResultDTO: Operation result.
+            ResultDTO: Operation result with the deleted expense.
         """
         try:
             with SessionLocal() as db_session:
@@ -144,9 +268,23 @@ class ExpenseRepository(IExpenseRepository):
                 if not expense:
                     return ResultDTO.fail("Expense not found")
 
+                apply_expense_change(db_session, ExpenseFacts.of(expense), None)
+                charge_budget(db_session, expense.user_id, expense.expense_date, -expense.amount)
+                # The receipt's purchase lines go with it; the grocery items stay. They are
+                # detached here rather than by the ORM's FK nulling on delete, which would not
+                # stamp updated_at and so hide the change from delta sync
+                db_session.execute(delete(GroceryPurchase).where(GroceryPurchase.expense_id == expense_id))
+                db_session.execute(
+                    update(Grocery)
+                    .where(Grocery.expense_id == expense_id)
+                    .values(expense_id=None, updated_at=datetime.now())
+                )
+                remove_documents(db_session, EXPENSE, [expense_id])
+                record_deletions(db_session, EXPENSE, expense.user_id, [expense_id])
+                deleted = ExpenseMapper.to_dto(expense)
                 db_session.delete(expense)
                 db_session.commit()
-                return ResultDTO.ok("Expense deleted successfully")
+                return ResultDTO.ok("Expense deleted and budget restored.", deleted)
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to delete expense: {repr(err)}")
     
@@ -165,6 +303,7 @@ class ExpenseRepository(IExpenseRepository):
             with SessionLocal() as db_session:
                 expense = (
                     db_session.query(Expense)
+                    .options(joinedload(Expense.category))
                     .filter_by(user_id=user_id, store_name=store_name, expense_date=expense_date)
                     .first()
                 )
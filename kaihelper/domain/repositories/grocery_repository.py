@@ -1,20 +1,76 @@
 """
 GroceryRepository
 Handles database persistence for Grocery entities.
+
+A ``groceries`` row is the user's item (name, latest price); every purchase of
+it is also appended to ``grocery_purchases`` so its price history is kept.
 """
 
+# --- Standard library imports ---
+from typing import Iterable, Optional
+
 # --- Third-party imports ---
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.exc import SQLAlchemyError
 
 # --- First-party imports ---
 from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.item_matching import canonical_item_name, item_indexes
+from kaihelper.domain.core.change_feed import record_deletions
+from kaihelper.domain.core.search_index import GROCERY, index_expenses, index_groceries, remove_documents
+from kaihelper.domain.models.expense import Expense
 from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.grocery_purchase import GroceryPurchase
+from kaihelper.domain.core.pagination import build_page, keyset_filters, resolve_fields, resolve_includes
 from kaihelper.domain.mappers.grocery_mapper import GroceryMapper
-from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO, PriceHistoryDTO, PriceHistoryQueryDTO, StorePriceDTO
 from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
 from kaihelper.domain.interfaces.i_grocery_repository import IGroceryRepository
 
 
+def record_purchases(
+    db_session,
+    groceries: Iterable,
+    store_name: Optional[str],
+    expense_id: Optional[int],
+    replace: bool = False,
+) -> int:
+    """
+    Append one purchase line per saved grocery with a single executemany INSERT.
+
+    Args:
+        db_session: Session of the caller's unit of work (not committed here).
+        groceries (Iterable[Grocery | GroceryDTO]): Saved lines with ``grocery_id`` set.
+        store_name (str | None): Store of the receipt.
+        expense_id (int | None): Receipt-level expense.
+        replace (bool): First drop the expense's earlier lines (a receipt merged
+            into an existing expense replaces its lines instead of duplicating them).
+
+    Returns:
+        int: Number of lines written.
+    """
+    if replace and expense_id is not None:
+        db_session.execute(delete(GroceryPurchase).where(GroceryPurchase.expense_id == expense_id))
+    rows = [GroceryMapper.to_purchase_row(grocery, store_name, expense_id) for grocery in groceries]
+    if rows:
+        db_session.execute(insert(GroceryPurchase), rows)
+    return len(rows)
+
+
+def _match_by_canonical_name(db_session, user_id: int, item_name: str) -> Optional[Grocery]:
+    """The user's grocery matching ``item_name`` through the item index, or None."""
+    found = item_indexes.match(db_session, user_id, canonical_item_name(item_name))
+    if found is None:
+        return None
+    grocery_id, key = found
+    grocery = db_session.get(Grocery, grocery_id)
+    if grocery is None or grocery.canonical_name != key:
+        item_indexes.invalidate(user_id)
+        return None
+    return grocery
+
+
 class GroceryRepository(IGroceryRepository):
     """Repository for CRUD operations on Grocery entities."""
 
@@ -32,8 +88,11 @@ class GroceryRepository(IGroceryRepository):
             with SessionLocal() as db_session:
                 model = GroceryMapper.to_model(dto)
                 db_session.add(model)
+                db_session.flush()
+                index_groceries(db_session, [model])
                 db_session.commit()
                 db_session.refresh(model)
+                item_indexes.add(model.user_id, [(model.grocery_id, model.canonical_name)])
                 return ResultDTO.ok(
                     "Grocery added successfully",
                     GroceryMapper.to_dto(model),
@@ -59,8 +118,12 @@ class GroceryRepository(IGroceryRepository):
                 if not grocery:
                     return ResultDTO.fail("Grocery not found")
 
+                canonical_name = grocery.canonical_name
                 GroceryMapper.apply_updates(grocery, dto)
+                index_groceries(db_session, [grocery])
                 db_session.commit()
+                if grocery.canonical_name != canonical_name:
+                    item_indexes.invalidate(grocery.user_id)
                 db_session.refresh(grocery)
                 return ResultDTO.ok(
                     "Grocery updated successfully",
@@ -73,6 +136,9 @@ class GroceryRepository(IGroceryRepository):
         """
         Retrieve a grocery item by its name for a specific user.
 
+        An exact name is looked up first; otherwise the name is matched by its
+        canonical key, or a misspelling of it, through the user's item index.
+
         Args:
             user_id (int): User identifier.
             item_name (str): Item name to search for.
@@ -85,6 +151,8 @@ class GroceryRepository(IGroceryRepository):
                 grocery = db_session.query(Grocery).filter_by(
                     user_id=user_id, item_name=item_name
                 ).first()
+                if grocery is None:
+                    grocery = _match_by_canonical_name(db_session, user_id, item_name)
                 if grocery:
                     return ResultDTO.ok(
                         "Grocery found",
@@ -112,6 +180,44 @@ class GroceryRepository(IGroceryRepository):
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to retrieve groceries: {repr(err)}")
 
+    def get_page(self, user_id: int, query: PageQueryDTO) -> ResultDTO:
+        """
+        Retrieve one keyset page of a user's groceries, newest purchase first.
+
+        Args:
+            user_id (int): User identifier.
+            query (PageQueryDTO): Page size, cursor, purchase-date range and field projection.
+
+        Returns:
+            ResultDTO: PageDTO of grocery dicts, or a failure for invalid input.
+        """
+        available = {column.key: column for column in Grocery.__table__.c}
+        try:
+            fields = resolve_fields(query.fields, available, always=("grocery_id",))
+            resolve_includes(query.include, ())
+            filters = keyset_filters(query, Grocery.purchase_date, Grocery.grocery_id)
+        except ValueError as err:
+            return ResultDTO.fail(str(err), code=400)
+
+        columns = [available[name].label(name) for name in fields]
+        if "purchase_date" not in fields:
+            columns.append(Grocery.purchase_date.label("purchase_date"))
+        stmt = (
+            select(*columns)
+            .where(Grocery.user_id == user_id, *filters)
+            .order_by(Grocery.purchase_date.desc(), Grocery.grocery_id.desc())
+        )
+        if query.limit is not None:
+            stmt = stmt.limit(query.limit + 1)
+
+        try:
+            with SessionLocal() as db_session:
+                rows = db_session.execute(stmt).all()
+                page = build_page(rows, query.limit, fields, "purchase_date", "grocery_id")
+                return ResultDTO.ok("Groceries retrieved successfully", page)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve groceries: {repr(err)}", code=500)
+
     def get_by_id(self, grocery_id: int) -> ResultDTO:
         """
         Retrieve a grocery record by its ID.
@@ -134,6 +240,98 @@ class GroceryRepository(IGroceryRepository):
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to retrieve grocery: {repr(err)}")
 
+    def add_purchases(self, expense_id: Optional[int], store_name: Optional[str], groceries: list[GroceryDTO]) -> ResultDTO:
+        """
+        Record the purchase lines of one receipt, replacing earlier lines of the same expense.
+
+        Args:
+            expense_id (int | None): Receipt-level expense.
+            store_name (str | None): Store of the receipt.
+            groceries (list[GroceryDTO]): Saved grocery lines (``grocery_id`` set).
+
+        Returns:
+            ResultDTO: Number of lines written.
+        """
+        try:
+            with SessionLocal() as db_session:
+                written = record_purchases(db_session, groceries, store_name, expense_id, replace=True)
+                if expense_id is not None and (expense := db_session.get(Expense, expense_id)) is not None:
+                    # The receipt's document lists its items
+                    index_expenses(db_session, [expense])
+                db_session.commit()
+                return ResultDTO.ok("Purchases recorded", written)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to record purchases: {repr(err)}")
+
+    def get_price_history(self, grocery_id: int, query: PriceHistoryQueryDTO) -> ResultDTO:
+        """
+        Retrieve an item's purchases (the most recent ``query.limit``, oldest
+        first) and per-store unit-price statistics over the whole range.
+
+        Both reads seek ``ix_grocery_purchases_item_date``.
+
+        Args:
+            grocery_id (int): Grocery identifier.
+            query (PriceHistoryQueryDTO): Date range, store and point limit.
+
+        Returns:
+            ResultDTO: PriceHistoryDTO or not found message.
+        """
+        filters = [GroceryPurchase.grocery_id == grocery_id]
+        if query.date_from:
+            filters.append(GroceryPurchase.purchase_date >= query.date_from)
+        if query.date_to:
+            filters.append(GroceryPurchase.purchase_date <= query.date_to)
+        if query.store_name:
+            filters.append(GroceryPurchase.store_name == query.store_name)
+
+        try:
+            with SessionLocal() as db_session:
+                item_name = db_session.execute(
+                    select(Grocery.item_name).where(Grocery.grocery_id == grocery_id)
+                ).scalar()
+                if item_name is None:
+                    return ResultDTO.fail("Grocery not found")
+
+                purchases = db_session.execute(
+                    select(GroceryPurchase)
+                    .where(*filters)
+                    .order_by(GroceryPurchase.purchase_date.desc(), GroceryPurchase.purchase_id.desc())
+                    .limit(query.limit)
+                ).scalars().all()
+
+                avg_price = func.avg(GroceryPurchase.unit_price)
+                store_rows = db_session.execute(
+                    select(
+                        GroceryPurchase.store_name,
+                        func.count(),
+                        func.min(GroceryPurchase.unit_price),
+                        func.max(GroceryPurchase.unit_price),
+                        avg_price,
+                        func.max(GroceryPurchase.purchase_date),
+                    )
+                    .where(*filters)
+                    .group_by(GroceryPurchase.store_name)
+                    .order_by(avg_price)
+                ).all()
+
+                history = PriceHistoryDTO(
+                    grocery_id=grocery_id,
+                    item_name=item_name,
+                    points=[GroceryMapper.to_price_point(model) for model in reversed(purchases)],
+                    stores=[
+                        StorePriceDTO(
+                            store_name=store, purchase_count=count,
+                            min_unit_price=low, max_unit_price=high,
+                            avg_unit_price=round(avg, 2), last_purchase_date=last,
+                        )
+                        for store, count, low, high, avg, last in store_rows
+                    ],
+                )
+                return ResultDTO.ok("Price history retrieved successfully", history)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve price history: {repr(err)}")
+
     def delete(self, grocery_id: int) -> ResultDTO:
         """
         Delete a grocery record by its ID.
@@ -142,7 +340,7 @@ class GroceryRepository(IGroceryRepository):
             grocery_id (int): Grocery identifier.
 
         Returns:
-            ResultDTO: Operation result.
+            ResultDTO: Operation result with the deleted grocery.
         """
         try:
             with SessionLocal() as db_session:
@@ -150,9 +348,14 @@ class GroceryRepository(IGroceryRepository):
                 if not grocery:
                     return ResultDTO.fail("Grocery not found")
 
+                db_session.execute(delete(GroceryPurchase).where(GroceryPurchase.grocery_id == grocery_id))
+                remove_documents(db_session, GROCERY, [grocery_id])
+                record_deletions(db_session, GROCERY, grocery.user_id, [grocery_id])
+                deleted = GroceryMapper.to_dto(grocery)
                 db_session.delete(grocery)
                 db_session.commit()
-                return ResultDTO.ok("Grocery deleted successfully")
+                item_indexes.invalidate(grocery.user_id)
+                return ResultDTO.ok("Grocery deleted successfully", deleted)
         except SQLAlchemyError as err:
             return ResultDTO.fail(f"Failed to delete grocery: {repr(err)}")
         
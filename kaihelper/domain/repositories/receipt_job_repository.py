@@ -0,0 +1,268 @@
+"""
+ReceiptJobRepository
+Handles durable state for asynchronous receipt ingestion jobs.
+"""
+
+# --- Standard library imports ---
+import uuid
+from datetime import datetime, timedelta
+
+# --- Third-party imports ---
+from sqlalchemy import update
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- First-party imports ---
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.models.receipt_job import ReceiptJob
+from kaihelper.domain.mappers.receipt_job_mapper import ReceiptJobMapper
+from kaihelper.domain.interfaces.i_receipt_job_repository import IReceiptJobRepository
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class ReceiptJobRepository(IReceiptJobRepository):
+    """Repository for creating, claiming and finishing receipt jobs."""
+
+    def create(self, user_id: int, image_bytes: bytes) -> ResultDTO:
+        """
+        Insert a new queued job.
+
+        Args:
+            user_id (int): Owner of the receipt.
+            image_bytes (bytes): Preprocessed image bytes to process.
+
+        Returns:
+            ResultDTO: Operation result containing the created ReceiptJobDTO.
+        """
+        try:
+            with SessionLocal() as db_session:
+                now = datetime.now()
+                model = ReceiptJob(
+                    job_id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    status="queued",
+                    image=image_bytes,
+                    attempts=0,
+                    created_at=now,
+                    updated_at=now,
+                )
+                db_session.add(model)
+                db_session.commit()
+                return ResultDTO.ok("Receipt job queued", ReceiptJobMapper.to_dto(model), code=202)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to queue receipt job: {repr(err)}")
+
+    def get_by_id(self, job_id: str) -> ResultDTO:
+        """
+        Retrieve a job by its ID.
+
+        Args:
+            job_id (str): Job identifier.
+
+        Returns:
+            ResultDTO: Job data or not found message.
+        """
+        try:
+            with SessionLocal() as db_session:
+                job = db_session.get(ReceiptJob, job_id)
+                if job:
+                    return ResultDTO.ok("Receipt job found", ReceiptJobMapper.to_dto(job))
+                return ResultDTO.fail("Receipt job not found", code=404)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve receipt job: {repr(err)}")
+
+    def list_by_user(self, user_id: int, limit: int = 20) -> ResultDTO:
+        """
+        Retrieve the most recent jobs of a user.
+
+        Args:
+            user_id (int): User identifier.
+            limit (int): Maximum number of jobs returned.
+
+        Returns:
+            ResultDTO: List of jobs, newest first.
+        """
+        try:
+            with SessionLocal() as db_session:
+                jobs = (
+                    db_session.query(ReceiptJob)
+                    .filter_by(user_id=user_id)
+                    .order_by(ReceiptJob.created_at.desc())
+                    .limit(limit)
+                    .all()
+                )
+                data = [ReceiptJobMapper.to_dto(job) for job in jobs]
+                return ResultDTO.ok("Receipt jobs retrieved successfully", data)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to retrieve receipt jobs: {repr(err)}")
+
+    def claim(self, job_id: str) -> ResultDTO:
+        """
+        Atomically move a queued job to ``running``.
+
+        The conditional UPDATE guarantees only one worker wins the job even
+        when the same ID is delivered twice (e.g. SQS at-least-once delivery).
+
+        Args:
+            job_id (str): Job identifier.
+
+        Returns:
+            ResultDTO: ``{"user_id", "image", "attempts"}`` when claimed, failure otherwise.
+        """
+        try:
+            with SessionLocal() as db_session:
+                now = datetime.now()
+                claimed = db_session.execute(
+                    update(ReceiptJob)
+                    .where(ReceiptJob.job_id == job_id, ReceiptJob.status == "queued")
+                    .values(
+                        status="running",
+                        attempts=ReceiptJob.attempts + 1,
+                        started_at=now,
+                        updated_at=now,
+                    )
+                ).rowcount
+                db_session.commit()
+                if not claimed:
+                    return ResultDTO.fail("Receipt job is not queued", code=409)
+
+                job = db_session.get(ReceiptJob, job_id)
+                return ResultDTO.ok(
+                    "Receipt job claimed",
+                    {"user_id": job.user_id, "image": job.image, "attempts": job.attempts},
+                )
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to claim receipt job: {repr(err)}")
+
+    def heartbeat(self, job_id: str) -> ResultDTO:
+        """
+        Refresh ``updated_at`` of a running job so it is not taken for abandoned.
+
+        Args:
+            job_id (str): Job identifier.
+
+        Returns:
+            ResultDTO: Operation result.
+        """
+        try:
+            with SessionLocal() as db_session:
+                db_session.execute(
+                    update(ReceiptJob)
+                    .where(ReceiptJob.job_id == job_id, ReceiptJob.status == "running")
+                    .values(updated_at=datetime.now())
+                )
+                db_session.commit()
+                return ResultDTO.ok("Receipt job heartbeat recorded")
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to record receipt job heartbeat: {repr(err)}")
+
+    def complete(self, job_id: str, result_json: str) -> ResultDTO:
+        """
+        Mark a job as succeeded and release its image bytes.
+
+        Args:
+            job_id (str): Job identifier.
+            result_json (str): JSON-encoded receipt summary.
+
+        Returns:
+            ResultDTO: Operation result.
+        """
+        return self._finish(job_id, status="succeeded", result=result_json, error=None)
+
+    def fail(self, job_id: str, error: str, retry: bool = False) -> ResultDTO:
+        """
+        Record a failed attempt.
+
+        Args:
+            job_id (str): Job identifier.
+            error (str): Failure reason (truncated to the column size).
+            retry (bool): Put the job back to ``queued`` instead of failing it for good.
+
+        Returns:
+            ResultDTO: Operation result.
+        """
+        if retry:
+            try:
+                with SessionLocal() as db_session:
+                    db_session.execute(
+                        update(ReceiptJob)
+                        .where(ReceiptJob.job_id == job_id)
+                        .values(status="queued", error=error[:500], updated_at=datetime.now())
+                    )
+                    db_session.commit()
+                    return ResultDTO.ok("Receipt job re-queued")
+            except SQLAlchemyError as err:
+                return ResultDTO.fail(f"Failed to re-queue receipt job: {repr(err)}")
+        return self._finish(job_id, status="failed", result=None, error=error[:500])
+
+    def list_resumable(self, stale_after_seconds: int, max_attempts: int) -> ResultDTO:
+        """
+        Settle running jobs whose worker stopped heartbeating and return the IDs
+        whose delivery was lost.
+
+        An abandoned job that already used ``max_attempts`` (e.g. one that
+        crashes its worker every time) is failed instead of re-queued.
+
+        Args:
+            stale_after_seconds (int): Age after which a job is considered abandoned.
+            max_attempts (int): Attempts before an abandoned job is failed for good.
+
+        Returns:
+            ResultDTO: List of job IDs to (re)submit, oldest first.
+        """
+        try:
+            with SessionLocal() as db_session:
+                now = datetime.now()
+                cutoff = now - timedelta(seconds=stale_after_seconds)
+                abandoned = (ReceiptJob.status == "running", ReceiptJob.updated_at < cutoff)
+                db_session.execute(
+                    update(ReceiptJob)
+                    .where(*abandoned, ReceiptJob.attempts >= max_attempts)
+                    .values(
+                        status="failed",
+                        error="Worker stopped before finishing the job",
+                        image=None,
+                        updated_at=now,
+                        finished_at=now,
+                    )
+                )
+                # updated_at stays stale, so the select below picks them up
+                db_session.execute(
+                    update(ReceiptJob)
+                    .where(*abandoned, ReceiptJob.attempts < max_attempts)
+                    .values(status="queued")
+                )
+                db_session.commit()
+                # Recently queued jobs are still on their way through the queue
+                # (or waiting out a retry delay); only stale ones were lost
+                job_ids = [
+                    job_id for (job_id,) in db_session.query(ReceiptJob.job_id)
+                    .filter(ReceiptJob.status == "queued", ReceiptJob.updated_at < cutoff)
+                    .order_by(ReceiptJob.created_at)
+                    .all()
+                ]
+                return ResultDTO.ok("Resumable receipt jobs retrieved", job_ids)
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to list resumable receipt jobs: {repr(err)}")
+
+    @staticmethod
+    def _finish(job_id: str, status: str, result: str | None, error: str | None) -> ResultDTO:
+        """Move a job to a final state and drop the stored image."""
+        try:
+            with SessionLocal() as db_session:
+                now = datetime.now()
+                db_session.execute(
+                    update(ReceiptJob)
+                    .where(ReceiptJob.job_id == job_id)
+                    .values(
+                        status=status,
+                        result=result,
+                        error=error,
+                        image=None,
+                        updated_at=now,
+                        finished_at=now,
+                    )
+                )
+                db_session.commit()
+                return ResultDTO.ok(f"Receipt job {status}")
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to finish receipt job: {repr(err)}")
@@ -0,0 +1,287 @@
+"""
+ReceiptRepository
+Unit-of-work persistence for scanned receipts: resolves the category, writes the
+receipt-level expense, adjusts the active budget, upserts every grocery line,
+appends its purchase lines (price history) and updates the search index in one
+session and one commit.
+"""
+
+# --- Standard library imports ---
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# --- Third-party imports ---
+from sqlalchemy import insert, or_
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- First-party imports ---
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.rollups import ExpenseFacts, apply_expense_change
+from kaihelper.domain.core.budget_ledger import InsufficientBudget, charge_budget
+from kaihelper.domain.core.item_matching import canonical_item_name, item_indexes
+from kaihelper.domain.core.search_index import index_receipt
+from kaihelper.domain.core.tracing import span
+from kaihelper.domain.repositories.category_repository import get_or_create_category
+from kaihelper.domain.repositories.grocery_repository import record_purchases
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.mappers.expense_mapper import ExpenseMapper
+from kaihelper.domain.mappers.grocery_mapper import GroceryMapper
+from kaihelper.domain.interfaces.i_receipt_repository import IReceiptRepository
+from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO
+from kaihelper.contracts.receipt_dto import SavedReceiptDTO
+from kaihelper.contracts.result_dto import ResultDTO
+
+
+class ReceiptRepository(IReceiptRepository):
+    """Repository that persists a whole receipt in a single transaction."""
+
+    def save_receipt(
+        self,
+        category_name: str,
+        expense: ExpenseDTO,
+        groceries: List[GroceryDTO],
+        category_id: Optional[int] = None,
+    ) -> ResultDTO:
+        """
+        Persist a receipt as one unit of work.
+
+        The category is resolved (or created) unless the caller already knows
+        its ID, the expense is merged with an
+        existing one for the same user/store/date or inserted, the covering
+        budget is adjusted, and all groceries are upserted by canonical item name
+        using a single ``IN (...)`` lookup. Nothing is committed unless every step succeeds.
+
+        Args:
+            category_name (str): Normalized category name for the receipt.
+            expense (ExpenseDTO): Receipt-level expense (``category_id`` is filled in here).
+            groceries (list[GroceryDTO]): Grocery lines; later duplicates of an item win.
+            category_id (int | None): ID of ``category_name`` when already resolved
+                (e.g. from the category service's cache); looked up here otherwise.
+
+        Returns:
+            ResultDTO: Operation result containing a SavedReceiptDTO.
+        """
+        try:
+            with SessionLocal() as db_session:
+                saved = self._save_one(db_session, category_name, expense, groceries, category_id)
+                db_session.commit()
+                return ResultDTO.ok("Receipt saved successfully", saved)
+        except InsufficientBudget:
+            return ResultDTO.fail("Insufficient budget balance.")
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to save receipt: {repr(err)}")
+
+    def save_receipts(
+        self,
+        receipts: List[Tuple[str, ExpenseDTO, List[GroceryDTO], Optional[int]]],
+    ) -> List[ResultDTO]:
+        """
+        Persist many receipts in one session and one commit.
+
+        Each receipt runs inside its own SAVEPOINT, so a receipt that fails
+        (e.g. insufficient budget) is rolled back on its own while the rest of
+        the batch is still committed together.
+
+        Args:
+            receipts (list[tuple[str, ExpenseDTO, list[GroceryDTO], int | None]]):
+                ``(category_name, expense, groceries, category_id)`` per receipt
+                (see ``save_receipt``).
+
+        Returns:
+            list[ResultDTO]: One result per receipt, in input order.
+        """
+        results: List[ResultDTO] = []
+        try:
+            with SessionLocal() as db_session:
+                for category_name, expense, groceries, category_id in receipts:
+                    try:
+                        with db_session.begin_nested():
+                            saved = self._save_one(db_session, category_name, expense, groceries, category_id)
+                        results.append(ResultDTO.ok("Receipt saved successfully", saved))
+                    except InsufficientBudget:
+                        results.append(ResultDTO.fail("Insufficient budget balance."))
+                    except SQLAlchemyError as err:
+                        results.append(ResultDTO.fail(f"Failed to save receipt: {repr(err)}"))
+                db_session.commit()
+                return results
+        except SQLAlchemyError as err:
+            # The outer commit failed: nothing from this batch was persisted
+            return [ResultDTO.fail(f"Failed to save receipt batch: {repr(err)}") for _ in receipts]
+
+    def _save_one(
+        self,
+        db_session,
+        category_name: str,
+        expense: ExpenseDTO,
+        groceries: List[GroceryDTO],
+        category_id: Optional[int] = None,
+    ) -> SavedReceiptDTO:
+        """Run every unit-of-work step for one receipt inside ``db_session``."""
+        if category_id is None:
+            with span("receipt.category", category=category_name):
+                category_id = self._resolve_category(db_session, category_name).category_id
+        expense.category_id = category_id
+
+        with span("receipt.expense", amount=expense.amount) as current:
+            expense_model, amount_delta, merged = self._upsert_expense(db_session, expense)
+            current.set_attribute("merged", merged)
+            charge_budget(db_session, expense.user_id, expense.expense_date, amount_delta)
+
+        with span("receipt.groceries", items=len(groceries)):
+            grocery_models = self._upsert_groceries(
+                db_session, expense.user_id, category_id,
+                expense_model.expense_id, groceries,
+            )
+            record_purchases(
+                db_session, grocery_models, expense_model.store_name,
+                expense_model.expense_id, replace=merged,
+            )
+
+        with span("receipt.search_index"):
+            index_receipt(db_session, expense_model, grocery_models)
+
+        # Build DTOs before commit so the objects are not expired
+        # and reloaded one by one.
+        return SavedReceiptDTO(
+            category_id=category_id,
+            expense=ExpenseMapper.to_dto(expense_model),
+            groceries=[GroceryMapper.to_dto(model) for model in grocery_models],
+        )
+
+    # ------------------------------------------------------------------
+    # Unit-of-work steps (all share the caller's session)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _resolve_category(db_session, name: str) -> Category:
+        """Return the category with the given name, creating it if missing."""
+        return get_or_create_category(
+            db_session, name, f"Auto-added category from receipt import: {name}",
+        )
+
+    @staticmethod
+    def _upsert_expense(db_session, dto: ExpenseDTO) -> tuple[Expense, float, bool]:
+        """
+        Merge into an existing expense for the same user/store/date or insert a
+        new one, moving the monthly rollups along with it.
+
+        Returns:
+            tuple[Expense, float, bool]: The persisted model, the amount change to
+            apply to the budget, and whether an existing expense was merged into.
+        """
+        existing = (
+            db_session.query(Expense)
+            .filter_by(user_id=dto.user_id, store_name=dto.store_name, expense_date=dto.expense_date)
+            .first()
+        )
+        if existing:
+            delta = dto.amount - (existing.amount or 0.0)
+            before = ExpenseFacts.of(existing)
+            dto.expense_id = existing.expense_id
+            dto.notes = f"{existing.notes or ''} | Merged with new receipt data"
+            ExpenseMapper.apply_updates(existing, dto)
+            db_session.flush()
+            apply_expense_change(db_session, before, ExpenseFacts.of(existing))
+            return existing, delta, True
+
+        model = ExpenseMapper.to_model(dto)
+        db_session.add(model)
+        db_session.flush()
+        apply_expense_change(db_session, None, ExpenseFacts.of(model))
+        return model, dto.amount, False
+
+    @staticmethod
+    def _upsert_groceries(
+        db_session,
+        user_id: int,
+        category_id: int,
+        expense_id: int,
+        groceries: List[GroceryDTO],
+    ) -> List[Grocery]:
+        """
+        Insert or update all grocery lines with a constant number of statements.
+
+        Lines are keyed by canonical item name and matched to the user's items
+        through the in-memory item index (exact key, then misspellings of it);
+        one ``IN (...)`` lookup loads the matched rows plus any row with an
+        unmatched key written since the index was loaded. Matched items keep
+        their saved name. Then one batched UPDATE, one executemany INSERT and
+        one re-select of the inserted rows.
+        """
+        by_key: Dict[str, GroceryDTO] = {}
+        for dto in groceries:
+            by_key[canonical_item_name(dto.item_name)] = dto
+        if not by_key:
+            return []
+
+        matched: Dict[str, Tuple[int, str]] = {}
+        for key in by_key:
+            if (found := item_indexes.match(db_session, user_id, key)) is not None:
+                matched[key] = found
+        unmatched = [key for key in by_key if key not in matched]
+        existing_rows = (
+            db_session.query(Grocery)
+            .filter(
+                Grocery.user_id == user_id,
+                or_(
+                    Grocery.grocery_id.in_([grocery_id for grocery_id, _ in matched.values()]),
+                    Grocery.canonical_name.in_(unmatched),
+                ),
+            )
+            .order_by(Grocery.grocery_id)
+            .all()
+        )
+        by_id = {row.grocery_id: row for row in existing_rows}
+        by_canonical: Dict[str, Grocery] = {}
+        for row in existing_rows:
+            by_canonical.setdefault(row.canonical_name, row)
+
+        now = datetime.now()
+        models: Dict[str, Grocery] = {}
+        new_rows: Dict[str, dict] = {}
+        for key, dto in by_key.items():
+            dto.user_id = user_id
+            dto.category_id = category_id
+            dto.expense_id = expense_id
+            dto.updated_at = now
+            model = by_canonical.get(key)
+            if model is None and key in matched:
+                grocery_id, indexed_key = matched[key]
+                model = by_id.get(grocery_id)
+                if model is None or model.canonical_name != indexed_key:
+                    # Renamed, deleted or rolled back since the index was loaded
+                    item_indexes.invalidate(user_id)
+                    model = None
+            if model is not None:
+                dto.grocery_id = model.grocery_id
+                dto.item_name = model.item_name
+                GroceryMapper.apply_updates(model, dto)
+                models[key] = model
+            else:
+                dto.created_at = dto.created_at or now
+                new_rows[key] = GroceryMapper.to_row(dto)
+
+        # Dirty models are flushed as one executemany UPDATE
+        db_session.flush()
+        if new_rows:
+            db_session.execute(insert(Grocery), list(new_rows.values()))
+            inserted = (
+                db_session.query(Grocery)
+                .filter(Grocery.user_id == user_id, Grocery.canonical_name.in_(list(new_rows)))
+                .order_by(Grocery.grocery_id)
+                .all()
+            )
+            for row in inserted:
+                models.setdefault(row.canonical_name, row)
+            item_indexes.add(user_id, [(models[key].grocery_id, key) for key in new_rows if key in models])
+
+        # Lines matched to the same item collapse into it (the later line wins)
+        saved: Dict[int, Grocery] = {}
+        for key in by_key:
+            if (model := models.get(key)) is not None:
+                saved[model.grocery_id] = model
+        return list(saved.values())
+
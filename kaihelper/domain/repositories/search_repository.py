@@ -0,0 +1,68 @@
+"""
+SearchRepository
+Full-text search over a user's expenses and grocery items, answered by the
+``search_documents`` index (FTS5 on SQLite, FULLTEXT on MySQL) in one query.
+"""
+
+# --- Standard library imports ---
+from datetime import date
+
+# --- Third-party imports ---
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- First-party imports ---
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.pagination import decode_offset_cursor, encode_offset_cursor
+from kaihelper.domain.core.search_index import DOC_TYPES, query_terms, search
+from kaihelper.contracts.search_dto import SearchHitDTO, SearchPageDTO, SearchQueryDTO
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.domain.interfaces.i_search_repository import ISearchRepository
+
+
+def _as_date(value) -> date | None:
+    # FTS5 columns are untyped: dates come back as ISO strings
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+class SearchRepository(ISearchRepository):
+    """Read-only repository over the full-text search index."""
+
+    def search(self, user_id: int, query: SearchQueryDTO) -> ResultDTO:
+        """
+        Rank the user's expenses and grocery items matching every word of the query.
+
+        Args:
+            user_id (int): User identifier.
+            query (SearchQueryDTO): Words, document types, page size and cursor.
+
+        Returns:
+            ResultDTO: SearchPageDTO (best first; ``limit + 1`` rows are read to
+            know whether another page exists).
+        """
+        terms = query_terms(query.q)
+        if not terms:
+            return ResultDTO.fail("Search query has no words.")
+        try:
+            offset = decode_offset_cursor(query.cursor) if query.cursor else 0
+        except ValueError as err:
+            return ResultDTO.fail(str(err))
+
+        try:
+            with SessionLocal() as db_session:
+                rows = search(
+                    db_session, user_id, terms, query.types or DOC_TYPES, query.limit + 1, offset,
+                )
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to search: {repr(err)}")
+
+        hits = [
+            SearchHitDTO(
+                type=row.doc_type, id=int(row.doc_id), date=_as_date(row.doc_date),
+                title=row.title or "", text=row.body or "", score=round(float(row.score or 0.0), 6),
+            )
+            for row in rows[:query.limit]
+        ]
+        next_cursor = encode_offset_cursor(offset + query.limit) if len(rows) > query.limit else None
+        return ResultDTO.ok("Search completed", SearchPageDTO(hits=hits, next_cursor=next_cursor))
@@ -0,0 +1,117 @@
+"""
+SyncRepository
+Delta sync for the mobile client: a user's expenses and grocery items created,
+updated or deleted since a sync token, read from the ``updated_at`` indexes
+and the deletion tombstones (see ``kaihelper.domain.core.change_feed``).
+"""
+
+# --- Standard library imports ---
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# --- Third-party imports ---
+from sqlalchemy.exc import SQLAlchemyError
+
+# --- First-party imports ---
+from kaihelper.config.settings import settings
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.change_feed import (
+    DELETED, EXPENSE, EXPENSES, GROCERIES, GROCERY, STREAMS,
+    SyncToken, read_stream, reused_ids, row_position, stream_columns,
+)
+from kaihelper.contracts.sync_dto import SyncBatchDTO, SyncQueryDTO, SyncTableDTO
+from kaihelper.contracts.result_dto import ResultDTO
+from kaihelper.domain.interfaces.i_sync_repository import ISyncRepository
+
+_DELETED_KEYS = {EXPENSE: EXPENSES, GROCERY: GROCERIES}
+
+
+class SyncRepository(ISyncRepository):
+    """Read-only repository over the sync change feed."""
+
+    def __init__(self, settle_seconds: Optional[int] = None, retention_days: Optional[int] = None) -> None:
+        """
+        Args:
+            settle_seconds (int | None): Changes younger than this wait for the next
+                sync (SYNC_SETTLE_SECONDS by default).
+            retention_days (int | None): Tokens older than this are refused
+                (SYNC_TOMBSTONE_RETENTION_DAYS by default).
+        """
+        self._settle = timedelta(seconds=settings.SYNC_SETTLE_SECONDS if settle_seconds is None else settle_seconds)
+        self._retention = timedelta(
+            days=settings.SYNC_TOMBSTONE_RETENTION_DAYS if retention_days is None else retention_days
+        )
+
+    def changes(self, user_id: int, query: SyncQueryDTO) -> ResultDTO:
+        """
+        The user's rows changed since ``query.since`` (everything when None).
+
+        Args:
+            user_id (int): User identifier.
+            query (SyncQueryDTO): Token and batch size.
+
+        Returns:
+            ResultDTO: SyncBatchDTO; code 410 when the token is older than the
+            tombstone retention (the client must sync from scratch).
+        """
+        now = datetime.now()
+        horizon = now - self._settle
+        if query.since:
+            try:
+                token = SyncToken.decode(query.since)
+            except ValueError as err:
+                return ResultDTO.fail(str(err))
+            if token.horizon < now - self._retention:
+                return ResultDTO.fail("Sync token expired; sync from scratch.", code=410)
+            if token.positions is None:
+                # A new round, strictly after the last one
+                positions = {name: (token.horizon, None) for name in STREAMS}
+                horizon = max(horizon, token.horizon)
+            else:
+                positions = dict(token.positions)
+                horizon = token.horizon
+        else:
+            # A full sync has nothing to delete
+            positions = {EXPENSES: None, GROCERIES: None, DELETED: (horizon, None)}
+
+        try:
+            with SessionLocal() as db_session:
+                batches = {
+                    name: read_stream(db_session, name, user_id, positions[name], horizon, query.limit + 1)
+                    for name in STREAMS
+                }
+                has_more = False
+                for name, rows in batches.items():
+                    if len(rows) > query.limit:
+                        has_more = True
+                        rows = batches[name] = rows[:query.limit]
+                    if rows:
+                        positions[name] = row_position(name, rows[-1])
+                deleted = self._deleted(db_session, batches[DELETED])
+        except SQLAlchemyError as err:
+            return ResultDTO.fail(f"Failed to read changes: {repr(err)}")
+
+        batch = SyncBatchDTO(
+            expenses=self._table(EXPENSES, batches[EXPENSES]),
+            groceries=self._table(GROCERIES, batches[GROCERIES]),
+            deleted=deleted,
+            next_token=SyncToken(horizon, positions if has_more else None).encode(),
+            has_more=has_more,
+        )
+        return ResultDTO.ok("Changes retrieved", batch)
+
+    @staticmethod
+    def _table(stream: str, rows) -> SyncTableDTO:
+        columns = stream_columns(stream)
+        return SyncTableDTO(columns=columns, rows=[[row._mapping[name] for name in columns] for row in rows])
+
+    @staticmethod
+    def _deleted(db_session, tombstones) -> Dict[str, List[int]]:
+        deleted: Dict[str, List[int]] = {EXPENSES: [], GROCERIES: []}
+        for tombstone in tombstones:
+            deleted[_DELETED_KEYS[tombstone.entity_type]].append(tombstone.entity_id)
+        for entity_type, key in _DELETED_KEYS.items():
+            if deleted[key]:
+                reused = reused_ids(db_session, entity_type, deleted[key])
+                deleted[key] = [entity_id for entity_id in deleted[key] if entity_id not in reused]
+        return deleted
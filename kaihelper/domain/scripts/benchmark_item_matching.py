@@ -0,0 +1,213 @@
+"""
+Grocery item-name matching benchmark.
+
+Builds an ``ItemNameIndex`` over a synthetic catalogue (brands x products x
+sizes, one user's worth by default), then matches receipt-style spellings of
+catalogue items (case, spacing, unit conversions, till abbreviations and
+one-letter typos) and names that must not match (unknown products, other
+sizes of a known product), plus ``NEAR_MISSES``: distinct products whose names
+differ by one word from an indexed item.
+
+Reports index build time, match latency (p50/p99/max), precision/recall at
+the threshold and the near misses that matched (exit status 1 if any); ``--scan`` also times a brute-force scan of every item, the
+cost the trigram postings avoid.
+
+Usage:
+    python -m kaihelper.domain.scripts.benchmark_item_matching
+    python -m kaihelper.domain.scripts.benchmark_item_matching --items 20000 --queries 5000 --threshold 0.8
+    python -m kaihelper.domain.scripts.benchmark_item_matching --scan
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import List, Optional, Set, Tuple
+
+from kaihelper.config.settings import settings
+from kaihelper.domain.core.item_matching import ABBREVIATIONS, ItemNameIndex, canonical_item_name, typo_similarity
+
+BRANDS = (
+    "Pams", "Anchor", "Meadow Fresh", "Tip Top", "Vogel's", "Whittaker's", "Watties", "Sanitarium",
+    "Countdown", "Value", "Lewis Road", "Mainland", "Tegel", "Hellers", "Kapiti", "Griffins",
+    "Essentials", "Macro", "Ceres", "Edmonds", "Pic's", "Lisa's", "Copenhagen", "Bluebird",
+)
+PRODUCTS = (
+    "milk", "light milk", "trim milk", "white bread", "wholemeal bread", "chicken breast", "beef mince",
+    "cheese", "butter", "greek yoghurt", "dark chocolate", "milk chocolate", "baked beans",
+    "tomato sauce", "peanut butter", "free range eggs", "orange juice", "apple juice", "potato chips",
+    "frozen peas", "rolled oats", "basmati rice", "spaghetti", "olive oil", "coffee beans",
+    "earl grey tea", "ice cream", "sausages", "hummus", "crackers", "toilet paper", "dish liquid",
+)
+SIZES = ("1l", "2l", "3l", "500ml", "250g", "500g", "1kg", "12pk", "6pk", "400g", "750ml", "1.5l")
+UNSEEN_PRODUCTS = ("kombucha", "tofu", "sourdough", "feijoa", "kumara", "halloumi", "miso", "tahini")
+# (indexed item, receipt name): different products that must never match
+NEAR_MISSES = (
+    ("Whittakers Dark Chocolate", "Whittakers Milk Chocolate"),
+    ("Coca Cola", "Coca Cola Zero"),
+    ("Pepsi Max", "Pepsi"),
+    ("Pams Butter", "Pams Butter Salted"),
+    ("Chicken Breast", "Chicken Breasts Skinless"),
+)
+
+_EXPANSIONS = {}
+for _short, _long in ABBREVIATIONS.items():
+    _EXPANSIONS.setdefault(_long, _short)
+
+
+def catalogue(count: int, rng: random.Random) -> List[str]:
+    """``count`` distinct item names (brand, product, size)."""
+    names = [f"{brand} {product} {size}" for brand in BRANDS for product in PRODUCTS for size in SIZES]
+    rng.shuffle(names)
+    if count > len(names):
+        # Beyond the base grid, number product lines ("Pams milk 2l line 3")
+        names += [f"{name} line {n}" for n in range(2, count // len(names) + 2) for name in names]
+    return names[:count]
+
+
+def _respell_size(token: str) -> str:
+    if token.endswith("ml") and token[:-2].isdigit():
+        return f"{token[:-2]} ML"
+    if token.endswith("kg"):
+        return f"{float(token[:-2]) * 1000:g}gm"
+    if token.endswith("l"):
+        return f"{float(token[:-1]) * 1000:g}ml"
+    if token.endswith("pk"):
+        return f"{token[:-2]} pack"
+    return token.upper()
+
+
+def _typo(word: str, rng: random.Random) -> str:
+    if len(word) < 5:
+        return word
+    i = rng.randrange(1, len(word) - 2)
+    if rng.random() < 0.5:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + word[i + 1:]
+
+
+def variant(name: str, rng: random.Random) -> str:
+    """A receipt-style spelling of ``name``: one or two distortions."""
+    words = name.split()
+    for _ in range(rng.randint(1, 2)):
+        kind = rng.choice(("case", "size", "abbrev", "typo"))
+        if kind == "case":
+            words = [word.upper() if rng.random() < 0.5 else word.capitalize() for word in words]
+        elif kind == "size":
+            words = [_respell_size(word) if word[0].isdigit() else word for word in words]
+        elif kind == "abbrev":
+            words = [_EXPANSIONS.get(word.lower(), word) for word in words]
+        else:
+            longest = max(range(len(words)), key=lambda i: len(words[i]) if words[i].isalpha() else 0)
+            words[longest] = _typo(words[longest], rng)
+    return " ".join(words)
+
+
+def negative(known: Set[str], rng: random.Random) -> str:
+    """A name that matches no catalogue key: an unseen product or a size not stocked."""
+    brand = rng.choice(BRANDS)
+    if rng.random() < 0.5:
+        return f"{brand} {rng.choice(UNSEEN_PRODUCTS)} {rng.choice(SIZES)}"
+    while True:
+        candidate = f"{brand} {rng.choice(PRODUCTS)} {rng.choice(('2.5l', '150g', '24pk', '900ml'))}"
+        if canonical_item_name(candidate) not in known:
+            return candidate
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def scan(keys: List[Tuple[str, Tuple[str, ...]]], key: str, threshold: float) -> Optional[str]:
+    """Brute-force best match, for comparison with the index."""
+    words = key.split()
+    best, best_score = None, 0.0
+    for candidate, other in keys:
+        score = typo_similarity(words, other, threshold)
+        if score is not None and score > best_score:
+            best, best_score = candidate, score
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy grocery item-name matching")
+    parser.add_argument("--items", type=int, default=5000, help="catalogue size (items of one user)")
+    parser.add_argument("--queries", type=int, default=2000, help="receipt names to match")
+    parser.add_argument("--negatives", type=float, default=0.2, help="share of queries with no true match")
+    parser.add_argument("--threshold", type=float, default=settings.ITEM_MATCH_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scan", action="store_true", help="also time a brute-force scan")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    names = catalogue(args.items, rng)
+
+    started = time.perf_counter()
+    index = ItemNameIndex()
+    keys = [canonical_item_name(name) for name in names]
+    for grocery_id, key in enumerate(keys, start=1):
+        index.add(grocery_id, key)
+    build_ms = (time.perf_counter() - started) * 1000
+    known = set(keys)
+
+    queries: List[Tuple[str, Optional[int]]] = []
+    for _ in range(args.queries):
+        if rng.random() < args.negatives:
+            queries.append((negative(known, rng), None))
+        else:
+            grocery_id = rng.randrange(len(names))
+            queries.append((variant(names[grocery_id], rng), grocery_id + 1))
+
+    latencies: List[float] = []
+    true_pos = false_pos = false_neg = exact = 0
+    for query, expected in queries:
+        key = canonical_item_name(query)
+        started = time.perf_counter()
+        found = index.match(key, args.threshold)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+        if found is not None and found[2] == 1.0:
+            exact += 1
+        if found is None:
+            false_neg += expected is not None
+        elif found[0] == expected:
+            true_pos += 1
+        else:
+            false_pos += 1
+
+    positives = sum(1 for _, expected in queries if expected is not None)
+    precision = true_pos / (true_pos + false_pos) if true_pos + false_pos else 1.0
+    recall = true_pos / positives if positives else 1.0
+    print(f"catalogue: {len(index)} distinct keys from {len(names)} names, built in {build_ms:.1f} ms")
+    print(f"queries:   {len(queries)} ({positives} with a true match), threshold {args.threshold}")
+    print(
+        f"match:     p50 {percentile(latencies, 50):.1f} us  p99 {percentile(latencies, 99):.1f} us  "
+        f"max {max(latencies):.1f} us (canonicalization excluded)"
+    )
+    print(f"quality:   precision {precision:.3f}  recall {recall:.3f}  "
+          f"({exact} exact-key hits, {false_pos} wrong matches, {false_neg} missed)")
+
+    near_misses = ItemNameIndex()
+    for grocery_id, (indexed, _) in enumerate(NEAR_MISSES, start=1):
+        near_misses.add(grocery_id, canonical_item_name(indexed))
+    wrong = [
+        (indexed, query) for indexed, query in NEAR_MISSES
+        if near_misses.match(canonical_item_name(query), args.threshold) is not None
+    ]
+    print(f"near miss: {len(NEAR_MISSES) - len(wrong)} of {len(NEAR_MISSES)} distinct products kept apart")
+    for indexed, query in wrong:
+        print(f"           {query!r} matched {indexed!r}")
+
+    if args.scan:
+        words = [(key, tuple(key.split())) for key in known]
+        sample = queries[:min(len(queries), 200)]
+        started = time.perf_counter()
+        for query, _ in sample:
+            scan(words, canonical_item_name(query), args.threshold)
+        per_query = (time.perf_counter() - started) * 1_000_000 / len(sample)
+        print(f"scan:      {per_query:.1f} us per query over every key (brute force)")
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
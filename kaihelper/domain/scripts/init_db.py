@@ -1,8 +1,8 @@
-from kaihelper.domain.core.database import Base, engine
-from kaihelper.domain.models.user import User
+from kaihelper.domain.core.database import engine
+from kaihelper.domain.core.migrations import upgrade_database
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    upgrade_database(engine)
     
 if __name__ == "__main__":
     init_db()
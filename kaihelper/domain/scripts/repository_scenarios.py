@@ -0,0 +1,265 @@
+"""
+Scratch database and repository call scenarios shared by the query checks
+(``check_query_plans``, ``check_query_counts``, and their pytest tests in
+``kaihelper/tests``).
+
+``seed`` fills a freshly migrated database with a few households' worth of
+rows; ``scenarios`` calls every repository read/update path with IDs that
+exist in that data; ``capture`` records the SQL a call sends to the database.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Tuple
+
+from passlib.hash import pbkdf2_sha256
+from sqlalchemy import event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from kaihelper.domain.core.change_feed import EXPENSE, GROCERY, SyncToken
+from kaihelper.domain.core.item_matching import item_indexes
+from kaihelper.domain.core.pagination import encode_cursor, encode_offset_cursor
+from kaihelper.domain.core.rollups import rebuild_rollups
+from kaihelper.domain.core.search_index import rebuild_search_index
+from kaihelper.domain.models.user import User
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.budget import Budget
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.grocery_purchase import GroceryPurchase
+from kaihelper.domain.models.receipt_job import ReceiptJob
+from kaihelper.domain.models.sync_tombstone import SyncTombstone
+from kaihelper.domain.repositories.user_repository import UserRepository
+from kaihelper.domain.repositories.category_repository import CategoryRepository
+from kaihelper.domain.repositories.budget_repository import BudgetRepository
+from kaihelper.domain.repositories.expense_repository import ExpenseRepository
+from kaihelper.domain.repositories.grocery_repository import GroceryRepository
+from kaihelper.domain.repositories.receipt_job_repository import ReceiptJobRepository
+from kaihelper.domain.repositories.receipt_repository import ReceiptRepository
+from kaihelper.domain.repositories.analytics_repository import AnalyticsRepository
+from kaihelper.domain.repositories.search_repository import SearchRepository
+from kaihelper.domain.repositories.sync_repository import SyncRepository
+from kaihelper.contracts.expense_dto import ExpenseDTO
+from kaihelper.contracts.grocery_dto import GroceryDTO, PriceHistoryQueryDTO
+from kaihelper.contracts.page_dto import PageQueryDTO
+from kaihelper.contracts.analytics_dto import AnalyticsQueryDTO
+from kaihelper.contracts.search_dto import SearchQueryDTO
+from kaihelper.contracts.sync_dto import SyncQueryDTO
+
+USERS = 20
+CATEGORIES = 30
+EXPENSES_PER_USER = 150
+ITEMS_PER_EXPENSE = 5
+ITEM_NAMES = 400
+JOBS_PER_USER = 20
+TOMBSTONES_PER_USER = 10
+SYNC_BATCH = 100
+
+
+# ---------------------------------------------------------------------------
+# Scratch database
+# ---------------------------------------------------------------------------
+
+def seed(db_engine: Engine) -> Dict[str, object]:
+    """Insert users, categories, budgets, expenses, groceries, jobs and tombstones in bulk."""
+    now = datetime.now()
+    today = date.today()
+    ids: Dict[str, object] = {}
+    password = pbkdf2_sha256.using(rounds=1000).hash("password")
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com",
+             "password": password, "is_active": True, "created_at": now, "updated_at": now}
+            for u in range(1, USERS + 1)
+        ])
+        connection.execute(insert(Category), [
+            {"category_id": c, "name": f"Category {c}", "description": None, "created_at": now}
+            for c in range(1, CATEGORIES + 1)
+        ])
+        connection.execute(insert(Budget), [
+            {"user_id": u, "total_budget": 500.0, "remaining_balance": 500.0,
+             "start_date": today - timedelta(days=30 * (m + 1)), "end_date": today - timedelta(days=30 * m) + timedelta(days=30)}
+            for u in range(1, USERS + 1) for m in range(12)
+        ])
+
+        expenses, groceries, jobs = [], [], []
+        expense_id = grocery_id = 0
+        for u in range(1, USERS + 1):
+            for e in range(EXPENSES_PER_USER):
+                expense_id += 1
+                day = today - timedelta(days=e)
+                expenses.append({
+                    "expense_id": expense_id, "user_id": u, "category_id": 1 + e % CATEGORIES,
+                    "amount": 42.0, "expense_date": day, "store_name": f"Store {e % 7}",
+                    "created_at": now, "updated_at": now,
+                })
+                for i in range(ITEMS_PER_EXPENSE):
+                    grocery_id += 1
+                    groceries.append({
+                        "grocery_id": grocery_id, "user_id": u, "category_id": 1 + e % CATEGORIES,
+                        "expense_id": expense_id, "item_name": f"Item {(e * ITEMS_PER_EXPENSE + i) % ITEM_NAMES}",
+                        "canonical_name": f"item {(e * ITEMS_PER_EXPENSE + i) % ITEM_NAMES}",
+                        "unit_price": 2.0, "quantity": 1.0, "total_cost": 2.0,
+                        "purchase_date": day, "created_at": now, "updated_at": now,
+                    })
+            for j in range(JOBS_PER_USER):
+                jobs.append({
+                    "job_id": f"{u:08d}-0000-0000-0000-{j:012d}", "user_id": u,
+                    "status": ("queued", "running", "succeeded", "failed")[j % 4], "attempts": 0,
+                    "created_at": now - timedelta(minutes=j), "updated_at": now - timedelta(minutes=j),
+                })
+        connection.execute(insert(Expense), expenses)
+        connection.execute(insert(Grocery), groceries)
+        # Every line is a purchase of the user's first grocery row with that name
+        stores = {row["expense_id"]: row["store_name"] for row in expenses}
+        first_ids: Dict[Tuple[int, str], int] = {}
+        connection.execute(insert(GroceryPurchase), [
+            {"grocery_id": first_ids.setdefault((row["user_id"], row["item_name"]), row["grocery_id"]),
+             "user_id": row["user_id"], "expense_id": row["expense_id"], "store_name": stores[row["expense_id"]],
+             "purchase_date": row["purchase_date"], "unit_price": row["unit_price"], "quantity": row["quantity"],
+             "total_cost": row["total_cost"], "created_at": now}
+            for row in groceries
+        ])
+        connection.execute(insert(ReceiptJob), jobs)
+        # Deletions of rows that no longer exist (IDs past the seeded ones)
+        connection.execute(insert(SyncTombstone), [
+            {"user_id": u, "entity_type": (EXPENSE, GROCERY)[t % 2],
+             "entity_id": grocery_id + u * TOMBSTONES_PER_USER + t, "deleted_at": now}
+            for u in range(1, USERS + 1) for t in range(TOMBSTONES_PER_USER)
+        ])
+        # Bulk inserts bypass the repositories, so derive the rollups and the search index once
+        with Session(bind=connection) as db_session:
+            rebuild_rollups(db_session)
+            rebuild_search_index(db_session)
+            db_session.flush()
+
+    ids.update(
+        user_id=USERS // 2, expense_id=expense_id // 2, grocery_id=grocery_id // 2,
+        item_grocery_id=first_ids[(USERS // 2, "Item 7")],
+        job_id=jobs[len(jobs) // 2]["job_id"], expense_date=today - timedelta(days=3), seeded_at=now,
+    )
+    return ids
+
+
+def analyze(db_engine: Engine) -> None:
+    """Refresh planner statistics so the plans match a populated database."""
+    with db_engine.begin() as connection:
+        if db_engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("ANALYZE")
+        else:
+            connection.exec_driver_sql(
+                "ANALYZE TABLE users, categories, budgets, expenses, groceries, grocery_purchases, receipt_jobs, "
+                "search_documents, sync_tombstones"
+            )
+
+
+# ---------------------------------------------------------------------------
+# Repository paths under test
+# ---------------------------------------------------------------------------
+
+def scenarios(ids: Dict[str, object]) -> List[Tuple[str, Callable[[], object]]]:
+    """Every repository query path, called with IDs that exist in the seed data."""
+    users, categories, budgets = UserRepository(), CategoryRepository(), BudgetRepository()
+    expenses, groceries = ExpenseRepository(), GroceryRepository()
+    jobs, receipts, analytics = ReceiptJobRepository(), ReceiptRepository(), AnalyticsRepository()
+    search = SearchRepository()
+    # No settle window: the seed rows were written moments ago
+    sync = SyncRepository(settle_seconds=0)
+    user_id = ids["user_id"]
+
+    def save_receipt():
+        expense = ExpenseDTO(
+            user_id=user_id, amount=4.0, expense_date=ids["expense_date"], store_name="Store 3",
+            created_at=datetime.now(), updated_at=datetime.now(),
+        )
+        lines = [
+            GroceryDTO(item_name=name, unit_price=2.0, quantity=1.0, total_cost=2.0,
+                       purchase_date=ids["expense_date"])
+            for name in ("Item 7", "Brand New Item")
+        ]
+        return receipts.save_receipt("Category 3", expense, lines)
+
+    return [
+        ("UserRepository.get_user_by_email", lambda: users.get_user_by_email(f"user{user_id}@example.com")),
+        ("UserRepository.get_user_by_id", lambda: users.get_user_by_id(user_id)),
+        ("UserRepository.verify_credentials", lambda: users.verify_credentials(f"user{user_id}", "password")),
+        ("CategoryRepository.get_all", categories.get_all),
+        ("CategoryRepository.get_by_id", lambda: categories.get_by_id(3)),
+        ("CategoryRepository.get_by_name", lambda: categories.get_by_name("Category 3")),
+        ("BudgetRepository.get_active_budgets", lambda: budgets.get_active_budgets(user_id)),
+        ("BudgetRepository.get_covering_budgets",
+         lambda: budgets.get_covering_budgets(user_id, ids["expense_date"])),
+        ("ExpenseRepository.get_all", lambda: expenses.get_all(user_id)),
+        ("ExpenseRepository.get_all (include groceries)", lambda: expenses.get_all(user_id, include_groceries=True)),
+        ("ExpenseRepository.get_page", lambda: expenses.get_page(user_id, PageQueryDTO(limit=20))),
+        ("ExpenseRepository.get_page (cursor, range, fields)", lambda: expenses.get_page(user_id, PageQueryDTO(
+            limit=20, cursor=encode_cursor(ids["expense_date"], ids["expense_id"]),
+            date_from=ids["expense_date"] - timedelta(days=60), fields=["amount", "category_name"],
+        ))),
+        ("ExpenseRepository.get_page (include groceries)", lambda: expenses.get_page(user_id, PageQueryDTO(
+            limit=20, include=["groceries"],
+        ))),
+        ("ExpenseRepository.get_by_id", lambda: expenses.get_by_id(ids["expense_id"])),
+        ("ExpenseRepository.get_by_id (include groceries)",
+         lambda: expenses.get_by_id(ids["expense_id"], include_groceries=True)),
+        ("ExpenseRepository.get_by_grocery_id", lambda: expenses.get_by_grocery_id(ids["grocery_id"])),
+        ("ExpenseRepository.check_exist",
+         lambda: expenses.check_exist(user_id, "Store 3", ids["expense_date"])),
+        ("GroceryRepository.get_all", lambda: groceries.get_all(user_id)),
+        ("GroceryRepository.get_page", lambda: groceries.get_page(user_id, PageQueryDTO(
+            limit=20, cursor=encode_cursor(ids["expense_date"], ids["grocery_id"]), fields=["item_name"],
+        ))),
+        ("GroceryRepository.get_by_id", lambda: groceries.get_by_id(ids["grocery_id"])),
+        ("GroceryRepository.get_by_name", lambda: groceries.get_by_name(user_id, "Item 7")),
+        ("GroceryRepository.get_by_name (canonical, cold index)", lambda: (
+            item_indexes.clear(), groceries.get_by_name(user_id, "ITEMS 7"),
+        )),
+        ("GroceryRepository.get_by_expense_id", lambda: groceries.get_by_expense_id(ids["expense_id"])),
+        ("GroceryRepository.get_price_history",
+         lambda: groceries.get_price_history(ids["item_grocery_id"], PriceHistoryQueryDTO())),
+        ("GroceryRepository.get_price_history (range, store)",
+         lambda: groceries.get_price_history(ids["item_grocery_id"], PriceHistoryQueryDTO(
+             date_from=ids["expense_date"] - timedelta(days=90), store_name="Store 3",
+         ))),
+        ("ReceiptJobRepository.get_by_id", lambda: jobs.get_by_id(ids["job_id"])),
+        ("ReceiptJobRepository.list_by_user", lambda: jobs.list_by_user(user_id)),
+        ("ReceiptJobRepository.list_resumable", lambda: jobs.list_resumable(300, 3)),
+        ("AnalyticsRepository.category_monthly_totals",
+         lambda: analytics.category_monthly_totals(user_id, AnalyticsQueryDTO())),
+        ("AnalyticsRepository.store_totals", lambda: analytics.store_totals(user_id, AnalyticsQueryDTO(
+            date_from=ids["expense_date"] - timedelta(days=90),
+        ))),
+        ("AnalyticsRepository.store_totals (whole months)", lambda: analytics.store_totals(user_id, AnalyticsQueryDTO(
+            date_from=(ids["expense_date"] - timedelta(days=60)).replace(day=1),
+        ))),
+        ("AnalyticsRepository.local_share", lambda: analytics.local_share(user_id, AnalyticsQueryDTO())),
+        ("AnalyticsRepository.top_items", lambda: analytics.top_items(user_id, AnalyticsQueryDTO())),
+        ("SearchRepository.search", lambda: search.search(user_id, SearchQueryDTO(q="store 3 item 7"))),
+        ("SearchRepository.search (groceries, second page)", lambda: search.search(user_id, SearchQueryDTO(
+            q="item", types=["grocery"], cursor=encode_offset_cursor(20),
+        ))),
+        ("SyncRepository.changes (full sync)", lambda: sync.changes(user_id, SyncQueryDTO(limit=SYNC_BATCH))),
+        ("SyncRepository.changes (delta)", lambda: sync.changes(user_id, SyncQueryDTO(
+            since=SyncToken(ids["seeded_at"] - timedelta(minutes=1)).encode(), limit=SYNC_BATCH,
+        ))),
+        ("ReceiptRepository.save_receipt", save_receipt),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Capture
+# ---------------------------------------------------------------------------
+
+def capture(db_engine: Engine, func: Callable[[], object]) -> List[Tuple[str, object]]:
+    """Run ``func`` and return the (statement, parameters) pairs it sent to the database."""
+    captured: List[Tuple[str, object]] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        captured.append((statement, parameters[0] if executemany else parameters))
+
+    event.listen(db_engine, "before_cursor_execute", _record)
+    try:
+        func()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", _record)
+    return captured
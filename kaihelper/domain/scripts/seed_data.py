@@ -7,7 +7,8 @@ Usage:
 
 import os
 from sqlalchemy import inspect
-from kaihelper.domain.core.database import SessionLocal, engine, Base
+from kaihelper.domain.core.database import SessionLocal, engine
+from kaihelper.domain.core.migrations import upgrade_database
 from kaihelper.domain.models.user import User
 from passlib.hash import pbkdf2_sha256
 
@@ -35,13 +36,11 @@ def encrypt_password(password: str) -> str:
 # ---------------------------------------------------------------------------
 
 def ensure_schema_exists():
-    """Ensures all tables are created if the schema is empty."""
-    if (tables := inspect(engine).get_table_names()):
-        print(f"ℹ️  Found {len(tables)} existing tables — skipping schema creation.")
-    else:
-        print("🧱 No tables found — creating database schema...")
-        Base.metadata.create_all(bind=engine)
-        print("✅ All tables created successfully.")
+    """Ensures the schema is migrated to the latest revision."""
+    tables = inspect(engine).get_table_names()
+    print(f"ℹ️  Found {len(tables)} existing tables — applying pending migrations...")
+    revision = upgrade_database(engine)
+    print(f"✅ Schema at revision {revision}.")
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,36 @@
+"""
+Concurrency test for budget balance updates: expenses raced at one budget
+from parallel threads leave exactly the expected balance (see
+``domain/scripts/stress_budget_updates``, which takes custom thread counts).
+"""
+
+import pytest
+
+from kaihelper.config.settings import settings
+from kaihelper.domain.core.database import SessionLocal, build_engine
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.scripts.stress_budget_updates import AMOUNT, run
+
+THREADS = 8
+PER_THREAD = 25
+ATTEMPTED = THREADS * PER_THREAD
+
+
+@pytest.mark.parametrize("label, total_budget", [
+    ("ample budget", ATTEMPTED * AMOUNT + 100.0),
+    # Covers half of the expenses, so refusals race with charges
+    ("tight budget", (ATTEMPTED // 2) * AMOUNT),
+])
+def test_concurrent_expenses_keep_budget_consistent(database_url, label, total_budget):
+    # Same pool, busy-timeout and WAL settings as the application engine
+    db_engine = build_engine(database_url, settings)
+    try:
+        upgrade_database(db_engine)
+        SessionLocal.configure(bind=db_engine)
+        outcome = run(db_engine, label, total_budget, THREADS, PER_THREAD)
+    finally:
+        db_engine.dispose()
+
+    assert not outcome.problems, "\n".join(outcome.problems)
+    assert outcome.succeeded + outcome.refused == ATTEMPTED
+    assert outcome.succeeded == min(ATTEMPTED, int(total_budget // AMOUNT))
@@ -0,0 +1,73 @@
+"""
+ReceiptStreamParser: items come out as soon as their closing brace arrives,
+whatever the chunk boundaries, and braces, brackets or quotes inside strings
+never confuse the scanner.
+"""
+
+import json
+
+import pytest
+
+from kaihelper.utils.incremental_json import ReceiptStreamParser
+
+RECEIPT = {
+    "store_name": "Pak'nSave {Albany} [North]",
+    "receipt_date": "2026-01-15",
+    "total_amount": 21.5,
+    "paid": True,
+    "items": [
+        {"item_name": "Cheese \"Tasty\" {1kg}", "quantity": 1, "unit_price": 12.5, "total_price": 12.5},
+        {"item_name": "Bread ] [ } {", "quantity": 2, "unit_price": 3.0, "total_price": 6.0,
+         "meta": {"tags": ["bakery", {"shelf": "A\\3"}]}},
+        {"item_name": "Caf\u00e9 beans \\ \"dark\"", "quantity": 1, "unit_price": 3.0, "total_price": 3.0},
+    ],
+    "notes": ["not", {"an": "item"}],
+    "category": "Groceries",
+}
+
+
+def _chunks(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 10_000])
+def test_items_and_header_survive_any_chunking(size):
+    text = json.dumps(RECEIPT, indent=1)
+    parser = ReceiptStreamParser()
+
+    items = [item for chunk in _chunks(text, size) for item in parser.feed(chunk)]
+
+    assert items == RECEIPT["items"]
+    assert parser.items_seen == len(RECEIPT["items"])
+    assert parser.header == {key: value for key, value in RECEIPT.items() if key not in ("items", "notes")}
+    assert parser.result() == RECEIPT
+
+
+def test_item_is_emitted_when_its_closing_brace_arrives():
+    text = json.dumps(RECEIPT, ensure_ascii=False)
+    first_end = text.index(', {"item_name": "Bread')
+    parser = ReceiptStreamParser()
+
+    assert parser.feed(text[:first_end - 1]) == []
+    assert parser.feed(text[first_end - 1:first_end]) == [RECEIPT["items"][0]]
+    assert [item["item_name"] for item in parser.feed(text[first_end:])] == [
+        item["item_name"] for item in RECEIPT["items"][1:]
+    ]
+
+
+def test_header_fields_are_known_before_items_when_sent_first():
+    parser = ReceiptStreamParser()
+
+    parser.feed('{"category": "Dairy", "store_name": "a \\"quoted\\" {name}", "items": [')
+
+    assert parser.header == {"category": "Dairy", "store_name": 'a "quoted" {name}'}
+    assert parser.feed('{"item_name": "Milk"}') == [{"item_name": "Milk"}]
+
+
+def test_escaped_backslash_before_closing_quote():
+    parser = ReceiptStreamParser()
+
+    # "C:\\" ends with an escaped backslash, so its closing quote really closes the string
+    items = parser.feed('{"items": [{"item_name": "C:\\\\"}, {"item_name": "}"}]}')
+
+    assert items == [{"item_name": "C:\\"}, {"item_name": "}"}]
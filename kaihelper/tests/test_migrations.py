@@ -0,0 +1,42 @@
+"""
+Migration history on each engine: a fresh database and one left behind by the
+old ``create_all`` startup hook (baseline tables, no ``alembic_version``) both
+upgrade to head.
+"""
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
+
+from kaihelper.domain.core.migrations import BASELINE_REVISION, head_revisions, upgrade_database
+
+# What ``Base.metadata.create_all`` created before migrations existed
+BASELINE_TABLES = {"users", "categories", "budgets", "expenses", "groceries", "email_verification_codes"}
+
+
+def _tables(db_engine) -> set:
+    return set(inspect(db_engine).get_table_names()) - {"alembic_version"}
+
+
+def test_fresh_database_upgrades_to_head(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    try:
+        assert upgrade_database(db_engine) == head_revisions()[0]
+        assert {"receipt_jobs", "receipt_extraction_cache"} <= _tables(db_engine)
+    finally:
+        db_engine.dispose()
+
+
+def test_create_all_database_upgrades_to_head(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    try:
+        # The baseline revision is that schema; dropping alembic_version
+        # leaves the database exactly as the startup hook did
+        upgrade_database(db_engine, BASELINE_REVISION)
+        assert _tables(db_engine) == BASELINE_TABLES
+        with db_engine.begin() as connection:
+            connection.execute(text("DROP TABLE alembic_version"))
+
+        assert upgrade_database(db_engine) == head_revisions()[0]
+        assert {"receipt_jobs", "receipt_extraction_cache"} <= _tables(db_engine)
+    finally:
+        db_engine.dispose()
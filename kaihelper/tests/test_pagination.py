@@ -0,0 +1,131 @@
+"""
+Keyset pagination on each engine: following ``next_cursor`` visits every row
+of a list exactly once, in (date, id) order, even when many rows share a date
+and rows are inserted between pages; invalid input fails with code 400.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.pool import NullPool
+
+from kaihelper.contracts.page_dto import PageQueryDTO
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.user import User
+from kaihelper.domain.repositories.expense_repository import ExpenseRepository
+from kaihelper.domain.repositories.grocery_repository import GroceryRepository
+
+TODAY = date(2026, 1, 15)
+# Most rows share a date, and IDs do not follow insertion order
+DATES = [TODAY] * 12 + [TODAY - timedelta(days=1)] * 6 + [TODAY - timedelta(days=3)] * 4
+IDS = [7, 19, 2, 11, 23, 5, 16, 1, 9, 22, 13, 4, 18, 3, 21, 10, 6, 15, 20, 8, 12, 14]
+
+
+@pytest.fixture
+def db_engine(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    now = datetime.now()
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com",
+             "password": "x", "is_active": True, "created_at": now, "updated_at": now}
+            for u in (1, 2)
+        ])
+        connection.execute(insert(Category), [{"category_id": 1, "name": "Groceries", "created_at": now}])
+        # User 2's rows sit on the same dates, between user 1's IDs
+        connection.execute(insert(Expense), [
+            {"expense_id": row_id, "user_id": 1, "category_id": 1, "amount": 10.0,
+             "expense_date": day, "created_at": now, "updated_at": now}
+            for row_id, day in zip(IDS, DATES)
+        ] + [
+            {"expense_id": 100 + row_id, "user_id": 2, "category_id": 1, "amount": 10.0,
+             "expense_date": day, "created_at": now, "updated_at": now}
+            for row_id, day in zip(IDS, DATES)
+        ])
+        connection.execute(insert(Grocery), [
+            {"grocery_id": row_id, "user_id": 1, "category_id": 1, "item_name": f"Item {row_id}",
+             "unit_price": 2.0, "quantity": 1.0, "total_cost": 2.0, "purchase_date": day,
+             "created_at": now, "updated_at": now}
+            for row_id, day in zip(IDS, DATES)
+        ])
+    SessionLocal.configure(bind=db_engine)
+    yield db_engine
+    db_engine.dispose()
+
+
+def _expected(date_from=None):
+    """IDs newest first, ties broken by the higher ID."""
+    rows = [(day, row_id) for row_id, day in zip(IDS, DATES) if date_from is None or day >= date_from]
+    return [row_id for _, row_id in sorted(rows, reverse=True)]
+
+
+def _walk(repository, id_key, limit, between_pages=None, **query):
+    pages, cursor = [], None
+    while True:
+        result = repository.get_page(1, PageQueryDTO(limit=limit, cursor=cursor, **query))
+        assert result.success, result.message
+        pages.append([item[id_key] for item in result.data.items])
+        cursor = result.data.next_cursor
+        if cursor is None:
+            return pages
+        if between_pages is not None:
+            between_pages()
+
+
+@pytest.mark.parametrize("limit", [1, 3, 5, 12, len(IDS), 50])
+def test_expense_pages_cover_every_row_once(db_engine, limit):
+    pages = _walk(ExpenseRepository(), "expense_id", limit)
+
+    assert [row_id for page in pages for row_id in page] == _expected()
+    assert all(len(page) == limit for page in pages[:-1])
+    assert 0 < len(pages[-1]) <= limit
+
+
+@pytest.mark.parametrize("limit", [2, 5])
+def test_grocery_pages_cover_every_row_once(db_engine, limit):
+    pages = _walk(GroceryRepository(), "grocery_id", limit)
+
+    assert [row_id for page in pages for row_id in page] == _expected()
+
+
+def test_cursor_keeps_filters_and_projection(db_engine):
+    date_from = TODAY - timedelta(days=1)
+
+    pages = _walk(ExpenseRepository(), "expense_id", 4, fields=["amount"], date_from=date_from)
+
+    assert [row_id for page in pages for row_id in page] == _expected(date_from)
+
+
+def test_rows_inserted_between_pages_do_not_shift_the_walk(db_engine):
+    inserted = iter(range(50, 60))
+
+    def add_expense():
+        # Ties with the first page's date but sorts before every cursor (higher ID)
+        now = datetime.now()
+        with db_engine.begin() as connection:
+            connection.execute(insert(Expense), [{
+                "expense_id": next(inserted), "user_id": 1, "category_id": 1, "amount": 1.0,
+                "expense_date": TODAY, "created_at": now, "updated_at": now,
+            }])
+
+    pages = _walk(ExpenseRepository(), "expense_id", 5, between_pages=add_expense)
+
+    assert [row_id for page in pages for row_id in page] == _expected()
+
+
+@pytest.mark.parametrize("query", [
+    PageQueryDTO(limit=5, cursor="not-a-cursor"),
+    PageQueryDTO(limit=5, fields=["no_such_column"]),
+    PageQueryDTO(limit=5, include=["receipts"]),
+])
+def test_invalid_page_query_fails_with_400(db_engine, query):
+    result = ExpenseRepository().get_page(1, query)
+
+    assert not result.success
+    assert result.code == 400
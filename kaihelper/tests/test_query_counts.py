@@ -0,0 +1,27 @@
+"""
+Statement and row-count regression test: every repository call stays within
+its budget in ``check_query_counts.BUDGETS`` (see
+``domain/scripts/check_query_counts``, which prints the counts).
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from kaihelper.domain.scripts.check_query_counts import BUDGETS, check
+
+
+def test_repository_calls_within_budget(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    try:
+        findings = check(db_engine)
+    finally:
+        db_engine.dispose()
+
+    assert {finding.scenario for finding in findings} == set(BUDGETS)
+    failures = [
+        f"{finding.scenario}: {len(finding.statements)} statements, {finding.rows} rows "
+        f"(budget {finding.budget[0]}/{finding.budget[1]})\n"
+        + "".join(f"    {rows:>6}  {' '.join(statement.split())[:140]}\n" for statement, rows in finding.statements)
+        for finding in findings if finding.over_budget
+    ]
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,26 @@
+"""
+Query-plan regression test: no repository statement may fall back to a full
+table scan (see ``domain/scripts/check_query_plans``, which prints the plans).
+"""
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from kaihelper.domain.scripts.check_query_plans import check
+
+
+def test_repository_queries_use_indexes(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    try:
+        findings = check(db_engine)
+    finally:
+        db_engine.dispose()
+
+    assert findings, "no statements were captured"
+    failures = [
+        f"{finding.scenario}: full scan of {', '.join(finding.full_scans)}\n"
+        f"    {' '.join(finding.statement.split())[:160]}\n"
+        + "".join(f"      {line}\n" for line in finding.plan)
+        for finding in findings if finding.full_scans
+    ]
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,161 @@
+"""
+Offline extraction engines: the deterministic fake engine, the routing
+extractor's escalation rules, and how the till-slip parser scores a receipt
+by reconciling its lines with the printed total.
+"""
+
+import pytest
+
+from kaihelper.business.interfaces.i_receipt_extractor import IReceiptExtractor
+from kaihelper.business.services.receipt_extractors import (
+    FakeReceiptExtractor,
+    RoutingReceiptExtractor,
+    TransientExtractionError,
+    is_transient_error,
+)
+from kaihelper.utils.receipt_text_parser import parse_receipt_text, score_receipt
+
+FIXTURE = {
+    "store_name": "Fixture Mart",
+    "receipt_date": "2026-01-15",
+    "category": "Groceries",
+    "items": [{"item_name": "Milk", "quantity": 1, "unit_price": 4.2, "total_price": 4.2}],
+    "total_amount": 4.2,
+}
+
+
+def _engine(name: str, confidence: float) -> FakeReceiptExtractor:
+    engine = FakeReceiptExtractor(fixture={**FIXTURE, "store_name": name}, confidence=confidence)
+    engine.name = name
+    return engine
+
+
+class _FailingExtractor(IReceiptExtractor):
+    name = "broken"
+
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+
+    def extract(self, image_bytes: bytes):
+        raise self.error
+
+
+# --- FakeReceiptExtractor ---
+
+def test_fake_extractor_is_deterministic_per_image():
+    engine = FakeReceiptExtractor()
+
+    first, again, other = engine.extract(b"receipt-1"), engine.extract(b"receipt-1"), engine.extract(b"receipt-2")
+
+    assert first.data == again.data
+    assert first.data["receipt_number"] != other.data["receipt_number"]
+    assert first.engine == "fake" and first.confidence == 1.0
+    # Self-consistent: the lines add up to the total
+    assert score_receipt(first.data) == 1.0
+
+
+def test_fake_extractor_returns_a_copy_of_its_fixture():
+    engine = FakeReceiptExtractor(fixture=FIXTURE, confidence=0.5)
+
+    result = engine.extract(b"anything")
+    result.data["items"].clear()
+
+    assert engine.extract(b"anything").data["items"]
+    assert result.confidence == 0.5
+
+
+# --- RoutingReceiptExtractor ---
+
+def test_routing_stops_at_first_confident_engine():
+    router = RoutingReceiptExtractor([_engine("ocr", 0.9), _engine("llm", 1.0)], min_confidence=0.8)
+
+    result = router.extract(b"img")
+
+    assert result.engine == "ocr"
+    assert router.stats() == {"ocr.accepted": 1}
+
+
+def test_routing_escalates_low_confidence_and_errors():
+    router = RoutingReceiptExtractor(
+        [_engine("ocr", 0.4), _FailingExtractor(RuntimeError("bad image")), _engine("llm", 0.5)],
+        min_confidence=0.8,
+    )
+
+    result = router.extract(b"img")
+
+    # The last engine's answer is accepted whatever its score
+    assert result.engine == "llm"
+    assert router.stats() == {"ocr.escalated": 1, "broken.errors": 1, "llm.accepted": 1}
+
+
+def test_routing_reports_items_once_when_streaming():
+    streamed = []
+    router = RoutingReceiptExtractor([_engine("ocr", 0.4), _engine("llm", 1.0)], min_confidence=0.8)
+
+    result = router.extract_stream(
+        b"img", lambda item, header: streamed.append((item["item_name"], header["store_name"])),
+    )
+
+    assert result.engine == "llm"
+    assert streamed == [("Milk", "llm")]
+
+
+@pytest.mark.parametrize("errors, transient", [
+    ([RuntimeError("no text"), TimeoutError("read timed out")], True),
+    ([RuntimeError("no text"), ValueError("bad json")], False),
+])
+def test_routing_fails_when_every_engine_fails(errors, transient):
+    router = RoutingReceiptExtractor([_FailingExtractor(error) for error in errors])
+
+    with pytest.raises(RuntimeError, match="All extraction engines failed") as raised:
+        router.extract(b"img")
+
+    assert isinstance(raised.value, TransientExtractionError) is transient
+    assert is_transient_error(raised.value) is transient
+
+
+# --- receipt_text_parser ---
+
+SLIP = """\
+FRESH CHOICE BARRINGTON
+15/01/2026 10:42
+MILK 2L                 4.20
+2 @ 3.50 BREAD          7.00
+BANANAS
+1.234kg x $3.99/kg      4.92
+SUBTOTAL               16.12
+{adjustments}TOTAL                  {total}
+EFTPOS                 {total}
+"""
+
+
+@pytest.mark.parametrize("adjustments, total, confidence", [
+    ("", "16.12", 1.0),                                   # lines add up to the total
+    ("", "18.50", 0.4),                                   # a line was missed or misread
+    ("CLUBCARD DISCOUNT     -1.12\n", "15.00", 1.0),      # total after discount
+    ("GST                    2.42\n", "18.54", 1.0),      # tax-exclusive lines
+])
+def test_parser_confidence_reconciles_lines_with_total(adjustments, total, confidence):
+    parsed, score = parse_receipt_text(SLIP.format(adjustments=adjustments, total=total))
+
+    assert [(item["item_name"], item["quantity"], item["total_price"]) for item in parsed["items"]] == [
+        ("Milk 2L", 1.0, 4.20), ("Bread", 2.0, 7.00), ("Bananas", 1.234, 4.92),
+    ]
+    assert parsed["total_amount"] == float(total)
+    assert parsed["receipt_date"] == "2026-01-15"
+    assert score == confidence
+
+
+def test_parser_scales_by_ocr_confidence_and_distrusts_missing_total():
+    lines = "FRESH CHOICE\n15/01/2026\nMILK 2L    4.20\nBREAD    3.50\n"
+
+    parsed, score = parse_receipt_text(lines, ocr_confidence=0.9)
+
+    # Without a printed total the item sum is used, but it cannot be verified
+    assert parsed["total_amount"] == 7.70
+    assert score == pytest.approx(0.3 * 0.9)
+
+
+def test_score_penalises_missing_date():
+    assert score_receipt({**FIXTURE, "receipt_date": None}) == 0.9
+    assert score_receipt({**FIXTURE, "items": []}) == 0.0
@@ -0,0 +1,62 @@
+"""
+Receipt job recovery on each engine: the resume sweep leaves live and freshly
+queued jobs alone, re-queues abandoned ones and fails those out of attempts.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.pool import NullPool
+
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.models.receipt_job import ReceiptJob
+from kaihelper.domain.models.user import User
+from kaihelper.domain.repositories.receipt_job_repository import ReceiptJobRepository
+
+STALE_SECONDS = 300
+MAX_ATTEMPTS = 3
+
+
+@pytest.fixture
+def jobs(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    now = datetime.now()
+    stale = now - timedelta(seconds=STALE_SECONDS * 2)
+
+    def job(job_id, status, attempts, updated_at):
+        return {"job_id": job_id, "user_id": 1, "status": status, "image": b"jpeg", "attempts": attempts,
+                "created_at": updated_at, "updated_at": updated_at}
+
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "username": "user1", "email": "user1@example.com",
+                                           "password": "x", "is_active": True, "created_at": now, "updated_at": now}])
+        connection.execute(insert(ReceiptJob), [
+            job("fresh-queued", "queued", 0, now),
+            job("lost-queued", "queued", 1, stale),
+            job("live-running", "running", 1, now),
+            job("abandoned", "running", 1, stale),
+            job("crash-loop", "running", MAX_ATTEMPTS, stale),
+        ])
+    SessionLocal.configure(bind=db_engine)
+    yield ReceiptJobRepository()
+    db_engine.dispose()
+
+
+def test_resume_sweep_settles_abandoned_jobs(jobs):
+    resumable = jobs.list_resumable(STALE_SECONDS, MAX_ATTEMPTS)
+
+    assert resumable.success
+    assert sorted(resumable.data) == ["abandoned", "lost-queued"]
+    assert jobs.get_by_id("fresh-queued").data.status == "queued"
+    assert jobs.get_by_id("live-running").data.status == "running"
+    assert jobs.get_by_id("crash-loop").data.status == "failed"
+
+
+def test_heartbeat_keeps_running_job_live(jobs):
+    assert jobs.heartbeat("abandoned").success
+
+    assert jobs.list_resumable(STALE_SECONDS, MAX_ATTEMPTS).data == ["lost-queued"]
+    assert jobs.get_by_id("abandoned").data.status == "running"
@@ -0,0 +1,110 @@
+"""
+Streamed receipt upload on each engine: the SSE events arrive as ``started``,
+one ``item`` per line, ``extracted``, then ``result``, and the receipt is
+saved once, after the stream. The vision model is a replayed recording
+(``FakeVisionClient``), streamed in small chunks.
+"""
+
+import json
+from datetime import datetime
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.pool import NullPool
+
+from kaihelper.api.routes.receipt_api import router as receipt_router
+from kaihelper.business.services.receipt_extractors import VisionLLMExtractor
+from kaihelper.business.services.receipt_service import ReceiptService
+from kaihelper.business.services.service_installer import ServiceInstaller
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.domain_installer import DomainInstaller
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.user import User
+from kaihelper.domain.repositories.receipt_repository import ReceiptRepository
+from kaihelper.utils.fake_vision_client import FakeVisionClient
+
+RECORDING = {
+    "store_name": "Fresh Choice",
+    "receipt_date": "2026-01-15",
+    "category": "groceries",
+    "currency": "NZD",
+    "items": [
+        {"item_name": "Milk", "quantity": 1, "unit_price": 4.2, "total_price": 4.2},
+        {"item_name": "Bread {sliced}", "quantity": 2, "unit_price": 3.5, "total_price": 7.0},
+        {"item_name": "Apples", "quantity": 1.5, "unit_price": 4.0, "total_price": 6.0},
+    ],
+    "total_amount": 17.2,
+}
+
+
+@pytest.fixture
+def client(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    now = datetime.now()
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [{"id": 1, "username": "user1", "email": "user1@example.com",
+                                           "password": "x", "is_active": True, "created_at": now, "updated_at": now}])
+    SessionLocal.configure(bind=db_engine)
+
+    services = ServiceInstaller(DomainInstaller())
+    receipt_service = ReceiptService(
+        category_service=services.get_category_service(),
+        grocery_service=services.get_grocery_service(),
+        expense_service=services.get_expense_service(),
+        receipt_repository=ReceiptRepository(),
+        extractor=VisionLLMExtractor("", client=FakeVisionClient([RECORDING])),
+    )
+
+    app = FastAPI()
+    app.state.services = SimpleNamespace(get_receipt_service=lambda: receipt_service)
+    app.include_router(receipt_router, prefix="/api/receipts")
+    with TestClient(app) as test_client:
+        yield test_client, db_engine
+    db_engine.dispose()
+
+
+def _image() -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (64, 96), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_stream_reports_items_then_saves_once(client):
+    test_client, db_engine = client
+
+    response = test_client.post(
+        "/api/receipts/upload",
+        data={"user_id": "1", "stream": "true"},
+        files={"file": ("receipt.png", _image(), "image/png")},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [name for name, _ in events] == ["started", "item", "item", "item", "extracted", "result"]
+    assert events[0][1] == {"streaming": True}
+    assert [payload["item_name"] for name, payload in events if name == "item"] == [
+        item["item_name"] for item in RECORDING["items"]
+    ]
+    assert events[-2][1]["items"] == len(RECORDING["items"])
+    assert events[-1][1]["success"] is True
+
+    with db_engine.connect() as connection:
+        assert connection.scalar(select(func.count()).select_from(Expense)) == 1
+        assert connection.scalar(select(func.count()).select_from(Grocery)) == len(RECORDING["items"])
@@ -0,0 +1,185 @@
+"""
+Response cache and conditional GETs: a write moves only the written user's
+scope versions (``invalidate_all`` moves everyone's), a cached list answers
+``If-None-Match`` with 304, and deleting an expense refreshes the user's
+grocery list, whose items it detaches.
+"""
+
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from kaihelper.api.routes.expense_api import router as expense_router
+from kaihelper.api.routes.grocery_api import router as grocery_router
+from kaihelper.business.services.expense_service import ExpenseService
+from kaihelper.business.services.grocery_service import GroceryService
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.core.rollups import rebuild_rollups
+from kaihelper.domain.core.search_index import rebuild_search_index
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.user import User
+from kaihelper.utils.response_cache import (
+    BUDGETS, EXPENSES, GROCERIES, LocalRedis, MemoryResponseBackend, RedisResponseBackend, ResponseCache,
+)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return ResponseCache(MemoryResponseBackend(100))
+    return ResponseCache(RedisResponseBackend(LocalRedis()))
+
+
+def _keys(cache):
+    return {
+        (user_id, scope): cache.key(user_id, scope, "/list?")
+        for user_id in (1, 2) for scope in (EXPENSES, GROCERIES)
+    }
+
+
+def test_stored_response_round_trips(cache):
+    key = cache.key(1, EXPENSES, "/api/expenses/user/1?")
+
+    assert cache.get(key) is None
+    stored = cache.put(key, b'{"data":[]}')
+
+    assert cache.get(key) == stored
+    assert stored.etag.startswith('"') and stored.etag.endswith('"')
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_invalidate_moves_only_the_users_scopes(cache):
+    before = _keys(cache)
+    cache.put(before[(1, EXPENSES)], b"[]")
+
+    cache.invalidate(1, EXPENSES, BUDGETS)
+    after = _keys(cache)
+
+    assert after[(1, EXPENSES)] != before[(1, EXPENSES)]
+    assert cache.get(after[(1, EXPENSES)]) is None
+    assert {name: key for name, key in after.items() if name != (1, EXPENSES)} == {
+        name: key for name, key in before.items() if name != (1, EXPENSES)
+    }
+    # Without a user there is nothing to invalidate
+    cache.invalidate(None, GROCERIES)
+    assert _keys(cache) == after
+
+
+def test_invalidate_all_moves_every_users_scope(cache):
+    before = _keys(cache)
+
+    cache.invalidate_all(EXPENSES)
+    after = _keys(cache)
+
+    assert all(after[(user_id, EXPENSES)] != before[(user_id, EXPENSES)] for user_id in (1, 2))
+    assert all(after[(user_id, GROCERIES)] == before[(user_id, GROCERIES)] for user_id in (1, 2))
+
+
+# --- Conditional GETs on the list routes ---
+
+@pytest.fixture
+def api(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    now = datetime.now()
+    written = now - timedelta(hours=1)
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com",
+             "password": "x", "is_active": True, "created_at": now, "updated_at": now}
+            for u in (1, 2)
+        ])
+        connection.execute(insert(Category), [{"category_id": 1, "name": "Groceries", "created_at": now}])
+        connection.execute(insert(Expense), [
+            {"expense_id": expense_id, "user_id": user_id, "category_id": 1, "amount": 10.0,
+             "expense_date": date.today(), "created_at": written, "updated_at": written}
+            for expense_id, user_id in ((1, 1), (2, 1), (3, 2))
+        ])
+        connection.execute(insert(Grocery), [
+            {"grocery_id": grocery_id, "user_id": 1, "category_id": 1, "expense_id": 1,
+             "item_name": f"Item {grocery_id}", "unit_price": 2.0, "quantity": 1.0, "total_cost": 2.0,
+             "purchase_date": date.today(), "created_at": written, "updated_at": written}
+            for grocery_id in (1, 2)
+        ])
+        with Session(bind=connection) as db_session:
+            rebuild_rollups(db_session)
+            rebuild_search_index(db_session)
+            db_session.flush()
+    SessionLocal.configure(bind=db_engine)
+
+    response_cache = ResponseCache(MemoryResponseBackend(100))
+    expense_service = ExpenseService(response_cache=response_cache)
+    grocery_service = GroceryService(response_cache=response_cache)
+    app = FastAPI()
+    app.state.services = SimpleNamespace(
+        get_response_cache=lambda: response_cache,
+        get_expense_service=lambda: expense_service,
+        get_grocery_service=lambda: grocery_service,
+    )
+    app.include_router(expense_router, prefix="/api/expenses")
+    app.include_router(grocery_router, prefix="/api/groceries")
+    with TestClient(app) as client:
+        yield client, expense_service, response_cache
+    db_engine.dispose()
+
+
+def test_matching_etag_gets_304(api):
+    client, _, response_cache = api
+
+    first = client.get("/api/expenses/user/1")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, no-cache"
+    etag = first.headers["etag"]
+
+    again = client.get("/api/expenses/user/1", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert response_cache.stats()["hits"] == 1
+
+    for header in (f'W/{etag}, "other"', "*"):
+        assert client.get("/api/expenses/user/1", headers={"If-None-Match": header}).status_code == 304
+    stale = client.get("/api/expenses/user/1", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+    assert stale.json() == first.json()
+
+
+def test_query_string_is_part_of_the_key(api):
+    client, _, _ = api
+
+    full = client.get("/api/expenses/user/1")
+    page = client.get("/api/expenses/user/1", params={"limit": 1})
+
+    assert len(full.json()["data"]) == 2
+    assert len(page.json()["data"]) == 1
+    assert page.headers["etag"] != full.headers["etag"]
+    # Parameter order does not matter
+    assert client.get("/api/expenses/user/1?fields=amount&limit=1").headers["etag"] == \
+        client.get("/api/expenses/user/1?limit=1&fields=amount").headers["etag"]
+
+
+def test_expense_delete_refreshes_grocery_list(api):
+    client, expense_service, _ = api
+    groceries = client.get("/api/groceries/user/1")
+    other_user = client.get("/api/expenses/user/2")
+    assert [item["expense_id"] for item in groceries.json()["data"]] == [1, 1]
+
+    assert expense_service.delete_expense(1).success
+
+    refreshed = client.get("/api/groceries/user/1", headers={"If-None-Match": groceries.headers["etag"]})
+    assert refreshed.status_code == 200
+    assert [item["expense_id"] for item in refreshed.json()["data"]] == [None, None]
+    assert [item["expense_id"] for item in client.get("/api/expenses/user/1").json()["data"]] == [2]
+    # Another user's cached list is untouched
+    assert client.get(
+        "/api/expenses/user/2", headers={"If-None-Match": other_user.headers["etag"]},
+    ).status_code == 304
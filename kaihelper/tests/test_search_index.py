@@ -0,0 +1,63 @@
+"""
+Full-text search on each engine, including the words InnoDB leaves out of a
+FULLTEXT index (shorter than ``innodb_ft_min_token_size``, stopwords).
+"""
+
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.core.search_index import DOC_TYPES, GROCERY, index_groceries, query_terms, search
+
+ITEMS = {
+    1: "Pams Milk 2L",
+    2: "Anchor Milk 1L",
+    3: "The Best Hummus",
+    4: "Pams Butter",
+}
+
+
+@pytest.fixture
+def db(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    groceries = [
+        SimpleNamespace(grocery_id=grocery_id, user_id=1, item_name=name, canonical_name=None,
+                        notes=None, purchase_date=date(2026, 1, grocery_id))
+        for grocery_id, name in ITEMS.items()
+    ]
+    # Another user's copy of every item must never be returned
+    groceries += [SimpleNamespace(**{**vars(grocery), "grocery_id": grocery.grocery_id + 100, "user_id": 2})
+                  for grocery in groceries]
+    with Session(db_engine) as session:
+        index_groceries(session, groceries)
+        # InnoDB applies FULLTEXT changes at commit
+        session.commit()
+    with Session(db_engine) as session:
+        yield session
+    db_engine.dispose()
+
+
+def _found(db, query: str):
+    rows = search(db, 1, query_terms(query), DOC_TYPES, limit=10)
+    assert all(row.doc_type == GROCERY for row in rows)
+    return sorted(row.doc_id for row in rows)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("milk", [1, 2]),
+    ("pams", [1, 4]),
+    ("pams milk", [1]),
+    ("mil", [1, 2]),            # prefix
+    ("2l", [1]),                # shorter than the InnoDB minimum token size
+    ("milk 2l", [1]),
+    ("the hummus", [3]),        # InnoDB stopword
+    ("kombucha", []),
+])
+def test_search_matches_every_term(db, query, expected):
+    assert _found(db, query) == expected
@@ -0,0 +1,166 @@
+"""
+Delta sync on each engine: tokens round-trip, a round served in small
+batches delivers every row exactly once, deletes arrive as tombstones in the
+next round, and an expired or malformed token is refused (410 / 400).
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from kaihelper.api.routes.sync_api import router as sync_router
+from kaihelper.business.services.sync_service import SyncService
+from kaihelper.contracts.sync_dto import SyncQueryDTO
+from kaihelper.domain.core.change_feed import DELETED, EXPENSES, GROCERIES, SyncToken
+from kaihelper.domain.core.database import SessionLocal
+from kaihelper.domain.core.migrations import upgrade_database
+from kaihelper.domain.core.rollups import rebuild_rollups
+from kaihelper.domain.core.search_index import rebuild_search_index
+from kaihelper.domain.models.category import Category
+from kaihelper.domain.models.expense import Expense
+from kaihelper.domain.models.grocery import Grocery
+from kaihelper.domain.models.user import User
+from kaihelper.domain.repositories.expense_repository import ExpenseRepository
+from kaihelper.domain.repositories.grocery_repository import GroceryRepository
+from kaihelper.domain.repositories.sync_repository import SyncRepository
+
+EXPENSE_IDS = [1, 2, 3, 4, 5]
+GROCERY_IDS = [1, 2, 3]
+
+
+@pytest.fixture
+def db_engine(database_url):
+    db_engine = create_engine(database_url, poolclass=NullPool, future=True)
+    upgrade_database(db_engine)
+    now = datetime.now()
+    # Written before the first sync's horizon, whatever the clock resolution
+    written = now - timedelta(hours=1)
+    with db_engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": u, "username": f"user{u}", "email": f"user{u}@example.com",
+             "password": "x", "is_active": True, "created_at": now, "updated_at": now}
+            for u in (1, 2)
+        ])
+        connection.execute(insert(Category), [{"category_id": 1, "name": "Groceries", "created_at": now}])
+        connection.execute(insert(Expense), [
+            {"expense_id": expense_id, "user_id": 1, "category_id": 1, "amount": 10.0,
+             "expense_date": date.today(), "created_at": written, "updated_at": written}
+            for expense_id in EXPENSE_IDS
+        ] + [{"expense_id": 99, "user_id": 2, "category_id": 1, "amount": 10.0,
+              "expense_date": date.today(), "created_at": written, "updated_at": written}])
+        connection.execute(insert(Grocery), [
+            {"grocery_id": grocery_id, "user_id": 1, "category_id": 1, "expense_id": 1,
+             "item_name": f"Item {grocery_id}", "unit_price": 2.0, "quantity": 1.0, "total_cost": 2.0,
+             "purchase_date": date.today(), "created_at": written, "updated_at": written}
+            for grocery_id in GROCERY_IDS
+        ])
+        with Session(bind=connection) as db_session:
+            rebuild_rollups(db_session)
+            rebuild_search_index(db_session)
+            db_session.flush()
+    SessionLocal.configure(bind=db_engine)
+    yield db_engine
+    db_engine.dispose()
+
+
+def _sync_round(repository, since=None, limit=500):
+    """Follow ``next_token`` until the round is finished; returns the batches and the last token."""
+    batches = []
+    while True:
+        result = repository.changes(1, SyncQueryDTO(since=since, limit=limit))
+        assert result.success, result.message
+        batches.append(result.data)
+        since = result.data.next_token
+        if not result.data.has_more:
+            return batches, since
+
+
+def _ids(table):
+    return [row[0] for row in table.rows]
+
+
+def _past_clock_tick(db_engine):
+    """MySQL's DATETIME keeps whole seconds, so a write in the horizon's second could sort before it."""
+    if db_engine.dialect.name == "mysql":
+        time.sleep(1.1)
+
+
+def test_token_round_trips():
+    horizon = datetime(2026, 1, 15, 10, 42, 7, 123456)
+    positions = {EXPENSES: (horizon - timedelta(seconds=5), 42), GROCERIES: None, DELETED: (horizon, None)}
+
+    for token in (SyncToken(horizon), SyncToken(horizon, positions)):
+        encoded = token.encode()
+        assert "=" not in encoded
+        assert SyncToken.decode(encoded) == token
+
+
+def test_batches_deliver_every_row_once(db_engine):
+    repository = SyncRepository(settle_seconds=0)
+
+    batches, token = _sync_round(repository, limit=2)
+
+    assert [batch.has_more for batch in batches] == [True, True, False]
+    assert [_ids(batch.expenses) for batch in batches] == [[1, 2], [3, 4], [5]]
+    assert [_ids(batch.groceries) for batch in batches] == [[1, 2], [3], []]
+    assert all(batch.deleted == {"expenses": [], "groceries": []} for batch in batches)
+    assert batches[0].expenses.columns[0] == "expense_id" and "user_id" not in batches[0].expenses.columns
+    assert SyncToken.decode(token).positions is None
+
+    # Nothing changed since the finished round
+    batches, _ = _sync_round(repository, since=token)
+    assert [(_ids(batch.expenses), _ids(batch.groceries)) for batch in batches] == [([], [])]
+
+
+def test_deletes_arrive_as_tombstones(db_engine):
+    repository = SyncRepository(settle_seconds=0)
+    _, token = _sync_round(repository)
+    _past_clock_tick(db_engine)
+
+    assert ExpenseRepository().delete(1).success
+    assert GroceryRepository().delete(3).success
+
+    batches, _ = _sync_round(repository, since=token)
+
+    assert len(batches) == 1
+    batch = batches[0]
+    assert batch.deleted == {"expenses": [1], "groceries": [3]}
+    assert _ids(batch.expenses) == []
+    # The expense's remaining items are detached, so they sync as updates
+    expense_column = batch.groceries.columns.index("expense_id")
+    assert [(row[0], row[expense_column]) for row in batch.groceries.rows] == [(1, None), (2, None)]
+
+
+def test_full_sync_skips_tombstones(db_engine):
+    assert GroceryRepository().delete(3).success
+
+    batches, _ = _sync_round(SyncRepository(settle_seconds=0))
+
+    # A client syncing from scratch never had the row
+    assert batches[0].deleted == {"expenses": [], "groceries": []}
+    assert _ids(batches[0].groceries) == [1, 2]
+
+
+def test_expired_and_invalid_tokens_are_refused(db_engine):
+    repository = SyncRepository(settle_seconds=0, retention_days=1)
+    expired = SyncToken(datetime.now() - timedelta(days=2)).encode()
+
+    assert repository.changes(1, SyncQueryDTO(since=expired)).code == 410
+    assert repository.changes(1, SyncQueryDTO(since="not-a-token")).code == 400
+
+    app = FastAPI()
+    app.state.services = SimpleNamespace(get_sync_service=lambda: SyncService(repository))
+    app.include_router(sync_router, prefix="/api/sync")
+    with TestClient(app) as client:
+        assert client.get("/api/sync", params={"user_id": 1, "since": expired}).status_code == 410
+        assert client.get("/api/sync/user/1", params={"since": "not-a-token"}).status_code == 400
+        response = client.get("/api/sync/user/1")
+    assert response.status_code == 200
+    assert SyncToken.decode(response.json()["next_token"]).positions is None
@@ -0,0 +1,319 @@
+# kaihelper/utils/extraction_cache.py
+"""
+Content-addressed cache for receipt extraction results.
+
+Entries are keyed by the SHA-256 of the preprocessed image bytes produced by
+``image_normalizer.preprocess_receipt_image`` and store the parsed JSON dict returned by
+the vision model. Backends are pluggable (in-process LRU, local directory, or
+a database table) and all of them honour a TTL and a maximum entry count.
+Only byte-identical normalized images match: a payload is never reused for a
+merely similar photo, which could be another user's receipt with the same layout.
+"""
+
+# --- Standard library imports ---
+import hashlib
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+def content_key(image_bytes: bytes) -> str:
+    """Return the content address (hex SHA-256) of normalized image bytes."""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class ExtractionCacheBackend(ABC):
+    """Storage contract for cached extraction payloads."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        """Return ``(payload, created_ts)`` for a key and mark it recently used."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, payload: dict, created_ts: float) -> None:
+        """Store a payload under a key."""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key if present."""
+        pass
+
+    @abstractmethod
+    def evict(self, max_entries: int) -> int:
+        """Drop least-recently-used entries beyond ``max_entries``; return the count removed."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryCacheBackend(ExtractionCacheBackend):
+    """In-process LRU backed by an OrderedDict (per Lambda container / worker)."""
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        payload, created_ts = entry
+        return json.loads(payload), created_ts
+
+    def put(self, key: str, payload: dict, created_ts: float) -> None:
+        self._entries[key] = (json.dumps(payload), created_ts)
+        self._entries.move_to_end(key)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def evict(self, max_entries: int) -> int:
+        removed = 0
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileCacheBackend(ExtractionCacheBackend):
+    """One JSON file per entry in a local directory; file mtime tracks recency."""
+
+    def __init__(self, directory: str) -> None:
+        self._dir = os.path.abspath(directory)
+        os.makedirs(self._dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            return None
+        return entry["payload"], entry["created_ts"]
+
+    def put(self, key: str, payload: dict, created_ts: float) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({"payload": payload, "created_ts": created_ts}, handle)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _files(self) -> list[str]:
+        return [name for name in os.listdir(self._dir) if name.endswith(".json")]
+
+    def evict(self, max_entries: int) -> int:
+        files = self._files()
+        if len(files) <= max_entries:
+            return 0
+        files.sort(key=lambda name: os.path.getmtime(os.path.join(self._dir, name)))
+        stale = files[: len(files) - max_entries]
+        for name in stale:
+            self.delete(name[:-5])
+        return len(stale)
+
+    def clear(self) -> None:
+        for name in self._files():
+            self.delete(name[:-5])
+
+    def __len__(self) -> int:
+        return len(self._files())
+
+
+class DatabaseCacheBackend(ExtractionCacheBackend):
+    """Entries stored in the ``receipt_extraction_cache`` table via SQLAlchemy."""
+
+    def __init__(self, session_factory=None) -> None:
+        # Deferred so the memory/file backends never touch the database layer
+        from kaihelper.domain.models.extraction_cache import ExtractionCacheEntry
+
+        if session_factory is None:
+            from kaihelper.domain.core.database import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        self._model = ExtractionCacheEntry
+
+    def get(self, key: str) -> Optional[Tuple[dict, float]]:
+        with self._session_factory() as db_session:
+            entry = db_session.get(self._model, key)
+            if entry is None:
+                return None
+            entry.last_hit_at = datetime.now()
+            db_session.commit()
+            return json.loads(entry.payload), entry.created_at.timestamp()
+
+    def put(self, key: str, payload: dict, created_ts: float) -> None:
+        body = json.dumps(payload)
+        created_at = datetime.fromtimestamp(created_ts)
+        with self._session_factory() as db_session:
+            db_session.merge(self._model(
+                cache_key=key,
+                payload=body,
+                size_bytes=len(body),
+                created_at=created_at,
+                last_hit_at=created_at,
+            ))
+            db_session.commit()
+
+    def delete(self, key: str) -> None:
+        with self._session_factory() as db_session:
+            db_session.query(self._model).filter_by(cache_key=key).delete()
+            db_session.commit()
+
+    def evict(self, max_entries: int) -> int:
+        with self._session_factory() as db_session:
+            total = db_session.query(self._model).count()
+            if total <= max_entries:
+                return 0
+            stale = [
+                key for (key,) in db_session.query(self._model.cache_key)
+                .order_by(self._model.last_hit_at)
+                .limit(total - max_entries)
+                .all()
+            ]
+            db_session.query(self._model).filter(
+                self._model.cache_key.in_(stale)
+            ).delete(synchronize_session=False)
+            db_session.commit()
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._session_factory() as db_session:
+            db_session.query(self._model).delete()
+            db_session.commit()
+
+    def __len__(self) -> int:
+        with self._session_factory() as db_session:
+            return db_session.query(self._model).count()
+
+
+class ExtractionCache:
+    """
+    Read-through cache facade with TTL, size-based eviction and hit/miss counters.
+
+    Args:
+        backend (ExtractionCacheBackend): Storage backend.
+        ttl_seconds (int): Entries older than this are treated as misses (0 = no expiry).
+        max_entries (int): Upper bound on stored entries (LRU eviction).
+    """
+
+    def __init__(
+        self,
+        backend: ExtractionCacheBackend,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 512,
+    ) -> None:
+        self._backend = backend
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "puts": 0, "evictions": 0, "expired": 0}
+
+    def _is_expired(self, created_ts: float) -> bool:
+        return bool(self._ttl) and (time.time() - created_ts) > self._ttl
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        """Return a live payload for a key, dropping it if expired."""
+        entry = self._backend.get(key)
+        if entry is None:
+            return None
+        payload, created_ts = entry
+        if self._is_expired(created_ts):
+            self._backend.delete(key)
+            self._stats["expired"] += 1
+            return None
+        return payload
+
+    def get(self, image_bytes: bytes) -> Optional[dict]:
+        """Return the cached extraction for an image, or None on a miss."""
+        key = content_key(image_bytes)
+        with self._lock:
+            if (payload := self._lookup(key)) is not None:
+                self._stats["hits"] += 1
+                return payload
+
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, image_bytes: bytes, payload: dict) -> None:
+        """Store an extraction result for an image and enforce the size bound."""
+        key = content_key(image_bytes)
+        with self._lock:
+            self._backend.put(key, payload, time.time())
+            self._stats["puts"] += 1
+            self._stats["evictions"] += self._backend.evict(self._max_entries)
+
+    def clear(self) -> None:
+        """Remove every cached entry (counters are kept)."""
+        with self._lock:
+            self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            hit_rate = self._stats["hits"] / lookups if lookups else 0.0
+            return {
+                **self._stats,
+                "hit_rate": round(hit_rate, 4),
+                "size": len(self._backend),
+                "max_entries": self._max_entries,
+                "ttl_seconds": self._ttl,
+                "backend": type(self._backend).__name__,
+            }
+
+
+def build_extraction_cache(config) -> Optional[ExtractionCache]:
+    """
+    Build the cache configured in Settings, or None when disabled.
+
+    Args:
+        config (Settings): Application settings.
+    """
+    kind = config.EXTRACTION_CACHE_BACKEND
+    if kind in ("", "none", "off"):
+        return None
+    if kind == "memory":
+        backend: ExtractionCacheBackend = MemoryCacheBackend()
+    elif kind == "file":
+        backend = FileCacheBackend(config.EXTRACTION_CACHE_DIR)
+    elif kind in ("db", "database", "sqlite"):
+        backend = DatabaseCacheBackend()
+    else:
+        raise ValueError(f"Unknown EXTRACTION_CACHE_BACKEND '{kind}'")
+
+    return ExtractionCache(
+        backend,
+        ttl_seconds=config.EXTRACTION_CACHE_TTL_SECONDS,
+        max_entries=config.EXTRACTION_CACHE_MAX_ENTRIES,
+    )
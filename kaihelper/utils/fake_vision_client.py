@@ -0,0 +1,100 @@
+# kaihelper/utils/fake_vision_client.py
+"""
+Offline stand-in for the OpenAI chat-completions client.
+
+Replays recorded receipt extractions (the JSON the vision model returned)
+with a configurable latency, so ``VisionLLMExtractor`` — request building,
+base64 encoding, JSON and streaming parsing — runs end to end without an API
+key or network. Used by the ``replay`` extraction engine and the ingestion
+benchmark.
+
+Recordings are loaded from a ``.json`` file (one extraction or a list), a
+``.jsonl`` file (one extraction per line) or a directory of such files, and
+are replayed in order, wrapping around.
+"""
+
+# --- Standard library imports ---
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Iterator, List
+
+# Streamed responses are cut into chunks of about this many characters
+STREAM_CHUNK_CHARS = 64
+
+
+def load_recordings(path: str) -> List[dict]:
+    """
+    Read recorded extractions from a file or directory.
+
+    Args:
+        path (str): ``.json``/``.jsonl`` file, or a directory of them (sorted by name).
+
+    Returns:
+        list[dict]: Extractions in replay order.
+
+    Raises:
+        ValueError: If no recording is found.
+    """
+    if os.path.isdir(path):
+        files = [
+            os.path.join(path, name) for name in sorted(os.listdir(path))
+            if name.endswith((".json", ".jsonl"))
+        ]
+    else:
+        files = [path]
+
+    recordings: List[dict] = []
+    for file_path in files:
+        with open(file_path, "r", encoding="utf-8") as handle:
+            if file_path.endswith(".jsonl"):
+                recordings.extend(json.loads(line) for line in handle if line.strip())
+            else:
+                payload = json.load(handle)
+                recordings.extend(payload if isinstance(payload, list) else [payload])
+    if not recordings:
+        raise ValueError(f"No recorded extractions found in {path}")
+    return recordings
+
+
+class FakeVisionClient:
+    """
+    Duck-typed ``openai.OpenAI`` replacement: ``client.chat.completions.create``.
+
+    Each call returns the next recording after sleeping ``latency_ms``; with
+    ``stream=True`` the JSON is delivered in chunks spread over the same
+    latency, so items arrive progressively like a real streamed completion.
+    """
+
+    def __init__(self, recordings: List[dict], latency_ms: float = 0.0) -> None:
+        if not recordings:
+            raise ValueError("FakeVisionClient needs at least one recording")
+        self.recordings = [json.dumps(recording) for recording in recordings]
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _next(self) -> str:
+        with self._lock:
+            content = self.recordings[self.calls % len(self.recordings)]
+            self.calls += 1
+        return content
+
+    def _create(self, stream: bool = False, **_request):
+        content = self._next()
+        if stream:
+            return self._stream(content)
+        time.sleep(self.latency_ms / 1000)
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _stream(self, content: str) -> Iterator[SimpleNamespace]:
+        pieces = [content[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+        pause = self.latency_ms / 1000 / len(pieces)
+        for piece in pieces:
+            time.sleep(pause)
+            delta = SimpleNamespace(content=piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
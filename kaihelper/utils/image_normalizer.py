@@ -1,14 +1,259 @@
 # kaihelper/utils/image_normalizer.py
+"""
+Receipt image preprocessing.
+
+One pipeline that decodes the upload once and encodes once:
+EXIF-orient -> auto-crop to the receipt -> grayscale -> downscale -> JPEG/WebP.
+The output is what we send to the vision model (and what the extraction
+cache hashes), so every byte saved here is saved on upload and tokens.
+"""
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
 from io import BytesIO
-from PIL import Image
+from typing import TYPE_CHECKING, Dict, Optional
 
-def to_jpeg_bytes(raw: bytes) -> bytes:
+from kaihelper.config.settings import settings
+from kaihelper.domain.core.tracing import span
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# PIL (and pillow-heif) are imported on first use: endpoints that never touch
+# an image should not pay for them on a cold start.
+
+
+@dataclass(frozen=True)
+class PreprocessOptions:
+    """
+    Tunables for the preprocessing pipeline.
+
+    Attributes:
+        max_long_edge (int): Downscale so the longest side is at most this (0 = keep size).
+        output_format (str): "JPEG" or "WEBP".
+        quality (int): Encoder quality (1-95).
+        grayscale (bool): Convert to 8-bit grayscale before encoding.
+        autocrop (bool): Crop to the bright paper region when it is clearly detectable.
     """
-    Open arbitrary image bytes (JPEG/PNG/WEBP/GIF/HEIC if pillow-heif registered),
-    convert to RGB, and re-encode as clean JPEG bytes.
+    max_long_edge: int = 1600
+    output_format: str = "JPEG"
+    quality: int = 80
+    grayscale: bool = True
+    autocrop: bool = True
+
+    @staticmethod
+    def from_settings() -> "PreprocessOptions":
+        """Build options from the global Settings."""
+        return PreprocessOptions(
+            max_long_edge=settings.IMAGE_MAX_LONG_EDGE,
+            output_format=settings.IMAGE_FORMAT,
+            quality=settings.IMAGE_QUALITY,
+            grayscale=settings.IMAGE_GRAYSCALE,
+            autocrop=settings.IMAGE_AUTOCROP,
+        )
+
+
+@dataclass
+class PreprocessedImage:
     """
+    Result of the preprocessing pipeline.
+
+    Attributes:
+        data (bytes): Encoded image bytes.
+        mime_type (str): MIME type of ``data`` (image/jpeg or image/webp).
+        width (int): Output width in pixels.
+        height (int): Output height in pixels.
+        input_bytes (int): Size of the raw upload.
+        output_bytes (int): Size of ``data``.
+        cropped (bool): Whether auto-crop changed the frame.
+        timings_ms (dict[str, float]): Per-stage timings in milliseconds.
+    """
+    data: bytes
+    mime_type: str
+    width: int
+    height: int
+    input_bytes: int
+    output_bytes: int
+    cropped: bool = False
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """One-line metrics summary for logs."""
+        ratio = self.output_bytes / self.input_bytes if self.input_bytes else 0.0
+        stages = " ".join(f"{name}={ms}" for name, ms in self.timings_ms.items())
+        return (
+            f"{self.input_bytes}B -> {self.output_bytes}B ({ratio:.0%}) "
+            f"{self.width}x{self.height} {self.mime_type} cropped={self.cropped} | {stages}"
+        )
+
+
+_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+
+def image_mime_type(data: bytes) -> str:
+    """Detect the MIME type of encoded bytes produced by this module."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    return "image/jpeg"
+
+
+@lru_cache(maxsize=None)
+def _register_heif_opener() -> None:
+    """Let PIL open HEIC/HEIF uploads when pillow-heif is installed (once per process)."""
+    try:
+        import pillow_heif
+
+        pillow_heif.register_heif_opener()
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def _otsu_threshold(gray: "Image.Image") -> int:
+    """Otsu's threshold on an 8-bit grayscale image histogram."""
+    histogram = gray.histogram()[:256]
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    sum_bg, weight_bg, best_var, threshold = 0.0, 0, -1.0, 127
+    for level, count in enumerate(histogram):
+        weight_bg += count
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += level * count
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        between = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if between > best_var:
+            best_var, threshold = between, level
+    return threshold
+
+
+def _receipt_bbox(img: "Image.Image") -> Optional[tuple[int, int, int, int]]:
+    """
+    Locate the receipt (bright paper on a darker background) on a small thumbnail.
+
+    Returns:
+        tuple | None: Crop box in ``img`` coordinates, or None when no confident crop exists.
+    """
+    from PIL import ImageFilter
+
+    probe = img.convert("L") if img.mode != "L" else img
+    probe = probe.copy()
+    probe.thumbnail((256, 256))
+    threshold = _otsu_threshold(probe)
+    mask = probe.point(lambda value: 255 if value > threshold else 0)
+    # Erode so specks/glare in the background do not stretch the box
+    mask = mask.filter(ImageFilter.MinFilter(5))
+    bbox = mask.getbbox()
+    if not bbox:
+        return None
+
+    left, top, right, bottom = bbox
+    box_area = (right - left) * (bottom - top)
+    probe_area = probe.width * probe.height
+    # Nothing to gain (already tight) or not confident (tiny region)
+    if box_area > 0.92 * probe_area or box_area < 0.15 * probe_area:
+        return None
+
+    scale_x = img.width / probe.width
+    scale_y = img.height / probe.height
+    margin_x = int(0.02 * img.width)
+    margin_y = int(0.02 * img.height)
+    return (
+        max(0, int(left * scale_x) - margin_x),
+        max(0, int(top * scale_y) - margin_y),
+        min(img.width, int(right * scale_x) + margin_x),
+        min(img.height, int(bottom * scale_y) + margin_y),
+    )
+
+
+def preprocess_receipt_image(raw: bytes, options: PreprocessOptions | None = None) -> PreprocessedImage:
+    """
+    Decode once, normalize for the vision model, and encode once.
+
+    Args:
+        raw (bytes): Uploaded image bytes (JPEG/PNG/WEBP/GIF/HEIC if pillow-heif registered).
+        options (PreprocessOptions | None): Pipeline tunables (defaults from Settings).
+
+    Returns:
+        PreprocessedImage: Encoded bytes plus size and timing metrics.
+    """
+    from PIL import Image, ImageOps
+
+    _register_heif_opener()
+    options = options or PreprocessOptions.from_settings()
+    output_format = options.output_format.upper()
+    if output_format not in _MIME_TYPES:
+        raise ValueError(f"Unsupported output format '{options.output_format}'")
+
+    timings: Dict[str, float] = {}
+    started = stage = time.perf_counter()
+
+    def _lap(name: str) -> None:
+        nonlocal stage
+        now = time.perf_counter()
+        timings[name] = round((now - stage) * 1000, 2)
+        stage = now
+
     with Image.open(BytesIO(raw)) as img:
-        img = img.convert("RGB")
-        buf = BytesIO()
-        img.save(buf, format="JPEG", quality=90, optimize=True)
-        return buf.getvalue()
+        target_mode = "L" if options.grayscale else "RGB"
+        with span("image.decode", input_bytes=len(raw), source_format=img.format):
+            if options.max_long_edge:
+                # Let the JPEG decoder do most of the downscale (DCT scaling) while decoding
+                img.draft(target_mode, (options.max_long_edge, options.max_long_edge))
+            img.load()
+        _lap("decode_ms")
+
+        img = ImageOps.exif_transpose(img)
+        _lap("orient_ms")
+
+        img = img.convert(target_mode)
+
+        cropped = False
+        if options.autocrop and (box := _receipt_bbox(img)) is not None:
+            img = img.crop(box)
+            cropped = True
+        _lap("crop_ms")
+
+        if options.max_long_edge and max(img.size) > options.max_long_edge:
+            img.thumbnail((options.max_long_edge, options.max_long_edge), Image.Resampling.LANCZOS)
+        _lap("resize_ms")
+
+        with span("image.encode", format=output_format, width=img.width, height=img.height) as current:
+            buf = BytesIO()
+            save_kwargs = {"quality": options.quality}
+            if output_format == "JPEG":
+                save_kwargs["optimize"] = True
+            else:
+                save_kwargs["method"] = 4
+            img.save(buf, format=output_format, **save_kwargs)
+            data = buf.getvalue()
+            current.set_attribute("output_bytes", len(data))
+        _lap("encode_ms")
+
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return PreprocessedImage(
+            data=data,
+            mime_type=_MIME_TYPES[output_format],
+            width=img.width,
+            height=img.height,
+            input_bytes=len(raw),
+            output_bytes=len(data),
+            cropped=cropped,
+            timings_ms=timings,
+        )
+
+
+def to_jpeg_bytes(raw: bytes) -> bytes:
+    """
+    Open arbitrary image bytes (JPEG/PNG/WEBP/GIF/HEIC if pillow-heif registered)
+    and return the preprocessed bytes sent to the vision model.
+
+    Kept for callers that only need the bytes; the encoding follows
+    IMAGE_FORMAT (JPEG by default).
+    """
+    return preprocess_receipt_image(raw).data
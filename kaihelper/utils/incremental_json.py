@@ -0,0 +1,123 @@
+# kaihelper/utils/incremental_json.py
+"""
+Incremental parser for streamed receipt JSON.
+
+The vision model streams one JSON object shaped like the extraction prompt.
+``ReceiptStreamParser`` consumes it chunk by chunk and hands back every
+``items[]`` entry the moment its closing brace arrives, together with the
+top-level scalar fields seen so far (store_name, receipt_date, category, ...),
+so each line can be reported long before the completion finishes.
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+
+class ReceiptStreamParser:
+    """
+    Character-level scanner over a growing JSON buffer.
+
+    Only tracks what it needs: string/escape state, nesting depth, the current
+    top-level key, and where the current ``items[]`` element started. Complete
+    elements are decoded with ``json.loads`` on their exact slice, so the
+    scanner never has to understand numbers or literals itself.
+    """
+
+    def __init__(self, array_key: str = "items") -> None:
+        self.array_key = array_key
+        self.header: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._in_array = False
+        self._item_start: Optional[int] = None
+        self._items_seen = 0
+
+    @property
+    def items_seen(self) -> int:
+        """Number of array elements emitted so far."""
+        return self._items_seen
+
+    def feed(self, chunk: str) -> List[dict]:
+        """
+        Append a chunk of the stream.
+
+        Returns:
+            list[dict]: Array elements completed by this chunk, in order.
+        """
+        if not chunk:
+            return []
+        self._text += chunk
+        text = self._text
+        completed: List[dict] = []
+
+        for index in range(self._pos, len(text)):
+            char = text[index]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(text, index)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                if self._depth == 1 and self._value_start is not None:
+                    # Container value at the top level: only the items array is tracked
+                    self._in_array = char == "[" and self._key == self.array_key
+                    self._value_start = None
+                elif self._in_array and self._depth == 2 and char == "{":
+                    self._item_start = index
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 1:
+                    self._end_scalar(text, index)
+                elif self._in_array and self._depth == 3 and char == "}" and self._item_start is not None:
+                    completed.append(json.loads(text[self._item_start:index + 1]))
+                    self._item_start = None
+                    self._items_seen += 1
+                elif self._in_array and self._depth == 2 and char == "]":
+                    self._in_array = False
+                self._depth -= 1
+            elif self._depth == 1:
+                if char == ":":
+                    self._key = json.loads(self._last_string) if self._last_string else None
+                    self._value_start = index + 1
+                elif char == ",":
+                    self._end_scalar(text, index)
+
+        self._pos = len(text)
+        return completed
+
+    def result(self) -> dict:
+        """Decode the complete document (call once the stream has ended)."""
+        return json.loads(self._text)
+
+    def _end_string(self, text: str, index: int) -> None:
+        if self._depth != 1:
+            return
+        raw = text[self._string_start:index + 1]
+        if self._value_start is not None:
+            self.header[self._key] = json.loads(raw)
+            self._value_start = None
+        else:
+            self._last_string = raw
+
+    def _end_scalar(self, text: str, index: int) -> None:
+        """Record a number/true/false/null value that ends at ``index``."""
+        if self._value_start is None:
+            return
+        raw = text[self._value_start:index].strip()
+        self._value_start = None
+        if raw:
+            self.header[self._key] = json.loads(raw)
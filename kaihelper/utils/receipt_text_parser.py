@@ -0,0 +1,224 @@
+# kaihelper/utils/receipt_text_parser.py
+"""
+Rule-based parser for OCR'd till slips.
+
+Turns plain receipt text into the same JSON shape the vision model returns
+(store_name, receipt_date, items, total_amount, ...) and scores how much the
+result can be trusted. The score is what the routing extractor uses to decide
+whether a receipt needs the LLM at all, so it is deliberately conservative:
+anything whose line items do not add up to the printed total is low confidence.
+"""
+import re
+from datetime import date, datetime
+from typing import Optional
+
+_AMOUNT = r"-?\$?\d{1,6}[.,]\d{2}"
+_PRICE_AT_END = re.compile(rf"^(?P<body>.*?)\s*(?P<price>{_AMOUNT})\s*[A-Z*#]{{0,2}}$")
+_QTY_AT_UNIT = re.compile(
+    r"(?P<qty>\d+(?:\.\d+)?)\s*(?:kg|ea|pk)?\s*[x@]\s*\$?(?P<unit>\d{1,6}[.,]\d{2})(?:\s*/\s*(?:kg|ea))?",
+    re.IGNORECASE,
+)
+_LEADING_QTY = re.compile(r"^(?P<qty>\d{1,3})\s*[xX]\s+")
+_RECEIPT_NUMBER = re.compile(
+    r"(?:receipt|invoice|inv|trans(?:action)?)\s*(?:no\.?|number|#)?\s*[:#]?\s*(?P<number>[A-Z0-9-]*\d[A-Z0-9-]{2,})",
+    re.IGNORECASE,
+)
+_CURRENCY = re.compile(r"\b(NZD|AUD|USD|EUR|GBP)\b")
+_DATE_PATTERNS = (
+    (re.compile(r"\b(?P<y>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})\b"), None),
+    (re.compile(r"\b(?P<d>\d{1,2})[-/.](?P<m>\d{1,2})[-/.](?P<y>\d{2,4})\b"), None),
+    (re.compile(r"\b(?P<d>\d{1,2})\s*(?P<mon>[A-Za-z]{3})[A-Za-z]*\.?\s*,?\s*(?P<y>\d{2,4})\b"), "%b"),
+)
+
+_SUMMARY_KEYWORDS = (
+    ("subtotal_amount", ("subtotal", "sub total", "sub-total")),
+    ("tax_amount", ("gst", "tax", "vat")),
+    ("discount_amount", ("discount", "savings", "saving", "promo")),
+    ("total_amount", ("total", "amount due", "balance due", "to pay")),
+)
+_PAYMENT_KEYWORDS = ("eftpos", "visa", "mastercard", "amex", "credit", "debit", "cash")
+_IGNORED_KEYWORDS = (
+    "change", "tendered", "rounding", "paid", "auth", "terminal", "approved",
+    "card no", "acct", "account", "ref", "items", "qty",
+)
+# Same hints the vision prompt uses for the ``local`` flag ("NZ" must be a whole word)
+_LOCAL_BRANDS = ("kiwi", "aotearoa", "pams", "rolling meadow")
+_CATEGORY_KEYWORDS = (
+    ("Transport", ("fuel", "petrol", "diesel", "unleaded", "z energy", "bp ", "mobil")),
+    ("Health", ("pharmacy", "chemist", "prescription")),
+    ("Dining", ("cafe", "restaurant", "takeaway", "coffee")),
+)
+_DEFAULT_SUGGESTION = "You can save this receipt under 'Groceries' or tag it by store name for tracking."
+
+
+def _to_amount(raw: str) -> float:
+    return float(raw.replace("$", "").replace(",", "."))
+
+
+def _parse_date(text: str) -> Optional[str]:
+    """Return the first plausible (day-first) date in ``text`` as ISO, or None."""
+    for pattern, month_format in _DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            year = int(match["y"])
+            year = year + 2000 if year < 100 else year
+            try:
+                if month_format:
+                    month = datetime.strptime(match["mon"][:3].title(), month_format).month
+                else:
+                    month = int(match["m"])
+                parsed = date(year, month, int(match["d"]))
+            except ValueError:
+                continue
+            if 2000 <= parsed.year <= date.today().year + 1:
+                return parsed.isoformat()
+    return None
+
+
+def _summary_field(lowered: str) -> Optional[str]:
+    """Map a summary line (TOTAL, GST, ...) to its receipt field."""
+    for field_name, keywords in _SUMMARY_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return field_name
+    return None
+
+
+def _make_item(name: str, quantity: float, unit_price: float, total_price: float) -> dict:
+    name = re.sub(r"\s{2,}", " ", name).strip(" .:-*").title()
+    lowered = name.lower()
+    return {
+        "item_name": name,
+        "quantity": quantity,
+        "unit_price": unit_price,
+        "total_price": total_price,
+        "local": "nz" in lowered.split() or any(brand in lowered for brand in _LOCAL_BRANDS),
+    }
+
+
+def _split_quantity(body: str, price: float) -> tuple[str, float, float]:
+    """Pull ``2 @ 1.50`` / ``1.234kg x $3.99/kg`` / ``2 x NAME`` out of an item description."""
+    if match := _QTY_AT_UNIT.search(body):
+        quantity = float(match["qty"])
+        unit_price = _to_amount(match["unit"])
+        return (body[: match.start()] + body[match.end():]).strip(), quantity, unit_price
+    if match := _LEADING_QTY.match(body):
+        quantity = float(match["qty"])
+        return body[match.end():], quantity, round(price / quantity, 2)
+    return body, 1.0, price
+
+
+def score_receipt(parsed: dict) -> float:
+    """
+    Structural confidence of a parsed receipt, independent of the engine.
+
+    1.0 when line items reconcile with the printed total (allowing for
+    discounts and tax-exclusive totals), 0.4 when they do not, 0.0 without
+    items or a positive total. A missing date costs 10%.
+    """
+    items = parsed.get("items") or []
+    total = parsed.get("total_amount") or 0.0
+    if not items or total <= 0:
+        return 0.0
+
+    items_sum = sum(float(item.get("total_price") or 0.0) for item in items)
+    discount = abs(float(parsed.get("discount_amount") or 0.0))
+    tax = float(parsed.get("tax_amount") or 0.0)
+    tolerance = max(0.05, 0.01 * total)
+    candidates = (items_sum, items_sum - discount, items_sum + tax, items_sum - discount + tax)
+    score = 1.0 if any(abs(candidate - total) <= tolerance for candidate in candidates) else 0.4
+    if not parsed.get("receipt_date"):
+        score *= 0.9
+    return round(score, 3)
+
+
+def parse_receipt_text(text: str, ocr_confidence: float = 1.0) -> tuple[dict, float]:
+    """
+    Parse OCR text of a till slip.
+
+    Args:
+        text (str): Receipt text, one printed line per line.
+        ocr_confidence (float): Mean recognition confidence of the OCR engine (0.0-1.0).
+
+    Returns:
+        tuple[dict, float]: Receipt in the vision-prompt JSON shape, and its confidence.
+    """
+    lines = [re.sub(r"\s+", " ", line).strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+
+    parsed: dict = {
+        "store_name": None,
+        "store_address": None,
+        "receipt_number": None,
+        "receipt_date": _parse_date(text),
+        "due_date": None,
+        "payment_method": None,
+        "category": "Groceries",
+        "currency": (match[1] if (match := _CURRENCY.search(text)) else None),
+        "items": [],
+        "subtotal_amount": None,
+        "tax_amount": None,
+        "discount_amount": None,
+        "total_amount": None,
+        "suggestion": _DEFAULT_SUGGESTION,
+    }
+    if match := _RECEIPT_NUMBER.search(text):
+        parsed["receipt_number"] = match["number"]
+
+    discount = 0.0
+    pending_name: Optional[str] = None
+    for line in lines:
+        lowered = line.lower()
+        if parsed["payment_method"] is None and (
+            method := next((word for word in _PAYMENT_KEYWORDS if word in lowered), None)
+        ):
+            parsed["payment_method"] = method.title() if method != "eftpos" else "EFTPOS"
+
+        match = _PRICE_AT_END.match(line)
+        if not match:
+            letters = sum(char.isalpha() for char in line)
+            if parsed["store_name"] is None and letters >= 3 and _parse_date(line) is None:
+                parsed["store_name"] = line.title()
+            elif letters >= 3 and not any(keyword in lowered for keyword in _IGNORED_KEYWORDS):
+                # Name on its own line; weight/quantity and price follow on the next one
+                pending_name = line
+            continue
+
+        body, price = match["body"], _to_amount(match["price"])
+        if (field_name := _summary_field(lowered)) is not None:
+            if field_name == "discount_amount":
+                discount += abs(price)
+            elif parsed[field_name] is None:
+                parsed[field_name] = abs(price)
+            pending_name = None
+            continue
+        if any(keyword in lowered for keyword in _IGNORED_KEYWORDS + _PAYMENT_KEYWORDS):
+            pending_name = None
+            continue
+        if price < 0:
+            discount += abs(price)
+            continue
+
+        name, quantity, unit_price = _split_quantity(body, price)
+        if sum(char.isalpha() for char in name) < 2:
+            if pending_name is None:
+                continue
+            name = pending_name
+        pending_name = None
+        if quantity <= 0:
+            continue
+        parsed["items"].append(_make_item(name, quantity, unit_price, price))
+
+    if discount:
+        parsed["discount_amount"] = round(discount, 2)
+    if parsed["total_amount"] is None and parsed["items"]:
+        # No printed total: fall back to the item sum, which score_receipt cannot verify
+        parsed["total_amount"] = round(sum(item["total_price"] for item in parsed["items"]), 2)
+        confidence = 0.3 * ocr_confidence
+    else:
+        confidence = score_receipt(parsed) * ocr_confidence
+
+    haystack = f"{parsed['store_name'] or ''} {text[:200]}".lower()
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if any(keyword in haystack for keyword in keywords):
+            parsed["category"] = category
+            break
+    return parsed, round(max(0.0, min(confidence, 1.0)), 3)
@@ -0,0 +1,324 @@
+# kaihelper/utils/response_cache.py
+"""
+Read-through cache for per-user GET responses (expense, grocery and budget
+lists, the user profile).
+
+Entries hold the serialized JSON body and its ETag, under a key built from
+the user, a *scope* (``expenses``, ``groceries``, ``budgets``, ``profile``),
+the scope's current versions and the request path and query. Writes do not
+delete entries: ``invalidate`` gives the user's scopes a new version, so
+every entry built before the write stops being addressed and ages out by TTL
+or LRU. Writes to shared data (categories, whose names appear in every user's
+expenses) call ``invalidate_all``, which moves a scope's global version. Because readers fetch the version *before* querying the database, a
+response built from pre-write rows can only ever be stored under the old
+version.
+
+Backends are pluggable: an in-process LRU (per worker; a write in one worker
+does not reach the others, so the TTL bounds their staleness), or a
+Redis-compatible store shared by every worker. Without a server URL the
+Redis backend runs against ``LocalRedis``, an in-process stand-in for the
+few commands it uses.
+"""
+
+# --- Standard library imports ---
+import fnmatch
+import hashlib
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+# --- First-party imports ---
+from kaihelper.domain.core.logger import get_logger
+
+log = get_logger("ResponseCache")
+
+EXPENSES = "expenses"
+GROCERIES = "groceries"
+BUDGETS = "budgets"
+PROFILE = "profile"
+SCOPES = (EXPENSES, GROCERIES, BUDGETS, PROFILE)
+# Version owner shared by every user (see ``ResponseCache.invalidate_all``)
+ALL_USERS = "*"
+
+
+class CachedResponse(NamedTuple):
+    """A serialized response body and its entity tag."""
+
+    body: bytes
+    etag: str
+
+
+def entity_tag(body: bytes) -> str:
+    """Strong ETag of a response body (quoted hex digest)."""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+class ResponseCacheBackend(ABC):
+    """Storage contract for cached responses and scope versions."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value of a live key, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Store a value, expiring after ``ttl_seconds`` (0 = never)."""
+        pass
+
+    @abstractmethod
+    def add(self, key: str, value: bytes) -> bool:
+        """Store a value only if the key is absent; True if it was stored."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryResponseBackend(ResponseCacheBackend):
+    """In-process LRU backed by an OrderedDict (per worker)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] and entry[1] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _store(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl_seconds if ttl_seconds else 0.0)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def add(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            if key in self._entries:
+                return False
+            self._store(key, value, 0)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LocalRedis:
+    """
+    In-process stand-in for a Redis server: ``get``, ``set`` (``ex``, ``nx``),
+    ``delete`` and ``scan_iter`` with Redis' semantics, for development and
+    benchmarks without a server. Nothing is shared between processes.
+    """
+
+    def __init__(self) -> None:
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] and entry[1] < time.monotonic():
+            del self._data[key]
+            return None
+        return entry[0] if entry else None
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(name)
+
+    def set(self, name: str, value, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(name) is not None:
+                return None
+            data = value if isinstance(value, bytes) else str(value).encode()
+            self._data[name] = (data, time.monotonic() + ex if ex else 0.0)
+            return True
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
+
+    def scan_iter(self, match: str = "*"):
+        with self._lock:
+            keys = [key for key in self._data if fnmatch.fnmatchcase(key, match)]
+        return iter(keys)
+
+
+class RedisResponseBackend(ResponseCacheBackend):
+    """Entries in a Redis-compatible store (``redis.Redis`` or ``LocalRedis``), expired by the server."""
+
+    def __init__(self, client, prefix: str = "kaihelper:response:") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        self._client.set(self._prefix + key, value, ex=ttl_seconds or None)
+
+    def add(self, key: str, value: bytes) -> bool:
+        return bool(self._client.set(self._prefix + key, value, nx=True))
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self._prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=self._prefix + "*"))
+
+
+class ResponseCache:
+    """
+    Versioned response cache facade with hit/miss counters.
+
+    Args:
+        backend (ResponseCacheBackend): Storage backend.
+        ttl_seconds (int): Lifetime of a cached response.
+    """
+
+    def __init__(self, backend: ResponseCacheBackend, ttl_seconds: int = 60) -> None:
+        self._backend = backend
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "puts": 0, "invalidations": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _version(self, owner: object, scope: str) -> str:
+        """Current version of a scope for ``owner`` (a user ID or ``ALL_USERS``), starting one if none is stored."""
+        version_key = f"v:{owner}:{scope}"
+        version = self._backend.get(version_key)
+        if version is None:
+            # A fresh token rather than a counter: a version lost to eviction never repeats
+            self._backend.add(version_key, uuid.uuid4().hex.encode())
+            version = self._backend.get(version_key) or b"0"
+        return version.decode()
+
+    def key(self, user_id: int, scope: str, variant: str) -> str:
+        """
+        Cache key of one response, at the scope's current version.
+
+        Args:
+            user_id (int): Owner of the data.
+            scope (str): One of ``SCOPES``.
+            variant (str): Request path and canonical query string.
+        """
+        digest = hashlib.blake2b(variant.encode(), digest_size=12).hexdigest()
+        version = f"{self._version(ALL_USERS, scope)}.{self._version(user_id, scope)}"
+        return f"r:{user_id}:{scope}:{version}:{digest}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a cached response, or None on a miss."""
+        stored = self._backend.get(key)
+        if stored is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        etag, _, body = stored.partition(b"\n")
+        return CachedResponse(body, etag.decode())
+
+    def put(self, key: str, body: bytes) -> CachedResponse:
+        """Store a serialized body; returns it with its ETag."""
+        response = CachedResponse(body, entity_tag(body))
+        self._backend.set(key, response.etag.encode() + b"\n" + body, self._ttl)
+        self._count("puts")
+        return response
+
+    def invalidate(self, user_id: Optional[int], *scopes: str) -> None:
+        """
+        Move a user's scopes to new versions (after a committed write).
+
+        Never raises: the write has already committed, so a backend error is
+        logged and the stale entries expire by TTL instead.
+        """
+        if not user_id:
+            return
+        try:
+            for scope in scopes:
+                self._backend.set(f"v:{user_id}:{scope}", uuid.uuid4().hex.encode(), 0)
+                self._count("invalidations")
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("Response cache invalidation failed", user_id=user_id, error=repr(err))
+
+    def invalidate_all(self, *scopes: str) -> None:
+        """
+        Move the scopes of every user to new versions (after a write to shared data).
+
+        Never raises, like ``invalidate``.
+        """
+        try:
+            for scope in scopes:
+                self._backend.set(f"v:{ALL_USERS}:{scope}", uuid.uuid4().hex.encode(), 0)
+                self._count("invalidations")
+        except Exception as err:  # pylint: disable=broad-except
+            log.warning("Response cache invalidation failed", scopes=scopes, error=repr(err))
+
+    def clear(self) -> None:
+        """Remove every cached entry (counters are kept)."""
+        self._backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and backend."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "ttl_seconds": self._ttl,
+                "backend": type(self._backend).__name__,
+            }
+
+
+def build_response_cache(config) -> Optional[ResponseCache]:
+    """
+    Build the cache configured in Settings, or None when disabled.
+
+    Args:
+        config (Settings): Application settings.
+    """
+    kind = config.RESPONSE_CACHE_BACKEND
+    if kind in ("", "none", "off") or config.RESPONSE_CACHE_TTL_SECONDS <= 0:
+        return None
+    if kind == "memory":
+        backend: ResponseCacheBackend = MemoryResponseBackend(config.RESPONSE_CACHE_MAX_ENTRIES)
+    elif kind == "redis":
+        if config.RESPONSE_CACHE_REDIS_URL:
+            import redis  # deferred: optional dependency, only needed with a server URL
+
+            client = redis.Redis.from_url(config.RESPONSE_CACHE_REDIS_URL)
+        else:
+            client = LocalRedis()
+        backend = RedisResponseBackend(client)
+    else:
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND '{kind}'")
+    return ResponseCache(backend, ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS)
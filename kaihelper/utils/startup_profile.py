@@ -0,0 +1,148 @@
+# kaihelper/utils/startup_profile.py
+"""
+Cold-start profiling for the API Lambda.
+
+Every measurement runs in a fresh interpreter, like a new Lambda container:
+
+    # Per-module import cost (self / cumulative ms) of the API entry point
+    python -m kaihelper.utils.startup_profile imports --top 25
+
+    # Import + first invocation through the Mangum handler, p50/p90 over N runs
+    python -m kaihelper.utils.startup_profile coldstart --runs 10 --path /health
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+DEFAULT_MODULE = "kaihelper.api.main_api"
+
+_COLD_START_SCRIPT = """
+import json, time
+started = time.perf_counter()
+module = __import__({module!r}, fromlist=["handler"])
+imported = time.perf_counter()
+event = {{
+    "version": "2.0", "routeKey": "$default", "rawPath": {path!r}, "rawQueryString": "",
+    "headers": {{"host": "localhost"}}, "isBase64Encoded": False,
+    "requestContext": {{"http": {{"method": "GET", "path": {path!r}, "protocol": "HTTP/1.1",
+                                 "sourceIp": "127.0.0.1"}}, "stage": "$default"}},
+}}
+response = module.handler(event, None)
+finished = time.perf_counter()
+print("COLDSTART " + json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "first_request_ms": (finished - imported) * 1000,
+    "total_ms": (finished - started) * 1000,
+    "status": response.get("statusCode"),
+}}))
+"""
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True, text=True, env=os.environ.copy(), check=False,
+    )
+
+
+def import_profile(module: str = DEFAULT_MODULE) -> List[Dict]:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        list[dict]: ``{"module", "self_ms", "cumulative_ms"}`` per imported module,
+        most expensive (cumulative) first.
+    """
+    proc = _run(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        rows.append({
+            "module": name.strip(),
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+    return sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)
+
+
+def package_totals(rows: List[Dict]) -> Dict[str, float]:
+    """Sum self time per top-level package (fastapi, sqlalchemy, openai, kaihelper, ...)."""
+    totals: Dict[str, float] = {}
+    for row in rows:
+        package = row["module"].split(".")[0]
+        totals[package] = totals.get(package, 0.0) + row["self_ms"]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def cold_start(runs: int = 10, path: str = "/health", module: str = DEFAULT_MODULE) -> Dict:
+    """
+    Measure import + first request through the Lambda handler ``runs`` times.
+
+    Returns:
+        dict: p50/p90/mean per phase plus the raw samples.
+    """
+    code = _COLD_START_SCRIPT.format(module=module, path=path)
+    samples = []
+    for _ in range(runs):
+        proc = _run(code)
+        line = next((l for l in proc.stdout.splitlines() if l.startswith("COLDSTART ")), None)
+        if line is None:
+            raise RuntimeError(f"Cold start run failed:\n{proc.stderr[-2000:]}")
+        samples.append(json.loads(line[len("COLDSTART "):]))
+
+    def _summary(key: str) -> Dict[str, float]:
+        values = sorted(sample[key] for sample in samples)
+        return {
+            "p50": round(statistics.median(values), 1),
+            "p90": round(values[min(len(values) - 1, int(0.9 * len(values)))], 1),
+            "mean": round(statistics.fmean(values), 1),
+        }
+
+    return {
+        "runs": runs,
+        "path": path,
+        "status": samples[-1]["status"],
+        "import_ms": _summary("import_ms"),
+        "first_request_ms": _summary("first_request_ms"),
+        "total_ms": _summary("total_ms"),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="KaiHelper cold-start profiling")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imports = sub.add_parser("imports", help="per-module import-time profile")
+    imports.add_argument("--module", default=DEFAULT_MODULE)
+    imports.add_argument("--top", type=int, default=25)
+
+    bench = sub.add_parser("coldstart", help="cold-start benchmark through the Lambda handler")
+    bench.add_argument("--module", default=DEFAULT_MODULE)
+    bench.add_argument("--runs", type=int, default=10)
+    bench.add_argument("--path", default="/health")
+
+    args = parser.parse_args(argv)
+    if args.command == "imports":
+        rows = import_profile(args.module)
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for row in rows[:args.top]:
+            print(f"{row['cumulative_ms']:>14.1f} {row['self_ms']:>9.1f}  {row['module']}")
+        print("\nSelf time per package (ms):")
+        for package, total in list(package_totals(rows).items())[:15]:
+            print(f"{total:>10.1f}  {package}")
+    else:
+        print(json.dumps(cold_start(args.runs, args.path, args.module), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,14 @@
 """
 Reset the KaiHelper database (safe for MySQL).
-Drops tables manually in dependency order, then recreates them.
+Drops tables manually in dependency order, then recreates them via migrations.
 """
 
 import os, sys
 from sqlalchemy import text
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
 
-from kaihelper.domain.core.database import Base, engine
-from kaihelper.domain.models.user import User
-from kaihelper.domain.models.budget import Budget
-from kaihelper.domain.models.category import Category
-from kaihelper.domain.models.expense import Expense
-from kaihelper.domain.models.grocery import Grocery
-from kaihelper.domain.models.EmailVerificationCode import EmailVerificationCode
+from kaihelper.domain.core.database import engine
+from kaihelper.domain.core.migrations import upgrade_database
 
 
 def reset_db():
@@ -25,6 +20,11 @@ def reset_db():
 
         # --- Drop in correct dependency order ---
         drop_order = [
+            "alembic_version",
+            "receipt_jobs",
+            "rollup_category_months",
+            "rollup_store_months",
+            "receipt_extraction_cache",
             "email_verification_codes",
             "groceries",
             "expenses",
@@ -49,8 +49,8 @@ def reset_db():
         conn.commit()
 
     # --- Recreate tables ---
-    print("🧱 Creating all tables...")
-    Base.metadata.create_all(bind=engine)
+    print("🧱 Applying migrations...")
+    upgrade_database(engine)
 
     print("✅ Database reset and recreated successfully!")
 
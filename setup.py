@@ -4,5 +4,15 @@ setup(
     name='kaihelper',
     version='0.1.0',
     packages=find_packages(),
+    package_data={'kaihelper.domain.migrations': ['script.py.mako']},
     install_requires=[],
+    entry_points={
+        'console_scripts': [
+            'kaihelper-item-names=kaihelper.domain.core.item_matching:main',
+            'kaihelper-migrate=kaihelper.domain.core.migrations:main',
+            'kaihelper-rollups=kaihelper.domain.core.rollups:main',
+            'kaihelper-search-index=kaihelper.domain.core.search_index:main',
+            'kaihelper-sync=kaihelper.domain.core.change_feed:main',
+        ],
+    },
 )